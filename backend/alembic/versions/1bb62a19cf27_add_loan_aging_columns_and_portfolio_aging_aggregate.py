@@ -0,0 +1,48 @@
+"""Add loan aging columns and portfolio_aging aggregate
+
+Revision ID: 1bb62a19cf27
+Revises: 32a26cc6a9ed
+Create Date: 2026-10-18 09:03:10.803891
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1bb62a19cf27'
+down_revision: Union[str, Sequence[str], None] = '32a26cc6a9ed'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('loans', sa.Column('principal_outstanding', sa.Numeric(precision=10, scale=2), nullable=True))
+    op.add_column('loans', sa.Column('days_past_due', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('loans', sa.Column('aged_on', sa.Date(), nullable=True))
+    op.create_table('portfolio_aging',
+    sa.Column('tenant_id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('loan_product_id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('officer_id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('bucket', sa.String(), nullable=False),
+    sa.Column('loan_count', sa.Integer(), nullable=False),
+    sa.Column('principal_outstanding', sa.Numeric(precision=16, scale=2), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['loan_product_id'], ['loan_products.id'], ),
+    sa.ForeignKeyConstraint(['tenant_id'], ['tenants.id'], ),
+    sa.PrimaryKeyConstraint('tenant_id', 'loan_product_id', 'officer_id', 'bucket')
+    )
+    # Days past due and the aggregate are filled by the next nightly sweep,
+    # or immediately with `python manage.py aging rebuild`.
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('portfolio_aging')
+    op.drop_column('loans', 'aged_on')
+    op.drop_column('loans', 'days_past_due')
+    op.drop_column('loans', 'principal_outstanding')
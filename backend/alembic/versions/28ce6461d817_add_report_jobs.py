@@ -0,0 +1,52 @@
+"""Add report_jobs
+
+Revision ID: 28ce6461d817
+Revises: 1bb62a19cf27
+Create Date: 2026-10-18 09:17:20.142862
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '28ce6461d817'
+down_revision: Union[str, Sequence[str], None] = '1bb62a19cf27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('report_jobs',
+    sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('kind', sa.String(), nullable=False),
+    sa.Column('format', sa.String(), nullable=False),
+    sa.Column('parameters', sa.JSON(), nullable=False),
+    sa.Column('status', sa.Enum('QUEUED', 'RUNNING', 'SUCCEEDED', 'FAILED', 'EXPIRED', name='reportjobstatus'), nullable=False),
+    sa.Column('error', sa.String(), nullable=True),
+    sa.Column('artifact_path', sa.String(), nullable=True),
+    sa.Column('artifact_size', sa.BigInteger(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('started_at', sa.DateTime(), nullable=True),
+    sa.Column('finished_at', sa.DateTime(), nullable=True),
+    sa.Column('expires_at', sa.DateTime(), nullable=True),
+    sa.Column('requested_by_user_id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('tenant_id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.ForeignKeyConstraint(['requested_by_user_id'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['tenant_id'], ['tenants.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_report_jobs_status_created_at', 'report_jobs', ['status', 'created_at'], unique=False)
+    op.create_index('ix_report_jobs_tenant_id_status', 'report_jobs', ['tenant_id', 'status'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_report_jobs_tenant_id_status', table_name='report_jobs')
+    op.drop_index('ix_report_jobs_status_created_at', table_name='report_jobs')
+    op.drop_table('report_jobs')
+    sa.Enum(name='reportjobstatus').drop(op.get_bind(), checkfirst=True)
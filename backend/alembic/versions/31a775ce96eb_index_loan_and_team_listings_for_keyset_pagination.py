@@ -0,0 +1,53 @@
+"""index loan and team listings for keyset pagination
+
+Revision ID: 31a775ce96eb
+Revises: ee38fc867225
+Create Date: 2026-10-18 09:54:12.826370
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '31a775ce96eb'
+down_revision: Union[str, Sequence[str], None] = 'ee38fc867225'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (table, new index, columns, index it supersedes or None, its columns)
+INDEXES = [
+    ('loans', 'ix_loans_tenant_id_applied_at_id', ['tenant_id', 'applied_at', 'id'], None, None),
+    ('loans', 'ix_loans_client_id_applied_at_id', ['client_id', 'applied_at', 'id'], 'ix_loans_client_id', ['client_id']),
+    ('users', 'ix_users_tenant_id_email', ['tenant_id', 'email'], None, None),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Keyset pages compare (applied_at, id), which never matches a NULL
+    op.execute("UPDATE loans SET applied_at = updated_at WHERE applied_at IS NULL")
+    with op.batch_alter_table('loans') as batch:
+        batch.alter_column('applied_at', existing_type=sa.DateTime(), nullable=False)
+
+    # Built concurrently before the superseded index is dropped, so lookups
+    # stay indexed and the tables stay writable throughout
+    with op.get_context().autocommit_block():
+        for table, name, columns, old_name, _ in INDEXES:
+            op.create_index(name, table, columns, postgresql_concurrently=True)
+            if old_name:
+                op.drop_index(old_name, table_name=table, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for table, name, _, old_name, old_columns in reversed(INDEXES):
+            if old_name:
+                op.create_index(old_name, table, old_columns, postgresql_concurrently=True)
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
+    with op.batch_alter_table('loans') as batch:
+        batch.alter_column('applied_at', existing_type=sa.DateTime(), nullable=True)
@@ -0,0 +1,89 @@
+"""Add loan penalties, delinquency sweep checkpoints and penalty accounts
+
+Revision ID: 32a26cc6a9ed
+Revises: 646e7880316e
+Create Date: 2026-10-18 08:58:19.580636
+
+"""
+import uuid
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '32a26cc6a9ed'
+down_revision: Union[str, Sequence[str], None] = '646e7880316e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Accounts the delinquency sweep posts penalties to, added to existing tenants
+PENALTY_ACCOUNTS = [
+    ("Penalties Receivable", "1110", "ASSET"),
+    ("Penalty Revenue", "4020", "REVENUE"),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('loan_penalties',
+    sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('schedule_id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('loan_id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('period', sa.Date(), nullable=False),
+    sa.Column('amount', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.Column('transaction_id', sa.String(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('tenant_id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.ForeignKeyConstraint(['loan_id'], ['loans.id'], ),
+    sa.ForeignKeyConstraint(['schedule_id'], ['repayment_schedules.id'], ),
+    sa.ForeignKeyConstraint(['tenant_id'], ['tenants.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_loan_penalties_loan_id'), 'loan_penalties', ['loan_id'], unique=False)
+    op.create_index(op.f('ix_loan_penalties_tenant_id'), 'loan_penalties', ['tenant_id'], unique=False)
+    op.create_index('uq_loan_penalties_schedule_id_period', 'loan_penalties', ['schedule_id', 'period'], unique=True)
+    op.create_table('delinquency_sweeps',
+    sa.Column('tenant_id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('as_of', sa.Date(), nullable=False),
+    sa.Column('installments_marked_late', sa.Integer(), nullable=False),
+    sa.Column('penalties_charged', sa.Integer(), nullable=False),
+    sa.Column('completed_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['tenant_id'], ['tenants.id'], ),
+    sa.PrimaryKeyConstraint('tenant_id', 'as_of')
+    )
+
+    # Data migration: give every existing tenant the penalty accounts
+    connection = op.get_bind()
+    chart = sa.table(
+        'chart_of_accounts',
+        sa.column('id', postgresql.UUID(as_uuid=True)),
+        sa.column('name', sa.String()),
+        sa.column('account_code', sa.String()),
+        sa.column('account_type', sa.Enum('ASSET', 'LIABILITY', 'EQUITY', 'REVENUE', 'EXPENSE', name='accounttype')),
+        sa.column('is_active', sa.Boolean()),
+        sa.column('tenant_id', postgresql.UUID(as_uuid=True)),
+    )
+    for name, code, account_type in PENALTY_ACCOUNTS:
+        missing = connection.execute(sa.text(
+            "SELECT id FROM tenants WHERE id NOT IN "
+            "(SELECT tenant_id FROM chart_of_accounts WHERE account_code = :code)"
+        ), {"code": code}).scalars().all()
+        if missing:
+            op.bulk_insert(chart, [
+                {"id": uuid.uuid4(), "name": name, "account_code": code, "account_type": account_type,
+                 "is_active": True, "tenant_id": tenant_id}
+                for tenant_id in missing
+            ])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # The penalty accounts are left in place: they may already carry ledger entries
+    op.drop_table('delinquency_sweeps')
+    op.drop_index('uq_loan_penalties_schedule_id_period', table_name='loan_penalties')
+    op.drop_index(op.f('ix_loan_penalties_tenant_id'), table_name='loan_penalties')
+    op.drop_index(op.f('ix_loan_penalties_loan_id'), table_name='loan_penalties')
+    op.drop_table('loan_penalties')
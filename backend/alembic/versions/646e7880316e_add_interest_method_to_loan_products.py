@@ -0,0 +1,28 @@
+"""Add interest_method to loan_products
+
+Revision ID: 646e7880316e
+Revises: b58bde2df3f2
+Create Date: 2026-10-18 08:46:24.757383
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '646e7880316e'
+down_revision: Union[str, Sequence[str], None] = 'b58bde2df3f2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('loan_products', sa.Column('interest_method', sa.String(), server_default='flat', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('loan_products', 'interest_method')
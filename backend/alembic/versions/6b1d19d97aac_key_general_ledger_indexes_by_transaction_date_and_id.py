@@ -0,0 +1,44 @@
+"""Key general ledger indexes by transaction date and id
+
+Revision ID: 6b1d19d97aac
+Revises: cf0b893074ef
+Create Date: 2026-10-18 09:27:30.533792
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6b1d19d97aac'
+down_revision: Union[str, Sequence[str], None] = 'cf0b893074ef'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (new index, columns, index it supersedes, its columns)
+INDEXES = [
+    ('ix_general_ledger_entries_tenant_id_transaction_date_id', ['tenant_id', 'transaction_date', 'id'],
+     'ix_general_ledger_entries_tenant_id_transaction_date', ['tenant_id', 'transaction_date']),
+    ('ix_general_ledger_entries_account_id_transaction_date_id', ['account_id', 'transaction_date', 'id'],
+     'ix_general_ledger_entries_account_id', ['account_id']),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Built concurrently before the superseded index is dropped, so ledger
+    # reads stay indexed and the table stays writable throughout
+    with op.get_context().autocommit_block():
+        for name, columns, old_name, _ in INDEXES:
+            op.create_index(name, 'general_ledger_entries', columns, postgresql_concurrently=True)
+            op.drop_index(old_name, table_name='general_ledger_entries', postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, _, old_name, old_columns in reversed(INDEXES):
+            op.create_index(old_name, 'general_ledger_entries', old_columns, postgresql_concurrently=True)
+            op.drop_index(name, table_name='general_ledger_entries', postgresql_concurrently=True)
@@ -0,0 +1,39 @@
+"""Add statement reference to repayment transactions
+
+Revision ID: 72c63f47e998
+Revises: ffb2c8aceeb8
+Create Date: 2026-10-18 09:34:42.706734
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '72c63f47e998'
+down_revision: Union[str, Sequence[str], None] = 'ffb2c8aceeb8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('repayment_transactions', sa.Column('reference', sa.String(), nullable=True))
+    # Every existing row has a NULL reference, but build it without blocking repayments
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'uq_repayment_transactions_tenant_id_reference', 'repayment_transactions', ['tenant_id', 'reference'],
+            unique=True, postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'uq_repayment_transactions_tenant_id_reference', table_name='repayment_transactions',
+            postgresql_concurrently=True,
+        )
+    op.drop_column('repayment_transactions', 'reference')
@@ -0,0 +1,58 @@
+"""Add repayment allocations and paid amounts
+
+Revision ID: 7a759f208acf
+Revises: 72c63f47e998
+Create Date: 2026-10-18 09:38:43.116804
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7a759f208acf'
+down_revision: Union[str, Sequence[str], None] = '72c63f47e998'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('repayment_schedules', sa.Column('principal_paid', sa.Numeric(precision=10, scale=2), server_default='0', nullable=False))
+    op.add_column('repayment_schedules', sa.Column('interest_paid', sa.Numeric(precision=10, scale=2), server_default='0', nullable=False))
+    op.add_column('loan_penalties', sa.Column('amount_paid', sa.Numeric(precision=10, scale=2), server_default='0', nullable=False))
+    op.create_table('repayment_allocations',
+    sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('transaction_id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('component', sa.String(), nullable=False),
+    sa.Column('schedule_id', postgresql.UUID(as_uuid=True), nullable=True),
+    sa.Column('penalty_id', postgresql.UUID(as_uuid=True), nullable=True),
+    sa.Column('amount', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.Column('tenant_id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.ForeignKeyConstraint(['penalty_id'], ['loan_penalties.id'], ),
+    sa.ForeignKeyConstraint(['schedule_id'], ['repayment_schedules.id'], ),
+    sa.ForeignKeyConstraint(['tenant_id'], ['tenants.id'], ),
+    sa.ForeignKeyConstraint(['transaction_id'], ['repayment_transactions.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_repayment_allocations_transaction_id'), 'repayment_allocations', ['transaction_id'], unique=False)
+
+    # Installments already marked paid were paid in full; loans with nothing left to pay are paid off
+    op.execute("UPDATE repayment_schedules SET principal_paid = principal_due, interest_paid = interest_due WHERE status = 'PAID'")
+    op.execute(
+        "UPDATE loans SET status = 'PAID_OFF' WHERE status = 'DISBURSED' "
+        "AND EXISTS (SELECT 1 FROM repayment_schedules s WHERE s.loan_id = loans.id) "
+        "AND NOT EXISTS (SELECT 1 FROM repayment_schedules s WHERE s.loan_id = loans.id AND s.status <> 'PAID')"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_repayment_allocations_transaction_id'), table_name='repayment_allocations')
+    op.drop_table('repayment_allocations')
+    op.drop_column('loan_penalties', 'amount_paid')
+    op.drop_column('repayment_schedules', 'interest_paid')
+    op.drop_column('repayment_schedules', 'principal_paid')
@@ -0,0 +1,56 @@
+"""Add tenant-scoped composite and partial indexes
+
+Revision ID: a8fd38cd090c
+Revises: f7591831b46a
+Create Date: 2026-10-18 08:39:33.474762
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a8fd38cd090c'
+down_revision: Union[str, Sequence[str], None] = 'f7591831b46a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+UNPAID = sa.text("status <> 'PAID'")
+
+# (name, table, columns, options)
+INDEXES = [
+    ('ix_loans_tenant_id_status', 'loans', ['tenant_id', 'status'], {}),
+    ('ix_loans_client_id', 'loans', ['client_id'], {}),
+    ('ix_loan_products_tenant_id', 'loan_products', ['tenant_id'], {}),
+    ('ix_repayment_schedules_loan_id_status_due_date', 'repayment_schedules', ['loan_id', 'status', 'due_date'], {}),
+    ('ix_repayment_schedules_unpaid_tenant_id_due_date', 'repayment_schedules', ['tenant_id', 'due_date'],
+     {'postgresql_where': UNPAID, 'sqlite_where': UNPAID}),
+    ('ix_repayment_transactions_tenant_id_transaction_date', 'repayment_transactions', ['tenant_id', 'transaction_date'], {}),
+    ('ix_repayment_transactions_loan_id', 'repayment_transactions', ['loan_id'], {}),
+    ('ix_general_ledger_entries_account_id', 'general_ledger_entries', ['account_id'], {}),
+    ('ix_general_ledger_entries_tenant_id_transaction_date', 'general_ledger_entries', ['tenant_id', 'transaction_date'], {}),
+    ('uq_chart_of_accounts_tenant_id_account_code', 'chart_of_accounts', ['tenant_id', 'account_code'], {'unique': True}),
+    ('ix_clients_tenant_id', 'clients', ['tenant_id'], {}),
+    ('ix_users_tenant_id', 'users', ['tenant_id'], {}),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block. Building
+    # concurrently keeps the tables writable while the indexes are built.
+    # If a concurrent build fails, Postgres leaves an INVALID index behind:
+    # drop it and re-run the upgrade.
+    with op.get_context().autocommit_block():
+        for name, table, columns, options in INDEXES:
+            op.create_index(name, table, columns, postgresql_concurrently=True, **options)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
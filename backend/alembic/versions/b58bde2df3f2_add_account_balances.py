@@ -0,0 +1,47 @@
+"""Add account_balances with running totals per account
+
+Revision ID: b58bde2df3f2
+Revises: a8fd38cd090c
+Create Date: 2026-10-18 08:41:22.398092
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b58bde2df3f2'
+down_revision: Union[str, Sequence[str], None] = 'a8fd38cd090c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('account_balances',
+    sa.Column('account_id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('total_debits', sa.Numeric(precision=16, scale=2), server_default='0', nullable=False),
+    sa.Column('total_credits', sa.Numeric(precision=16, scale=2), server_default='0', nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.Column('tenant_id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.ForeignKeyConstraint(['account_id'], ['chart_of_accounts.id'], ),
+    sa.ForeignKeyConstraint(['tenant_id'], ['tenants.id'], ),
+    sa.PrimaryKeyConstraint('account_id')
+    )
+    op.create_index(op.f('ix_account_balances_tenant_id'), 'account_balances', ['tenant_id'], unique=False)
+    # Backfill from the existing ledger. Postings that race with this are
+    # picked up by `python manage.py balances verify` / `rebuild`.
+    op.execute(
+        "INSERT INTO account_balances (account_id, tenant_id, total_debits, total_credits, updated_at) "
+        "SELECT account_id, tenant_id, COALESCE(SUM(debit), 0), COALESCE(SUM(credit), 0), CURRENT_TIMESTAMP "
+        "FROM general_ledger_entries GROUP BY account_id, tenant_id"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_account_balances_tenant_id'), table_name='account_balances')
+    op.drop_table('account_balances')
@@ -0,0 +1,50 @@
+"""Add updated_at and created_at high-water marks for the analytics mirror
+
+Revision ID: cf0b893074ef
+Revises: 28ce6461d817
+Create Date: 2026-10-18 09:20:46.436516
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'cf0b893074ef'
+down_revision: Union[str, Sequence[str], None] = '28ce6461d817'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (table, column); existing rows get the migration time, which is fine because
+# the analytics mirror's first sync of a tenant is a full extract
+_WATERMARKS = [
+    ("loans", "updated_at"),
+    ("repayment_schedules", "updated_at"),
+    ("repayment_transactions", "created_at"),
+    ("general_ledger_entries", "created_at"),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table, column in _WATERMARKS:
+        if op.get_bind().dialect.name == "postgresql":
+            # The default is evaluated once for the ALTER, so the table is not rewritten
+            op.add_column(table, sa.Column(column, sa.DateTime(), server_default=sa.func.now(), nullable=False))
+            op.alter_column(table, column, server_default=None)
+        else:
+            # SQLite cannot add a column with a non-constant default
+            op.add_column(table, sa.Column(column, sa.DateTime(), nullable=True))
+            op.execute(f"UPDATE {table} SET {column} = CURRENT_TIMESTAMP")
+            with op.batch_alter_table(table) as batch:
+                batch.alter_column(column, existing_type=sa.DateTime(), nullable=False)
+        op.create_index(f"ix_{table}_tenant_id_{column}", table, ["tenant_id", column], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table, column in reversed(_WATERMARKS):
+        op.drop_index(f"ix_{table}_tenant_id_{column}", table_name=table)
+        op.drop_column(table, column)
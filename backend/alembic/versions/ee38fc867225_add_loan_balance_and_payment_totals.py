@@ -0,0 +1,57 @@
+"""add loan balance and payment totals
+
+Revision ID: ee38fc867225
+Revises: 7a759f208acf
+Create Date: 2026-10-18 09:51:53.092289
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'ee38fc867225'
+down_revision: Union[str, Sequence[str], None] = '7a759f208acf'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('loans', sa.Column('interest_outstanding', sa.Numeric(precision=10, scale=2), nullable=True))
+    op.add_column('loans', sa.Column('penalties_outstanding', sa.Numeric(precision=10, scale=2), nullable=True))
+    op.add_column('loans', sa.Column('next_due_date', sa.Date(), nullable=True))
+    op.add_column('loans', sa.Column('total_paid', sa.Numeric(precision=12, scale=2), server_default='0', nullable=False))
+    op.add_column('loans', sa.Column('last_payment_at', sa.DateTime(), nullable=True))
+
+    # Payment totals from the transactions; balances of already aged loans from their installments and penalties
+    op.execute(
+        "UPDATE loans SET "
+        "total_paid = COALESCE((SELECT SUM(t.amount_paid) FROM repayment_transactions t WHERE t.loan_id = loans.id), 0), "
+        "last_payment_at = (SELECT MAX(t.transaction_date) FROM repayment_transactions t WHERE t.loan_id = loans.id)"
+    )
+    op.execute(
+        "UPDATE loans SET "
+        "interest_outstanding = COALESCE((SELECT SUM(s.interest_due - s.interest_paid) FROM repayment_schedules s "
+        "WHERE s.loan_id = loans.id AND s.status <> 'PAID'), 0), "
+        "penalties_outstanding = COALESCE((SELECT SUM(p.amount - p.amount_paid) FROM loan_penalties p "
+        "WHERE p.loan_id = loans.id), 0), "
+        "next_due_date = (SELECT MIN(s.due_date) FROM repayment_schedules s "
+        "WHERE s.loan_id = loans.id AND s.status <> 'PAID') "
+        "WHERE status = 'DISBURSED'"
+    )
+    op.execute(
+        "UPDATE loans SET interest_outstanding = 0, penalties_outstanding = 0 "
+        "WHERE status <> 'DISBURSED' AND principal_outstanding IS NOT NULL"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('loans', 'last_payment_at')
+    op.drop_column('loans', 'total_paid')
+    op.drop_column('loans', 'next_due_date')
+    op.drop_column('loans', 'penalties_outstanding')
+    op.drop_column('loans', 'interest_outstanding')
@@ -0,0 +1,28 @@
+"""Add token_version to users
+
+Revision ID: f7591831b46a
+Revises: c027c60e4f2c
+Create Date: 2026-10-18 08:27:51.833801
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f7591831b46a'
+down_revision: Union[str, Sequence[str], None] = 'c027c60e4f2c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('users', sa.Column('token_version', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('users', 'token_version')
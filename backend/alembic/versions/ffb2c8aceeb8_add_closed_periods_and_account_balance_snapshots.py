@@ -0,0 +1,50 @@
+"""Add closed periods and account balance snapshots
+
+Revision ID: ffb2c8aceeb8
+Revises: 6b1d19d97aac
+Create Date: 2026-10-18 09:32:13.292504
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'ffb2c8aceeb8'
+down_revision: Union[str, Sequence[str], None] = '6b1d19d97aac'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('closed_periods',
+    sa.Column('tenant_id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('period_end', sa.Date(), nullable=False),
+    sa.Column('closed_at', sa.DateTime(), nullable=False),
+    sa.Column('closed_by_user_id', postgresql.UUID(as_uuid=True), nullable=True),
+    sa.ForeignKeyConstraint(['closed_by_user_id'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['tenant_id'], ['tenants.id'], ),
+    sa.PrimaryKeyConstraint('tenant_id', 'period_end')
+    )
+    op.create_table('account_balance_snapshots',
+    sa.Column('account_id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('period_end', sa.Date(), nullable=False),
+    sa.Column('total_debits', sa.Numeric(precision=16, scale=2), nullable=False),
+    sa.Column('total_credits', sa.Numeric(precision=16, scale=2), nullable=False),
+    sa.Column('tenant_id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.ForeignKeyConstraint(['account_id'], ['chart_of_accounts.id'], ),
+    sa.ForeignKeyConstraint(['tenant_id'], ['tenants.id'], ),
+    sa.PrimaryKeyConstraint('account_id', 'period_end')
+    )
+    op.create_index('ix_account_balance_snapshots_tenant_id_period_end', 'account_balance_snapshots', ['tenant_id', 'period_end'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_account_balance_snapshots_tenant_id_period_end', table_name='account_balance_snapshots')
+    op.drop_table('account_balance_snapshots')
+    op.drop_table('closed_periods')
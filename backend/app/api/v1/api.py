@@ -1,6 +1,6 @@
 from fastapi import APIRouter
 # --- CORRECTED: Import all the endpoint modules ---
-from .endpoints import auth, clients, loans, loan_products, repayments, reports, investors, settings, team
+from .endpoints import auth, clients, loans, loan_products, repayments, reports, investors, settings, team, metrics
 
 api_router = APIRouter()
 api_router.include_router(auth.router, prefix="/auth", tags=["Authentication & Onboarding"])
@@ -11,4 +11,5 @@ api_router.include_router(loan_products.router, prefix="/loan-products", tags=["
 api_router.include_router(loans.router, prefix="/loans", tags=["Loan Lifecycle"])
 api_router.include_router(repayments.router, prefix="/repayments", tags=["Repayments"])
 api_router.include_router(investors.router, prefix="/investors", tags=["Investor Management"]) # This will now work
-api_router.include_router(reports.router, prefix="/reports", tags=["Reports"])
\ No newline at end of file
+api_router.include_router(reports.router, prefix="/reports", tags=["Reports"])
+api_router.include_router(metrics.router, prefix="/metrics", tags=["Operations"])
\ No newline at end of file
@@ -3,14 +3,16 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
 from .... import models
 from ....schemas import tenant as tenant_schema
 from ....schemas import user as user_schema
 from ....schemas import token as token_schema
 from ....services import user_service
-from ....core import security, dependencies
+from ....core import security, dependencies, tenant_registry
 from ....core.security import UserRole
+from ....core.hashing import HashingBusyError
 from ....models.accounting import DEFAULT_COA
 
 router = APIRouter()
@@ -21,7 +23,7 @@ router = APIRouter()
     status_code=status.HTTP_201_CREATED,
     summary="Register a New Organization and its First Admin User"
 )
-def register_organization(
+async def register_organization(
     org_in: tenant_schema.OrganizationRegistration,
     db: Session = Depends(dependencies.get_db)
 ):
@@ -29,6 +31,12 @@ def register_organization(
     Onboards a new MFI by creating their Tenant, Subdomain, default Settings,
     Chart of Accounts, and the first Admin User. This is a single, atomic transaction.
     """
+    hashed_password = await user_service.hash_password(org_in.admin_password)
+    return await run_in_threadpool(_create_organization, db, org_in, hashed_password)
+
+def _create_organization(
+    db: Session, org_in: tenant_schema.OrganizationRegistration, hashed_password: str
+) -> models.User:
     # Check if subdomain or email is already taken
     if db.query(models.Tenant).filter(models.Tenant.subdomain == org_in.subdomain).first():
         raise HTTPException(status_code=400, detail="Subdomain is already in use. Please choose another.")
@@ -58,10 +66,13 @@ def register_organization(
             db,
             user_in=user_schema.UserCreate(email=org_in.admin_email, password=org_in.admin_password),
             role=UserRole.ADMIN,
-            tenant_id=tenant.id
+            tenant_id=tenant.id,
+            hashed_password=hashed_password,
         )
         
         db.commit()
+        # A negative-cache entry may exist from earlier lookups of this subdomain
+        tenant_registry.invalidate_tenant(tenant.subdomain)
         db.refresh(admin_user)
         return admin_user
     except Exception:
@@ -73,28 +84,36 @@ def register_organization(
         )
 
 @router.post("/token", response_model=token_schema.Token, summary="User Login")
-def login_for_access_token(
+async def login_for_access_token(
     form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(dependencies.get_db)
 ):
     """
     Standard OAuth2 password flow. Takes a username and password, returns a JWT access token.
     This works for all user roles (Admin, Client, etc.).
+
+    Password verification runs in a bounded process pool. When that pool is
+    saturated the request is refused with a 503 rather than queued indefinitely.
     """
-    user = user_service.authenticate_user(db, email=form_data.username, password=form_data.password)
+    try:
+        user = await user_service.authenticate_user_async(db, email=form_data.username, password=form_data.password)
+    except HashingBusyError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many concurrent logins. Please retry shortly.",
+            headers={"Retry-After": "1"},
+        )
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    access_token = security.create_access_token(
-        data={"sub": str(user.id), "role": user.role}
-    )
+    access_token = security.create_access_token(data=security.build_token_claims(user))
     return {"access_token": access_token, "token_type": "bearer"}
 
 
 @router.get("/me", response_model=user_schema.User, summary="Get Current User Details")
-def read_current_user(current_user: models.User = Depends(dependencies.get_current_user)):
+def read_current_user(current_user: models.User = Depends(dependencies.get_current_db_user)):
     """
     Returns the details of the currently authenticated user based on the provided JWT.
     """
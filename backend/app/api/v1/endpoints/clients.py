@@ -2,13 +2,15 @@
 
 from fastapi import APIRouter, Depends, status, HTTPException
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
 # --- Specific imports for clarity and correctness ---
-from .... import models
 from ....schemas import client as client_schema
+from ....schemas import tenant as tenant_schema
 from ....schemas import user as user_schema
-from ....services import client_service
+from ....services import client_service, user_service
 from ....core.dependencies import get_db, allow_mfi_staff, get_tenant_from_subdomain
+from ....core.principal import Principal
 
 router = APIRouter()
 
@@ -21,7 +23,7 @@ router = APIRouter()
 )
 def create_client_by_staff(
     client_in: client_schema.ClientCreateByStaff,
-    current_user: models.User = Depends(allow_mfi_staff),
+    current_user: Principal = Depends(allow_mfi_staff),
     db: Session = Depends(get_db)
 ):
     """
@@ -37,10 +39,10 @@ def create_client_by_staff(
     status_code=status.HTTP_201_CREATED,
     summary="Client Self-Registration (via Subdomain)"
 )
-def client_self_signup(
+async def client_self_signup(
     signup_data: client_schema.ClientSelfSignUp, 
     # The current tenant is now automatically resolved from the request's host/header.
-    tenant: models.Tenant = Depends(get_tenant_from_subdomain),
+    tenant: tenant_schema.Tenant = Depends(get_tenant_from_subdomain),
     db: Session = Depends(get_db)
 ):
     """
@@ -49,11 +51,14 @@ def client_self_signup(
     `X-Tenant-Subdomain: apex`) will sign up a client for the 'Apex' tenant.
     This creates both a Client profile and a User account for the client portal.
     """
+    hashed_password = await user_service.hash_password(signup_data.user_info.password)
     try:
-        user = client_service.create_client_and_user_account(
+        user = await run_in_threadpool(
+            client_service.create_client_and_user_account,
             db,
             signup_data=signup_data,
-            tenant_id=tenant.id
+            tenant_id=tenant.id,
+            hashed_password=hashed_password,
         )
         return user
     except ValueError as e:
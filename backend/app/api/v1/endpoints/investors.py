@@ -7,9 +7,9 @@ from fastapi import APIRouter, Depends, status
 from sqlalchemy.orm import Session
 
 # --- CORRECTED: Specific imports ---
-from .... import models
 from ....schemas import investor as investor_schema
 from ....core.dependencies import get_db, allow_admin_only
+from ....core.principal import Principal
 from ....services import investor_service
 
 router = APIRouter()
@@ -23,7 +23,7 @@ router = APIRouter()
 )
 def create_investor(
     investor_in: investor_schema.InvestorCreate,
-    current_user: models.User = Depends(allow_admin_only),
+    current_user: Principal = Depends(allow_admin_only),
     db: Session = Depends(get_db)
 ):
     """
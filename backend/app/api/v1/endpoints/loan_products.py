@@ -4,13 +4,16 @@
 API endpoints for managing Loan Products.
 These are the templates for loans that an MFI can offer.
 """
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Header, status
 from sqlalchemy.orm import Session
-from typing import List
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
 
 # --- CORRECTED: Specific and correct imports ---
 from .... import models, schemas
-from ....core.dependencies import get_db, allow_admin_only, get_current_user
+from ....core.dependencies import get_db, get_async_db, allow_admin_only, get_current_user
+from ....core.principal import Principal
+from ....services import catalog_service
 
 router = APIRouter()
 
@@ -23,7 +26,7 @@ router = APIRouter()
 )
 def create_loan_product(
     product_in: schemas.loan.LoanProductCreate,
-    current_user: models.User = Depends(allow_admin_only),
+    current_user: Principal = Depends(allow_admin_only),
     db: Session = Depends(get_db)
 ):
     """
@@ -44,17 +47,19 @@ def create_loan_product(
     response_model=List[schemas.loan.LoanProduct],
     summary="List all Loan Products for a Tenant"
 )
-def list_loan_products(
+async def list_loan_products(
+    if_none_match: Optional[str] = Header(None),
     # --- THIS IS THE CORRECTED FUNCTION SIGNATURE ---
     # It depends on the current user to get their tenant_id.
-    current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    # Cache misses read the primary (see catalog_service)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Returns a list of all available loan products for the currently
     authenticated user's tenant. Accessible by any authenticated user.
+    Served from the catalog cache with an ETag; answers 304 when
+    `If-None-Match` already holds the current version.
     """
-    products = db.query(models.loan.LoanProduct).filter(
-        models.loan.LoanProduct.tenant_id == current_user.tenant_id
-    ).all()
-    return products
\ No newline at end of file
+    entry = await catalog_service.loan_products(db, current_user.tenant_id)
+    return catalog_service.respond(entry, if_none_match)
\ No newline at end of file
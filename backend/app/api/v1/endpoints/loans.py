@@ -1,10 +1,16 @@
-from fastapi import APIRouter, Depends, BackgroundTasks # Add BackgroundTasks
+from fastapi import APIRouter, Depends, BackgroundTasks, HTTPException, Query, status # Add BackgroundTasks
 from sqlalchemy.orm import Session
-from typing import List # Add List
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+from datetime import date
+from typing import Optional
 import uuid
 # --- CORRECTED: Specific imports ---
 from .... import models, schemas
-from ....core.dependencies import get_db, allow_clients_only, allow_admin_only
+from ....core.config import settings
+from ....core.dependencies import get_db, get_async_read_db, allow_clients_only, allow_admin_only, allow_mfi_staff
+from ....core.pagination import Page, keyset_page_async
+from ....core.principal import Principal
 from ....services import loan_service, notification_service # Import services
 
 router = APIRouter()
@@ -15,7 +21,7 @@ router = APIRouter()
 def apply_for_loan(
     loan_in: schemas.loan.LoanApply,
     background_tasks: BackgroundTasks,
-    current_user: models.User = Depends(allow_clients_only),
+    current_user: Principal = Depends(allow_clients_only),
     db: Session = Depends(get_db)
 ):
     new_loan = loan_service.create_loan_application(db, loan_in=loan_in, user=current_user)
@@ -26,14 +32,59 @@ def apply_for_loan(
     )
     return new_loan
 
-@router.get("/my-loans", response_model=List[schemas.loan.Loan], dependencies=[Depends(allow_clients_only)])
-def get_my_loans(
-    current_user: models.User = Depends(allow_clients_only),
-    db: Session = Depends(get_db)
+@router.get(
+    "/",
+    response_model=Page[schemas.loan.LoanSummary],
+    dependencies=[Depends(allow_mfi_staff)],
+    summary="List the Organisation's Loans"
+)
+async def list_loans(
+    loan_status: Optional[models.LoanStatus] = Query(None, alias="status"),
+    loan_product_id: Optional[uuid.UUID] = None,
+    officer_id: Optional[uuid.UUID] = None,
+    client_id: Optional[uuid.UUID] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(settings.PAGE_SIZE_DEFAULT, ge=1, le=settings.PAGE_SIZE_MAX),
+    current_user: Principal = Depends(allow_mfi_staff),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """
+    The organisation's loans, newest application first, optionally filtered
+    by status, product, officer, client and an inclusive application date
+    range. Pass `next_cursor` back as `cursor` for the next page.
+    """
+    if start_date and end_date and start_date > end_date:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="start_date must not be after end_date.")
+    stmt = loan_service.loan_list_statement(
+        current_user.tenant_id, status=loan_status, loan_product_id=loan_product_id, officer_id=officer_id,
+        client_id=client_id, start_date=start_date, end_date=end_date,
+    )
+    rows, next_cursor = await keyset_page_async(
+        db, stmt, keys=(models.Loan.applied_at, models.Loan.id), cursor=cursor, limit=limit, descending=True
+    )
+    return Page[schemas.loan.LoanSummary](
+        items=[schemas.loan.LoanSummary.model_validate(row) for row in rows], next_cursor=next_cursor
+    )
+
+@router.get("/my-loans", response_model=Page[schemas.loan.Loan], dependencies=[Depends(allow_clients_only)])
+async def get_my_loans(
+    cursor: Optional[str] = None,
+    limit: int = Query(settings.PAGE_SIZE_DEFAULT, ge=1, le=settings.PAGE_SIZE_MAX),
+    current_user: Principal = Depends(allow_clients_only),
+    db: AsyncSession = Depends(get_async_read_db)
 ):
+    """The borrower's loans, newest application first, a page at a time."""
     if not current_user.client_id:
-        return []
-    return db.query(models.Loan).filter(models.Loan.client_id == current_user.client_id).all()
+        return Page[schemas.loan.Loan](items=[])
+    rows, next_cursor = await keyset_page_async(
+        db, select(models.Loan).where(models.Loan.client_id == current_user.client_id),
+        keys=(models.Loan.applied_at, models.Loan.id), cursor=cursor, limit=limit, descending=True, scalars=True,
+    )
+    return Page[schemas.loan.Loan](
+        items=[schemas.loan.Loan.model_validate(loan) for loan in rows], next_cursor=next_cursor
+    )
 
 
 @router.post("/{loan_id}/approve", response_model=schemas.loan.Loan, dependencies=[Depends(allow_admin_only)])
@@ -50,6 +101,34 @@ def approve_loan(
     )
     return approved_loan
 
+@router.post(
+    "/disburse-batch",
+    response_model=schemas.loan.LoanDisbursementReport,
+    dependencies=[Depends(allow_admin_only)],
+    summary="Disburse Many Approved Loans (Admin Only)"
+)
+def disburse_loans(
+    batch: schemas.loan.LoanDisbursementBatch,
+    background_tasks: BackgroundTasks,
+    current_user: Principal = Depends(allow_admin_only),
+    db: Session = Depends(get_db)
+):
+    """
+    Disburses the given approved loans in one transaction and reports the
+    outcome per loan. Loans that are not approved, belong to another
+    organisation or are being disbursed concurrently are skipped; a loan
+    that fails does not affect the others.
+    """
+    report = loan_service.disburse_loans(db, loan_ids=batch.loan_ids, tenant_id=current_user.tenant_id)
+    for result in report.results:
+        if result.outcome == "disbursed":
+            background_tasks.add_task(
+                notification_service.send_loan_status_update,
+                loan_id=result.loan_id,
+                new_status="Disbursed"
+            )
+    return report
+
 @router.post("/{loan_id}/disburse", response_model=schemas.loan.Loan, dependencies=[Depends(allow_admin_only)])
 def disburse_loan(
     loan_id: uuid.UUID,
@@ -0,0 +1,40 @@
+# backend/app/api/v1/endpoints/metrics.py
+
+"""
+Operational metrics for the current worker process: connection-pool usage,
+read-replica routing and the hit rates of the in-process caches.
+"""
+from fastapi import APIRouter, Depends
+
+from ....core.config import settings
+from ....core.dependencies import allow_admin_only
+from ....core import db_metrics, read_routing, tenant_registry, principal
+from ....core.hashing import password_hasher
+from ....services import accounting_service, catalog_service, report_job_service, reporting_service
+
+router = APIRouter()
+
+@router.get("/", dependencies=[Depends(allow_admin_only)], summary="Process Metrics (Admin Only)")
+def get_metrics():
+    """
+    Returns pool statistics (checked-out connections, checkout wait-time
+    histogram, overflow events) and cache counters for this worker.
+    Multiply `max_connections_per_worker` by the number of workers to size
+    against Postgres `max_connections`.
+    """
+    return {
+        "database": {
+            "pools": db_metrics.pool_stats(),
+            "max_connections_per_worker": settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW,
+            "read_replica": read_routing.stats(),
+        },
+        "caches": {
+            "tenant_registry": tenant_registry.stats(),
+            "chart_of_accounts": accounting_service.account_cache_stats(),
+            "dashboard": reporting_service.dashboard_cache_stats(),
+            "catalog": catalog_service.catalog_cache_stats(),
+            **principal.stats(),
+        },
+        "hashing": password_hasher.stats(),
+        "report_jobs": report_job_service.runner.stats(),
+    }
@@ -1,12 +1,13 @@
 """
 API endpoints for recording loan repayments.
 """
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, File, HTTPException, UploadFile, status
 from sqlalchemy.orm import Session
 import uuid
 from .... import models, schemas
 from app.core.dependencies import get_db, allow_mfi_staff
-from app.services import repayment_service
+from app.core.principal import Principal
+from app.services import repayment_import_service, repayment_service
 
 router = APIRouter()
 
@@ -19,7 +20,7 @@ router = APIRouter()
 def record_repayment(
     loan_id: uuid.UUID,
     payment_in: schemas.repayment.RepaymentRecord,
-    current_user: models.User = Depends(allow_mfi_staff),
+    current_user: Principal = Depends(allow_mfi_staff),
     db: Session = Depends(get_db)
 ):
     loan = db.query(models.Loan).filter(models.Loan.id == loan_id).first()
@@ -28,4 +29,25 @@ def record_repayment(
         
     repayment_service.record_payment(db, payment_in=payment_in, loan=loan, user=current_user)
     db.commit()
-    return
\ No newline at end of file
+    return
+
+@router.post(
+    "/import",
+    response_model=schemas.repayment.RepaymentImportReport,
+    dependencies=[Depends(allow_mfi_staff)],
+    summary="Import repayments from a bank or mobile-money statement"
+)
+def import_repayments(
+    statement: UploadFile = File(..., description="CSV or XLSX with reference, loan_id, amount[, transaction_date]"),
+    current_user: Principal = Depends(allow_mfi_staff),
+    db: Session = Depends(get_db)
+):
+    """
+    Records every payment of a statement in one transaction and reports
+    each line as accepted, duplicate or rejected. Lines whose reference was
+    already imported are skipped, so re-uploading a statement is safe.
+    """
+    lines = repayment_import_service.read_statement(statement.file, statement.filename)
+    report = repayment_import_service.import_statement(db, current_user.tenant_id, current_user.id, lines)
+    db.commit()
+    return report
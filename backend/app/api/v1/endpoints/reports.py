@@ -3,21 +3,26 @@
 """
 API endpoints for generating financial and operational reports.
 """
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from typing import List
-# --- For Excel Export ---
-import pandas as pd
-from io import BytesIO
-from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+from typing import List, Literal, Optional
+from datetime import date
+import uuid
+from fastapi.responses import FileResponse, StreamingResponse
 
 # --- CORRECTED: Specific imports ---
 from .... import models
 from ....schemas import reporting as reporting_schema
 from ....schemas import accounting as accounting_schema
-from ....core.dependencies import get_db, allow_mfi_staff, allow_admin_only, allow_auditor_and_admin
-from ....services import reporting_service
+from ....core.dependencies import get_db, get_async_db, get_read_db, get_async_read_db, allow_mfi_staff, allow_admin_only, allow_auditor_and_admin
+from ....core.config import settings
+from ....core.pagination import Page, keyset_page
+from ....core.principal import Principal
+from ....services import (
+    aging_service, analytics_service, export_service, period_service, report_job_service, reporting_service,
+)
 
 
 router = APIRouter()
@@ -28,29 +33,33 @@ router = APIRouter()
     dependencies=[Depends(allow_mfi_staff)],
     summary="Generate a Trial Balance Report"
 )
-def get_trial_balance(
-    current_user: models.User = Depends(allow_mfi_staff),
-    db: Session = Depends(get_db)
+async def get_trial_balance(
+    as_of: Optional[date] = None,
+    current_user: Principal = Depends(allow_mfi_staff),
+    db: AsyncSession = Depends(get_async_read_db)
 ):
     """
-    Calculates the total debits and credits for each account to ensure the books are balanced.
+    Returns the total debits and credits for each account to ensure the books are balanced.
+    Totals come from the running `account_balances`, so the cost is per account, not per ledger entry.
+    With `as_of`, totals through that date come from the last closed-period
+    snapshot before it plus the ledger entries since.
     """
-    results = db.query(
+    if as_of is not None:
+        return await db.run_sync(period_service.trial_balance, tenant_id=current_user.tenant_id, as_of=as_of)
+    stmt = select(
         models.accounting.ChartOfAccount.account_code,
         models.accounting.ChartOfAccount.name,
-        func.sum(models.accounting.GeneralLedgerEntry.debit).label("total_debits"),
-        func.sum(models.accounting.GeneralLedgerEntry.credit).label("total_credits")
+        models.accounting.AccountBalance.total_debits,
+        models.accounting.AccountBalance.total_credits
     ).join(
-        models.accounting.GeneralLedgerEntry, 
-        models.accounting.ChartOfAccount.id == models.accounting.GeneralLedgerEntry.account_id
-    ).filter(
-        models.accounting.ChartOfAccount.tenant_id == current_user.tenant_id
-    ).group_by(
-        models.accounting.ChartOfAccount.account_code,
-        models.accounting.ChartOfAccount.name
+        models.accounting.AccountBalance,
+        models.accounting.ChartOfAccount.id == models.accounting.AccountBalance.account_id
+    ).where(
+        models.accounting.AccountBalance.tenant_id == current_user.tenant_id
     ).order_by(
         models.accounting.ChartOfAccount.account_code
-    ).all()
+    )
+    results = (await db.execute(stmt)).all()
     
     return [
         accounting_schema.TrialBalanceEntry( # This now works
@@ -62,44 +71,257 @@ def get_trial_balance(
         for r in results
     ]
 
+@router.get(
+    "/balance-sheet",
+    response_model=accounting_schema.BalanceSheet,
+    dependencies=[Depends(allow_mfi_staff)],
+    summary="Generate a Balance Sheet as of a Date"
+)
+async def get_balance_sheet(
+    as_of: Optional[date] = None,
+    current_user: Principal = Depends(allow_mfi_staff),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """Assets, liabilities and equity at the end of `as_of` (default today)."""
+    return await db.run_sync(
+        period_service.balance_sheet, tenant_id=current_user.tenant_id, as_of=as_of or date.today()
+    )
+
+@router.get(
+    "/income-statement",
+    response_model=accounting_schema.IncomeStatement,
+    dependencies=[Depends(allow_mfi_staff)],
+    summary="Generate an Income Statement for a Date Range"
+)
+async def get_income_statement(
+    start_date: date,
+    end_date: date,
+    current_user: Principal = Depends(allow_mfi_staff),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """Revenue and expenses between two dates, inclusive."""
+    return await db.run_sync(
+        period_service.income_statement, tenant_id=current_user.tenant_id, start_date=start_date, end_date=end_date
+    )
+
+@router.get(
+    "/periods",
+    response_model=List[accounting_schema.ClosedPeriod],
+    dependencies=[Depends(allow_auditor_and_admin)],
+    summary="List Closed Accounting Periods"
+)
+def list_closed_periods(
+    current_user: Principal = Depends(allow_auditor_and_admin),
+    db: Session = Depends(get_read_db)
+):
+    return period_service.list_closed_periods(db, current_user.tenant_id)
+
+@router.post(
+    "/periods",
+    response_model=accounting_schema.ClosedPeriod,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(allow_admin_only)],
+    summary="Close an Accounting Period"
+)
+def close_period(
+    period_in: accounting_schema.PeriodClose,
+    current_user: Principal = Depends(allow_admin_only),
+    db: Session = Depends(get_db)
+):
+    """
+    Closes a month (by default last month) and snapshots every account's
+    balance at its end. Months are closed in order, and postings dated in a
+    closed month are rejected from then on.
+    """
+    closed = period_service.close_period(
+        db, current_user.tenant_id, period_in.period_end or period_service.previous_month_end(), current_user.id
+    )
+    db.commit()
+    db.refresh(closed)
+    return closed
+
+@router.get(
+    "/ledger",
+    response_model=Page[accounting_schema.LedgerEntry],
+    dependencies=[Depends(allow_auditor_and_admin)],
+    summary="Browse or Export General Ledger Entries"
+)
+def browse_ledger(
+    account_code: Optional[str] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    transaction_id: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(settings.PAGE_SIZE_DEFAULT, ge=1, le=settings.PAGE_SIZE_MAX),
+    export_format: Literal["json", "ndjson", "csv"] = Query("json", alias="format"),
+    current_user: Principal = Depends(allow_auditor_and_admin),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Raw ledger entries in (transaction_date, id) order, optionally for one
+    account, an inclusive date range or one transaction.
+
+    `format=json` returns a page; pass `next_cursor` back as `cursor` for the
+    next one. `format=ndjson` or `csv` streams every matching entry while it
+    is read, so a full year can be pulled without holding it in memory.
+    """
+    if start_date and end_date and start_date > end_date:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="start_date must not be after end_date.")
+    filters = dict(account_code=account_code, start_date=start_date, end_date=end_date, transaction_id=transaction_id)
+    if export_format != "json":
+        rows = export_service.ledger_rows(db, current_user.tenant_id, **filters)
+        stream = export_service.stream_rows(export_service.LEDGER_COLUMNS, rows, export_format, "General Ledger")
+        headers = {'Content-Disposition': f'attachment; filename="general_ledger.{export_format}"'}
+        return StreamingResponse(stream, headers=headers, media_type=export_service.MEDIA_TYPES[export_format])
+
+    entry = models.accounting.GeneralLedgerEntry
+    rows, next_cursor = keyset_page(
+        db, export_service.ledger_statement(current_user.tenant_id, **filters),
+        keys=(entry.transaction_date, entry.id), cursor=cursor, limit=limit,
+    )
+    return Page[accounting_schema.LedgerEntry](
+        items=[accounting_schema.LedgerEntry.model_validate(row) for row in rows], next_cursor=next_cursor
+    )
+
 @router.get(
     "/dashboard", 
     response_model=reporting_schema.DashboardMetrics, # This now works
     dependencies=[Depends(allow_admin_only)]
 )
-def get_dashboard_data(
-    current_user: models.User = Depends(allow_admin_only),
-    db: Session = Depends(get_db)
+async def get_dashboard_data(
+    current_user: Principal = Depends(allow_admin_only),
+    # Cache misses are computed on the primary: a lagging replica could
+    # otherwise cache pre-write figures under the post-write version
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Provides aggregated metrics for the admin dashboard."""
-    return reporting_service.get_dashboard_metrics(db, tenant_id=current_user.tenant_id)
+    # The aggregate queries run on the async connection without a threadpool hop
+    return await db.run_sync(reporting_service.get_dashboard_metrics, tenant_id=current_user.tenant_id)
+
+@router.get(
+    "/portfolio-at-risk",
+    response_model=reporting_schema.PortfolioAtRisk,
+    dependencies=[Depends(allow_auditor_and_admin)],
+    summary="Portfolio at Risk and Aging Buckets"
+)
+async def get_portfolio_at_risk(
+    current_user: Principal = Depends(allow_auditor_and_admin),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """
+    PAR1/30/60/90 and aging-bucket totals of active loans, overall and by
+    product and loan officer. Days past due are as of the last repayment or
+    nightly sweep touching each loan.
+    """
+    return await db.run_sync(aging_service.get_portfolio_at_risk, tenant_id=current_user.tenant_id)
+
+@router.get(
+    "/analytics/vintages",
+    response_model=reporting_schema.VintageCurves,
+    dependencies=[Depends(allow_auditor_and_admin)],
+    summary="Vintage Collection Curves (Analytics Mirror)"
+)
+def get_vintage_curves(current_user: Principal = Depends(allow_auditor_and_admin)):
+    """
+    Cumulative collections per disbursement month by months on book.
+    Analytics endpoints read the tenant's Parquet mirror, not the database;
+    `mirrored_at` says how current it is.
+    """
+    return analytics_service.vintage_curves(current_user.tenant_id)
+
+@router.get(
+    "/analytics/repayment-behavior",
+    response_model=reporting_schema.RepaymentBehavior,
+    dependencies=[Depends(allow_auditor_and_admin)],
+    summary="Repayment Behaviour by Product (Analytics Mirror)"
+)
+def get_repayment_behavior(current_user: Principal = Depends(allow_auditor_and_admin)):
+    return analytics_service.repayment_behavior(current_user.tenant_id)
+
+@router.get(
+    "/analytics/officer-productivity",
+    response_model=reporting_schema.OfficerProductivity,
+    dependencies=[Depends(allow_auditor_and_admin)],
+    summary="Loan Officer Productivity (Analytics Mirror)"
+)
+def get_officer_productivity(current_user: Principal = Depends(allow_auditor_and_admin)):
+    return analytics_service.officer_productivity(current_user.tenant_id)
 
 @router.get("/export/loans", dependencies=[Depends(allow_auditor_and_admin)])
-def export_loans_to_excel(
-    current_user: models.User = Depends(allow_auditor_and_admin),
+def export_loans(
+    export_format: Literal["xlsx", "csv"] = Query("xlsx", alias="format"),
+    current_user: Principal = Depends(allow_auditor_and_admin),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Exports a list of all loans to an Excel (default) or CSV file for auditing.
+    The file is streamed while the loans are read, so memory use does not
+    grow with the size of the portfolio. For large portfolios prefer
+    `POST /reports/jobs`, which does not hold a request open.
+    """
+    stream = export_service.stream_loans(db, current_user.tenant_id, export_format)
+    headers = {'Content-Disposition': f'attachment; filename="loan_report.{export_format}"'}
+    return StreamingResponse(stream, headers=headers, media_type=export_service.MEDIA_TYPES[export_format])
+
+@router.post(
+    "/jobs",
+    response_model=reporting_schema.ReportJob,
+    status_code=status.HTTP_202_ACCEPTED,
+    dependencies=[Depends(allow_auditor_and_admin)],
+    summary="Request a Report in the Background"
+)
+def create_report_job(
+    job_in: reporting_schema.ReportJobCreate,
+    background_tasks: BackgroundTasks,
+    current_user: Principal = Depends(allow_auditor_and_admin),
     db: Session = Depends(get_db)
 ):
-    """Exports a list of all loans to an Excel file for auditing."""
-    loans = db.query(models.Loan).filter(models.Loan.tenant_id == current_user.tenant_id).all()
-    
-    loan_data = [
-        {
-            "loan_id": str(loan.id),
-            "client_id": str(loan.client_id),
-            "amount_requested": float(loan.amount_requested),
-            "status": loan.status.value,
-            "applied_at": loan.applied_at.strftime("%Y-%m-%d %H:%M:%S") if loan.applied_at else None
-        } 
-        for loan in loans
-    ]
-    
-    df = pd.DataFrame(loan_data)
-    
-    output = BytesIO()
-    with pd.ExcelWriter(output, engine='openpyxl') as writer:
-        df.to_excel(writer, index=False, sheet_name='Loans')
-    
-    output.seek(0)
-    
-    headers = {'Content-Disposition': 'attachment; filename="loan_report.xlsx"'}
-    return StreamingResponse(output, headers=headers, media_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
\ No newline at end of file
+    """
+    Queues a loan export, trial balance or general ledger report and returns
+    at once. Poll `GET /reports/jobs/{job_id}` until it has succeeded, then
+    download the file from `/reports/jobs/{job_id}/download`.
+    """
+    job = report_job_service.enqueue(db, job_in=job_in, user=current_user)
+    db.commit()
+    db.refresh(job)
+    background_tasks.add_task(report_job_service.runner.dispatch)
+    return job
+
+@router.get(
+    "/jobs",
+    response_model=List[reporting_schema.ReportJob],
+    dependencies=[Depends(allow_auditor_and_admin)],
+    summary="List Recent Report Jobs"
+)
+def list_report_jobs(
+    current_user: Principal = Depends(allow_auditor_and_admin),
+    db: Session = Depends(get_db)
+):
+    return report_job_service.list_jobs(db, tenant_id=current_user.tenant_id)
+
+@router.get(
+    "/jobs/{job_id}",
+    response_model=reporting_schema.ReportJob,
+    dependencies=[Depends(allow_auditor_and_admin)],
+    summary="Get a Report Job"
+)
+def get_report_job(
+    job_id: uuid.UUID,
+    current_user: Principal = Depends(allow_auditor_and_admin),
+    db: Session = Depends(get_db)
+):
+    return report_job_service.get_job(db, job_id=job_id, tenant_id=current_user.tenant_id)
+
+@router.get("/jobs/{job_id}/download", dependencies=[Depends(allow_auditor_and_admin)], summary="Download a Report")
+def download_report(
+    job_id: uuid.UUID,
+    current_user: Principal = Depends(allow_auditor_and_admin),
+    db: Session = Depends(get_db)
+):
+    """Returns the generated file; 409 while the job has not succeeded, 410 once the file has expired."""
+    job = report_job_service.artifact_for_download(db, job_id=job_id, tenant_id=current_user.tenant_id)
+    return FileResponse(
+        job.artifact_path,
+        media_type=export_service.MEDIA_TYPES[job.format],
+        filename=f"{job.kind}_{job.created_at:%Y%m%d_%H%M%S}.{job.format}",
+    )
@@ -1,28 +1,34 @@
 """
 API endpoints for managing tenant-specific settings.
 """
-from fastapi import APIRouter, Depends, HTTPException, status # Add HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, status # Add HTTPException, status
 from sqlalchemy.orm import Session
+from typing import Optional
 # --- CORRECTED: Specific imports ---
 from .... import models, schemas
 from ....core.dependencies import get_db, allow_admin_only
+from ....core.principal import Principal
+from ....services import catalog_service
 
 router = APIRouter()
 
 @router.get("/", response_model=schemas.tenant.TenantSettings)
 def get_tenant_settings(
-    current_user: models.User = Depends(allow_admin_only),
+    if_none_match: Optional[str] = Header(None),
+    current_user: Principal = Depends(allow_admin_only),
     db: Session = Depends(get_db)
 ):
-    settings = db.query(models.tenant.TenantSettings).filter(
-        models.tenant.TenantSettings.tenant_id == current_user.tenant_id
-    ).first()
-    return settings
+    """
+    The organisation's settings, served from the catalog cache with an ETag;
+    answers 304 when `If-None-Match` already holds the current version.
+    """
+    entry = catalog_service.tenant_settings(db, current_user.tenant_id)
+    return catalog_service.respond(entry, if_none_match)
 
 @router.put("/", response_model=schemas.tenant.TenantSettings, dependencies=[Depends(allow_admin_only)])
 def update_tenant_settings(
     settings_in: schemas.tenant.TenantSettingsUpdate,
-    current_user: models.User = Depends(allow_admin_only),
+    current_user: Principal = Depends(allow_admin_only),
     db: Session = Depends(get_db)
 ):
     db_settings = db.query(models.tenant.TenantSettings).filter(
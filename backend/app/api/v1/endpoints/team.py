@@ -1,12 +1,19 @@
 """
 API endpoints for MFI Admins to manage their team members.
 """
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
-from typing import List
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+from starlette.concurrency import run_in_threadpool
+from typing import Optional
+import uuid
 from .... import models, schemas
-from app.core.dependencies import get_db, allow_admin_only
-from services import user_service
+from app.core.config import settings
+from app.core.dependencies import get_db, get_async_read_db, allow_admin_only
+from app.core.pagination import Page, keyset_page_async
+from app.core.principal import Principal
+from app.services import user_service
 
 router = APIRouter()
 
@@ -17,23 +24,54 @@ router = APIRouter()
     status_code=status.HTTP_201_CREATED,
     summary="Add a New Team Member"
 )
-def add_team_member(
+async def add_team_member(
     member_in: schemas.user.TeamMemberCreate,
-    current_user: models.User = Depends(allow_admin_only),
+    current_user: Principal = Depends(allow_admin_only),
     db: Session = Depends(get_db)
 ):
     """Allows an admin to invite/create a new user within their organization."""
-    return user_service.create_team_member(db, member_in=member_in, tenant_id=current_user.tenant_id)
+    hashed_password = await user_service.hash_password(member_in.password)
+    return await run_in_threadpool(
+        user_service.create_team_member,
+        db, member_in=member_in, tenant_id=current_user.tenant_id, hashed_password=hashed_password,
+    )
 
 @router.get(
     "/members",
-    response_model=List[schemas.user.User],
+    response_model=Page[schemas.user.User],
     dependencies=[Depends(allow_admin_only)],
     summary="List All Team Members"
 )
-def list_team_members(
-    current_user: models.User = Depends(allow_admin_only),
+async def list_team_members(
+    cursor: Optional[str] = None,
+    limit: int = Query(settings.PAGE_SIZE_DEFAULT, ge=1, le=settings.PAGE_SIZE_MAX),
+    current_user: Principal = Depends(allow_admin_only),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """Returns the users belonging to the admin's tenant by email, a page at a time."""
+    rows, next_cursor = await keyset_page_async(
+        db, select(models.User).where(models.User.tenant_id == current_user.tenant_id),
+        keys=(models.User.email,), cursor=cursor, limit=limit, scalars=True,
+    )
+    return Page[schemas.user.User](
+        items=[schemas.user.User.model_validate(user) for user in rows], next_cursor=next_cursor
+    )
+
+@router.post(
+    "/members/{user_id}/deactivate",
+    response_model=schemas.user.User,
+    dependencies=[Depends(allow_admin_only)],
+    summary="Deactivate a Team Member"
+)
+def deactivate_team_member(
+    user_id: uuid.UUID,
+    current_user: Principal = Depends(allow_admin_only),
     db: Session = Depends(get_db)
 ):
-    """Returns a list of all users belonging to the admin's tenant."""
-    return db.query(models.User).filter(models.User.tenant_id == current_user.tenant_id).all()
\ No newline at end of file
+    """Deactivates a user of the admin's tenant and revokes all of their access tokens."""
+    user = db.query(models.User).filter(
+        models.User.id == user_id, models.User.tenant_id == current_user.tenant_id
+    ).first()
+    if not user:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found.")
+    return user_service.set_user_active(db, user, is_active=False)
@@ -0,0 +1,118 @@
+# backend/app/core/cache.py
+
+"""
+Small in-process caching primitives shared by the hot-path lookups
+(tenant resolution, authentication, chart of accounts, ...).
+
+Each worker process keeps its own copy, so every cache here is bounded in
+size and in age: a stale entry can survive at most `ttl` seconds in a worker
+that did not see the corresponding invalidation. Invalidations triggered by
+writes are deferred until the writing transaction commits
+(`register_invalidator`).
+"""
+import itertools
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable, Iterable
+from typing import Any
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+_MISSING = object()
+_versions = itertools.count(1)
+
+
+class TTLCache:
+    """
+    A thread-safe LRU cache whose entries also expire after a time-to-live.
+
+    Hit and miss counters are kept so the effectiveness of each cache can be
+    inspected at runtime through `stats()`.
+    """
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Returns the cached value for `key`, or `default` if absent or expired."""
+        now = time.monotonic()
+        with self._lock:
+            item = self._data.get(key, _MISSING)
+            if item is _MISSING or item[0] <= now:
+                if item is not _MISSING:
+                    del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return item[1]
+
+    def set(self, key: Hashable, value: Any, ttl: float | None = None) -> None:
+        """Stores `value` under `key`, optionally with a per-entry TTL override."""
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+def next_version() -> int:
+    """A process-wide increasing number for stamping versioned cache entries."""
+    return next(_versions)
+
+
+def history_values(target, attribute: str) -> set:
+    """Every non-null value `attribute` of a flushed object had before or after the flush."""
+    history = getattr(inspect(target).attrs, attribute).history
+    return {value for value in (*history.deleted, *history.unchanged, *history.added) if value}
+
+
+def register_invalidator(key: str, on_commit: Callable[[Hashable], None]) -> Callable[[Session, Iterable], None]:
+    """
+    Returns `queue(session, items)`, which defers invalidations to commit
+    time: items are collected in `session.info[key]` and passed one by one
+    to `on_commit` once the session's transaction commits, or dropped if it
+    rolls back. Applying them only after the commit means a concurrent
+    request cannot re-cache the pre-commit state.
+    """
+    @event.listens_for(Session, "after_commit")
+    def _apply(session):
+        for item in session.info.pop(key, ()):
+            on_commit(item)
+
+    @event.listens_for(Session, "after_rollback")
+    def _discard(session):
+        session.info.pop(key, None)
+
+    def queue(session: Session, items: Iterable) -> None:
+        session.info.setdefault(key, set()).update(items)
+
+    return queue
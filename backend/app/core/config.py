@@ -1,4 +1,5 @@
 import os
+import tempfile
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -7,8 +8,108 @@ class Settings:
     PROJECT_NAME: str = "mfx API"
     PROJECT_VERSION: str = "1.0.0"
     DATABASE_URL: str = os.getenv("DATABASE_URL")
+    # Optional read replica for reports/exports/listings (unset = read from primary)
+    READ_DATABASE_URL: str | None = os.getenv("READ_DATABASE_URL") or None
     SECRET_KEY: str = os.getenv("SECRET_KEY")
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 1440 # 24 hours
 
+    # --- Database connection pool (per worker process) ---
+    # Keep WEB_CONCURRENCY x (DB_POOL_SIZE + DB_MAX_OVERFLOW) below Postgres max_connections
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    DB_POOL_TIMEOUT_SECONDS: int = int(os.getenv("DB_POOL_TIMEOUT_SECONDS", "10"))
+    DB_POOL_RECYCLE_SECONDS: int = int(os.getenv("DB_POOL_RECYCLE_SECONDS", "1800"))
+    DB_POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+    DB_CONNECT_TIMEOUT_SECONDS: int = int(os.getenv("DB_CONNECT_TIMEOUT_SECONDS", "10"))
+    DB_STATEMENT_TIMEOUT_MS: int = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "30000"))
+    DB_LOCK_TIMEOUT_MS: int = int(os.getenv("DB_LOCK_TIMEOUT_MS", "5000"))
+
+    # --- Read-replica staleness guard ---
+    # After a user commits a write, their reads stay on the primary this long
+    READ_AFTER_WRITE_PIN_SECONDS: int = int(os.getenv("READ_AFTER_WRITE_PIN_SECONDS", "10"))
+    # Replica is bypassed while its replay lag exceeds this
+    REPLICA_MAX_LAG_SECONDS: float = float(os.getenv("REPLICA_MAX_LAG_SECONDS", "5"))
+    REPLICA_HEALTH_CHECK_INTERVAL_SECONDS: float = float(os.getenv("REPLICA_HEALTH_CHECK_INTERVAL_SECONDS", "5"))
+
+    # --- In-process tenant registry (subdomain -> tenant) ---
+    TENANT_CACHE_MAXSIZE: int = int(os.getenv("TENANT_CACHE_MAXSIZE", "1024"))
+    TENANT_CACHE_TTL_SECONDS: int = int(os.getenv("TENANT_CACHE_TTL_SECONDS", "300"))
+    # Unknown subdomains are remembered for a shorter time to absorb signup spam
+    TENANT_CACHE_NEGATIVE_TTL_SECONDS: int = int(os.getenv("TENANT_CACHE_NEGATIVE_TTL_SECONDS", "30"))
+
+    # --- Chart-of-accounts cache (tenant -> account code -> account id) ---
+    COA_CACHE_MAXSIZE: int = int(os.getenv("COA_CACHE_MAXSIZE", "1024"))
+    COA_CACHE_TTL_SECONDS: int = int(os.getenv("COA_CACHE_TTL_SECONDS", "600"))
+
+    # --- Dashboard metrics cache (tenant -> computed metrics) ---
+    # Writes in this worker invalidate immediately; other workers catch up within the TTL
+    DASHBOARD_CACHE_MAXSIZE: int = int(os.getenv("DASHBOARD_CACHE_MAXSIZE", "1024"))
+    DASHBOARD_CACHE_TTL_SECONDS: int = int(os.getenv("DASHBOARD_CACHE_TTL_SECONDS", "60"))
+
+    # --- Catalog cache (tenant -> serialized loan products and settings) ---
+    # Writes in this worker invalidate immediately; other workers catch up within the TTL
+    CATALOG_CACHE_MAXSIZE: int = int(os.getenv("CATALOG_CACHE_MAXSIZE", "2048"))
+    CATALOG_CACHE_TTL_SECONDS: int = int(os.getenv("CATALOG_CACHE_TTL_SECONDS", "300"))
+
+    # --- Listings (keyset pagination) ---
+    PAGE_SIZE_DEFAULT: int = int(os.getenv("PAGE_SIZE_DEFAULT", "100"))
+    PAGE_SIZE_MAX: int = int(os.getenv("PAGE_SIZE_MAX", "1000"))
+
+    # --- Report exports ---
+    # Rows fetched per round trip from the server-side cursor while streaming
+    EXPORT_BATCH_SIZE: int = int(os.getenv("EXPORT_BATCH_SIZE", "5000"))
+
+    # --- Background report jobs ---
+    # Worker threads per process (0 = run jobs inline, for tests / local dev)
+    REPORT_JOB_WORKERS: int = int(os.getenv("REPORT_JOB_WORKERS", "2"))
+    # Jobs one tenant may have running at once, across all processes
+    REPORT_JOB_MAX_RUNNING_PER_TENANT: int = int(os.getenv("REPORT_JOB_MAX_RUNNING_PER_TENANT", "1"))
+    # RUNNING jobs older than this are failed (their process was stopped or hung)
+    REPORT_JOB_TIMEOUT_MINUTES: int = int(os.getenv("REPORT_JOB_TIMEOUT_MINUTES", "60"))
+    REPORT_ARTIFACT_DIR: str = os.getenv("REPORT_ARTIFACT_DIR", os.path.join(tempfile.gettempdir(), "mfx-reports"))
+    REPORT_ARTIFACT_RETENTION_HOURS: int = int(os.getenv("REPORT_ARTIFACT_RETENTION_HOURS", "24"))
+
+    # --- Analytics mirror (per-tenant Parquet files queried with DuckDB) ---
+    ANALYTICS_MIRROR_DIR: str = os.getenv("ANALYTICS_MIRROR_DIR", os.path.join(tempfile.gettempdir(), "mfx-analytics"))
+    # Rows fetched per round trip and written per Parquet row group while syncing
+    ANALYTICS_SYNC_BATCH_SIZE: int = int(os.getenv("ANALYTICS_SYNC_BATCH_SIZE", "50000"))
+    # Rows changed within this window are left for the next sync, so transactions
+    # still in flight when a sync starts are not skipped past
+    ANALYTICS_SYNC_LAG_SECONDS: int = int(os.getenv("ANALYTICS_SYNC_LAG_SECONDS", "60"))
+    # Each sync also re-reads this far behind the previous mark, so rows whose
+    # transaction committed that long after they were written are still mirrored
+    ANALYTICS_SYNC_OVERLAP_SECONDS: int = int(os.getenv("ANALYTICS_SYNC_OVERLAP_SECONDS", "3600"))
+    # Incremental files per table before a sync compacts them into one
+    ANALYTICS_MAX_PARTS: int = int(os.getenv("ANALYTICS_MAX_PARTS", "24"))
+    ANALYTICS_DUCKDB_THREADS: int = int(os.getenv("ANALYTICS_DUCKDB_THREADS", "2"))
+    ANALYTICS_DUCKDB_MEMORY_LIMIT: str = os.getenv("ANALYTICS_DUCKDB_MEMORY_LIMIT", "1GB")
+
+    # --- Journal posting ---
+    # Batches with at least this many ledger rows are written with COPY on Postgres
+    JOURNAL_COPY_THRESHOLD: int = int(os.getenv("JOURNAL_COPY_THRESHOLD", "1000"))
+
+    # --- Repayment statement imports ---
+    # Statement lines matched, written and posted per round of batched statements
+    REPAYMENT_IMPORT_BATCH_SIZE: int = int(os.getenv("REPAYMENT_IMPORT_BATCH_SIZE", "1000"))
+
+    # --- Nightly delinquency sweep ---
+    # Tenants swept concurrently, each on its own connection
+    SWEEP_WORKERS: int = int(os.getenv("SWEEP_WORKERS", "4"))
+
+    # --- Authentication caches ---
+    # Verified JWTs are remembered so repeat requests skip signature checks
+    TOKEN_CACHE_MAXSIZE: int = int(os.getenv("TOKEN_CACHE_MAXSIZE", "4096"))
+    TOKEN_CACHE_TTL_SECONDS: int = int(os.getenv("TOKEN_CACHE_TTL_SECONDS", "300"))
+    # Upper bound on how long another worker may honour a revoked token
+    TOKEN_VERSION_CACHE_TTL_SECONDS: int = int(os.getenv("TOKEN_VERSION_CACHE_TTL_SECONDS", "30"))
+
+    # --- Password hashing ---
+    # Changing the cost transparently re-hashes passwords on the next login
+    BCRYPT_ROUNDS: int = int(os.getenv("BCRYPT_ROUNDS", "12"))
+    # Size of the dedicated bcrypt process pool (0 = hash in-process)
+    HASHING_WORKERS: int = int(os.getenv("HASHING_WORKERS", "2"))
+    # Queued + running hash calls allowed before logins are refused with a 503
+    HASHING_MAX_PENDING: int = int(os.getenv("HASHING_MAX_PENDING", "32"))
+
 settings = Settings()
\ No newline at end of file
@@ -1,8 +1,67 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from contextlib import contextmanager
+from typing import Iterator
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
 from .config import settings
+from .db_metrics import InstrumentedAsyncQueuePool, InstrumentedQueuePool
+
+# Async drivers used for the AsyncEngine, per backend
+ASYNC_DRIVERS = {"postgresql": "asyncpg", "sqlite": "aiosqlite"}
+
+def async_database_url(url: str) -> str:
+    """Rewrites a sync database URL (e.g. postgresql://) to its async-driver form."""
+    parsed = make_url(url)
+    driver = ASYNC_DRIVERS.get(parsed.get_backend_name())
+    if driver is None:
+        raise ValueError(f"No async driver configured for '{parsed.get_backend_name()}' databases.")
+    return parsed.set(drivername=f"{parsed.get_backend_name()}+{driver}").render_as_string(hide_password=False)
+
+def engine_options(url: str, name: str, is_async: bool = False) -> dict:
+    """
+    Pool and connection options shared by every engine the app creates.
+    In-memory SQLite keeps SQLAlchemy's default single-connection pool.
+    """
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:"):
+        return {}
+    options = {
+        "poolclass": InstrumentedAsyncQueuePool if is_async else InstrumentedQueuePool,
+        "pool_logging_name": name,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS,
+        "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+    if parsed.get_backend_name() == "postgresql" and is_async:
+        # asyncpg takes the session timeouts as server settings at connect time
+        options["connect_args"] = {
+            "timeout": settings.DB_CONNECT_TIMEOUT_SECONDS,
+            "server_settings": {
+                "statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS),
+                "lock_timeout": str(settings.DB_LOCK_TIMEOUT_MS),
+            },
+        }
+    elif parsed.get_backend_name() == "postgresql":
+        options["connect_args"] = {"connect_timeout": settings.DB_CONNECT_TIMEOUT_SECONDS}
+    return options
+
+def apply_session_timeouts(dbapi_connection, connection_record):
+    """Sets per-connection statement/lock timeouts on every new Postgres connection."""
+    cursor = dbapi_connection.cursor()
+    cursor.execute(f"SET statement_timeout = {int(settings.DB_STATEMENT_TIMEOUT_MS)}")
+    cursor.execute(f"SET lock_timeout = {int(settings.DB_LOCK_TIMEOUT_MS)}")
+    cursor.close()
+    # Keep the SETs out of the first transaction's rollback scope
+    dbapi_connection.commit()
+
+engine = create_engine(settings.DATABASE_URL, **engine_options(settings.DATABASE_URL, "primary"))
+if engine.dialect.name == "postgresql":
+    event.listen(engine, "connect", apply_session_timeouts)
 
-engine = create_engine(settings.DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 def get_db():
@@ -10,4 +69,54 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+@contextmanager
+def snapshot_session(db: Session) -> Iterator[Session]:
+    """
+    A session whose reads all see one snapshot, for consistency checks. On
+    Postgres this is a fresh REPEATABLE READ session on `db`'s engine, as
+    the isolation level of `db` cannot change once it has run a query;
+    elsewhere it is `db` itself. Nothing is written through it.
+    """
+    bind = db.get_bind()
+    if bind.dialect.name != "postgresql":
+        yield db
+        return
+    snapshot = Session(bind=bind.engine.execution_options(isolation_level="REPEATABLE READ"))
+    try:
+        yield snapshot
+    finally:
+        snapshot.close()
+
+# --- Async engine for read-heavy endpoints ---
+# An awaiting request does not hold a threadpool slot while it waits on the DB.
+async_engine = create_async_engine(
+    async_database_url(settings.DATABASE_URL),
+    **engine_options(settings.DATABASE_URL, "primary_async", is_async=True)
+)
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+# --- Optional read replica (READ_DATABASE_URL) ---
+# Reports, exports and list endpoints read from here via `get_read_db`;
+# routing and the staleness guard live in `core.read_routing`.
+read_engine = None
+ReadSessionLocal = None
+async_read_engine = None
+AsyncReadSessionLocal = None
+if settings.READ_DATABASE_URL:
+    read_engine = create_engine(settings.READ_DATABASE_URL, **engine_options(settings.READ_DATABASE_URL, "replica"))
+    if read_engine.dialect.name == "postgresql":
+        event.listen(read_engine, "connect", apply_session_timeouts)
+    ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+    async_read_engine = create_async_engine(
+        async_database_url(settings.READ_DATABASE_URL),
+        **engine_options(settings.READ_DATABASE_URL, "replica_async", is_async=True)
+    )
+    AsyncReadSessionLocal = async_sessionmaker(
+        async_read_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+    )
@@ -0,0 +1,138 @@
+# backend/app/core/db_metrics.py
+
+"""
+Connection-pool instrumentation.
+
+SQLAlchemy pools expose their current size but not how long requests waited
+for a connection or how often the pool had to overflow. The pool classes
+below record both, per named engine, so `workers x (pool_size + max_overflow)`
+can be sized against Postgres `max_connections` from real numbers.
+"""
+import threading
+import time
+
+from sqlalchemy import exc as sa_exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+# Upper bounds (ms) of the checkout wait-time histogram buckets
+WAIT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class PoolMetrics:
+    """Counters and a wait-time histogram for one engine's pool."""
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.wait_ms_total = 0.0
+        self.wait_ms_max = 0.0
+        # One bucket per bound plus a final "+Inf" bucket
+        self.wait_histogram = [0] * (len(WAIT_BUCKETS_MS) + 1)
+        self.overflow_events = 0
+        self.timeouts = 0
+        self.invalidations = 0
+
+    def record_checkout(self, wait_ms: float, overflowed: bool) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.wait_ms_total += wait_ms
+            self.wait_ms_max = max(self.wait_ms_max, wait_ms)
+            for i, bound in enumerate(WAIT_BUCKETS_MS):
+                if wait_ms <= bound:
+                    self.wait_histogram[i] += 1
+                    break
+            else:
+                self.wait_histogram[-1] += 1
+            if overflowed:
+                self.overflow_events += 1
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+    def record_invalidation(self) -> None:
+        with self._lock:
+            self.invalidations += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            labels = [f"le_{b}ms" for b in WAIT_BUCKETS_MS] + ["le_inf"]
+            return {
+                "checkouts": self.checkouts,
+                "wait_ms_avg": self.wait_ms_total / self.checkouts if self.checkouts else 0.0,
+                "wait_ms_max": self.wait_ms_max,
+                "wait_ms_histogram": dict(zip(labels, self.wait_histogram)),
+                "overflow_events": self.overflow_events,
+                "timeouts": self.timeouts,
+                "invalidations": self.invalidations,
+            }
+
+
+_registry: dict[str, PoolMetrics] = {}
+_pools: dict[str, object] = {}
+_registry_lock = threading.Lock()
+
+
+def metrics_for(name: str) -> PoolMetrics:
+    with _registry_lock:
+        if name not in _registry:
+            _registry[name] = PoolMetrics(name)
+        return _registry[name]
+
+
+class _InstrumentedPoolMixin:
+    """
+    Times `_do_get` (the blocking part of a checkout) and detects checkouts
+    that had to open an overflow connection. Metrics are keyed by the
+    engine's `pool_logging_name`, which survives `Pool.recreate()`.
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        with _registry_lock:
+            _pools[self._metrics_name] = self
+
+    @property
+    def _metrics_name(self) -> str:
+        return self._orig_logging_name or "default"
+
+    def _do_get(self):
+        metrics = metrics_for(self._metrics_name)
+        overflow_before = self.overflow()
+        start = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except sa_exc.TimeoutError:
+            metrics.record_timeout()
+            raise
+        wait_ms = (time.perf_counter() - start) * 1000
+        metrics.record_checkout(wait_ms, overflowed=self.overflow() > max(overflow_before, 0))
+        return conn
+
+    def _invalidate(self, connection, exception=None, _checkin=True):
+        metrics_for(self._metrics_name).record_invalidation()
+        return super()._invalidate(connection, exception, _checkin)
+
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def pool_stats() -> dict:
+    """Live pool state plus recorded metrics for every instrumented engine."""
+    with _registry_lock:
+        pools = dict(_pools)
+    stats = {}
+    for name, pool in pools.items():
+        stats[name] = {
+            "pool_size": pool.size(),
+            "max_overflow": pool._max_overflow,
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": max(pool.overflow(), 0),
+            **metrics_for(name).snapshot(),
+        }
+    return stats
@@ -1,21 +1,26 @@
 # backend/app/core/dependencies.py
 
+import asyncio
 from typing import List
 from fastapi import Depends, HTTPException, status, Request
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from jose import JWTError, jwt
-import uuid
 
 from .. import models
+from ..schemas import tenant as tenant_schema
 from .config import settings
-from .database import get_db
+from . import database
+from .database import get_db, get_async_db
 from .security import UserRole
+from .principal import Principal, get_cached_principal, cache_principal, is_token_current
+from . import read_routing, tenant_registry
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/token")
 
 # --- REFACTORED: The Definitive Subdomain/Tenant Dependency ---
-def get_tenant_from_subdomain(request: Request, db: Session = Depends(get_db)) -> models.Tenant:
+def get_tenant_from_subdomain(request: Request, db: Session = Depends(get_db)) -> tenant_schema.Tenant:
     """
     Determines the current tenant based on the request.
 
@@ -27,11 +32,14 @@ def get_tenant_from_subdomain(request: Request, db: Session = Depends(get_db)) -
         back to parsing the `Host` header from the incoming request. It assumes a
         format like `subdomain.yourdomain.com`.
 
+    The subdomain is resolved through the in-process tenant registry, so the
+    database is only queried on a cache miss.
+
     Raises:
         HTTPException(404): If the tenant cannot be determined or is not found.
     
     Returns:
-        models.Tenant: The SQLAlchemy Tenant object for the current request.
+        tenant_schema.Tenant: A detached snapshot of the tenant for the current request.
     """
     subdomain = request.headers.get("x-tenant-subdomain")
 
@@ -52,34 +60,91 @@ def get_tenant_from_subdomain(request: Request, db: Session = Depends(get_db)) -
             detail="Could not determine tenant. Please provide the subdomain via the 'X-Tenant-Subdomain' header for testing, or use a subdomain in production (e.g., my-org.yourdomain.com)."
         )
 
-    tenant = db.query(models.Tenant).filter(models.Tenant.subdomain == subdomain).first()
+    tenant = tenant_registry.resolve_tenant(db, subdomain)
     if not tenant:
         raise HTTPException(status_code=404, detail=f"Tenant for subdomain '{subdomain}' not found.")
     
     return tenant
 
 
-def get_current_user(db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)) -> models.User:
+def get_current_user(
+    request: Request, db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)
+) -> Principal:
     """
-    Decodes the JWT token, validates it, and fetches the corresponding user.
+    Decodes the JWT token, validates it, and returns the authenticated principal.
+
+    The principal is rebuilt from the signed claims, so no `User` row is loaded.
+    Verified tokens are cached, and revocation/deactivation is enforced through
+    a (cached) token-version check. Use `get_current_db_user` when the full ORM
+    user is needed.
     """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        user_id_str: str = payload.get("sub")
-        if user_id_str is None:
+    principal = get_cached_principal(token)
+    if principal is None:
+        try:
+            payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+            if payload.get("sub") is None:
+                raise credentials_exception
+            # Tokens without a `ver` claim predate revocation and are refused (KeyError)
+            principal = Principal.from_claims(payload)
+        except (JWTError, KeyError, ValueError):
             raise credentials_exception
-        user_id = uuid.UUID(user_id_str)
-    except (JWTError, ValueError):
-        raise credentials_exception
-    
-    user = db.query(models.User).filter(models.User.id == user_id).first()
-    if user is None or not user.is_active:
+        cache_principal(token, principal, payload.get("exp"))
+
+    if not is_token_current(db, principal):
         raise credentials_exception
+    # Lets the read router pin this user to the primary once they commit a write
+    db.info["principal_id"] = principal.id
+    db.info["request_state"] = request.state
+    return principal
+
+
+def get_read_db(
+    request: Request, principal: Principal = Depends(get_current_user), db: Session = Depends(get_db)
+):
+    """
+    A session for read-only endpoints (reports, exports, listings).
+
+    Uses the read replica when one is configured, healthy and the user has not
+    written recently; otherwise hands back the request's primary session.
+    """
+    if read_routing.replica_configured() and read_routing.health_check_due():
+        read_routing.check_replica()
+    if not read_routing.use_replica(principal.id, request.cookies.get(read_routing.LAST_WRITE_COOKIE)):
+        yield db
+        return
+    replica_db = database.ReadSessionLocal()
+    try:
+        yield replica_db
+    finally:
+        replica_db.close()
+
+
+async def get_async_read_db(
+    request: Request, principal: Principal = Depends(get_current_user), db: AsyncSession = Depends(get_async_db)
+):
+    """Async counterpart of `get_read_db`."""
+    if read_routing.replica_configured() and read_routing.health_check_due():
+        # The lag probe is a blocking round-trip; keep it off the event loop
+        await asyncio.to_thread(read_routing.check_replica)
+    if not read_routing.use_replica(principal.id, request.cookies.get(read_routing.LAST_WRITE_COOKIE)):
+        yield db
+        return
+    async with database.AsyncReadSessionLocal() as replica_db:
+        yield replica_db
+
+
+def get_current_db_user(
+    principal: Principal = Depends(get_current_user), db: Session = Depends(get_db)
+) -> models.User:
+    """Loads the full ORM user for the current principal, for endpoints that need it."""
+    user = principal.load_user(db)
+    if user is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Could not validate credentials")
     return user
 
 
@@ -90,7 +155,7 @@ class RoleChecker:
     def __init__(self, allowed_roles: List[UserRole]):
         self.allowed_roles = allowed_roles
 
-    def __call__(self, current_user: models.User = Depends(get_current_user)):
+    def __call__(self, current_user: Principal = Depends(get_current_user)) -> Principal:
         """
         Raises:
             HTTPException(403): If the user's role is not in the allowed list.
@@ -0,0 +1,127 @@
+# backend/app/core/hashing.py
+
+"""
+A bounded process pool for bcrypt hashing and verification.
+
+bcrypt is deliberately slow (tens to hundreds of milliseconds per call). Run
+inside sync endpoints it occupies one of the shared anyio worker threads for
+the whole duration, so a burst of logins starves every other endpoint. The
+pool below moves that work to separate processes and refuses new work once
+too many calls are queued, so callers can fail fast with a 503 instead of
+stalling.
+"""
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+
+from passlib.context import CryptContext
+
+from .config import settings
+
+
+class HashingBusyError(Exception):
+    """Raised when the hashing queue is full and the call was not accepted."""
+
+
+@lru_cache(maxsize=None)
+def _context(rounds: int) -> CryptContext:
+    return CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=rounds)
+
+
+# --- Functions executed inside the worker processes (must be picklable) ---
+
+def _hash_in_worker(password: str, rounds: int) -> str:
+    return _context(rounds).hash(password)
+
+
+def _verify_in_worker(password: str, hashed_password: str, rounds: int) -> tuple[bool, str | None]:
+    # verify_and_update returns a new hash when the stored one uses a different cost
+    return _context(rounds).verify_and_update(password, hashed_password)
+
+
+class PasswordHasher:
+    """
+    Async facade over the worker pool.
+
+    `max_pending` bounds the number of calls that are queued or running at
+    any time; beyond it, `HashingBusyError` is raised immediately.
+    """
+    def __init__(self, workers: int, max_pending: int, rounds: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.rounds = rounds
+        self._executor: Executor | None = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+
+    def _get_executor(self) -> Executor:
+        with self._lock:
+            if self._executor is None:
+                if self.workers > 0:
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+                    )
+                else:
+                    # HASHING_WORKERS=0 keeps hashing in-process (tests, local dev)
+                    self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="bcrypt")
+            return self._executor
+
+    async def _submit(self, fn, *args):
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self.rejected += 1
+                raise HashingBusyError("Password hashing queue is full.")
+            self._pending += 1
+        succeeded = False
+        try:
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(self._get_executor(), fn, *args)
+            succeeded = True
+            return result
+        finally:
+            with self._lock:
+                self._pending -= 1
+                if succeeded:
+                    self.completed += 1
+                else:
+                    self.failed += 1
+
+    async def hash(self, password: str) -> str:
+        return await self._submit(_hash_in_worker, password, self.rounds)
+
+    async def verify(self, password: str, hashed_password: str) -> tuple[bool, str | None]:
+        """
+        Returns `(is_valid, new_hash)`. `new_hash` is set when the password is
+        valid but the stored hash was produced with a different bcrypt cost.
+        """
+        return await self._submit(_verify_in_worker, password, hashed_password, self.rounds)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "max_pending": self.max_pending,
+                "pending": self._pending,
+                "completed": self.completed,
+                "failed": self.failed,
+                "rejected": self.rejected,
+                "bcrypt_rounds": self.rounds,
+            }
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+
+password_hasher = PasswordHasher(
+    workers=settings.HASHING_WORKERS,
+    max_pending=settings.HASHING_MAX_PENDING,
+    rounds=settings.BCRYPT_ROUNDS,
+)
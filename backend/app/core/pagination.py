@@ -0,0 +1,89 @@
+# backend/app/core/pagination.py
+
+"""
+Keyset (cursor) pagination for listings.
+
+A page is fetched with `WHERE (k1, k2) > (:last_k1, :last_k2) ORDER BY k1, k2
+LIMIT n + 1`, so every page costs one index range scan however deep the
+client has paged, and rows inserted meanwhile never shift page boundaries
+the way OFFSET does. The sort keys must end in a unique column (usually
+the primary key) and should be covered by an index.
+
+The cursor handed to clients is an opaque, URL-safe encoding of the last
+row's key values.
+"""
+import base64
+import json
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, Generic, List, Optional, Sequence, TypeVar
+
+from fastapi import HTTPException, status
+from pydantic import BaseModel
+from sqlalchemy import Select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+T = TypeVar("T")
+
+class Page(BaseModel, Generic[T]):
+    items: List[T]
+    # Pass as `cursor` to fetch the next page; None on the last page
+    next_cursor: Optional[str] = None
+
+def _cursor_value(value: Any) -> str:
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return str(value.value if isinstance(value, Enum) else value)
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    payload = json.dumps([_cursor_value(value) for value in values])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str, keys: Sequence) -> tuple:
+    """The key values in `cursor`, converted to the Python types of `keys`. 400 if malformed."""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if len(values) != len(keys):
+            raise ValueError("cursor does not match the sort keys")
+        decoded = []
+        for key, value in zip(keys, values):
+            python_type = key.type.python_type
+            decoded.append(python_type.fromisoformat(value) if python_type in (date, datetime) else python_type(value))
+        return tuple(decoded)
+    except (ValueError, TypeError, UnicodeDecodeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid pagination cursor.")
+
+def _page_statement(stmt: Select, keys: Sequence, cursor: Optional[str], limit: int, descending: bool) -> Select:
+    if cursor:
+        after = decode_cursor(cursor, keys)
+        stmt = stmt.where(tuple_(*keys) < after if descending else tuple_(*keys) > after)
+    order = [key.desc() for key in keys] if descending else list(keys)
+    return stmt.order_by(*order).limit(limit + 1)
+
+def _split_page(rows: list, keys: Sequence, limit: int) -> tuple[list, Optional[str]]:
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor([getattr(rows[-1], key.key) for key in keys])
+
+def keyset_page(
+    db: Session, stmt: Select, keys: Sequence, cursor: Optional[str], limit: int,
+    descending: bool = False, scalars: bool = False,
+) -> tuple[list, Optional[str]]:
+    """
+    Runs `stmt` for the page after `cursor`, ordered by `keys` (all ascending
+    or all descending). Each returned row must expose the keys as attributes
+    of the same name: ORM entities (with `scalars=True`), or rows selecting
+    those columns. Returns the rows of the page and the cursor of the next one.
+    """
+    result = db.execute(_page_statement(stmt, keys, cursor, limit, descending))
+    return _split_page(list(result.scalars() if scalars else result), keys, limit)
+
+async def keyset_page_async(
+    db: AsyncSession, stmt: Select, keys: Sequence, cursor: Optional[str], limit: int,
+    descending: bool = False, scalars: bool = False,
+) -> tuple[list, Optional[str]]:
+    """Async counterpart of `keyset_page`."""
+    result = await db.execute(_page_statement(stmt, keys, cursor, limit, descending))
+    return _split_page(list(result.scalars() if scalars else result), keys, limit)
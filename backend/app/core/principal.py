@@ -0,0 +1,118 @@
+# backend/app/core/principal.py
+
+"""
+The authenticated principal of a request, rebuilt from signed JWT claims.
+
+Authorisation only needs the user's id, tenant, role and client link, all of
+which are carried in the token. The full `User` row is therefore never loaded
+on the hot path; revocation and deactivation are enforced by comparing the
+token's `ver` claim against the user's current `token_version`, which is
+itself cached for a short time.
+"""
+import time
+import uuid
+
+from sqlalchemy.orm import Session
+
+from .. import models
+from .cache import TTLCache
+from .config import settings
+
+_UNKNOWN = object()
+
+# token string -> (Principal, expiry timestamp)
+_verified_tokens = TTLCache(maxsize=settings.TOKEN_CACHE_MAXSIZE, ttl=settings.TOKEN_CACHE_TTL_SECONDS)
+# user id -> current token_version, or None if the user is inactive / gone
+_token_versions = TTLCache(maxsize=settings.TOKEN_CACHE_MAXSIZE, ttl=settings.TOKEN_VERSION_CACHE_TTL_SECONDS)
+
+
+class Principal:
+    """
+    A DB-free stand-in for `models.User` carrying the attributes that
+    services and endpoints use for authorisation and tenant scoping.
+    """
+    __slots__ = ("id", "tenant_id", "role", "client_id", "email", "token_version", "_user")
+
+    def __init__(
+        self,
+        id: uuid.UUID,
+        tenant_id: uuid.UUID,
+        role: str,
+        client_id: uuid.UUID | None,
+        email: str | None,
+        token_version: int,
+    ):
+        self.id = id
+        self.tenant_id = tenant_id
+        self.role = role
+        self.client_id = client_id
+        self.email = email
+        self.token_version = token_version
+        self._user = None
+
+    @classmethod
+    def from_claims(cls, claims: dict) -> "Principal":
+        """Builds a principal from decoded token claims. Raises KeyError/ValueError if malformed."""
+        client_id = claims.get("cid")
+        return cls(
+            id=uuid.UUID(claims["sub"]),
+            tenant_id=uuid.UUID(claims["tid"]),
+            role=claims["role"],
+            client_id=uuid.UUID(client_id) if client_id else None,
+            email=claims.get("email"),
+            token_version=int(claims["ver"]),
+        )
+
+    def copy(self) -> "Principal":
+        """A fresh instance without the lazily loaded user, safe to hand to a new request."""
+        return Principal(self.id, self.tenant_id, self.role, self.client_id, self.email, self.token_version)
+
+    def load_user(self, db: Session) -> models.User | None:
+        """Lazily loads (once) the ORM user for endpoints that need the full row."""
+        if self._user is None:
+            self._user = db.get(models.User, self.id)
+        return self._user
+
+
+def get_cached_principal(token: str) -> Principal | None:
+    """Returns the principal for an already-verified, unexpired token."""
+    cached = _verified_tokens.get(token)
+    if cached is None:
+        return None
+    principal, expires_at = cached
+    if expires_at is not None and expires_at <= time.time():
+        _verified_tokens.invalidate(token)
+        return None
+    return principal.copy()
+
+
+def cache_principal(token: str, principal: Principal, expires_at: float | None) -> None:
+    ttl = settings.TOKEN_CACHE_TTL_SECONDS
+    if expires_at is not None:
+        ttl = min(ttl, max(expires_at - time.time(), 0))
+    # Never share the lazily loaded ORM user between requests/sessions
+    _verified_tokens.set(token, (principal.copy(), expires_at), ttl=ttl)
+
+
+def is_token_current(db: Session, principal: Principal) -> bool:
+    """
+    Checks the token version against the user's current one. Only the two
+    narrow columns are read, and only when the version cache misses.
+    """
+    current = _token_versions.get(principal.id, default=_UNKNOWN)
+    if current is _UNKNOWN:
+        row = db.query(models.User.token_version, models.User.is_active).filter(
+            models.User.id == principal.id
+        ).first()
+        current = row.token_version if row is not None and row.is_active else None
+        _token_versions.set(principal.id, current)
+    return current is not None and current == principal.token_version
+
+
+def invalidate_user(user_id: uuid.UUID) -> None:
+    """Forgets the cached token version so the next request re-reads it."""
+    _token_versions.invalidate(user_id)
+
+
+def stats() -> dict:
+    return {"verified_tokens": _verified_tokens.stats(), "token_versions": _token_versions.stats()}
@@ -0,0 +1,176 @@
+# backend/app/core/read_routing.py
+
+"""
+Routing of read-only requests to the optional read replica.
+
+Reports, exports and listings are served from `READ_DATABASE_URL` when it is
+configured, with two staleness guards:
+
+  * read-your-writes: once a user commits a write on the primary, their reads
+    stay on the primary for `READ_AFTER_WRITE_PIN_SECONDS`. The pin is kept
+    in this worker's memory and, so that other workers honour it too, in a
+    short-lived cookie holding the time of the write. Clients that drop
+    cookies are only pinned on the worker that served the write;
+  * replica health: the replica's replay lag is checked at most every
+    `REPLICA_HEALTH_CHECK_INTERVAL_SECONDS`; while it is behind by more than
+    `REPLICA_MAX_LAG_SECONDS` (or unreachable) every read goes to the primary.
+
+Writes are detected on the primary session itself (flushes and bulk DML), and
+attributed to the user and request that `get_current_user` recorded in
+`session.info`.
+"""
+import threading
+import time
+import uuid
+
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+
+from . import database
+from .cache import TTLCache
+from .config import settings
+
+# user id -> True while that user's reads are pinned to the primary
+_recent_writers = TTLCache(maxsize=100_000, ttl=settings.READ_AFTER_WRITE_PIN_SECONDS)
+
+# Unix time of the client's last committed write, for reads served by other workers
+LAST_WRITE_COOKIE = "mfx_last_write"
+
+
+class _ReplicaState:
+    """Last known replica health, refreshed at most once per check interval."""
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.healthy = False
+        self.lag_seconds: float | None = None
+        self.checked_at = 0.0
+        self.error: str | None = None
+        self.primary_fallbacks = 0
+        self.replica_reads = 0
+
+    def reset(self) -> None:
+        with self._lock:
+            self.healthy, self.lag_seconds, self.checked_at, self.error = False, None, 0.0, None
+
+
+_replica = _ReplicaState()
+
+
+def replica_configured() -> bool:
+    return database.read_engine is not None
+
+
+def mark_recent_writer(user_id: uuid.UUID) -> None:
+    """Pins `user_id`'s reads to the primary for the configured window."""
+    _recent_writers.set(user_id, True)
+
+
+def is_pinned(user_id: uuid.UUID | None, last_write_cookie: str | None = None) -> bool:
+    """Whether `user_id` wrote within the pin window, per this worker or the request's cookie."""
+    if user_id is not None and _recent_writers.get(user_id) is not None:
+        return True
+    try:
+        written_at = float(last_write_cookie) if last_write_cookie else None
+    except ValueError:
+        return False
+    return written_at is not None and time.time() - written_at < settings.READ_AFTER_WRITE_PIN_SECONDS
+
+
+async def last_write_cookie_middleware(request, call_next):
+    """Hands the client a cookie recording when the request committed a write (see `_pin_writer`)."""
+    response = await call_next(request)
+    written_at = getattr(request.state, "last_write_at", None)
+    if written_at is not None:
+        response.set_cookie(
+            LAST_WRITE_COOKIE, f"{written_at:.3f}", max_age=settings.READ_AFTER_WRITE_PIN_SECONDS,
+            httponly=True, samesite="lax",
+        )
+    return response
+
+
+def _measure_lag(engine) -> float:
+    """Replication lag of `engine` in seconds (0 for a server that is not a standby)."""
+    with engine.connect() as conn:
+        if engine.dialect.name != "postgresql":
+            conn.execute(text("SELECT 1"))
+            return 0.0
+        in_recovery, lag = conn.execute(text(
+            "SELECT pg_is_in_recovery(), "
+            "CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+            "ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END"
+        )).one()
+        return float(lag or 0.0) if in_recovery else 0.0
+
+
+def health_check_due() -> bool:
+    return time.monotonic() - _replica.checked_at >= settings.REPLICA_HEALTH_CHECK_INTERVAL_SECONDS
+
+
+def check_replica() -> bool:
+    """Measures replica lag now and records whether the replica may be read from."""
+    try:
+        lag = _measure_lag(database.read_engine)
+        healthy, error = lag <= settings.REPLICA_MAX_LAG_SECONDS, None
+    except Exception as exc:  # any failure means "read from the primary"
+        lag, healthy, error = None, False, f"{type(exc).__name__}: {exc}"
+    with _replica._lock:
+        _replica.healthy, _replica.lag_seconds, _replica.error = healthy, lag, error
+        _replica.checked_at = time.monotonic()
+    return healthy
+
+
+def use_replica(user_id: uuid.UUID | None, last_write_cookie: str | None = None) -> bool:
+    """
+    Decides where a read for `user_id` goes. The health check must already be
+    fresh (see `health_check_due`/`check_replica`); this never touches the DB.
+    """
+    if not replica_configured():
+        return False
+    with _replica._lock:
+        if is_pinned(user_id, last_write_cookie) or not _replica.healthy:
+            _replica.primary_fallbacks += 1
+            return False
+        _replica.replica_reads += 1
+        return True
+
+
+def stats() -> dict:
+    with _replica._lock:
+        return {
+            "configured": replica_configured(),
+            "healthy": _replica.healthy,
+            "lag_seconds": _replica.lag_seconds,
+            "last_error": _replica.error,
+            "replica_reads": _replica.replica_reads,
+            "primary_fallbacks": _replica.primary_fallbacks,
+            "pinned_users": _recent_writers.stats(),
+        }
+
+
+# --- Write detection on primary sessions ---
+
+@event.listens_for(Session, "after_flush")
+def _flag_flush(session, flush_context):
+    session.info["wrote"] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _flag_bulk_dml(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info["wrote"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _pin_writer(session):
+    if session.info.pop("wrote", False):
+        user_id = session.info.get("principal_id")
+        if user_id is not None:
+            mark_recent_writer(user_id)
+        request_state = session.info.get("request_state")
+        if request_state is not None:
+            request_state.last_write_at = time.time()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_write_flag(session):
+    session.info.pop("wrote", None)
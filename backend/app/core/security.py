@@ -12,7 +12,7 @@ class UserRole(str, Enum):
     CLIENT = "client"
     INVESTOR = "investor"
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.BCRYPT_ROUNDS)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
@@ -20,6 +20,20 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
+def build_token_claims(user) -> dict:
+    """
+    The signed claims from which a request principal is rebuilt without
+    touching the database (see `core.principal`).
+    """
+    return {
+        "sub": str(user.id),
+        "tid": str(user.tenant_id),
+        "role": user.role,
+        "cid": str(user.client_id) if user.client_id else None,
+        "email": user.email,
+        "ver": user.token_version or 0,
+    }
+
 def create_access_token(data: dict) -> str:
     to_encode = data.copy()
     expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
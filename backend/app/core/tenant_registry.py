@@ -0,0 +1,71 @@
+# backend/app/core/tenant_registry.py
+
+"""
+In-process registry mapping subdomains to tenants.
+
+The subdomain -> tenant mapping almost never changes, so resolving it from the
+database on every public request (e.g. client signup) is wasted work. Lookups
+are served from a TTL/LRU cache; unknown subdomains are cached too (for a
+shorter time) so floods of requests for bogus subdomains never reach the DB.
+"""
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+
+from .. import models
+from ..schemas import tenant as tenant_schema
+from .cache import TTLCache, history_values, register_invalidator
+from .config import settings
+
+# Sentinel stored for subdomains known NOT to exist (negative caching)
+_NOT_FOUND = object()
+
+_tenants = TTLCache(maxsize=settings.TENANT_CACHE_MAXSIZE, ttl=settings.TENANT_CACHE_TTL_SECONDS)
+
+
+def resolve_tenant(db: Session, subdomain: str) -> tenant_schema.Tenant | None:
+    """
+    Returns the tenant registered under `subdomain`, or None if there is none.
+    Only a cache miss touches the database.
+    """
+    cached = _tenants.get(subdomain)
+    if cached is _NOT_FOUND:
+        return None
+    if cached is not None:
+        return cached
+
+    tenant = db.query(models.Tenant).filter(models.Tenant.subdomain == subdomain).first()
+    if tenant is None:
+        _tenants.set(subdomain, _NOT_FOUND, ttl=settings.TENANT_CACHE_NEGATIVE_TTL_SECONDS)
+        return None
+
+    resolved = tenant_schema.Tenant.model_validate(tenant)
+    _tenants.set(subdomain, resolved)
+    return resolved
+
+
+def invalidate_tenant(subdomain: str) -> None:
+    """
+    Drops any cached entry (positive or negative) for `subdomain`.
+    Must be called after a tenant is created, renamed or deleted.
+    """
+    _tenants.invalidate(subdomain)
+
+
+def stats() -> dict:
+    """Hit/miss counters for the registry, used by the metrics endpoint."""
+    return _tenants.stats()
+
+
+# --- Automatic invalidation on tenant changes ---
+# Applied only once the transaction commits (see core.cache.register_invalidator).
+
+_queue_subdomains = register_invalidator("stale_subdomains", invalidate_tenant)
+
+
+@event.listens_for(models.Tenant, "after_insert")
+@event.listens_for(models.Tenant, "after_update")
+@event.listens_for(models.Tenant, "after_delete")
+def _queue_tenant_invalidation(mapper, connection, target):
+    session = object_session(target)
+    if session is not None:
+        _queue_subdomains(session, history_values(target, "subdomain"))
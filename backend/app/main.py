@@ -2,9 +2,29 @@
 Main application file for the MFX API.
 Initializes the FastAPI application and includes all versioned API routers.
 """
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+import logging
+from fastapi import FastAPI, Request, status
+from fastapi.responses import JSONResponse
 from .core.config import settings
+from .core import read_routing
+from .core.hashing import password_hasher
 from .api.v1.api import api_router
+from .services import period_service, report_job_service
+
+logger = logging.getLogger(__name__)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Starts and stops process-wide resources around the application's lifetime."""
+    try:
+        # Pick up report jobs queued while no process had a free worker
+        report_job_service.runner.dispatch()
+    except Exception:
+        logger.exception("Could not dispatch queued report jobs at startup")
+    yield
+    report_job_service.runner.shutdown()
+    password_hasher.shutdown()
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
@@ -12,11 +32,21 @@ app = FastAPI(
     version=settings.PROJECT_VERSION,
     openapi_url="/api/v1/openapi.json",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan
 )
 
+app.middleware("http")(read_routing.last_write_cookie_middleware)
 app.include_router(api_router, prefix="/api/v1")
 
+@app.exception_handler(period_service.ClosedPeriodError)
+def closed_period_handler(request: Request, exc: period_service.ClosedPeriodError):
+    """A posting dated in a closed month conflicts with the close, whichever endpoint made it."""
+    return JSONResponse(
+        status_code=status.HTTP_409_CONFLICT,
+        content={"detail": str(exc), "closed_through": exc.closed_through.isoformat()},
+    )
+
 @app.get("/", tags=["Health Check"])
 def read_root():
     """Provides a simple JSON response to indicate the API is up and running."""
@@ -10,10 +10,16 @@ from .base import Base
 from .tenant import Tenant, TenantSettings
 from .user import User
 from .client import Client, KYCDocument, KycStatus
-from .loan import Loan, LoanProduct, LoanStatus
-from .repayment import RepaymentSchedule, RepaymentTransaction, RepaymentStatus
-from .accounting import ChartOfAccount, GeneralLedgerEntry, AccountType, DEFAULT_COA
+from .loan import Loan, LoanProduct, LoanStatus, InterestMethod, PenaltyType, AgingBucket, PortfolioAging
+from .repayment import (
+    RepaymentSchedule, RepaymentTransaction, RepaymentStatus, LoanPenalty, DelinquencySweep,
+    RepaymentAllocation, AllocationComponent,
+)
+from .accounting import (
+    ChartOfAccount, GeneralLedgerEntry, AccountBalance, AccountType, DEFAULT_COA, ClosedPeriod, AccountBalanceSnapshot,
+)
 from .investor import Investor, Fund, Investment
+from .report import ReportJob, ReportJobStatus, ReportKind
 
 # --- NEW: Define the public API of the 'models' package ---
 __all__ = [
@@ -27,14 +33,28 @@ __all__ = [
     "Loan",
     "LoanProduct",
     "LoanStatus",
+    "InterestMethod",
+    "PenaltyType",
+    "AgingBucket",
+    "PortfolioAging",
     "RepaymentSchedule",
     "RepaymentTransaction",
     "RepaymentStatus",
+    "LoanPenalty",
+    "DelinquencySweep",
+    "RepaymentAllocation",
+    "AllocationComponent",
     "ChartOfAccount",
     "GeneralLedgerEntry",
+    "AccountBalance",
     "AccountType",
     "DEFAULT_COA",
+    "ClosedPeriod",
+    "AccountBalanceSnapshot",
     "Investor",
     "Fund",
     "Investment",
+    "ReportJob",
+    "ReportJobStatus",
+    "ReportKind",
 ]
\ No newline at end of file
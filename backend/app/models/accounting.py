@@ -1,6 +1,6 @@
 import uuid
 from datetime import datetime
-from sqlalchemy import Column, String, ForeignKey, Numeric, DateTime, Enum as SQLAlchemyEnum, Boolean
+from sqlalchemy import Column, String, ForeignKey, Numeric, Date, DateTime, Enum as SQLAlchemyEnum, Boolean, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from .base import Base
@@ -16,29 +16,59 @@ class AccountType(str, Enum):
 class ChartOfAccount(Base):
     """Defines the accounts for the General Ledger."""
     __tablename__ = "chart_of_accounts"
+    __table_args__ = (
+        Index("uq_chart_of_accounts_tenant_id_account_code", "tenant_id", "account_code", unique=True),
+    )
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     name = Column(String, nullable=False)
-    account_code = Column(String, nullable=False) # Should be unique per tenant
+    account_code = Column(String, nullable=False) # Unique per tenant, see __table_args__
     account_type = Column(SQLAlchemyEnum(AccountType), nullable=False) # This line relies on the import
     is_active = Column(Boolean, default=True)
     
     tenant_id = Column(UUID(as_uuid=True), ForeignKey("tenants.id"), nullable=False)
 
+class AccountBalance(Base):
+    """
+    Running debit/credit totals per account, maintained by
+    `accounting_service.post_transaction` in the same transaction as the
+    ledger entries. Reports read these instead of summing the whole ledger.
+    """
+    __tablename__ = "account_balances"
+    account_id = Column(UUID(as_uuid=True), ForeignKey("chart_of_accounts.id"), primary_key=True)
+    account = relationship("ChartOfAccount")
+
+    total_debits = Column(Numeric(16, 2), nullable=False, default=0, server_default="0")
+    total_credits = Column(Numeric(16, 2), nullable=False, default=0, server_default="0")
+    updated_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    tenant_id = Column(UUID(as_uuid=True), ForeignKey("tenants.id"), nullable=False, index=True)
+
 # NEW and CORRECT
 DEFAULT_COA = [
     {"name": "Cash on Hand", "account_code": "1010", "account_type": AccountType.ASSET},
     {"name": "Loans Receivable", "account_code": "1100", "account_type": AccountType.ASSET},
+    {"name": "Penalties Receivable", "account_code": "1110", "account_type": AccountType.ASSET},
     {"name": "Interest Revenue", "account_code": "4010", "account_type": AccountType.REVENUE},
+    {"name": "Penalty Revenue", "account_code": "4020", "account_type": AccountType.REVENUE},
     {"name": "Client Savings", "account_code": "2010", "account_type": AccountType.LIABILITY},
 ]
 
 class GeneralLedgerEntry(Base):
     """A single entry (debit or credit) in the General Ledger."""
     __tablename__ = "general_ledger_entries"
+    __table_args__ = (
+        # Ledger reads for one tenant or one account in (transaction_date, id) order,
+        # which is also the keyset of the ledger browser
+        Index("ix_general_ledger_entries_tenant_id_transaction_date_id", "tenant_id", "transaction_date", "id"),
+        Index("ix_general_ledger_entries_account_id_transaction_date_id", "account_id", "transaction_date", "id"),
+        Index("ix_general_ledger_entries_tenant_id_created_at", "tenant_id", "created_at"),
+    )
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     
     transaction_id = Column(String, index=True, nullable=False) # Groups entries for one event
     transaction_date = Column(DateTime, default=datetime.utcnow, nullable=False)
+    # When the entry was posted (transaction_date may be backdated); entries are never updated
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     description = Column(String, nullable=False)
     
     account_id = Column(UUID(as_uuid=True), ForeignKey("chart_of_accounts.id"), nullable=False)
@@ -47,4 +77,28 @@ class GeneralLedgerEntry(Base):
     debit = Column(Numeric(12, 2), default=0.00)
     credit = Column(Numeric(12, 2), default=0.00)
     
-    tenant_id = Column(UUID(as_uuid=True), ForeignKey("tenants.id"), nullable=False)
\ No newline at end of file
+    tenant_id = Column(UUID(as_uuid=True), ForeignKey("tenants.id"), nullable=False)
+
+class ClosedPeriod(Base):
+    """
+    A closed accounting month. Once a month is closed its balances are
+    frozen in `account_balance_snapshots` and postings dated on or before
+    `period_end` are rejected. Months are closed in order.
+    """
+    __tablename__ = "closed_periods"
+    tenant_id = Column(UUID(as_uuid=True), ForeignKey("tenants.id"), primary_key=True)
+    period_end = Column(Date, primary_key=True) # Last day of the closed month
+    closed_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    closed_by_user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=True) # None = closed by a scheduled job
+
+class AccountBalanceSnapshot(Base):
+    """Cumulative debit/credit totals of an account through the end of a closed period."""
+    __tablename__ = "account_balance_snapshots"
+    __table_args__ = (
+        Index("ix_account_balance_snapshots_tenant_id_period_end", "tenant_id", "period_end"),
+    )
+    account_id = Column(UUID(as_uuid=True), ForeignKey("chart_of_accounts.id"), primary_key=True)
+    period_end = Column(Date, primary_key=True)
+    total_debits = Column(Numeric(16, 2), nullable=False, default=0)
+    total_credits = Column(Numeric(16, 2), nullable=False, default=0)
+    tenant_id = Column(UUID(as_uuid=True), ForeignKey("tenants.id"), nullable=False)
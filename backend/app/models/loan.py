@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime
 from enum import Enum
-from sqlalchemy import Column, String, ForeignKey, Numeric, DateTime, Enum as SQLAlchemyEnum, Integer
+from sqlalchemy import Column, String, ForeignKey, Numeric, Date, DateTime, Enum as SQLAlchemyEnum, Integer, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from .base import Base
@@ -13,20 +13,39 @@ class LoanStatus(str, Enum):
     DISBURSED = "disbursed"
     PAID_OFF = "paid_off"
 
+class InterestMethod(str, Enum):
+    FLAT = "flat"            # interest on the original principal, spread evenly
+    DECLINING = "declining"  # equal principal, interest on the outstanding balance
+    ANNUITY = "annuity"      # equal installments, interest on the outstanding balance
+
+class PenaltyType(str, Enum):
+    FLAT = "flat"              # penalty_value per overdue installment
+    PERCENTAGE = "percentage"  # penalty_value percent of the overdue installment
+
 class LoanProduct(Base):
     __tablename__ = "loan_products"
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     name = Column(String, nullable=False)
     interest_rate = Column(Numeric(5, 2), nullable=False)
     max_tenure_months = Column(Integer, nullable=False)
+    interest_method = Column(String, nullable=False, default=InterestMethod.FLAT.value, server_default=InterestMethod.FLAT.value)
     grace_period_days = Column(Integer, default=0)
-    penalty_type = Column(String, nullable=True)
+    penalty_type = Column(String, nullable=True) # A PenaltyType value; unset = no penalty
     penalty_value = Column(Numeric(10, 2), default=0.00)
-    tenant_id = Column(UUID(as_uuid=True), ForeignKey("tenants.id"), nullable=False)
+    tenant_id = Column(UUID(as_uuid=True), ForeignKey("tenants.id"), nullable=False, index=True)
     tenant = relationship("Tenant")
 
 class Loan(Base):
     __tablename__ = "loans"
+    __table_args__ = (
+        # Tenant-scoped status filters (dashboard counts, officer work queues)
+        Index("ix_loans_tenant_id_status", "tenant_id", "status"),
+        # High-water mark scans of the analytics mirror
+        Index("ix_loans_tenant_id_updated_at", "tenant_id", "updated_at"),
+        # Keyset pages of loan listings, newest application first
+        Index("ix_loans_tenant_id_applied_at_id", "tenant_id", "applied_at", "id"),
+        Index("ix_loans_client_id_applied_at_id", "client_id", "applied_at", "id"),
+    )
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     amount_requested = Column(Numeric(10, 2), nullable=False)
     tenure_months = Column(Integer, nullable=False)
@@ -40,9 +59,48 @@ class Loan(Base):
     loan_product_id = Column(UUID(as_uuid=True), ForeignKey("loan_products.id"), nullable=False)
     product = relationship("LoanProduct")
     
-    applied_at = Column(DateTime, default=datetime.utcnow)
+    applied_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     approved_at = Column(DateTime, nullable=True)
     disbursed_at = Column(DateTime, nullable=True)
+
+    # Balance and aging state, maintained by `aging_service` from the loan's
+    # installments and penalties (NULL until the loan is disbursed)
+    principal_outstanding = Column(Numeric(10, 2), nullable=True)
+    interest_outstanding = Column(Numeric(10, 2), nullable=True)
+    penalties_outstanding = Column(Numeric(10, 2), nullable=True)
+    next_due_date = Column(Date, nullable=True) # Oldest unpaid installment; NULL once nothing is due
+    days_past_due = Column(Integer, nullable=False, default=0, server_default="0")
+    aged_on = Column(Date, nullable=True) # The date days_past_due was computed for
+    # Running payment totals, maintained by `allocation_service` with each repayment
+    total_paid = Column(Numeric(12, 2), nullable=False, default=0, server_default="0")
+    last_payment_at = Column(DateTime, nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
     
     tenant_id = Column(UUID(as_uuid=True), ForeignKey("tenants.id"), nullable=False)
-    tenant = relationship("Tenant")
\ No newline at end of file
+    tenant = relationship("Tenant")
+
+class AgingBucket(str, Enum):
+    CURRENT = "current"
+    DPD_1_30 = "1-30"
+    DPD_31_60 = "31-60"
+    DPD_61_90 = "61-90"
+    DPD_91_PLUS = "91+"
+
+class PortfolioAging(Base):
+    """
+    Outstanding principal of active loans per product, officer and aging
+    bucket. Maintained incrementally by `aging_service` on disbursement and
+    repayment and rebuilt by the nightly sweep, so portfolio-at-risk reports
+    read a handful of rows instead of the repayment schedules.
+    """
+    __tablename__ = "portfolio_aging"
+    tenant_id = Column(UUID(as_uuid=True), ForeignKey("tenants.id"), primary_key=True)
+    loan_product_id = Column(UUID(as_uuid=True), ForeignKey("loan_products.id"), primary_key=True)
+    # Not a foreign key: loans without an officer are grouped under UNASSIGNED_OFFICER
+    officer_id = Column(UUID(as_uuid=True), primary_key=True)
+    bucket = Column(String, primary_key=True) # An AgingBucket value
+    loan_count = Column(Integer, nullable=False, default=0)
+    principal_outstanding = Column(Numeric(16, 2), nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+UNASSIGNED_OFFICER = uuid.UUID("ffffffff-ffff-ffff-ffff-ffffffffffff") # The RFC 9562 "max" UUID
\ No newline at end of file
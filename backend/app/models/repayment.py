@@ -1,6 +1,6 @@
 import uuid
 from datetime import datetime
-from sqlalchemy import Column, ForeignKey, Numeric, DateTime, Date, Enum as SQLAlchemyEnum
+from sqlalchemy import Column, ForeignKey, Numeric, DateTime, Date, Enum as SQLAlchemyEnum, Index, Integer, String, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from .base import Base
@@ -11,9 +11,27 @@ class RepaymentStatus(str, Enum):
     PAID = "paid"
     LATE = "late"
 
+class AllocationComponent(str, Enum):
+    PENALTY = "penalty"
+    INTEREST = "interest"
+    PRINCIPAL = "principal"
+    OVERPAYMENT = "overpayment" # Paid beyond everything the loan owes
+
 class RepaymentSchedule(Base):
     """Represents a single installment due for a loan."""
     __tablename__ = "repayment_schedules"
+    __table_args__ = (
+        # Installments of one loan by status, oldest due first
+        Index("ix_repayment_schedules_loan_id_status_due_date", "loan_id", "status", "due_date"),
+        # Tenant-wide overdue sweeps only ever look at unpaid installments
+        Index(
+            "ix_repayment_schedules_unpaid_tenant_id_due_date", "tenant_id", "due_date",
+            postgresql_where=text("status <> 'PAID'"),
+            sqlite_where=text("status <> 'PAID'"),
+        ),
+        # High-water mark scans of the analytics mirror
+        Index("ix_repayment_schedules_tenant_id_updated_at", "tenant_id", "updated_at"),
+    )
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     
     loan_id = Column(UUID(as_uuid=True), ForeignKey("loans.id"), nullable=False)
@@ -23,26 +41,88 @@ class RepaymentSchedule(Base):
     amount_due = Column(Numeric(10, 2), nullable=False)
     principal_due = Column(Numeric(10, 2), nullable=False)
     interest_due = Column(Numeric(10, 2), nullable=False)
+    # Allocated by `allocation_service`; the installment is PAID once both reach their due amounts
+    principal_paid = Column(Numeric(10, 2), nullable=False, default=0, server_default="0")
+    interest_paid = Column(Numeric(10, 2), nullable=False, default=0, server_default="0")
     status = Column(SQLAlchemyEnum(RepaymentStatus), default=RepaymentStatus.PENDING, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
     
     tenant_id = Column(UUID(as_uuid=True), ForeignKey("tenants.id"), nullable=False)
 
 class RepaymentTransaction(Base):
     """Records an actual payment made by a client."""
     __tablename__ = "repayment_transactions"
+    __table_args__ = (
+        Index("ix_repayment_transactions_tenant_id_transaction_date", "tenant_id", "transaction_date"),
+        Index("ix_repayment_transactions_tenant_id_created_at", "tenant_id", "created_at"),
+        # Idempotency key of statement imports; NULL (manual entries) never conflicts
+        Index("uq_repayment_transactions_tenant_id_reference", "tenant_id", "reference", unique=True),
+    )
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
 
-    loan_id = Column(UUID(as_uuid=True), ForeignKey("loans.id"), nullable=False)
+    loan_id = Column(UUID(as_uuid=True), ForeignKey("loans.id"), nullable=False, index=True)
     loan = relationship("Loan")
 
     schedule_id = Column(UUID(as_uuid=True), ForeignKey("repayment_schedules.id"), nullable=True)
     schedule = relationship("RepaymentSchedule")
 
     amount_paid = Column(Numeric(10, 2), nullable=False)
+    # Bank or mobile-money reference of a payment imported from a statement
+    reference = Column(String, nullable=True)
     transaction_date = Column(DateTime, default=datetime.utcnow, nullable=False)
+    # When the row was written (transaction_date may be backdated); rows are never updated
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
 
     # MFI staff member who recorded the payment
     recorded_by_user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
     recorder = relationship("User")
 
-    tenant_id = Column(UUID(as_uuid=True), ForeignKey("tenants.id"), nullable=False)
\ No newline at end of file
+    tenant_id = Column(UUID(as_uuid=True), ForeignKey("tenants.id"), nullable=False)
+
+class RepaymentAllocation(Base):
+    """The part of a repayment applied to one penalty, or to the interest or principal of one installment."""
+    __tablename__ = "repayment_allocations"
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    transaction_id = Column(UUID(as_uuid=True), ForeignKey("repayment_transactions.id"), nullable=False, index=True)
+    component = Column(String, nullable=False) # An AllocationComponent value
+    schedule_id = Column(UUID(as_uuid=True), ForeignKey("repayment_schedules.id"), nullable=True)
+    penalty_id = Column(UUID(as_uuid=True), ForeignKey("loan_penalties.id"), nullable=True)
+    amount = Column(Numeric(10, 2), nullable=False)
+    tenant_id = Column(UUID(as_uuid=True), ForeignKey("tenants.id"), nullable=False)
+
+class LoanPenalty(Base):
+    """
+    A late-payment penalty charged on an overdue installment. At most one
+    penalty per installment per period (the month it was assessed in), so
+    re-running the delinquency sweep never charges twice.
+    """
+    __tablename__ = "loan_penalties"
+    __table_args__ = (
+        Index("uq_loan_penalties_schedule_id_period", "schedule_id", "period", unique=True),
+    )
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+
+    schedule_id = Column(UUID(as_uuid=True), ForeignKey("repayment_schedules.id"), nullable=False)
+    schedule = relationship("RepaymentSchedule")
+    loan_id = Column(UUID(as_uuid=True), ForeignKey("loans.id"), nullable=False, index=True)
+
+    period = Column(Date, nullable=False) # First day of the assessment month
+    amount = Column(Numeric(10, 2), nullable=False)
+    amount_paid = Column(Numeric(10, 2), nullable=False, default=0, server_default="0")
+    transaction_id = Column(String, nullable=False) # The GL transaction that booked it
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    tenant_id = Column(UUID(as_uuid=True), ForeignKey("tenants.id"), nullable=False, index=True)
+
+class DelinquencySweep(Base):
+    """
+    Checkpoint of the nightly delinquency sweep: one row per tenant per
+    sweep date, written in the same transaction as the sweep itself.
+    Tenants that already have a row are skipped when a run is resumed.
+    """
+    __tablename__ = "delinquency_sweeps"
+    tenant_id = Column(UUID(as_uuid=True), ForeignKey("tenants.id"), primary_key=True)
+    as_of = Column(Date, primary_key=True)
+    installments_marked_late = Column(Integer, nullable=False, default=0)
+    penalties_charged = Column(Integer, nullable=False, default=0)
+    completed_at = Column(DateTime, default=datetime.utcnow, nullable=False)
@@ -0,0 +1,46 @@
+# backend/app/models/report.py
+
+import uuid
+from datetime import datetime
+from enum import Enum
+from sqlalchemy import Column, String, ForeignKey, DateTime, BigInteger, JSON, Enum as SQLAlchemyEnum, Index
+from sqlalchemy.dialects.postgresql import UUID
+from .base import Base
+
+class ReportKind(str, Enum):
+    LOAN_EXPORT = "loan_export"
+    TRIAL_BALANCE = "trial_balance"    # optionally as of a date
+    GENERAL_LEDGER = "general_ledger"  # optionally for a date range
+
+class ReportJobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    EXPIRED = "expired" # Succeeded, but the artifact was removed by the retention policy
+
+class ReportJob(Base):
+    """A report generated in the background; the result is a file on local disk."""
+    __tablename__ = "report_jobs"
+    __table_args__ = (
+        # The dispatcher's queue scan and per-tenant running counts
+        Index("ix_report_jobs_status_created_at", "status", "created_at"),
+        Index("ix_report_jobs_tenant_id_status", "tenant_id", "status"),
+    )
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    kind = Column(String, nullable=False) # A ReportKind value
+    format = Column(String, nullable=False) # "csv" or "xlsx"
+    parameters = Column(JSON, nullable=False, default=dict)
+    status = Column(SQLAlchemyEnum(ReportJobStatus), default=ReportJobStatus.QUEUED, nullable=False)
+    error = Column(String, nullable=True)
+
+    artifact_path = Column(String, nullable=True)
+    artifact_size = Column(BigInteger, nullable=True)
+
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+    expires_at = Column(DateTime, nullable=True)
+
+    requested_by_user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
+    tenant_id = Column(UUID(as_uuid=True), ForeignKey("tenants.id"), nullable=False)
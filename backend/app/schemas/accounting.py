@@ -1,7 +1,90 @@
-from pydantic import BaseModel
+from datetime import date, datetime
+from decimal import ROUND_HALF_UP, Decimal
+from typing import List, Optional
+from uuid import UUID
+
+from pydantic import BaseModel, Field, field_validator, model_validator
 
 class TrialBalanceEntry(BaseModel):
     account_code: str
     account_name: str
     total_debits: float
-    total_credits: float
\ No newline at end of file
+    total_credits: float
+
+class StatementLine(BaseModel):
+    account_code: str
+    account_name: str
+    # In the account's normal direction: debit for assets and expenses, credit otherwise
+    amount: float
+
+class BalanceSheet(BaseModel):
+    as_of: date
+    assets: List[StatementLine]
+    liabilities: List[StatementLine]
+    equity: List[StatementLine]
+    # Revenue less expenses to date, not yet closed into an equity account
+    current_earnings: float
+    total_assets: float
+    total_liabilities: float
+    total_equity: float
+    total_liabilities_and_equity: float
+
+class IncomeStatement(BaseModel):
+    start_date: date
+    end_date: date
+    revenue: List[StatementLine]
+    expenses: List[StatementLine]
+    total_revenue: float
+    total_expenses: float
+    net_income: float
+
+class PeriodClose(BaseModel):
+    # Last day of the month to close; defaults to the end of last month
+    period_end: Optional[date] = None
+
+class ClosedPeriod(BaseModel):
+    period_end: date
+    closed_at: datetime
+    closed_by_user_id: Optional[UUID] = None
+
+    class Config:
+        from_attributes = True
+
+class LedgerEntry(BaseModel):
+    id: UUID
+    transaction_date: datetime
+    transaction_id: str
+    account_code: str
+    account_name: str
+    description: str
+    debit: float
+    credit: float
+
+    class Config:
+        from_attributes = True
+
+class JournalLine(BaseModel):
+    """One leg of a journal entry: a debit or a credit to a single account."""
+    account_code: str
+    debit: Decimal = Field(default=Decimal("0.00"), ge=0)
+    credit: Decimal = Field(default=Decimal("0.00"), ge=0)
+
+    @field_validator("debit", "credit")
+    @classmethod
+    def to_cents(cls, value: Decimal) -> Decimal:
+        # The ledger stores cents; rounding here keeps each entry's balance check exact
+        return value.quantize(Decimal("0.01"), ROUND_HALF_UP)
+
+    @model_validator(mode="after")
+    def one_sided(self):
+        if (self.debit > 0) == (self.credit > 0):
+            raise ValueError("A journal line must have either a debit or a credit amount, not both.")
+        return self
+
+class JournalEntry(BaseModel):
+    """A balanced, multi-leg journal entry posted as one GL transaction."""
+    description: str
+    lines: List[JournalLine] = Field(min_length=2)
+    transaction_date: Optional[datetime] = None
+    # Generated when omitted; groups the entry's ledger rows
+    transaction_id: Optional[str] = None
@@ -1,12 +1,16 @@
 import uuid
-from pydantic import BaseModel
-from datetime import datetime
-from ..models.loan import LoanStatus
+from pydantic import BaseModel, Field
+from datetime import date, datetime
+from typing import List, Optional
+from ..models.loan import LoanStatus, InterestMethod
 
 class LoanProductBase(BaseModel):
     name: str
     interest_rate: float
     max_tenure_months: int
+    interest_method: InterestMethod = InterestMethod.FLAT
+    class Config:
+        use_enum_values = True
 
 class LoanProductCreate(LoanProductBase):
     pass
@@ -34,5 +38,45 @@ class Loan(LoanBase):
     client_id: uuid.UUID
     loan_product_id: uuid.UUID
     applied_at: datetime
+    # Maintained on the loan with each disbursement, repayment and sweep (None until disbursed)
+    principal_outstanding: Optional[float] = None
+    interest_outstanding: Optional[float] = None
+    penalties_outstanding: Optional[float] = None
+    next_due_date: Optional[date] = None
+    days_past_due: int = 0
+    total_paid: float = 0
+    last_payment_at: Optional[datetime] = None
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class LoanSummary(BaseModel):
+    """A row of the staff loan listing."""
+    id: uuid.UUID
+    client_id: uuid.UUID
+    loan_product_id: uuid.UUID
+    assigned_officer_id: Optional[uuid.UUID] = None
+    status: LoanStatus
+    amount_requested: float
+    tenure_months: int
+    applied_at: datetime
+    disbursed_at: Optional[datetime] = None
+    principal_outstanding: Optional[float] = None
+    next_due_date: Optional[date] = None
+    days_past_due: int = 0
+    total_paid: float = 0
+    class Config:
+        from_attributes = True
+
+class LoanDisbursementBatch(BaseModel):
+    loan_ids: List[uuid.UUID] = Field(min_length=1, max_length=1000)
+
+class LoanDisbursementResult(BaseModel):
+    loan_id: uuid.UUID
+    outcome: str  # "disbursed", "skipped" or "failed"
+    detail: Optional[str] = None
+
+class LoanDisbursementReport(BaseModel):
+    disbursed: int
+    skipped: int
+    failed: int
+    results: List[LoanDisbursementResult]
@@ -1,16 +1,35 @@
 import uuid
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import date
+from typing import List, Optional
 from ..models.repayment import RepaymentStatus
 
 class RepaymentRecord(BaseModel):
-    schedule_id: uuid.UUID
-    amount_paid: float
+    # Informational: payments are allocated oldest first, whichever installment is named
+    schedule_id: Optional[uuid.UUID] = None
+    amount_paid: float = Field(ge=0.01)
 
 class RepaymentSchedule(BaseModel):
     id: uuid.UUID
     due_date: date
     amount_due: float
+    principal_paid: float
+    interest_paid: float
     status: RepaymentStatus
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class RepaymentImportLine(BaseModel):
+    line: int  # Row number in the uploaded file, header included
+    reference: Optional[str] = None
+    loan_id: Optional[uuid.UUID] = None
+    amount: Optional[float] = None
+    outcome: str  # "accepted", "duplicate" or "rejected"
+    detail: Optional[str] = None
+
+class RepaymentImportReport(BaseModel):
+    accepted: int
+    duplicates: int
+    rejected: int
+    amount_accepted: float
+    lines: List[RepaymentImportLine]
@@ -1,8 +1,110 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, model_validator
+from typing import List, Literal, Optional
+from uuid import UUID
+from datetime import date, datetime
+from ..models.report import ReportJobStatus, ReportKind
 
 class DashboardMetrics(BaseModel):
     total_clients: int
     active_loans: int
     total_disbursed: float
     total_repaid: float
-    portfolio_at_risk_par30: float
\ No newline at end of file
+    portfolio_at_risk_par30: float
+
+class AgingBucketTotal(BaseModel):
+    bucket: str
+    loan_count: int
+    principal_outstanding: float
+
+class PortfolioAtRiskSummary(BaseModel):
+    loan_count: int
+    principal_outstanding: float
+    # Shares (0-1) of outstanding principal more than 1/30/60/90 days past due
+    par1: float
+    par30: float
+    par60: float
+    par90: float
+    buckets: List[AgingBucketTotal]
+
+class PortfolioAtRiskGroup(PortfolioAtRiskSummary):
+    id: Optional[UUID] = None # None groups loans without an assigned officer
+    name: Optional[str] = None
+
+class PortfolioAtRisk(PortfolioAtRiskSummary):
+    by_product: List[PortfolioAtRiskGroup]
+    by_officer: List[PortfolioAtRiskGroup]
+
+class ReportJobCreate(BaseModel):
+    kind: ReportKind
+    format: Literal["csv", "xlsx"] = "xlsx"
+    as_of: Optional[date] = None # trial_balance only; default is the current balances
+    start_date: Optional[date] = None # general_ledger only
+    end_date: Optional[date] = None # general_ledger only
+
+    @model_validator(mode="after")
+    def check_parameters(self):
+        if self.as_of is not None and self.kind != ReportKind.TRIAL_BALANCE:
+            raise ValueError("as_of applies to trial_balance reports only.")
+        if (self.start_date or self.end_date) and self.kind != ReportKind.GENERAL_LEDGER:
+            raise ValueError("start_date and end_date apply to general_ledger reports only.")
+        if self.start_date and self.end_date and self.start_date > self.end_date:
+            raise ValueError("start_date must not be after end_date.")
+        return self
+
+class ReportJob(BaseModel):
+    id: UUID
+    kind: ReportKind
+    format: str
+    parameters: dict
+    status: ReportJobStatus
+    error: Optional[str] = None
+    artifact_size: Optional[int] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    expires_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+class VintagePoint(BaseModel):
+    vintage: str # Disbursement month, YYYY-MM
+    months_on_book: int
+    loans: int
+    disbursed: float
+    collected: float
+    cumulative_collected: float
+    cumulative_collected_ratio: float
+
+class VintageCurves(BaseModel):
+    mirrored_at: datetime
+    rows: List[VintagePoint]
+
+class ProductRepaymentBehavior(BaseModel):
+    loan_product_id: UUID
+    product_name: Optional[str] = None
+    loans: int
+    installments_due: int
+    installments_paid: int
+    paid_on_time: int
+    installments_overdue: int
+    on_time_rate: float
+    avg_days_late: Optional[float] = None
+    amount_due: float
+
+class RepaymentBehavior(BaseModel):
+    mirrored_at: datetime
+    rows: List[ProductRepaymentBehavior]
+
+class OfficerProductivityRow(BaseModel):
+    officer_id: Optional[UUID] = None # None = loans without an assigned officer
+    loans_disbursed: int
+    principal_disbursed: float
+    active_loans: int
+    principal_outstanding: float
+    par30_outstanding: float
+    collected: float
+
+class OfficerProductivity(BaseModel):
+    mirrored_at: datetime
+    rows: List[OfficerProductivityRow]
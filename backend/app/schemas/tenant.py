@@ -44,4 +44,12 @@ class TenantSettings(TenantSettingsUpdate):
     id: uuid.UUID
     tenant_id: uuid.UUID
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class Tenant(BaseModel):
+    """A detached, cacheable view of a tenant used for request routing."""
+    id: uuid.UUID
+    name: str
+    subdomain: str
+    class Config:
+        from_attributes = True
@@ -1,25 +1,70 @@
 """
 Service for handling all double-entry accounting logic.
 """
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, object_session
+from sqlalchemy import delete, event, func, insert, literal, select, text
+from sqlalchemy.dialects import postgresql, sqlite
+from datetime import datetime
 from decimal import Decimal
+from typing import Iterable, List
+import csv
+import io
 import uuid
 from .. import models
+from ..schemas import accounting as accounting_schema
+from ..core.cache import TTLCache, history_values, register_invalidator
+from ..core.config import settings
+from ..core.database import snapshot_session
+from . import period_service
 
 # Standard account codes. A real app would allow tenants to configure these.
 CASH_ACCOUNT = "1010"
 LOANS_RECEIVABLE_ACCOUNT = "1100"
+PENALTIES_RECEIVABLE_ACCOUNT = "1110"
 INTEREST_REVENUE_ACCOUNT = "4010"
+PENALTY_REVENUE_ACCOUNT = "4020"
+CLIENT_SAVINGS_ACCOUNT = "2010"
 
-def get_account(db: Session, account_code: str, tenant_id: uuid.UUID) -> models.accounting.ChartOfAccount:
-    """Fetches an account from the Chart of Accounts."""
-    account = db.query(models.accounting.ChartOfAccount).filter(
-        models.accounting.ChartOfAccount.account_code == account_code,
-        models.accounting.ChartOfAccount.tenant_id == tenant_id
-    ).first()
-    if not account:
-        raise Exception(f"Accounting misconfiguration: Account '{account_code}' not found for tenant.")
-    return account
+# tenant id -> {account code: account id}. Codes are effectively static, so
+# postings resolve them from here instead of querying chart_of_accounts.
+_account_ids = TTLCache(maxsize=settings.COA_CACHE_MAXSIZE, ttl=settings.COA_CACHE_TTL_SECONDS)
+
+def _load_chart(db: Session, tenant_id: uuid.UUID) -> dict[str, uuid.UUID]:
+    chart = models.accounting.ChartOfAccount
+    rows = db.execute(select(chart.account_code, chart.id).where(chart.tenant_id == tenant_id))
+    codes = {code: account_id for code, account_id in rows}
+    _account_ids.set(tenant_id, codes)
+    return codes
+
+def get_account_ids(db: Session, tenant_id: uuid.UUID, account_codes: Iterable[str]) -> dict[str, uuid.UUID]:
+    """
+    Resolves account codes to account ids for a tenant. A cache miss loads
+    the tenant's whole chart in one query; a code missing from a cached
+    chart triggers one reload before it is reported as misconfigured.
+    """
+    account_codes = list(account_codes)
+    codes = _account_ids.get(tenant_id)
+    if codes is None or not codes.keys() >= set(account_codes):
+        codes = _load_chart(db, tenant_id)
+    missing = [code for code in account_codes if code not in codes]
+    if missing:
+        raise Exception(f"Accounting misconfiguration: Account '{missing[0]}' not found for tenant.")
+    return {code: codes[code] for code in account_codes}
+
+def invalidate_chart(tenant_id: uuid.UUID) -> None:
+    """Drops the cached chart of a tenant. Done automatically after commits that change it."""
+    _account_ids.invalidate(tenant_id)
+
+def account_cache_stats() -> dict:
+    return _account_ids.stats()
+
+class UnbalancedJournalError(ValueError):
+    """Raised when a journal entry's debits and credits do not match."""
+
+# Column order of ledger rows written by `post_journal_batch` (also the COPY column list)
+_LEDGER_COLUMNS = (
+    "id", "transaction_id", "transaction_date", "created_at", "description", "account_id", "debit", "credit", "tenant_id"
+)
 
 def post_transaction(
     db: Session, 
@@ -28,34 +73,207 @@ def post_transaction(
     debit_account_code: str,
     credit_account_code: str,
     amount: Decimal
-):
+) -> str:
     """
     Posts a balanced, two-legged transaction to the General Ledger.
-    This is the heart of the accounting system.
+    A convenience wrapper over `post_journal_batch`; returns the transaction id.
     """
-    transaction_id = str(uuid.uuid4())
-    debit_account = get_account(db, debit_account_code, tenant_id)
-    credit_account = get_account(db, credit_account_code, tenant_id)
-
-    # Create Debit Entry
-    debit_entry = models.accounting.GeneralLedgerEntry(
-        transaction_id=transaction_id,
+    entry = accounting_schema.JournalEntry(
         description=description,
-        account_id=debit_account.id,
-        debit=amount,
-        credit=Decimal("0.00"),
-        tenant_id=tenant_id
+        lines=[
+            accounting_schema.JournalLine(account_code=debit_account_code, debit=amount),
+            accounting_schema.JournalLine(account_code=credit_account_code, credit=amount),
+        ],
     )
-    # Create Credit Entry
-    credit_entry = models.accounting.GeneralLedgerEntry(
-        transaction_id=transaction_id,
-        description=description,
-        account_id=credit_account.id,
-        debit=Decimal("0.00"),
-        credit=amount,
-        tenant_id=tenant_id
+    return post_journal_batch(db, tenant_id, [entry])[0]
+
+def post_journal_batch(
+    db: Session,
+    tenant_id: uuid.UUID,
+    entries: List[accounting_schema.JournalEntry],
+) -> List[str]:
+    """
+    Posts many balanced, multi-leg journal entries in one go.
+    This is the heart of the accounting system.
+
+    All entries are validated in memory before anything is written; one
+    unbalanced entry, or one dated in a closed period, rejects the whole batch. Account codes are resolved
+    with at most one query, the ledger rows are written as one multi-row
+    INSERT (or COPY on Postgres for large batches), and the running
+    account balances are updated once per touched account.
+    Returns the transaction id of each entry, in order. The caller commits.
+    """
+    account_codes = {line.account_code for entry in entries for line in entry.lines}
+    account_ids = get_account_ids(db, tenant_id, account_codes)
+
+    now = datetime.utcnow()
+    rows = []
+    deltas: dict[uuid.UUID, tuple[Decimal, Decimal]] = {}
+    transaction_ids = []
+    for index, entry in enumerate(entries):
+        total_debits = sum((line.debit for line in entry.lines), Decimal("0"))
+        total_credits = sum((line.credit for line in entry.lines), Decimal("0"))
+        if total_debits != total_credits:
+            raise UnbalancedJournalError(
+                f"Journal entry {index} ('{entry.description}') is unbalanced: "
+                f"debits {total_debits} != credits {total_credits}."
+            )
+        transaction_id = entry.transaction_id or str(uuid.uuid4())
+        transaction_ids.append(transaction_id)
+        for line in entry.lines:
+            account_id = account_ids[line.account_code]
+            rows.append({
+                "id": uuid.uuid4(),
+                "transaction_id": transaction_id,
+                "transaction_date": entry.transaction_date or now,
+                "created_at": now,
+                "description": entry.description,
+                "account_id": account_id,
+                "debit": line.debit,
+                "credit": line.credit,
+                "tenant_id": tenant_id,
+            })
+            debit, credit = deltas.get(account_id, (Decimal("0"), Decimal("0")))
+            deltas[account_id] = (debit + line.debit, credit + line.credit)
+
+    if not rows:
+        return transaction_ids
+    period_service.ensure_open(db, tenant_id, (entry.transaction_date or now for entry in entries))
+    dialect = db.get_bind().dialect
+    if dialect.name == "postgresql" and dialect.driver in ("psycopg2", "psycopg") \
+            and len(rows) >= settings.JOURNAL_COPY_THRESHOLD:
+        _copy_ledger_rows(db, rows)
+    else:
+        # executemany; SQLAlchemy's insertmanyvalues renders it as batched multi-row INSERTs
+        db.execute(insert(models.accounting.GeneralLedgerEntry.__table__), rows)
+    apply_balance_deltas(db, tenant_id, deltas)
+    return transaction_ids
+
+def _copy_ledger_rows(db: Session, rows: List[dict]) -> None:
+    """Streams ledger rows into Postgres with COPY on the session's own connection."""
+    dbapi_connection = db.connection().connection.dbapi_connection
+    copy_sql = f"COPY general_ledger_entries ({', '.join(_LEDGER_COLUMNS)}) FROM STDIN"
+    with dbapi_connection.cursor() as cursor:
+        if hasattr(cursor, "copy_expert"):
+            # psycopg2: feed a CSV buffer
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            for row in rows:
+                writer.writerow([row[column] for column in _LEDGER_COLUMNS])
+            buffer.seek(0)
+            cursor.copy_expert(f"{copy_sql} WITH (FORMAT csv)", buffer)
+        else:
+            # psycopg 3: rows are adapted by the driver
+            with cursor.copy(copy_sql) as copy:
+                for row in rows:
+                    copy.write_row([row[column] for column in _LEDGER_COLUMNS])
+
+def _upsert(db: Session):
+    """The dialect's INSERT that supports ON CONFLICT."""
+    return postgresql.insert if db.get_bind().dialect.name == "postgresql" else sqlite.insert
+
+def apply_balance_deltas(db: Session, tenant_id: uuid.UUID, deltas: dict[uuid.UUID, tuple[Decimal, Decimal]]):
+    """
+    Adds `(debit, credit)` deltas to the running balances of the given accounts.
+
+    Each account is one atomic `INSERT .. ON CONFLICT DO UPDATE`, executed in
+    the caller's transaction so balances commit or roll back together with
+    the ledger entries. Accounts are updated in a fixed order so concurrent
+    postings touching the same accounts cannot deadlock.
+    """
+    balance = models.accounting.AccountBalance
+    now = datetime.utcnow()
+    for account_id in sorted(deltas, key=str):
+        debit, credit = deltas[account_id]
+        stmt = _upsert(db)(balance).values(
+            account_id=account_id, tenant_id=tenant_id, total_debits=debit, total_credits=credit, updated_at=now
+        )
+        db.execute(stmt.on_conflict_do_update(
+            index_elements=[balance.account_id],
+            set_={
+                "total_debits": balance.total_debits + stmt.excluded.total_debits,
+                "total_credits": balance.total_credits + stmt.excluded.total_credits,
+                "updated_at": stmt.excluded.updated_at,
+            },
+        ))
+
+def _ledger_totals(tenant_id: uuid.UUID | None):
+    entry = models.accounting.GeneralLedgerEntry
+    stmt = select(
+        entry.account_id,
+        entry.tenant_id,
+        func.coalesce(func.sum(entry.debit), 0).label("total_debits"),
+        func.coalesce(func.sum(entry.credit), 0).label("total_credits"),
+    ).group_by(entry.account_id, entry.tenant_id)
+    if tenant_id is not None:
+        stmt = stmt.where(entry.tenant_id == tenant_id)
+    return stmt
+
+def verify_account_balances(db: Session, tenant_id: uuid.UUID | None = None) -> list[dict]:
+    """
+    Recomputes every balance from the ledger and returns the accounts whose
+    stored totals drifted, as dicts of expected vs. stored totals.
+    """
+    balance = models.accounting.AccountBalance
+    stored_stmt = select(balance.account_id, balance.tenant_id, balance.total_debits, balance.total_credits)
+    if tenant_id is not None:
+        stored_stmt = stored_stmt.where(balance.tenant_id == tenant_id)
+    # Ledger and balances must be read from the same snapshot
+    with snapshot_session(db) as snapshot:
+        expected = {row.account_id: row for row in snapshot.execute(_ledger_totals(tenant_id))}
+        stored = {row.account_id: row for row in snapshot.execute(stored_stmt)}
+
+    drift = []
+    for account_id in expected.keys() | stored.keys():
+        want, have = expected.get(account_id), stored.get(account_id)
+        want_totals = (Decimal(want.total_debits), Decimal(want.total_credits)) if want else (Decimal(0), Decimal(0))
+        have_totals = (Decimal(have.total_debits), Decimal(have.total_credits)) if have else (Decimal(0), Decimal(0))
+        if want_totals != have_totals:
+            drift.append({
+                "account_id": account_id,
+                "tenant_id": (want or have).tenant_id,
+                "ledger_debits": want_totals[0],
+                "ledger_credits": want_totals[1],
+                "stored_debits": have_totals[0],
+                "stored_credits": have_totals[1],
+            })
+    return drift
+
+def rebuild_account_balances(db: Session, tenant_id: uuid.UUID | None = None) -> int:
+    """
+    Replaces the stored balances with totals recomputed from the ledger and
+    returns the number of balance rows written. The caller commits.
+    """
+    balance = models.accounting.AccountBalance
+    if db.get_bind().dialect.name == "postgresql":
+        # Blocks concurrent postings (their balance upserts) until we commit,
+        # so no delta can land between the recompute and the swap.
+        db.execute(text("LOCK TABLE account_balances IN SHARE ROW EXCLUSIVE MODE"))
+    clear = delete(balance)
+    if tenant_id is not None:
+        clear = clear.where(balance.tenant_id == tenant_id)
+    db.execute(clear)
+    totals = _ledger_totals(tenant_id).subquery()
+    result = db.execute(
+        balance.__table__.insert().from_select(
+            ["account_id", "tenant_id", "total_debits", "total_credits", "updated_at"],
+            select(
+                totals.c.account_id, totals.c.tenant_id, totals.c.total_debits, totals.c.total_credits,
+                literal(datetime.utcnow()),
+            ),
+        )
     )
+    return result.rowcount
+
+# --- Automatic invalidation on chart-of-accounts changes ---
+# Applied only once the transaction commits (see core.cache.register_invalidator).
+
+_queue_charts = register_invalidator("stale_charts", invalidate_chart)
 
-    db.add(debit_entry)
-    db.add(credit_entry)
-    # The commit will happen in the calling service function
\ No newline at end of file
+@event.listens_for(models.accounting.ChartOfAccount, "after_insert")
+@event.listens_for(models.accounting.ChartOfAccount, "after_update")
+@event.listens_for(models.accounting.ChartOfAccount, "after_delete")
+def _queue_chart_invalidation(mapper, connection, target):
+    session = object_session(target)
+    if session is not None:
+        _queue_charts(session, history_values(target, "tenant_id"))
@@ -0,0 +1,370 @@
+# backend/app/services/aging_service.py
+
+"""
+Loan aging engine: per-loan balances and days past due, and the
+`portfolio_aging` aggregate that portfolio-at-risk (PAR) reports read.
+
+Each disbursed loan carries `principal_outstanding` and
+`interest_outstanding` (scheduled amounts not yet paid, net of partial
+payments), `penalties_outstanding`, `next_due_date` (its oldest unpaid
+installment) and `days_past_due` (days since that installment fell due),
+so loan lists and the client portal read them without aggregating
+schedules. `portfolio_aging` sums those loans per product, officer and
+aging bucket:
+
+  - `refresh_loans` recomputes a few loans and moves their contribution
+    between aggregate rows with upserts. Disbursements and repayments call
+    it, so the cost is per touched loan.
+  - `rebuild_tenant_aging` recomputes every active loan of a tenant and
+    rewrites its aggregate rows. The nightly sweep calls it, which ages
+    loans by one more day and repairs any drift.
+
+A loan counts in the aggregate while it is disbursed and its stored
+`principal_outstanding` is positive. `verify_loan_balances` recomputes the
+stored fields, and the payment totals `allocation_service` keeps, from the
+source tables and reports any drift.
+"""
+from collections import defaultdict
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Iterable, List, Optional
+import uuid
+
+from sqlalchemy import and_, case, delete, func, insert, or_, select, update
+from sqlalchemy.orm import Session
+
+from .. import models
+from ..core.database import snapshot_session
+from ..schemas import reporting as reporting_schema
+from . import accounting_service
+
+# Upper bound (inclusive) of days past due for each bucket, in order
+_BUCKET_LIMITS = [
+    (0, models.AgingBucket.CURRENT),
+    (30, models.AgingBucket.DPD_1_30),
+    (60, models.AgingBucket.DPD_31_60),
+    (90, models.AgingBucket.DPD_61_90),
+]
+# PAR<n>: share of outstanding principal in loans more than n days past due
+PAR_BUCKETS = {
+    1: [models.AgingBucket.DPD_1_30, models.AgingBucket.DPD_31_60, models.AgingBucket.DPD_61_90, models.AgingBucket.DPD_91_PLUS],
+    30: [models.AgingBucket.DPD_31_60, models.AgingBucket.DPD_61_90, models.AgingBucket.DPD_91_PLUS],
+    60: [models.AgingBucket.DPD_61_90, models.AgingBucket.DPD_91_PLUS],
+    90: [models.AgingBucket.DPD_91_PLUS],
+}
+
+def bucket_for(days_past_due: int) -> models.AgingBucket:
+    for limit, bucket in _BUCKET_LIMITS:
+        if days_past_due <= limit:
+            return bucket
+    return models.AgingBucket.DPD_91_PLUS
+
+def _as_date(value):
+    if isinstance(value, str):  # SQLite returns MIN() of a date column as text
+        return date.fromisoformat(value[:10])
+    return value
+
+def _positions(db: Session, as_of: date, *criteria) -> List[dict]:
+    """
+    Stored and freshly computed aging state of the loans matching `criteria`,
+    from one grouped query over their unpaid installments.
+    """
+    loan, schedule, penalty = models.Loan, models.RepaymentSchedule, models.LoanPenalty
+    unpaid_penalties = (
+        select(func.coalesce(func.sum(penalty.amount - penalty.amount_paid), 0))
+        .where(penalty.loan_id == loan.id)
+        .scalar_subquery()
+    )
+    rows = db.execute(
+        select(
+            loan.id, loan.tenant_id, loan.loan_product_id, loan.assigned_officer_id, loan.status,
+            loan.principal_outstanding, loan.days_past_due,
+            func.coalesce(func.sum(schedule.principal_due - schedule.principal_paid), 0).label("unpaid_principal"),
+            func.coalesce(func.sum(schedule.interest_due - schedule.interest_paid), 0).label("unpaid_interest"),
+            unpaid_penalties.label("unpaid_penalties"),
+            func.min(schedule.due_date).label("oldest_unpaid"),
+        )
+        .outerjoin(schedule, and_(
+            schedule.loan_id == loan.id, schedule.status != models.RepaymentStatus.PAID
+        ))
+        .where(*criteria)
+        .group_by(
+            loan.id, loan.tenant_id, loan.loan_product_id, loan.assigned_officer_id, loan.status,
+            loan.principal_outstanding, loan.days_past_due,
+        )
+    ).all()
+    positions = []
+    for row in rows:
+        active = row.status == models.LoanStatus.DISBURSED
+        oldest = _as_date(row.oldest_unpaid)
+        positions.append({
+            "id": row.id,
+            "tenant_id": row.tenant_id,
+            "key": (row.loan_product_id, row.assigned_officer_id or models.loan.UNASSIGNED_OFFICER),
+            "old_outstanding": Decimal(row.principal_outstanding or 0),
+            "old_days_past_due": row.days_past_due or 0,
+            "outstanding": Decimal(row.unpaid_principal) if active else Decimal("0"),
+            "interest_outstanding": Decimal(row.unpaid_interest) if active else Decimal("0"),
+            "penalties_outstanding": Decimal(row.unpaid_penalties) if active else Decimal("0"),
+            "next_due_date": oldest if active else None,
+            "days_past_due": max((as_of - oldest).days, 0) if active and oldest else 0,
+        })
+    return positions
+
+def _store_positions(db: Session, positions: List[dict], as_of: date) -> None:
+    if positions:
+        db.execute(update(models.Loan), [
+            {
+                "id": p["id"], "principal_outstanding": p["outstanding"],
+                "interest_outstanding": p["interest_outstanding"], "penalties_outstanding": p["penalties_outstanding"],
+                "next_due_date": p["next_due_date"], "days_past_due": p["days_past_due"], "aged_on": as_of,
+            }
+            for p in positions
+        ])
+
+def _apply_aging_deltas(db: Session, tenant_id: uuid.UUID, deltas: dict) -> None:
+    """Adds `(loan_count, principal)` deltas to aggregate rows, in a fixed order to avoid deadlocks."""
+    aging = models.PortfolioAging
+    now = datetime.utcnow()
+    for key in sorted(deltas, key=lambda k: (str(k[0]), str(k[1]), k[2])):
+        count, principal = deltas[key]
+        if not count and not principal:
+            continue
+        product_id, officer_id, bucket = key
+        stmt = accounting_service._upsert(db)(aging).values(
+            tenant_id=tenant_id, loan_product_id=product_id, officer_id=officer_id, bucket=bucket,
+            loan_count=count, principal_outstanding=principal, updated_at=now,
+        )
+        db.execute(stmt.on_conflict_do_update(
+            index_elements=[aging.tenant_id, aging.loan_product_id, aging.officer_id, aging.bucket],
+            set_={
+                "loan_count": aging.loan_count + stmt.excluded.loan_count,
+                "principal_outstanding": aging.principal_outstanding + stmt.excluded.principal_outstanding,
+                "updated_at": stmt.excluded.updated_at,
+            },
+        ))
+
+def refresh_loans(db: Session, loan_ids: Iterable[uuid.UUID], as_of: Optional[date] = None) -> None:
+    """
+    Recomputes the aging state of the given loans and moves their
+    contribution in `portfolio_aging` accordingly. Call after flushing the
+    schedule changes; runs in the caller's transaction.
+    """
+    loan_ids = list(loan_ids)
+    if not loan_ids:
+        return
+    as_of = as_of or date.today()
+    positions = _positions(db, as_of, models.Loan.id.in_(loan_ids))
+    deltas_by_tenant: dict = defaultdict(lambda: defaultdict(lambda: [0, Decimal("0")]))
+    for p in positions:
+        deltas = deltas_by_tenant[p["tenant_id"]]
+        if p["old_outstanding"] > 0:
+            delta = deltas[(*p["key"], bucket_for(p["old_days_past_due"]).value)]
+            delta[0] -= 1
+            delta[1] -= p["old_outstanding"]
+        if p["outstanding"] > 0:
+            delta = deltas[(*p["key"], bucket_for(p["days_past_due"]).value)]
+            delta[0] += 1
+            delta[1] += p["outstanding"]
+    _store_positions(db, positions, as_of)
+    for tenant_id, deltas in deltas_by_tenant.items():
+        _apply_aging_deltas(db, tenant_id, deltas)
+
+def rebuild_tenant_aging(db: Session, tenant_id: uuid.UUID, as_of: Optional[date] = None) -> int:
+    """
+    Recomputes every active loan of a tenant as of `as_of` and rewrites its
+    `portfolio_aging` rows from scratch. Returns the number of loans aged.
+    """
+    as_of = as_of or date.today()
+    loan = models.Loan
+    positions = _positions(
+        db, as_of, loan.tenant_id == tenant_id,
+        or_(loan.status == models.LoanStatus.DISBURSED, loan.principal_outstanding > 0),
+    )
+    _store_positions(db, positions, as_of)
+
+    totals: dict = defaultdict(lambda: [0, Decimal("0")])
+    for p in positions:
+        if p["outstanding"] > 0:
+            total = totals[(*p["key"], bucket_for(p["days_past_due"]).value)]
+            total[0] += 1
+            total[1] += p["outstanding"]
+    db.execute(delete(models.PortfolioAging).where(models.PortfolioAging.tenant_id == tenant_id))
+    now = datetime.utcnow()
+    if totals:
+        db.execute(insert(models.PortfolioAging.__table__), [
+            {
+                "tenant_id": tenant_id, "loan_product_id": product_id, "officer_id": officer_id, "bucket": bucket,
+                "loan_count": count, "principal_outstanding": principal, "updated_at": now,
+            }
+            for (product_id, officer_id, bucket), (count, principal) in totals.items()
+        ])
+    return len(positions)
+
+# --- Consistency check of the denormalized loan fields ---
+
+def _payment_totals(tenant_id: uuid.UUID | None):
+    transaction = models.RepaymentTransaction
+    stmt = select(
+        transaction.loan_id,
+        func.sum(transaction.amount_paid).label("total_paid"),
+        func.max(transaction.transaction_date).label("last_payment_at"),
+    ).group_by(transaction.loan_id)
+    if tenant_id is not None:
+        stmt = stmt.where(transaction.tenant_id == tenant_id)
+    return stmt
+
+def verify_loan_balances(db: Session, tenant_id: uuid.UUID | None = None) -> list[dict]:
+    """
+    Recomputes the balance, next-due and payment fields stored on each loan
+    from its installments, penalties and transactions, and returns one dict
+    per drifted field (expected vs. stored). `days_past_due` is checked
+    against the date the loan was last aged, not today.
+    """
+    loan = models.Loan
+    criteria = [] if tenant_id is None else [loan.tenant_id == tenant_id]
+    # Loans and their source rows must be read from the same snapshot
+    with snapshot_session(db) as snapshot:
+        stored = {
+            row.id: row
+            for row in snapshot.execute(
+                select(
+                    loan.id, loan.tenant_id, loan.principal_outstanding, loan.interest_outstanding,
+                    loan.penalties_outstanding, loan.next_due_date, loan.days_past_due, loan.aged_on,
+                    loan.total_paid, loan.last_payment_at,
+                ).where(*criteria)
+            )
+        }
+        positions = {
+            p["id"]: p
+            for p in _positions(
+                snapshot, date.today(), *criteria,
+                or_(loan.status == models.LoanStatus.DISBURSED, loan.principal_outstanding.is_not(None)),
+            )
+        }
+        payments = {row.loan_id: row for row in snapshot.execute(_payment_totals(tenant_id))}
+
+    drift = []
+    for loan_id, have in stored.items():
+        expected = {"total_paid": Decimal("0"), "last_payment_at": None}
+        if loan_id in payments:
+            last_payment_at = payments[loan_id].last_payment_at
+            if isinstance(last_payment_at, str):  # As for MIN() of dates above
+                last_payment_at = datetime.fromisoformat(last_payment_at)
+            expected.update(total_paid=Decimal(payments[loan_id].total_paid), last_payment_at=last_payment_at)
+        if loan_id in positions:
+            p = positions[loan_id]
+            expected.update(
+                principal_outstanding=p["outstanding"],
+                interest_outstanding=p["interest_outstanding"],
+                penalties_outstanding=p["penalties_outstanding"],
+                next_due_date=p["next_due_date"],
+                days_past_due=(
+                    max((have.aged_on - p["next_due_date"]).days, 0) if have.aged_on and p["next_due_date"] else 0
+                ),
+            )
+        for field, want in expected.items():
+            value = getattr(have, field)
+            if isinstance(want, Decimal) and value is not None:
+                value = Decimal(value)
+            if value != want:
+                drift.append({
+                    "loan_id": loan_id, "tenant_id": have.tenant_id, "field": field,
+                    "expected": want, "stored": value,
+                })
+    return drift
+
+def rebuild_loan_balances(db: Session, tenant_id: uuid.UUID) -> int:
+    """
+    Rewrites a tenant's loan payment totals from its transactions and
+    re-ages its active loans (which rewrites their balances and the
+    `portfolio_aging` rows). Returns the number of loans aged. The caller
+    commits.
+    """
+    loan = models.Loan
+    # Holds off repayments to the tenant's loans until we commit
+    db.execute(select(loan.id).where(loan.tenant_id == tenant_id).with_for_update())
+    totals = _payment_totals(tenant_id).subquery()
+    db.execute(
+        update(loan)
+        .where(loan.tenant_id == tenant_id)
+        .values(
+            total_paid=func.coalesce(select(totals.c.total_paid).where(totals.c.loan_id == loan.id).scalar_subquery(), 0),
+            last_payment_at=select(totals.c.last_payment_at).where(totals.c.loan_id == loan.id).scalar_subquery(),
+        )
+        .execution_options(synchronize_session=False)
+    )
+    return rebuild_tenant_aging(db, tenant_id)
+
+# --- Reads (a few aggregate rows per tenant, independent of portfolio size) ---
+
+def _summary(rows, **extra):
+    by_bucket = defaultdict(lambda: [0, Decimal("0")])
+    for row in rows:
+        by_bucket[row.bucket][0] += row.loan_count
+        by_bucket[row.bucket][1] += Decimal(row.principal_outstanding)
+    outstanding = sum((principal for _, principal in by_bucket.values()), Decimal("0"))
+
+    def par(days: int) -> float:
+        at_risk = sum((by_bucket[b.value][1] for b in PAR_BUCKETS[days] if b.value in by_bucket), Decimal("0"))
+        return float(at_risk / outstanding) if outstanding else 0.0
+
+    return dict(
+        loan_count=sum(count for count, _ in by_bucket.values()),
+        principal_outstanding=float(outstanding),
+        par1=par(1), par30=par(30), par60=par(60), par90=par(90),
+        buckets=[
+            reporting_schema.AgingBucketTotal(
+                bucket=bucket.value,
+                loan_count=by_bucket[bucket.value][0] if bucket.value in by_bucket else 0,
+                principal_outstanding=float(by_bucket[bucket.value][1]) if bucket.value in by_bucket else 0.0,
+            )
+            for bucket in models.AgingBucket
+        ],
+        **extra,
+    )
+
+def get_portfolio_at_risk(db: Session, tenant_id: uuid.UUID) -> reporting_schema.PortfolioAtRisk:
+    """PAR1/30/60/90 and aging buckets for the tenant, by product and by loan officer."""
+    aging = models.PortfolioAging
+    rows = db.execute(
+        select(
+            aging.loan_product_id, aging.officer_id, aging.bucket, aging.loan_count, aging.principal_outstanding,
+            models.LoanProduct.name.label("product_name"), models.User.email.label("officer_email"),
+        )
+        .join(models.LoanProduct, models.LoanProduct.id == aging.loan_product_id)
+        .outerjoin(models.User, models.User.id == aging.officer_id)
+        .where(aging.tenant_id == tenant_id, aging.loan_count > 0)
+    ).all()
+
+    def groups(key, name):
+        grouped = defaultdict(list)
+        for row in rows:
+            grouped[key(row)].append(row)
+        return [
+            reporting_schema.PortfolioAtRiskGroup(**_summary(members, id=group_id, name=name(members[0])))
+            for group_id, members in sorted(grouped.items(), key=lambda item: name(item[1][0]) or "")
+        ]
+
+    return reporting_schema.PortfolioAtRisk(
+        **_summary(rows),
+        by_product=groups(lambda r: r.loan_product_id, lambda r: r.product_name),
+        by_officer=groups(
+            lambda r: None if r.officer_id == models.loan.UNASSIGNED_OFFICER else r.officer_id,
+            lambda r: r.officer_email,
+        ),
+    )
+
+def par_totals(tenant_id: uuid.UUID, days: int = 30):
+    """
+    A one-row SELECT of the tenant's outstanding principal and the part more
+    than `days` days past due, read from the aggregate.
+    """
+    aging = models.PortfolioAging
+    at_risk_buckets = [bucket.value for bucket in PAR_BUCKETS[days]]
+    return select(
+        func.coalesce(func.sum(aging.principal_outstanding), 0).label("outstanding"),
+        func.coalesce(
+            func.sum(case((aging.bucket.in_(at_risk_buckets), aging.principal_outstanding), else_=0)), 0
+        ).label("at_risk"),
+    ).where(aging.tenant_id == tenant_id)
@@ -0,0 +1,272 @@
+# backend/app/services/allocation_service.py
+
+"""
+Payment allocation waterfall.
+
+A payment settles what a loan owes in this order: unpaid penalties (oldest
+first), then each open installment oldest first, interest before
+principal. Whatever is left once the loan owes nothing is an overpayment.
+Partial payments leave the installment open with its paid amounts
+recorded; payments larger than the installment due run on into later ones
+(prepayment).
+
+`Allocator` locks the loans it loads, reads their open installments and
+unpaid penalties in two queries, allocates any number of payments in
+memory, and `flush` adds the amounts allocated to only the changed
+installments and penalties (one executemany each, as increments, so
+concurrent payments can never overwrite each other's),
+adds the payments to each loan's `total_paid` / `last_payment_at` and flips
+loans with nothing left to pay to PAID_OFF. The loans' outstanding
+balances are then recomputed by `aging_service.refresh_loans`.
+"""
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime
+from decimal import Decimal
+from typing import Iterable, List, Optional
+import uuid
+
+from sqlalchemy import DateTime, Numeric, and_, bindparam, case, exists, literal, or_, select, update
+from sqlalchemy.orm import Session
+
+from .. import models
+from ..schemas import accounting as accounting_schema
+from . import accounting_service
+
+# GL account credited for each component; the cash account is debited with the whole payment
+COMPONENT_ACCOUNTS = {
+    models.AllocationComponent.PENALTY: accounting_service.PENALTIES_RECEIVABLE_ACCOUNT,
+    models.AllocationComponent.INTEREST: accounting_service.INTEREST_REVENUE_ACCOUNT,
+    models.AllocationComponent.PRINCIPAL: accounting_service.LOANS_RECEIVABLE_ACCOUNT,
+    models.AllocationComponent.OVERPAYMENT: accounting_service.CLIENT_SAVINGS_ACCOUNT,
+}
+
+@dataclass
+class _Installment:
+    id: uuid.UUID
+    interest_due: Decimal
+    principal_due: Decimal
+    interest_paid: Decimal
+    principal_paid: Decimal
+    status: models.RepaymentStatus
+    # Allocated since the last flush
+    interest_added: Decimal = Decimal("0")
+    principal_added: Decimal = Decimal("0")
+
+@dataclass
+class _Penalty:
+    id: uuid.UUID
+    amount: Decimal
+    amount_paid: Decimal
+    added: Decimal = Decimal("0")  # Allocated since the last flush
+
+@dataclass
+class Allocation:
+    component: models.AllocationComponent
+    amount: Decimal
+    schedule_id: Optional[uuid.UUID] = None
+    penalty_id: Optional[uuid.UUID] = None
+
+class Allocator:
+    """Open installments and penalties of the loaded loans, allocated in memory until `flush`."""
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.installments: dict[uuid.UUID, deque] = {}
+        self.penalties: dict[uuid.UUID, deque] = {}
+        self._changed_installments: dict[uuid.UUID, _Installment] = {}
+        self._changed_penalties: dict[uuid.UUID, _Penalty] = {}
+        self._paid_off: set = set()
+        # loan id -> [amount paid, latest payment time] since the last flush
+        self._payments: dict[uuid.UUID, list] = {}
+
+    def load(self, loan_ids: Iterable[uuid.UUID]) -> None:
+        missing = [loan_id for loan_id in loan_ids if loan_id not in self.installments]
+        if not missing:
+            return
+        for loan_id in missing:
+            self.installments[loan_id] = deque()
+            self.penalties[loan_id] = deque()
+        # Concurrent payments to the same loans wait here until we commit, so
+        # they allocate against what we paid; id order avoids deadlocks
+        self.db.execute(
+            select(models.Loan.id).where(models.Loan.id.in_(missing)).order_by(models.Loan.id).with_for_update()
+        )
+        schedule, penalty = models.RepaymentSchedule, models.LoanPenalty
+        rows = self.db.execute(
+            select(
+                schedule.id, schedule.loan_id, schedule.interest_due, schedule.principal_due,
+                schedule.interest_paid, schedule.principal_paid, schedule.status,
+            )
+            .where(schedule.loan_id.in_(missing), schedule.status != models.RepaymentStatus.PAID)
+            .order_by(schedule.loan_id, schedule.due_date)
+        )
+        for row in rows:
+            self.installments[row.loan_id].append(_Installment(
+                row.id, Decimal(row.interest_due), Decimal(row.principal_due),
+                Decimal(row.interest_paid), Decimal(row.principal_paid), row.status,
+            ))
+        rows = self.db.execute(
+            select(penalty.id, penalty.loan_id, penalty.amount, penalty.amount_paid)
+            .where(penalty.loan_id.in_(missing), penalty.amount_paid < penalty.amount)
+            .order_by(penalty.loan_id, penalty.period)
+        )
+        for row in rows:
+            self.penalties[row.loan_id].append(_Penalty(row.id, Decimal(row.amount), Decimal(row.amount_paid)))
+
+    def owes(self, loan_id: uuid.UUID) -> bool:
+        """Whether a loaded loan has anything left to pay."""
+        return bool(self.installments[loan_id] or self.penalties[loan_id])
+
+    def allocate(self, loan_id: uuid.UUID, amount: Decimal, paid_at: datetime) -> List[Allocation]:
+        """Applies a payment made at `paid_at` to a loaded loan and returns how it was split."""
+        totals = self._payments.setdefault(loan_id, [Decimal("0"), paid_at])
+        totals[0] += amount
+        totals[1] = max(totals[1], paid_at)
+
+        allocations = []
+        remaining = amount
+        penalties = self.penalties[loan_id]
+        while remaining > 0 and penalties:
+            penalty = penalties[0]
+            paid = min(remaining, penalty.amount - penalty.amount_paid)
+            penalty.amount_paid += paid
+            penalty.added += paid
+            remaining -= paid
+            allocations.append(Allocation(models.AllocationComponent.PENALTY, paid, penalty_id=penalty.id))
+            self._changed_penalties[penalty.id] = penalty
+            if penalty.amount_paid >= penalty.amount:
+                penalties.popleft()
+
+        installments = self.installments[loan_id]
+        while remaining > 0 and installments:
+            installment = installments[0]
+            for component, due, paid_field, added_field in (
+                (models.AllocationComponent.INTEREST, installment.interest_due, "interest_paid", "interest_added"),
+                (models.AllocationComponent.PRINCIPAL, installment.principal_due, "principal_paid", "principal_added"),
+            ):
+                paid = min(remaining, due - getattr(installment, paid_field))
+                if paid > 0:
+                    setattr(installment, paid_field, getattr(installment, paid_field) + paid)
+                    setattr(installment, added_field, getattr(installment, added_field) + paid)
+                    remaining -= paid
+                    allocations.append(Allocation(component, paid, schedule_id=installment.id))
+            self._changed_installments[installment.id] = installment
+            if installment.interest_paid >= installment.interest_due and installment.principal_paid >= installment.principal_due:
+                installment.status = models.RepaymentStatus.PAID
+                installments.popleft()
+
+        if remaining > 0:
+            allocations.append(Allocation(models.AllocationComponent.OVERPAYMENT, remaining))
+        if not self.owes(loan_id):
+            self._paid_off.add(loan_id)
+        return allocations
+
+    def flush(self) -> None:
+        """
+        Adds the allocated amounts to the changed installments and penalties
+        (an installment is PAID once both its parts are), adds the payments
+        to the loans' running totals and marks fully repaid loans PAID_OFF.
+        """
+        if self._changed_installments:
+            schedules = models.RepaymentSchedule.__table__
+            interest = bindparam("interest_added", type_=Numeric(10, 2))
+            principal = bindparam("principal_added", type_=Numeric(10, 2))
+            self.db.execute(
+                update(schedules)
+                .where(schedules.c.id == bindparam("installment_id"))
+                .values(
+                    interest_paid=schedules.c.interest_paid + interest,
+                    principal_paid=schedules.c.principal_paid + principal,
+                    status=case(
+                        (
+                            and_(
+                                schedules.c.interest_paid + interest >= schedules.c.interest_due,
+                                schedules.c.principal_paid + principal >= schedules.c.principal_due,
+                            ),
+                            literal(models.RepaymentStatus.PAID, schedules.c.status.type),
+                        ),
+                        else_=schedules.c.status,
+                    ),
+                ),
+                [
+                    {"installment_id": i.id, "interest_added": i.interest_added, "principal_added": i.principal_added}
+                    for i in self._changed_installments.values()
+                ],
+            )
+            for installment in self._changed_installments.values():
+                installment.interest_added = installment.principal_added = Decimal("0")
+        if self._changed_penalties:
+            penalties = models.LoanPenalty.__table__
+            self.db.execute(
+                update(penalties)
+                .where(penalties.c.id == bindparam("penalty_id"))
+                .values(amount_paid=penalties.c.amount_paid + bindparam("added", type_=Numeric(10, 2))),
+                [{"penalty_id": p.id, "added": p.added} for p in self._changed_penalties.values()],
+            )
+            for penalty in self._changed_penalties.values():
+                penalty.added = Decimal("0")
+        if self._payments:
+            loans = models.Loan.__table__
+            paid_at = bindparam("paid_at", type_=DateTime)
+            self.db.execute(
+                update(loans)
+                .where(loans.c.id == bindparam("loan_id"))
+                .values(
+                    total_paid=loans.c.total_paid + bindparam("paid"),
+                    # Backdated imports must not move the timestamp backwards
+                    last_payment_at=case(
+                        (or_(loans.c.last_payment_at.is_(None), loans.c.last_payment_at < paid_at), paid_at),
+                        else_=loans.c.last_payment_at,
+                    ),
+                ),
+                [
+                    {"loan_id": loan_id, "paid": paid, "paid_at": last}
+                    for loan_id, (paid, last) in self._payments.items()
+                ],
+            )
+        if self._paid_off:
+            schedule, penalty = models.RepaymentSchedule, models.LoanPenalty
+            self.db.execute(
+                update(models.Loan)
+                .where(
+                    models.Loan.id.in_(self._paid_off), models.Loan.status == models.LoanStatus.DISBURSED,
+                    ~exists().where(schedule.loan_id == models.Loan.id, schedule.status != models.RepaymentStatus.PAID),
+                    ~exists().where(penalty.loan_id == models.Loan.id, penalty.amount_paid < penalty.amount),
+                )
+                .values(status=models.LoanStatus.PAID_OFF)
+                .execution_options(synchronize_session="fetch")
+            )
+        self._changed_installments.clear()
+        self._changed_penalties.clear()
+        self._paid_off.clear()
+        self._payments.clear()
+
+def allocation_rows(
+    transaction_id: uuid.UUID, tenant_id: uuid.UUID, allocations: List[Allocation]
+) -> List[dict]:
+    """`repayment_allocations` rows of one transaction, ready for a bulk insert."""
+    return [
+        {
+            "id": uuid.uuid4(), "transaction_id": transaction_id, "component": a.component.value,
+            "schedule_id": a.schedule_id, "penalty_id": a.penalty_id, "amount": a.amount, "tenant_id": tenant_id,
+        }
+        for a in allocations
+    ]
+
+def journal_entry(
+    description: str, amount: Decimal, allocations: List[Allocation], transaction_date: Optional[datetime] = None
+) -> accounting_schema.JournalEntry:
+    """Debits cash with the payment and credits each allocated component's account."""
+    credits: dict[str, Decimal] = {}
+    for allocation in allocations:
+        account_code = COMPONENT_ACCOUNTS[allocation.component]
+        credits[account_code] = credits.get(account_code, Decimal("0")) + allocation.amount
+    return accounting_schema.JournalEntry(
+        description=description,
+        transaction_date=transaction_date,
+        lines=[accounting_schema.JournalLine(account_code=accounting_service.CASH_ACCOUNT, debit=amount)] + [
+            accounting_schema.JournalLine(account_code=account_code, credit=credit)
+            for account_code, credit in credits.items()
+        ],
+    )
@@ -0,0 +1,376 @@
+# backend/app/services/analytics_service.py
+
+"""
+Columnar analytics mirror.
+
+Analytical reports (vintage curves, repayment behaviour, officer
+productivity) scan whole portfolios, so they run against a per-tenant copy
+of the relevant tables in Parquet, queried with an embedded DuckDB, instead
+of against the primary database.
+
+Layout, per tenant:
+
+  {ANALYTICS_MIRROR_DIR}/{tenant_id}/manifest.json
+  {ANALYTICS_MIRROR_DIR}/{tenant_id}/{table}/{part}.parquet
+
+`sync_tenant` is incremental: each table is extracted from its high-water
+mark (`updated_at` for rows that change, `created_at` for append-only rows)
+up to now minus ANALYTICS_SYNC_LAG_SECONDS, and the new rows are written as
+one more Parquet part. The watermark is stamped when a row is written, not
+when its transaction commits, so every sync re-reads the last
+ANALYTICS_SYNC_OVERLAP_SECONDS before the mark as well; rows a slow
+transaction committed behind the mark are picked up then, and since the
+same row may land in several parts, every table is read back with only the
+latest version of each id. Small dimension tables are re-copied in full.
+The manifest lists the parts and marks of every table and is replaced
+atomically at the end of a sync, so it is the commit point: readers only
+see parts it lists, and a sync that dies midway leaves the previous mirror
+intact. Once a table has more than ANALYTICS_MAX_PARTS parts they are
+compacted into one; replaced parts are deleted one sync later so queries
+already reading them can finish.
+
+Run `python manage.py analytics sync` on a schedule; `--full` rebuilds.
+"""
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from enum import Enum
+from typing import Iterator, List, NamedTuple, Optional
+import fcntl
+import json
+import os
+import uuid
+
+import duckdb
+import pyarrow as pa
+import pyarrow.parquet as pq
+from fastapi import HTTPException, status
+from sqlalchemy import JSON, BigInteger, Boolean, Date, DateTime, Integer, Numeric, String, Uuid, select
+from sqlalchemy import Enum as SQLAlchemyEnum
+from sqlalchemy.orm import Session
+
+from .. import models
+from ..core.config import settings
+
+class MirrorTable(NamedTuple):
+    name: str
+    model: type
+    watermark: Optional[str]  # High-water mark column; None = copied in full on every sync
+
+TABLES = [
+    MirrorTable("loans", models.Loan, "updated_at"),
+    MirrorTable("repayment_schedules", models.RepaymentSchedule, "updated_at"),
+    MirrorTable("repayment_transactions", models.RepaymentTransaction, "created_at"),
+    MirrorTable("general_ledger_entries", models.GeneralLedgerEntry, "created_at"),
+    MirrorTable("loan_products", models.LoanProduct, None),
+    MirrorTable("chart_of_accounts", models.ChartOfAccount, None),
+]
+
+_MANIFEST = "manifest.json"
+
+def tenant_dir(tenant_id: uuid.UUID) -> str:
+    return os.path.join(settings.ANALYTICS_MIRROR_DIR, str(tenant_id))
+
+def read_manifest(tenant_id: uuid.UUID) -> Optional[dict]:
+    try:
+        with open(os.path.join(tenant_dir(tenant_id), _MANIFEST)) as manifest:
+            return json.load(manifest)
+    except FileNotFoundError:
+        return None
+
+def _write_manifest(root: str, manifest: dict) -> None:
+    partial = os.path.join(root, f"{_MANIFEST}.part")
+    with open(partial, "w") as file:
+        json.dump(manifest, file, indent=1)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(partial, os.path.join(root, _MANIFEST))
+
+# --- Extraction ---
+
+def _columns(table: MirrorTable):
+    """Mirrored columns; tenant_id is implied by the directory."""
+    return [column for column in table.model.__table__.columns if column.name != "tenant_id"]
+
+def _arrow_type(column) -> pa.DataType:
+    column_type = column.type
+    if isinstance(column_type, Uuid):
+        return pa.string()
+    if isinstance(column_type, (SQLAlchemyEnum, String, JSON)):
+        return pa.string()
+    if isinstance(column_type, Numeric):
+        return pa.decimal128(column_type.precision or 18, column_type.scale or 0)
+    if isinstance(column_type, (Integer, BigInteger)):
+        return pa.int64()
+    if isinstance(column_type, Boolean):
+        return pa.bool_()
+    if isinstance(column_type, DateTime):
+        return pa.timestamp("us")
+    if isinstance(column_type, Date):
+        return pa.date32()
+    raise TypeError(f"No Parquet type for {column.table.name}.{column.name} ({column_type!r})")
+
+def _arrow_value(value):
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, dict):
+        return json.dumps(value)
+    return value
+
+def arrow_schema(table: MirrorTable) -> pa.Schema:
+    return pa.schema([pa.field(column.name, _arrow_type(column)) for column in _columns(table)])
+
+def _extract(
+    db: Session, root: str, table: MirrorTable, tenant_id: uuid.UUID,
+    low: Optional[datetime], high: Optional[datetime], always_write: bool,
+) -> tuple[Optional[str], int]:
+    """
+    Writes the tenant's rows of `table` with `low < watermark <= high` to a new
+    part, in row groups of ANALYTICS_SYNC_BATCH_SIZE. Returns the part's path
+    relative to `root` (None when there were no rows to write) and the row count.
+    """
+    columns = _columns(table)
+    schema = arrow_schema(table)
+    stmt = select(*columns).where(table.model.tenant_id == tenant_id)
+    if table.watermark is not None:
+        watermark = getattr(table.model, table.watermark)
+        if low is not None:
+            stmt = stmt.where(watermark > low)
+        stmt = stmt.where(watermark <= high).order_by(watermark)
+    result = db.execute(stmt.execution_options(yield_per=settings.ANALYTICS_SYNC_BATCH_SIZE))
+
+    relative = os.path.join(table.name, f"{datetime.utcnow():%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:8]}.parquet")
+    path = os.path.join(root, relative)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    rows = 0
+    writer = None
+    try:
+        for batch in result.partitions():
+            arrays = [
+                pa.array([_arrow_value(value) for value in values], type=field.type)
+                for values, field in zip(zip(*batch), schema)
+            ]
+            if writer is None:
+                writer = pq.ParquetWriter(path, schema, compression="zstd")
+            writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=schema))
+            rows += len(batch)
+        if writer is None and always_write:
+            # An empty part keeps the table queryable before it has any rows
+            writer = pq.ParquetWriter(path, schema, compression="zstd")
+    finally:
+        if writer is not None:
+            writer.close()
+    return (relative if writer is not None else None), rows
+
+# --- DuckDB ---
+
+def _quote(value: str) -> str:
+    return "'" + value.replace("'", "''") + "'"
+
+def _source(root: str, table: MirrorTable, parts: List[str]) -> str:
+    """A SELECT over the listed parts with only the latest version of each row."""
+    files = ", ".join(_quote(os.path.join(root, part)) for part in parts)
+    sql = f"SELECT * FROM read_parquet([{files}])"
+    if table.watermark is not None and len(parts) > 1:
+        sql += f" QUALIFY row_number() OVER (PARTITION BY id ORDER BY {table.watermark} DESC) = 1"
+    return sql
+
+def _connect() -> "duckdb.DuckDBPyConnection":
+    return duckdb.connect(config={
+        "threads": settings.ANALYTICS_DUCKDB_THREADS,
+        "memory_limit": settings.ANALYTICS_DUCKDB_MEMORY_LIMIT,
+    })
+
+def _compact(root: str, table: MirrorTable, parts: List[str]) -> str:
+    """Rewrites a table's parts as one part holding the latest version of each row."""
+    relative = os.path.join(table.name, f"{datetime.utcnow():%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:8]}-compact.parquet")
+    path = os.path.join(root, relative)
+    con = _connect()
+    try:
+        con.execute(f"COPY ({_source(root, table, parts)}) TO {_quote(path)} (FORMAT parquet, COMPRESSION zstd)")
+    finally:
+        con.close()
+    return relative
+
+@contextmanager
+def _sync_lock(root: str) -> Iterator[bool]:
+    """An exclusive, non-blocking lock on the tenant's mirror; yields False if another sync holds it."""
+    os.makedirs(root, exist_ok=True)
+    with open(os.path.join(root, ".sync.lock"), "w") as lock_file:
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+def sync_tenant(db: Session, tenant_id: uuid.UUID, full: bool = False, now: Optional[datetime] = None) -> dict:
+    """
+    Brings the tenant's mirror up to date (or rebuilds it with `full`).
+    Returns the rows written per table, or {"skipped": ...} when another
+    sync of the tenant is running.
+    """
+    root = tenant_dir(tenant_id)
+    with _sync_lock(root) as locked:
+        if not locked:
+            return {"skipped": "another sync is running"}
+        previous_tables = (read_manifest(tenant_id) or {}).get("tables", {})
+        high = (now or datetime.utcnow()) - timedelta(seconds=settings.ANALYTICS_SYNC_LAG_SECONDS)
+        overlap = timedelta(seconds=settings.ANALYTICS_SYNC_OVERLAP_SECONDS)
+
+        tables, replaced, written = {}, [], {}
+        for table in TABLES:
+            state = previous_tables.get(table.name, {})
+            if full:
+                replaced += state.get("parts", [])
+                state = {}
+            parts = list(state.get("parts", []))
+            low = state.get("high_water_mark")
+            if table.watermark is None:
+                part, rows = _extract(db, root, table, tenant_id, None, None, always_write=True)
+                replaced += parts
+                parts = [part]
+            else:
+                part, rows = _extract(
+                    db, root, table, tenant_id, datetime.fromisoformat(low) - overlap if low else None, high,
+                    always_write=not parts,
+                )
+                parts += [part] if part else []
+                if len(parts) > settings.ANALYTICS_MAX_PARTS:
+                    replaced += parts
+                    parts = [_compact(root, table, parts)]
+            tables[table.name] = {
+                "parts": parts,
+                "high_water_mark": high.isoformat() if table.watermark else None,
+            }
+            written[table.name] = rows
+
+        _write_manifest(root, {
+            "tenant_id": str(tenant_id),
+            "synced_at": high.isoformat(),
+            "tables": tables,
+            "replaced": replaced,
+        })
+        _remove_unlisted(root, tables, replaced)
+    return written
+
+def _remove_unlisted(root: str, tables: dict, replaced: List[str]) -> None:
+    """
+    Deletes parts that neither the new manifest nor its `replaced` list
+    mention: parts replaced by the previous sync, and leftovers of syncs that
+    died before writing their manifest.
+    """
+    keep = set(replaced)
+    for state in tables.values():
+        keep.update(state["parts"])
+    for table in TABLES:
+        directory = os.path.join(root, table.name)
+        if not os.path.isdir(directory):
+            continue
+        for name in os.listdir(directory):
+            relative = os.path.join(table.name, name)
+            if relative not in keep:
+                os.remove(os.path.join(root, relative))
+
+# --- Reports ---
+
+_VINTAGES = """
+WITH disbursed AS (
+    SELECT id, CAST(date_trunc('month', disbursed_at) AS DATE) AS vintage, amount_requested AS principal
+    FROM loans WHERE disbursed_at IS NOT NULL
+), vintages AS (
+    SELECT vintage, count(*) AS loans, sum(principal) AS disbursed FROM disbursed GROUP BY vintage
+), collections AS (
+    SELECT d.vintage,
+           date_diff('month', d.vintage, CAST(date_trunc('month', t.transaction_date) AS DATE)) AS months_on_book,
+           sum(t.amount_paid) AS collected
+    FROM repayment_transactions t JOIN disbursed d ON d.id = t.loan_id
+    GROUP BY 1, 2
+)
+SELECT strftime(c.vintage, '%Y-%m') AS vintage, c.months_on_book, v.loans, v.disbursed, c.collected,
+       sum(c.collected) OVER (PARTITION BY c.vintage ORDER BY c.months_on_book) AS cumulative_collected
+FROM collections c JOIN vintages v ON v.vintage = c.vintage
+ORDER BY c.vintage, c.months_on_book
+"""
+
+_REPAYMENT_BEHAVIOR = """
+WITH paid AS (
+    SELECT schedule_id, CAST(max(transaction_date) AS DATE) AS paid_on
+    FROM repayment_transactions WHERE schedule_id IS NOT NULL GROUP BY schedule_id
+)
+SELECT l.loan_product_id, p.name AS product_name,
+       count(DISTINCT l.id) AS loans,
+       count(*) AS installments_due,
+       count(*) FILTER (WHERE s.status = 'paid') AS installments_paid,
+       count(*) FILTER (WHERE s.status = 'paid' AND paid.paid_on <= s.due_date) AS paid_on_time,
+       count(*) FILTER (WHERE s.status <> 'paid') AS installments_overdue,
+       avg(greatest(date_diff('day', s.due_date, paid.paid_on), 0)) FILTER (WHERE s.status = 'paid') AS avg_days_late,
+       sum(s.amount_due) AS amount_due
+FROM repayment_schedules s
+JOIN loans l ON l.id = s.loan_id
+LEFT JOIN loan_products p ON p.id = l.loan_product_id
+LEFT JOIN paid ON paid.schedule_id = s.id
+WHERE s.due_date <= ?
+GROUP BY l.loan_product_id, p.name
+ORDER BY p.name
+"""
+
+_OFFICER_PRODUCTIVITY = """
+WITH collected AS (
+    SELECT loan_id, sum(amount_paid) AS collected FROM repayment_transactions GROUP BY loan_id
+)
+SELECT l.assigned_officer_id AS officer_id,
+       count(*) FILTER (WHERE l.disbursed_at IS NOT NULL) AS loans_disbursed,
+       coalesce(sum(l.amount_requested) FILTER (WHERE l.disbursed_at IS NOT NULL), 0) AS principal_disbursed,
+       count(*) FILTER (WHERE l.status = 'disbursed') AS active_loans,
+       coalesce(sum(l.principal_outstanding) FILTER (WHERE l.status = 'disbursed'), 0) AS principal_outstanding,
+       coalesce(sum(l.principal_outstanding) FILTER (WHERE l.status = 'disbursed' AND l.days_past_due > 30), 0)
+           AS par30_outstanding,
+       coalesce(sum(c.collected), 0) AS collected
+FROM loans l LEFT JOIN collected c ON c.loan_id = l.id
+GROUP BY l.assigned_officer_id
+ORDER BY principal_disbursed DESC
+"""
+
+def _query(tenant_id: uuid.UUID, sql: str, with_as_of: bool = False) -> tuple[datetime, List[dict]]:
+    """Runs `sql` over the tenant's mirror; returns the mirror's sync time and the rows as dicts."""
+    manifest = read_manifest(tenant_id)
+    if manifest is None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT, detail="The analytics mirror has not been built for this organisation yet."
+        )
+    root = tenant_dir(tenant_id)
+    synced_at = datetime.fromisoformat(manifest["synced_at"])
+    con = _connect()
+    try:
+        for table in TABLES:
+            parts = manifest["tables"][table.name]["parts"]
+            con.execute(f"CREATE VIEW {table.name} AS {_source(root, table, parts)}")
+        cursor = con.execute(sql, [synced_at.date()] if with_as_of else [])
+        names = [column[0] for column in cursor.description]
+        return synced_at, [dict(zip(names, row)) for row in cursor.fetchall()]
+    finally:
+        con.close()
+
+def vintage_curves(tenant_id: uuid.UUID) -> dict:
+    """Collections by disbursement month and months on book, with the cumulative share of principal."""
+    synced_at, rows = _query(tenant_id, _VINTAGES)
+    for row in rows:
+        row["cumulative_collected_ratio"] = float(row["cumulative_collected"] / row["disbursed"]) if row["disbursed"] else 0.0
+    return {"mirrored_at": synced_at, "rows": rows}
+
+def repayment_behavior(tenant_id: uuid.UUID) -> dict:
+    """Installments due by the mirror date per product, and how promptly they were paid."""
+    synced_at, rows = _query(tenant_id, _REPAYMENT_BEHAVIOR, with_as_of=True)
+    for row in rows:
+        row["on_time_rate"] = row["paid_on_time"] / row["installments_due"] if row["installments_due"] else 0.0
+    return {"mirrored_at": synced_at, "rows": rows}
+
+def officer_productivity(tenant_id: uuid.UUID) -> dict:
+    """Disbursements, active portfolio, PAR30 and collections per loan officer."""
+    synced_at, rows = _query(tenant_id, _OFFICER_PRODUCTIVITY)
+    return {"mirrored_at": synced_at, "rows": rows}
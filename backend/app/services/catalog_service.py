@@ -0,0 +1,114 @@
+# backend/app/services/catalog_service.py
+
+"""
+Tenant catalog data (loan products and settings) served as cached,
+pre-serialized JSON with strong ETags.
+
+Every page load fetches the catalog, but it changes a few times a year.
+Each worker keeps the serialized response bodies per tenant, so a hit costs
+neither a query nor a pass through the JSON encoder, and clients sending
+`If-None-Match` get a bodiless 304.
+
+  - A per-tenant catalog version is bumped once a transaction that touched
+    a loan product or the tenant's settings commits (mapper events below).
+    A cached body is only served while its version is current, so a body
+    loaded concurrently with such a write never outlives it.
+  - The ETag is a digest of the body, so every worker hands out the same
+    tag for the same content; other workers catch up within the TTL.
+  - Misses read the primary: a lagging replica could otherwise cache the
+    pre-write catalog under the new version.
+"""
+from dataclasses import dataclass
+from typing import List, Optional
+import hashlib
+import uuid
+
+from fastapi import HTTPException, Response, status
+from pydantic import TypeAdapter
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, object_session
+
+from .. import models
+from ..core.cache import TTLCache, history_values, next_version, register_invalidator
+from ..core.config import settings
+from ..schemas import loan as loan_schema
+from ..schemas import tenant as tenant_schema
+
+LOAN_PRODUCTS = "loan_products"
+SETTINGS = "settings"
+
+@dataclass(frozen=True)
+class CatalogEntry:
+    version: int
+    body: bytes
+    etag: str
+
+# (tenant id, catalog kind) -> CatalogEntry
+_catalog_cache = TTLCache(maxsize=settings.CATALOG_CACHE_MAXSIZE, ttl=settings.CATALOG_CACHE_TTL_SECONDS)
+# tenant id -> catalog version, bumped after every commit that changes the tenant's catalog
+_catalog_versions: dict[uuid.UUID, int] = {}
+
+_products_adapter = TypeAdapter(List[loan_schema.LoanProduct])
+
+def _lookup(tenant_id: uuid.UUID, kind: str) -> tuple[int, Optional[CatalogEntry]]:
+    """The tenant's current catalog version (read before any reload) and the matching cached entry."""
+    version = _catalog_versions.get(tenant_id, 0)
+    cached = _catalog_cache.get((tenant_id, kind))
+    return version, cached if cached is not None and cached.version == version else None
+
+def _store(tenant_id: uuid.UUID, kind: str, version: int, body: bytes) -> CatalogEntry:
+    entry = CatalogEntry(version, body, f'"{hashlib.sha256(body).hexdigest()[:32]}"')
+    _catalog_cache.set((tenant_id, kind), entry)
+    return entry
+
+async def loan_products(db: AsyncSession, tenant_id: uuid.UUID) -> CatalogEntry:
+    """The tenant's loan products, serialized; only a cache miss touches the database."""
+    version, entry = _lookup(tenant_id, LOAN_PRODUCTS)
+    if entry is not None:
+        return entry
+    result = await db.execute(select(models.LoanProduct).where(models.LoanProduct.tenant_id == tenant_id))
+    products = [loan_schema.LoanProduct.model_validate(product) for product in result.scalars()]
+    return _store(tenant_id, LOAN_PRODUCTS, version, _products_adapter.dump_json(products))
+
+def tenant_settings(db: Session, tenant_id: uuid.UUID) -> CatalogEntry:
+    """The tenant's settings, serialized; only a cache miss touches the database. 404 if missing."""
+    version, entry = _lookup(tenant_id, SETTINGS)
+    if entry is not None:
+        return entry
+    db_settings = db.query(models.TenantSettings).filter(models.TenantSettings.tenant_id == tenant_id).first()
+    if db_settings is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Settings not found.")
+    body = tenant_schema.TenantSettings.model_validate(db_settings).model_dump_json().encode()
+    return _store(tenant_id, SETTINGS, version, body)
+
+def respond(entry: CatalogEntry, if_none_match: Optional[str]) -> Response:
+    """The cached body with its ETag, or a 304 when the client already holds it."""
+    headers = {"ETag": entry.etag, "Cache-Control": "private, no-cache"}
+    if if_none_match:
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        if "*" in tags or entry.etag in tags:
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=entry.body, media_type="application/json", headers=headers)
+
+def catalog_cache_stats() -> dict:
+    return _catalog_cache.stats()
+
+# --- Automatic invalidation on product and settings changes ---
+# Applied only once the transaction commits (see core.cache.register_invalidator).
+
+def _bump_catalog_version(tenant_id: uuid.UUID) -> None:
+    _catalog_versions[tenant_id] = next_version()
+
+_queue_catalogs = register_invalidator("stale_catalogs", _bump_catalog_version)
+
+@event.listens_for(models.LoanProduct, "after_insert")
+@event.listens_for(models.LoanProduct, "after_update")
+@event.listens_for(models.LoanProduct, "after_delete")
+@event.listens_for(models.TenantSettings, "after_insert")
+@event.listens_for(models.TenantSettings, "after_update")
+@event.listens_for(models.TenantSettings, "after_delete")
+def _queue_catalog_invalidation(mapper, connection, target):
+    session = object_session(target)
+    if session is not None:
+        _queue_catalogs(session, history_values(target, "tenant_id"))
@@ -7,7 +7,7 @@ from .. import models
 # --- CORRECTED: Import the specific schemas we actually use ---
 from ..schemas.client import ClientCreateByStaff, ClientSelfSignUp
 from ..core.security import UserRole
-from . import user_service
+from . import reporting_service, user_service
 
 def create_client_by_staff(db: Session, client_in: ClientCreateByStaff, user: models.User) -> models.Client:
     """
@@ -20,11 +20,14 @@ def create_client_by_staff(db: Session, client_in: ClientCreateByStaff, user: mo
         tenant_id=user.tenant_id
     )
     db.add(db_client)
+    reporting_service.invalidate_dashboard(db, user.tenant_id)
     # The commit is handled by the endpoint's session management
     return db_client
 
 
-def create_client_and_user_account(db: Session, signup_data: ClientSelfSignUp, tenant_id: uuid.UUID) -> models.User:
+def create_client_and_user_account(
+    db: Session, signup_data: ClientSelfSignUp, tenant_id: uuid.UUID, hashed_password: str | None = None
+) -> models.User:
     """
     A transactional function to create both a Client profile and a User login.
     Used for the public signup portal.
@@ -40,6 +43,7 @@ def create_client_and_user_account(db: Session, signup_data: ClientSelfSignUp, t
         tenant_id=tenant_id
     )
     db.add(db_client)
+    reporting_service.invalidate_dashboard(db, tenant_id)
     db.flush() # Use flush to get the client's ID without ending the transaction
 
     # Create the User record and link it to the new Client profile
@@ -48,7 +52,8 @@ def create_client_and_user_account(db: Session, signup_data: ClientSelfSignUp, t
         user_in=signup_data.user_info, 
         role=UserRole.CLIENT, 
         tenant_id=tenant_id,
-        client_id=db_client.id # Link them here
+        client_id=db_client.id, # Link them here
+        hashed_password=hashed_password,
     )
     
     # The commit will happen in the endpoint after the service call returns.
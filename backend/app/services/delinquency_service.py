@@ -0,0 +1,196 @@
+# backend/app/services/delinquency_service.py
+
+"""
+Nightly delinquency sweep: marks overdue installments LATE and charges
+late-payment penalties, set-based per tenant.
+
+For one tenant the sweep is a fixed handful of statements no matter how
+large the portfolio is:
+
+  1. one UPDATE .. RETURNING flips every overdue PENDING installment to LATE;
+  2. one SELECT finds the LATE installments on penalised products that have
+     no penalty for the current period yet;
+  3. one INSERT .. ON CONFLICT DO NOTHING .. RETURNING records the
+     penalties, so a concurrent or repeated run can never charge twice;
+  4. one `post_journal_batch` books exactly the penalties that were inserted
+     (Dr Penalties Receivable / Cr Penalty Revenue);
+  5. `aging_service.rebuild_tenant_aging` re-ages the active loans and
+     rewrites the portfolio-at-risk aggregate.
+
+`sweep_all_tenants` runs tenants in parallel, each in its own transaction
+that also writes a `DelinquencySweep` checkpoint, so an interrupted run
+resumes with the tenants it had not finished.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Callable, List, Optional
+import logging
+import uuid
+
+from sqlalchemy import and_, exists, select, update
+from sqlalchemy.orm import Session
+
+from .. import models
+from ..core.config import settings
+from ..core.database import SessionLocal
+from ..schemas import accounting as accounting_schema
+from . import accounting_service, aging_service, reporting_service
+
+logger = logging.getLogger(__name__)
+
+_CENT = Decimal("0.01")
+
+def penalty_period(as_of: date) -> date:
+    """Penalties are charged at most once per installment per calendar month."""
+    return as_of.replace(day=1)
+
+def penalty_amount(penalty_type: str, penalty_value: Decimal, overdue: Decimal) -> Decimal:
+    """
+    A flat amount, or a percentage of what is still unpaid on the overdue
+    installment, rounded half-up to the cent.
+    """
+    if penalty_type == models.PenaltyType.PERCENTAGE.value:
+        return (Decimal(overdue) * Decimal(penalty_value) / 100).quantize(_CENT, ROUND_HALF_UP)
+    return Decimal(penalty_value).quantize(_CENT, ROUND_HALF_UP)
+
+def mark_overdue_installments(db: Session, tenant_id: uuid.UUID, as_of: date) -> List[uuid.UUID]:
+    """Flips every PENDING installment due before `as_of` to LATE; returns their ids."""
+    schedule = models.RepaymentSchedule
+    result = db.execute(
+        update(schedule)
+        .where(
+            schedule.tenant_id == tenant_id,
+            schedule.status == models.RepaymentStatus.PENDING,
+            schedule.status != models.RepaymentStatus.PAID,  # matches the partial unpaid-installments index
+            schedule.due_date < as_of,
+        )
+        .values(status=models.RepaymentStatus.LATE)
+        .returning(schedule.id)
+        .execution_options(synchronize_session=False)
+    )
+    return list(result.scalars())
+
+def charge_penalties(db: Session, tenant_id: uuid.UUID, as_of: date) -> int:
+    """
+    Charges the period's penalty on every LATE installment of a penalised
+    product that has not been charged yet, and books them as one journal
+    batch. Returns the number of penalties charged.
+    """
+    schedule, loan, product, penalty = (
+        models.RepaymentSchedule, models.Loan, models.LoanProduct, models.LoanPenalty
+    )
+    period = penalty_period(as_of)
+    due = db.execute(
+        select(
+            schedule.id, schedule.loan_id, schedule.amount_due - schedule.interest_paid - schedule.principal_paid,
+            product.penalty_type, product.penalty_value,
+        )
+        .join(loan, loan.id == schedule.loan_id)
+        .join(product, product.id == loan.loan_product_id)
+        .where(
+            schedule.tenant_id == tenant_id,
+            schedule.status == models.RepaymentStatus.LATE,
+            schedule.status != models.RepaymentStatus.PAID,  # matches the partial unpaid-installments index
+            schedule.due_date < as_of,
+            product.penalty_type.in_([t.value for t in models.PenaltyType]),
+            product.penalty_value > 0,
+            ~exists().where(and_(penalty.schedule_id == schedule.id, penalty.period == period)),
+        )
+    ).all()
+    rows = [
+        {
+            "id": uuid.uuid4(),
+            "schedule_id": schedule_id,
+            "loan_id": loan_id,
+            "period": period,
+            "amount": penalty_amount(penalty_type, penalty_value, overdue),
+            "transaction_id": str(uuid.uuid4()),
+            "tenant_id": tenant_id,
+        }
+        for schedule_id, loan_id, overdue, penalty_type, penalty_value in due
+    ]
+    rows = [row for row in rows if row["amount"] > 0]
+    if not rows:
+        return 0
+
+    # Rows another run inserted first are dropped by the unique (schedule_id, period) index
+    stmt = accounting_service._upsert(db)(penalty.__table__)
+    inserted = set(db.execute(
+        stmt.on_conflict_do_nothing(index_elements=["schedule_id", "period"]).returning(penalty.id), rows
+    ).scalars())
+    charged = [row for row in rows if row["id"] in inserted]
+    accounting_service.post_journal_batch(db, tenant_id, [
+        accounting_schema.JournalEntry(
+            description=f"Late payment penalty for Loan ID {row['loan_id']} ({period:%Y-%m})",
+            transaction_id=row["transaction_id"],
+            lines=[
+                accounting_schema.JournalLine(
+                    account_code=accounting_service.PENALTIES_RECEIVABLE_ACCOUNT, debit=row["amount"]
+                ),
+                accounting_schema.JournalLine(
+                    account_code=accounting_service.PENALTY_REVENUE_ACCOUNT, credit=row["amount"]
+                ),
+            ],
+        )
+        for row in charged
+    ])
+    return len(charged)
+
+def sweep_tenant(db: Session, tenant_id: uuid.UUID, as_of: date) -> models.DelinquencySweep:
+    """
+    Runs the sweep for one tenant and adds its checkpoint to the session.
+    The caller commits, so the checkpoint lands atomically with the sweep.
+    """
+    marked = mark_overdue_installments(db, tenant_id, as_of)
+    charged = charge_penalties(db, tenant_id, as_of)
+    aging_service.rebuild_tenant_aging(db, tenant_id, as_of)
+    reporting_service.invalidate_dashboard(db, tenant_id)
+    checkpoint = models.DelinquencySweep(
+        tenant_id=tenant_id, as_of=as_of, installments_marked_late=len(marked), penalties_charged=charged
+    )
+    db.add(checkpoint)
+    return checkpoint
+
+def _sweep_one(session_factory: Callable[[], Session], tenant_id: uuid.UUID, as_of: date) -> dict:
+    db = session_factory()
+    try:
+        if db.get(models.DelinquencySweep, (tenant_id, as_of)) is not None:
+            return {"tenant_id": tenant_id, "outcome": "skipped"}
+        checkpoint = sweep_tenant(db, tenant_id, as_of)
+        db.commit()
+        return {
+            "tenant_id": tenant_id,
+            "outcome": "swept",
+            "installments_marked_late": checkpoint.installments_marked_late,
+            "penalties_charged": checkpoint.penalties_charged,
+        }
+    except Exception as exc:
+        db.rollback()
+        logger.exception("Delinquency sweep failed for tenant %s", tenant_id)
+        return {"tenant_id": tenant_id, "outcome": "failed", "detail": str(exc)}
+    finally:
+        db.close()
+
+def sweep_all_tenants(
+    as_of: Optional[date] = None,
+    tenant_ids: Optional[List[uuid.UUID]] = None,
+    workers: Optional[int] = None,
+    session_factory: Callable[[], Session] = SessionLocal,
+) -> List[dict]:
+    """
+    Sweeps every tenant (or `tenant_ids`) for `as_of` (default today), up to
+    `workers` tenants at a time, each on its own session and transaction.
+    Tenants already checkpointed for `as_of` are skipped and a failing
+    tenant does not stop the others. Returns one result dict per tenant.
+    """
+    as_of = as_of or date.today()
+    if tenant_ids is None:
+        db = session_factory()
+        try:
+            tenant_ids = list(db.execute(select(models.Tenant.id).order_by(models.Tenant.id)).scalars())
+        finally:
+            db.close()
+    workers = max(1, min(workers or settings.SWEEP_WORKERS, len(tenant_ids) or 1))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="delinquency-sweep") as pool:
+        return list(pool.map(lambda tenant_id: _sweep_one(session_factory, tenant_id, as_of), tenant_ids))
@@ -0,0 +1,176 @@
+# backend/app/services/export_service.py
+
+"""
+Streaming report exports.
+
+Rows are read from a server-side cursor (`yield_per`) selecting only the
+exported columns, so no ORM objects are built and at most one batch of
+rows is in memory at a time. Writers turn the rows into response chunks:
+
+  csv     encoded and yielded incrementally, from the first batch onwards
+  ndjson  one JSON object per line, yielded like csv
+  xlsx    written with openpyxl's write-only workbook (rows go straight to a
+          temporary file), then streamed from disk in fixed-size chunks
+"""
+from datetime import date, datetime, timedelta
+from typing import Iterable, Iterator, Optional, Sequence
+import csv
+import io
+import json
+import tempfile
+import uuid
+
+from openpyxl import Workbook
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from .. import models
+from ..core.config import settings
+from . import period_service
+
+CHUNK_SIZE = 64 * 1024
+
+LOAN_EXPORT_COLUMNS = ["loan_id", "client_id", "amount_requested", "status", "applied_at"]
+TRIAL_BALANCE_COLUMNS = ["account_code", "account_name", "total_debits", "total_credits"]
+LEDGER_COLUMNS = ["entry_id", "transaction_date", "transaction_id", "account_code", "description", "debit", "credit"]
+
+MEDIA_TYPES = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+def loan_export_rows(db: Session, tenant_id: uuid.UUID) -> Iterator[tuple]:
+    """The tenant's loans as export rows, fetched in batches of EXPORT_BATCH_SIZE."""
+    result = db.execute(
+        select(
+            models.Loan.id, models.Loan.client_id, models.Loan.amount_requested,
+            models.Loan.status, models.Loan.applied_at,
+        )
+        .where(models.Loan.tenant_id == tenant_id)
+        .execution_options(yield_per=settings.EXPORT_BATCH_SIZE)
+    )
+    for loan_id, client_id, amount, status, applied_at in result:
+        yield (
+            str(loan_id),
+            str(client_id),
+            float(amount),
+            status.value,
+            applied_at.strftime("%Y-%m-%d %H:%M:%S") if isinstance(applied_at, datetime) else None,
+        )
+
+def trial_balance_rows(db: Session, tenant_id: uuid.UUID, as_of: Optional[date] = None) -> Iterator[tuple]:
+    """
+    Debit and credit totals per account. Current totals come from the running
+    account balances; totals as of a date come from the last period snapshot
+    before it plus the ledger entries since.
+    """
+    if as_of is not None:
+        for line in period_service.trial_balance(db, tenant_id, as_of):
+            yield (line.account_code, line.account_name, line.total_debits, line.total_credits)
+        return
+    chart = models.accounting.ChartOfAccount
+    balance = models.accounting.AccountBalance
+    stmt = (
+        select(chart.account_code, chart.name, balance.total_debits, balance.total_credits)
+        .join(balance, balance.account_id == chart.id)
+        .where(balance.tenant_id == tenant_id)
+    )
+    for code, name, debits, credits in db.execute(stmt.order_by(chart.account_code)):
+        yield (code, name, float(debits or 0), float(credits or 0))
+
+def ledger_statement(
+    tenant_id: uuid.UUID,
+    account_code: Optional[str] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    transaction_id: Optional[str] = None,
+):
+    """
+    The tenant's ledger entries matching the filters, with their account.
+    Dates are inclusive. Callers order by (transaction_date, id), which the
+    (tenant_id | account_id, transaction_date, id) indexes serve directly.
+    """
+    entry, chart = models.accounting.GeneralLedgerEntry, models.accounting.ChartOfAccount
+    stmt = (
+        select(
+            entry.id, entry.transaction_date, entry.transaction_id, chart.account_code,
+            chart.name.label("account_name"), entry.description, entry.debit, entry.credit,
+        )
+        .join(chart, chart.id == entry.account_id)
+        .where(entry.tenant_id == tenant_id)
+    )
+    if account_code is not None:
+        # Resolved to one account id up front, so the account index drives the scan
+        stmt = stmt.where(entry.account_id == select(chart.id).where(
+            chart.tenant_id == tenant_id, chart.account_code == account_code
+        ).scalar_subquery())
+    if start_date is not None:
+        stmt = stmt.where(entry.transaction_date >= start_date)
+    if end_date is not None:
+        stmt = stmt.where(entry.transaction_date < end_date + timedelta(days=1))
+    if transaction_id is not None:
+        stmt = stmt.where(entry.transaction_id == transaction_id)
+    return stmt
+
+def ledger_rows(db: Session, tenant_id: uuid.UUID, **filters) -> Iterator[tuple]:
+    """Ledger entries matching `filters` (see `ledger_statement`) as export rows, oldest first."""
+    entry = models.accounting.GeneralLedgerEntry
+    stmt = (
+        ledger_statement(tenant_id, **filters)
+        .order_by(entry.transaction_date, entry.id)
+        .execution_options(yield_per=settings.EXPORT_BATCH_SIZE)
+    )
+    for row in db.execute(stmt):
+        yield (
+            str(row.id), row.transaction_date.strftime("%Y-%m-%d %H:%M:%S"), row.transaction_id, row.account_code,
+            row.description, float(row.debit or 0), float(row.credit or 0),
+        )
+
+def stream_csv(columns: Sequence[str], rows: Iterable[tuple]) -> Iterator[bytes]:
+    """Yields UTF-8 CSV in chunks of roughly CHUNK_SIZE bytes."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    for row in rows:
+        writer.writerow(row)
+        if buffer.tell() >= CHUNK_SIZE:
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue().encode()
+
+def stream_ndjson(columns: Sequence[str], rows: Iterable[tuple]) -> Iterator[bytes]:
+    """Yields one JSON object per line, in chunks of roughly CHUNK_SIZE bytes."""
+    buffer = io.StringIO()
+    for row in rows:
+        buffer.write(json.dumps(dict(zip(columns, row))))
+        buffer.write("\n")
+        if buffer.tell() >= CHUNK_SIZE:
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue().encode()
+
+def stream_xlsx(columns: Sequence[str], rows: Iterable[tuple], sheet_name: str) -> Iterator[bytes]:
+    """Writes a write-only workbook to a temporary file and yields it in CHUNK_SIZE chunks."""
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet(sheet_name)
+    sheet.append(list(columns))
+    for row in rows:
+        sheet.append(row)
+    with tempfile.TemporaryFile() as spool:
+        workbook.save(spool)
+        spool.seek(0)
+        while chunk := spool.read(CHUNK_SIZE):
+            yield chunk
+
+def stream_rows(columns: Sequence[str], rows: Iterable[tuple], export_format: str, sheet_name: str) -> Iterator[bytes]:
+    if export_format == "csv":
+        return stream_csv(columns, rows)
+    if export_format == "ndjson":
+        return stream_ndjson(columns, rows)
+    return stream_xlsx(columns, rows, sheet_name=sheet_name)
+
+def stream_loans(db: Session, tenant_id: uuid.UUID, export_format: str) -> Iterator[bytes]:
+    return stream_rows(LOAN_EXPORT_COLUMNS, loan_export_rows(db, tenant_id), export_format, sheet_name="Loans")
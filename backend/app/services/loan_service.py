@@ -4,16 +4,22 @@
 Service layer to orchestrate all business logic related to loans.
 This includes application, approval, disbursement, and triggering other services.
 """
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import select
 from fastapi import HTTPException, status
-from datetime import datetime
+from datetime import date, datetime, timedelta
 from decimal import Decimal
+from typing import List, Optional
+import logging
 import uuid
 
 # --- CORRECTED: Specific imports for clarity and correctness ---
 from .. import models
 from ..schemas import loan as loan_schema
-from . import repayment_service, accounting_service
+from ..schemas import accounting as accounting_schema
+from . import repayment_service, accounting_service, aging_service, reporting_service
+
+logger = logging.getLogger(__name__)
 
 def create_loan_application(db: Session, loan_in: loan_schema.LoanApply, user: models.User) -> models.Loan:
     """
@@ -62,9 +68,44 @@ def approve_loan(db: Session, loan_id: uuid.UUID) -> models.Loan:
     db.refresh(db_loan)
     return db_loan
 
+def loan_list_statement(
+    tenant_id: uuid.UUID,
+    status: Optional[models.LoanStatus] = None,
+    loan_product_id: Optional[uuid.UUID] = None,
+    officer_id: Optional[uuid.UUID] = None,
+    client_id: Optional[uuid.UUID] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+):
+    """
+    The columns of the staff loan listing for the tenant's loans matching the
+    filters; dates bound `applied_at` and are inclusive. Callers order by
+    (applied_at, id), which the (tenant_id | client_id, applied_at, id)
+    indexes serve directly.
+    """
+    loan = models.Loan
+    stmt = select(
+        loan.id, loan.client_id, loan.loan_product_id, loan.assigned_officer_id, loan.status,
+        loan.amount_requested, loan.tenure_months, loan.applied_at, loan.disbursed_at,
+        loan.principal_outstanding, loan.next_due_date, loan.days_past_due, loan.total_paid,
+    ).where(loan.tenant_id == tenant_id)
+    if status is not None:
+        stmt = stmt.where(loan.status == status)
+    if loan_product_id is not None:
+        stmt = stmt.where(loan.loan_product_id == loan_product_id)
+    if officer_id is not None:
+        stmt = stmt.where(loan.assigned_officer_id == officer_id)
+    if client_id is not None:
+        stmt = stmt.where(loan.client_id == client_id)
+    if start_date is not None:
+        stmt = stmt.where(loan.applied_at >= start_date)
+    if end_date is not None:
+        stmt = stmt.where(loan.applied_at < end_date + timedelta(days=1))
+    return stmt
+
 def disburse_loan(db: Session, loan_id: uuid.UUID) -> models.Loan:
     """
-    Orchestrates the loan disbursement process:
+    Orchestrates the loan disbursement process (see `_apply_disbursements`):
     1. Updates loan status.
     2. Generates the repayment schedule.
     3. Posts the disbursement transaction to the General Ledger.
@@ -77,23 +118,118 @@ def disburse_loan(db: Session, loan_id: uuid.UUID) -> models.Loan:
     if not db_loan:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Approved loan not found.")
 
-    # 1. Update loan status
-    db_loan.status = models.loan.LoanStatus.DISBURSED
-    db_loan.disbursed_at = datetime.utcnow()
-    
-    # 2. Generate Repayment Schedule
-    repayment_service.generate_schedule(db, loan=db_loan, grace_days=db_loan.product.grace_period_days)
-
-    # 3. Post to Accounting
-    accounting_service.post_transaction(
-        db,
-        tenant_id=db_loan.tenant_id,
-        description=f"Loan disbursement for client {db_loan.client.first_name} {db_loan.client.last_name}",
-        debit_account_code=accounting_service.LOANS_RECEIVABLE_ACCOUNT, # Debit asset (Loans Receivable)
-        credit_account_code=accounting_service.CASH_ACCOUNT, # Credit asset (Cash)
-        amount=Decimal(db_loan.amount_requested)
-    )
+    # Same path as the batch endpoint, so the two cannot drift apart
+    _apply_disbursements(db, [db_loan], datetime.utcnow())
 
     db.commit()
     db.refresh(db_loan)
-    return db_loan
\ No newline at end of file
+    return db_loan
+
+def _disbursement_entry(loan: models.Loan) -> accounting_schema.JournalEntry:
+    amount = Decimal(loan.amount_requested)
+    return accounting_schema.JournalEntry(
+        description=f"Loan disbursement for client {loan.client.first_name} {loan.client.last_name}",
+        lines=[
+            accounting_schema.JournalLine(account_code=accounting_service.LOANS_RECEIVABLE_ACCOUNT, debit=amount),
+            accounting_schema.JournalLine(account_code=accounting_service.CASH_ACCOUNT, credit=amount),
+        ],
+    )
+
+def _apply_disbursements(db: Session, loans: List[models.Loan], disbursed_at: datetime) -> None:
+    """Marks `loans` disbursed, bulk inserts their schedules, ages them and posts one journal batch."""
+    for loan in loans:
+        loan.status = models.loan.LoanStatus.DISBURSED
+        loan.disbursed_at = disbursed_at
+    db.flush()
+    repayment_service.insert_schedule_rows(
+        db, repayment_service.schedule_rows(loans, [loan.product.grace_period_days or 0 for loan in loans])
+    )
+    aging_service.refresh_loans(db, [loan.id for loan in loans])
+    reporting_service.invalidate_dashboard(db, loans[0].tenant_id)
+    accounting_service.post_journal_batch(db, loans[0].tenant_id, [_disbursement_entry(loan) for loan in loans])
+
+def _failure_detail(loan_id: uuid.UUID, exc: Exception) -> str:
+    """
+    What the batch report says about a loan that failed. Only domain errors
+    are shown as raised; anything else (e.g. a database error, whose text
+    carries SQL and constraint names) is logged and reported generically.
+    """
+    if isinstance(exc, HTTPException):
+        return str(exc.detail)
+    if isinstance(exc, ValueError):
+        return str(exc)
+    logger.exception("Disbursement of loan %s failed", loan_id)
+    return "The loan could not be disbursed because of an internal error."
+
+def disburse_loans(db: Session, loan_ids: List[uuid.UUID], tenant_id: uuid.UUID) -> loan_schema.LoanDisbursementReport:
+    """
+    Disburses many approved loans of one tenant in a single transaction.
+
+    The loans are locked with `FOR UPDATE SKIP LOCKED`, so two concurrent
+    batches never disburse the same loan: a loan held by another batch is
+    reported as skipped. All schedules go in with one bulk insert and all
+    ledger postings in one journal batch. If that fast path fails, each
+    loan is retried in its own savepoint so one bad loan cannot fail the
+    rest; the report says what happened to every requested id.
+    """
+    requested = list(dict.fromkeys(loan_ids))
+    loans = db.execute(
+        select(models.Loan)
+        .where(
+            models.Loan.id.in_(requested),
+            models.Loan.tenant_id == tenant_id,
+            models.Loan.status == models.loan.LoanStatus.APPROVED,
+        )
+        .options(
+            joinedload(models.Loan.product, innerjoin=True),
+            joinedload(models.Loan.client, innerjoin=True),
+        )
+        .with_for_update(skip_locked=True, of=models.Loan)
+    ).scalars().all()
+    by_id = {loan.id: loan for loan in loans}
+
+    results: dict[uuid.UUID, loan_schema.LoanDisbursementResult] = {}
+    ready = []
+    for loan_id in requested:
+        loan = by_id.get(loan_id)
+        if loan is None:
+            results[loan_id] = loan_schema.LoanDisbursementResult(
+                loan_id=loan_id, outcome="skipped",
+                detail="Not an approved loan of this organisation, or being disbursed by another request."
+            )
+        elif loan.tenure_months < 1 or Decimal(loan.amount_requested) <= 0:
+            results[loan_id] = loan_schema.LoanDisbursementResult(
+                loan_id=loan_id, outcome="failed", detail="Loan amount and tenure must be positive."
+            )
+        else:
+            ready.append(loan)
+
+    disbursed_at = datetime.utcnow()
+    if ready:
+        try:
+            with db.begin_nested():
+                _apply_disbursements(db, ready, disbursed_at)
+            disbursed = ready
+        except Exception:
+            # Fall back to isolating each loan in its own savepoint
+            disbursed = []
+            for loan in ready:
+                try:
+                    with db.begin_nested():
+                        _apply_disbursements(db, [loan], disbursed_at)
+                    disbursed.append(loan)
+                except Exception as exc:
+                    results[loan.id] = loan_schema.LoanDisbursementResult(
+                        loan_id=loan.id, outcome="failed", detail=_failure_detail(loan.id, exc)
+                    )
+        for loan in disbursed:
+            results[loan.id] = loan_schema.LoanDisbursementResult(loan_id=loan.id, outcome="disbursed")
+    db.commit()
+
+    ordered = [results[loan_id] for loan_id in requested]
+    return loan_schema.LoanDisbursementReport(
+        disbursed=sum(r.outcome == "disbursed" for r in ordered),
+        skipped=sum(r.outcome == "skipped" for r in ordered),
+        failed=sum(r.outcome == "failed" for r in ordered),
+        results=ordered,
+    )
@@ -0,0 +1,220 @@
+# backend/app/services/period_service.py
+
+"""
+Accounting periods: month-end close, balance snapshots and statements as
+of any date.
+
+Closing a month stores every account's cumulative totals through the month
+end in `account_balance_snapshots` (the previous snapshot plus that month's
+entries) and from then on rejects postings dated in or before it, so a
+snapshot can never go stale. Balances as of any date are the latest
+snapshot on or before it plus the entries since: about a month of ledger
+for dates in closed periods, instead of the whole history.
+
+Postings dated in the current month cannot touch a closed period (only
+months that are over can be closed) and skip the check entirely; backdated
+postings read the tenant's last closed month. On Postgres both sides take a
+per-tenant advisory lock (shared for postings, exclusive for the close), so
+a backdated posting cannot commit into a month while it is being closed.
+"""
+from calendar import monthrange
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from typing import Iterable, List, Optional
+import uuid
+
+from fastapi import HTTPException, status
+from sqlalchemy import func, insert, select
+from sqlalchemy.orm import Session
+
+from .. import models
+from ..schemas import accounting as accounting_schema
+
+# Advisory lock namespace ("MFXP") for period closes; the second key is the tenant
+_PERIOD_LOCK_CLASS = 0x4D465850 & 0x7FFFFFFF
+
+class ClosedPeriodError(ValueError):
+    """A posting is dated in a closed accounting period."""
+
+    def __init__(self, message: str, closed_through: date):
+        super().__init__(message)
+        self.closed_through = closed_through
+
+def month_end(day: date) -> date:
+    return day.replace(day=monthrange(day.year, day.month)[1])
+
+def previous_month_end(today: Optional[date] = None) -> date:
+    return (today or datetime.utcnow().date()).replace(day=1) - timedelta(days=1)
+
+def last_closed(db: Session, tenant_id: uuid.UUID) -> Optional[date]:
+    return db.execute(
+        select(func.max(models.ClosedPeriod.period_end)).where(models.ClosedPeriod.tenant_id == tenant_id)
+    ).scalar()
+
+def _lock(db: Session, tenant_id: uuid.UUID, exclusive: bool) -> None:
+    if db.get_bind().dialect.name != "postgresql":
+        return  # SQLite serializes writers already
+    lock = func.pg_advisory_xact_lock if exclusive else func.pg_advisory_xact_lock_shared
+    db.execute(select(lock(_PERIOD_LOCK_CLASS, tenant_id.int & 0x7FFFFFFF)))
+
+def ensure_open(db: Session, tenant_id: uuid.UUID, transaction_dates: Iterable[datetime]) -> None:
+    """Raises ClosedPeriodError if any date falls in a closed period. Runs in the posting's transaction."""
+    earliest = min(transaction_dates, default=None)
+    if earliest is None or earliest >= datetime.utcnow().replace(day=1, hour=0, minute=0, second=0, microsecond=0):
+        return
+    _lock(db, tenant_id, exclusive=False)
+    closed = last_closed(db, tenant_id)
+    if closed is not None and earliest.date() <= closed:
+        raise ClosedPeriodError(
+            f"Cannot post an entry dated {earliest.date()}: the books are closed through {closed}.", closed
+        )
+
+def _entry_totals(db: Session, tenant_id: uuid.UUID, after: Optional[date], through: date) -> dict:
+    """Debit and credit totals per account of entries dated after `after` and on or before `through`."""
+    entry = models.GeneralLedgerEntry
+    stmt = (
+        select(entry.account_id, func.sum(entry.debit), func.sum(entry.credit))
+        .where(entry.tenant_id == tenant_id, entry.transaction_date < through + timedelta(days=1))
+        .group_by(entry.account_id)
+    )
+    if after is not None:
+        stmt = stmt.where(entry.transaction_date >= after + timedelta(days=1))
+    return {
+        account_id: [Decimal(debits or 0), Decimal(credits or 0)]
+        for account_id, debits, credits in db.execute(stmt)
+    }
+
+def _snapshot(db: Session, tenant_id: uuid.UUID, period_end: date) -> dict:
+    snapshot = models.AccountBalanceSnapshot
+    rows = db.execute(
+        select(snapshot.account_id, snapshot.total_debits, snapshot.total_credits)
+        .where(snapshot.tenant_id == tenant_id, snapshot.period_end == period_end)
+    )
+    return {account_id: [Decimal(debits), Decimal(credits)] for account_id, debits, credits in rows}
+
+def _add(totals: dict, delta: dict) -> dict:
+    for account_id, (debits, credits) in delta.items():
+        total = totals.setdefault(account_id, [Decimal("0"), Decimal("0")])
+        total[0] += debits
+        total[1] += credits
+    return totals
+
+def close_period(
+    db: Session, tenant_id: uuid.UUID, period_end: date, user_id: Optional[uuid.UUID] = None
+) -> models.ClosedPeriod:
+    """
+    Closes the month ending `period_end` and snapshots its balances.
+    Months must be over and are closed in order. The caller commits.
+    """
+    if period_end != month_end(period_end):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="period_end must be the last day of a month.")
+    if period_end >= datetime.utcnow().date():
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Only months that are over can be closed.")
+    _lock(db, tenant_id, exclusive=True)
+    previous = last_closed(db, tenant_id)
+    if previous is not None and period_end <= previous:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=f"The books are already closed through {previous}.")
+    if previous is not None and period_end != month_end(previous + timedelta(days=1)):
+        next_end = month_end(previous + timedelta(days=1))
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Close the month ending {next_end} first.")
+
+    totals = _snapshot(db, tenant_id, previous) if previous is not None else {}
+    _add(totals, _entry_totals(db, tenant_id, previous, period_end))
+    if totals:
+        db.execute(insert(models.AccountBalanceSnapshot.__table__), [
+            {
+                "account_id": account_id, "period_end": period_end, "tenant_id": tenant_id,
+                "total_debits": debits, "total_credits": credits,
+            }
+            for account_id, (debits, credits) in totals.items()
+        ])
+    closed = models.ClosedPeriod(tenant_id=tenant_id, period_end=period_end, closed_by_user_id=user_id)
+    db.add(closed)
+    db.flush()
+    return closed
+
+def list_closed_periods(db: Session, tenant_id: uuid.UUID) -> List[models.ClosedPeriod]:
+    return db.execute(
+        select(models.ClosedPeriod)
+        .where(models.ClosedPeriod.tenant_id == tenant_id)
+        .order_by(models.ClosedPeriod.period_end.desc())
+    ).scalars().all()
+
+def balances_as_of(db: Session, tenant_id: uuid.UUID, as_of: date) -> dict:
+    """Cumulative `[debits, credits]` per account id through the end of `as_of`."""
+    snapshot_end = db.execute(
+        select(func.max(models.AccountBalanceSnapshot.period_end)).where(
+            models.AccountBalanceSnapshot.tenant_id == tenant_id, models.AccountBalanceSnapshot.period_end <= as_of
+        )
+    ).scalar()
+    totals = _snapshot(db, tenant_id, snapshot_end) if snapshot_end is not None else {}
+    return _add(totals, _entry_totals(db, tenant_id, snapshot_end, as_of))
+
+def _accounts(db: Session, tenant_id: uuid.UUID) -> List[models.ChartOfAccount]:
+    chart = models.ChartOfAccount
+    return db.execute(select(chart).where(chart.tenant_id == tenant_id).order_by(chart.account_code)).scalars().all()
+
+def trial_balance(db: Session, tenant_id: uuid.UUID, as_of: date) -> List[accounting_schema.TrialBalanceEntry]:
+    totals = balances_as_of(db, tenant_id, as_of)
+    return [
+        accounting_schema.TrialBalanceEntry(
+            account_code=account.account_code, account_name=account.name,
+            total_debits=float(totals[account.id][0]), total_credits=float(totals[account.id][1]),
+        )
+        for account in _accounts(db, tenant_id) if account.id in totals
+    ]
+
+def _lines(accounts, amounts: dict, account_type: models.AccountType) -> List[accounting_schema.StatementLine]:
+    return [
+        accounting_schema.StatementLine(account_code=account.account_code, account_name=account.name, amount=amounts[account.id])
+        for account in accounts if account.account_type == account_type and amounts.get(account.id)
+    ]
+
+def _signed(accounts, totals: dict) -> dict:
+    """Balances in each account's normal direction: debit for assets and expenses, credit otherwise."""
+    debit_normal = {models.AccountType.ASSET, models.AccountType.EXPENSE}
+    return {
+        account.id: float(debits - credits if account.account_type in debit_normal else credits - debits)
+        for account in accounts if account.id in totals
+        for debits, credits in [totals[account.id]]
+    }
+
+def balance_sheet(db: Session, tenant_id: uuid.UUID, as_of: date) -> accounting_schema.BalanceSheet:
+    """Assets, liabilities and equity as of a date; unclosed revenue less expenses shows as current earnings."""
+    accounts = _accounts(db, tenant_id)
+    amounts = _signed(accounts, balances_as_of(db, tenant_id, as_of))
+    assets = _lines(accounts, amounts, models.AccountType.ASSET)
+    liabilities = _lines(accounts, amounts, models.AccountType.LIABILITY)
+    equity = _lines(accounts, amounts, models.AccountType.EQUITY)
+    earnings = sum(amounts.get(a.id, 0.0) for a in accounts if a.account_type == models.AccountType.REVENUE) \
+        - sum(amounts.get(a.id, 0.0) for a in accounts if a.account_type == models.AccountType.EXPENSE)
+    total_liabilities = sum(line.amount for line in liabilities)
+    total_equity = sum(line.amount for line in equity) + earnings
+    return accounting_schema.BalanceSheet(
+        as_of=as_of, assets=assets, liabilities=liabilities, equity=equity, current_earnings=earnings,
+        total_assets=sum(line.amount for line in assets), total_liabilities=total_liabilities,
+        total_equity=total_equity, total_liabilities_and_equity=total_liabilities + total_equity,
+    )
+
+def income_statement(
+    db: Session, tenant_id: uuid.UUID, start_date: date, end_date: date
+) -> accounting_schema.IncomeStatement:
+    """Revenue and expenses over an inclusive date range: balances at its end less balances before its start."""
+    if start_date > end_date:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="start_date must not be after end_date.")
+    accounts = _accounts(db, tenant_id)
+    closing = balances_as_of(db, tenant_id, end_date)
+    opening = balances_as_of(db, tenant_id, start_date - timedelta(days=1))
+    activity = defaultdict(lambda: [Decimal("0"), Decimal("0")], closing)
+    for account_id, (debits, credits) in opening.items():
+        activity[account_id] = [activity[account_id][0] - debits, activity[account_id][1] - credits]
+    amounts = _signed(accounts, activity)
+    revenue = _lines(accounts, amounts, models.AccountType.REVENUE)
+    expenses = _lines(accounts, amounts, models.AccountType.EXPENSE)
+    total_revenue = sum(line.amount for line in revenue)
+    total_expenses = sum(line.amount for line in expenses)
+    return accounting_schema.IncomeStatement(
+        start_date=start_date, end_date=end_date, revenue=revenue, expenses=expenses,
+        total_revenue=total_revenue, total_expenses=total_expenses, net_income=total_revenue - total_expenses,
+    )
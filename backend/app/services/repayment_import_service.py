@@ -0,0 +1,233 @@
+# backend/app/services/repayment_import_service.py
+
+"""
+Bulk repayment import from bank and mobile-money statements.
+
+A statement (CSV or XLSX) has one payment per line with the columns
+`reference`, `loan_id`, `amount` and optionally `transaction_date`. Lines are
+parsed as the file is read and handled in batches of
+REPAYMENT_IMPORT_BATCH_SIZE: references are checked with one query, loans
+are matched against an in-memory index of the tenant's disbursed loans,
+and a loan's open installments are loaded into an
+`allocation_service.Allocator` the first time a batch mentions it. The
+batch's transactions, allocations, installment updates and ledger postings
+are then each written as one batched statement.
+
+The statement reference is the idempotency key: a reference already
+imported, or repeated in the same file, is reported as a duplicate and
+never recorded twice, so a statement can safely be uploaded again.
+
+Each payment is split over the loan's penalties, interest and principal
+with the same waterfall as payments recorded one at a time.
+"""
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
+from itertools import islice
+from typing import BinaryIO, Iterable, Iterator, List, NamedTuple, Optional, Union
+import csv
+import io
+import uuid
+
+from fastapi import HTTPException, status
+from openpyxl import load_workbook
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+
+from .. import models
+from ..core.config import settings
+from ..schemas import repayment as repayment_schema
+from . import accounting_service, aging_service, allocation_service, period_service, reporting_service
+
+REQUIRED_COLUMNS = ("reference", "loan_id", "amount")
+
+class _Payment(NamedTuple):
+    line: int
+    reference: str
+    loan_id: uuid.UUID
+    amount: Decimal
+    paid_at: datetime
+
+def _header(values: Optional[tuple]) -> List[str]:
+    header = [str(value or "").strip().lower() for value in values or ()]
+    missing = [column for column in REQUIRED_COLUMNS if column not in header]
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"The statement's first row must name the columns; missing: {', '.join(missing)}.",
+        )
+    return header
+
+def _read_csv(file: BinaryIO) -> Iterator[tuple[int, dict]]:
+    reader = csv.reader(io.TextIOWrapper(file, encoding="utf-8-sig", newline=""))
+    line = 1
+    try:
+        header = _header(next(reader, None))
+        for line, values in enumerate(reader, start=2):
+            if any(value.strip() for value in values):
+                yield line, dict(zip(header, values))
+    except (UnicodeDecodeError, csv.Error):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Line {line + 1} is not valid UTF-8 CSV.")
+
+def _read_xlsx(file: BinaryIO) -> Iterator[tuple[int, dict]]:
+    workbook = load_workbook(file, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = _header(next(rows, None))
+        for line, values in enumerate(rows, start=2):
+            if any(value not in (None, "") for value in values):
+                yield line, dict(zip(header, values))
+    finally:
+        workbook.close()
+
+def read_statement(file: BinaryIO, filename: Optional[str]) -> Iterator[tuple[int, dict]]:
+    """Yields `(line number, {column: value})` for each non-blank line of an uploaded statement."""
+    if (filename or "").lower().endswith(".xlsx"):
+        return _read_xlsx(file)
+    return _read_csv(file)
+
+def _rejected(line: int, reference: str, detail: str) -> repayment_schema.RepaymentImportLine:
+    return repayment_schema.RepaymentImportLine(line=line, reference=reference or None, outcome="rejected", detail=detail)
+
+def _parse_line(line: int, values: dict, now: datetime) -> Union[_Payment, repayment_schema.RepaymentImportLine]:
+    reference = str(values.get("reference") or "").strip()
+    if not reference:
+        return _rejected(line, reference, "Missing reference.")
+    try:
+        loan_id = uuid.UUID(str(values.get("loan_id") or "").strip())
+    except ValueError:
+        return _rejected(line, reference, "loan_id is not a loan id.")
+    try:
+        amount = Decimal(str(values.get("amount") or "").strip().replace(",", "")).quantize(Decimal("0.01"))
+    except InvalidOperation:
+        return _rejected(line, reference, "amount is not a number.")
+    if not amount.is_finite() or amount <= 0:
+        return _rejected(line, reference, "amount must be positive.")
+    paid_at = values.get("transaction_date")
+    if paid_at in (None, ""):
+        paid_at = now
+    elif not isinstance(paid_at, datetime):
+        try:
+            paid_at = paid_at if isinstance(paid_at, date) else datetime.fromisoformat(str(paid_at).strip())
+        except ValueError:
+            return _rejected(line, reference, "transaction_date is not an ISO date.")
+        if not isinstance(paid_at, datetime):
+            paid_at = datetime.combine(paid_at, datetime.min.time())
+    if paid_at > now:
+        return _rejected(line, reference, "transaction_date is in the future.")
+    return _Payment(line, reference, loan_id, amount, paid_at)
+
+def _disbursed_loan_ids(db: Session, tenant_id: uuid.UUID) -> set:
+    return set(db.execute(
+        select(models.Loan.id).where(models.Loan.tenant_id == tenant_id, models.Loan.status == models.LoanStatus.DISBURSED)
+    ).scalars())
+
+def _import_batch(
+    db: Session, tenant_id: uuid.UUID, user_id: uuid.UUID, batch: List[tuple[int, dict]],
+    loan_ids: set, allocator: allocation_service.Allocator, closed_through: Optional[date], seen: set, now: datetime,
+) -> List[repayment_schema.RepaymentImportLine]:
+    results, payments = [], []
+    for line, values in batch:
+        payment = _parse_line(line, values, now)
+        if isinstance(payment, repayment_schema.RepaymentImportLine):
+            results.append(payment)
+        else:
+            payments.append(payment)
+    if not payments:
+        return results
+
+    transaction = models.RepaymentTransaction
+    imported = set(db.execute(
+        select(transaction.reference).where(
+            transaction.tenant_id == tenant_id, transaction.reference.in_([p.reference for p in payments])
+        )
+    ).scalars())
+    allocator.load({p.loan_id for p in payments if p.loan_id in loan_ids and p.reference not in imported})
+
+    rows, allocation_rows, entries = [], [], []
+    for payment in payments:
+        result = repayment_schema.RepaymentImportLine(
+            line=payment.line, reference=payment.reference, loan_id=payment.loan_id, amount=float(payment.amount),
+            outcome="rejected",
+        )
+        if payment.reference in seen:
+            results.append(result.model_copy(update={"outcome": "duplicate", "detail": "Repeated earlier in this file."}))
+            continue
+        if payment.reference in imported:
+            results.append(result.model_copy(update={"outcome": "duplicate", "detail": "Already imported."}))
+            continue
+        if payment.loan_id not in loan_ids:
+            results.append(result.model_copy(update={"detail": "No disbursed loan with this id."}))
+            continue
+        if closed_through is not None and payment.paid_at.date() <= closed_through:
+            results.append(result.model_copy(update={"detail": f"The books are closed through {closed_through}."}))
+            continue
+        if not allocator.owes(payment.loan_id):
+            results.append(result.model_copy(update={"detail": "The loan has nothing left to pay."}))
+            continue
+        seen.add(payment.reference)
+        allocations = allocator.allocate(payment.loan_id, payment.amount, payment.paid_at)
+        transaction_id = uuid.uuid4()
+        rows.append({
+            "id": transaction_id,
+            "loan_id": payment.loan_id,
+            "schedule_id": next((a.schedule_id for a in allocations if a.schedule_id), None),
+            "amount_paid": payment.amount,
+            "reference": payment.reference,
+            "transaction_date": payment.paid_at,
+            "created_at": now,
+            "recorded_by_user_id": user_id,
+            "tenant_id": tenant_id,
+        })
+        allocation_rows += allocation_service.allocation_rows(transaction_id, tenant_id, allocations)
+        entries.append(allocation_service.journal_entry(
+            f"Repayment for Loan ID {payment.loan_id} (ref {payment.reference})",
+            payment.amount, allocations, payment.paid_at,
+        ))
+        results.append(result.model_copy(update={"outcome": "accepted"}))
+    if not rows:
+        return results
+
+    stmt = accounting_service._upsert(db)(transaction.__table__)
+    inserted = db.execute(
+        stmt.on_conflict_do_nothing(index_elements=["tenant_id", "reference"]).returning(transaction.id), rows
+    ).scalars().all()
+    if len(inserted) != len(rows):
+        # Another import recorded some of these references after the check above
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="This statement is being imported by another request; retry once it finishes.",
+        )
+    db.execute(insert(models.RepaymentAllocation.__table__), allocation_rows)
+    allocator.flush()
+    accounting_service.post_journal_batch(db, tenant_id, entries)
+    return results
+
+def import_statement(
+    db: Session, tenant_id: uuid.UUID, user_id: uuid.UUID, lines: Iterable[tuple[int, dict]]
+) -> repayment_schema.RepaymentImportReport:
+    """
+    Records the payments of a parsed statement (see `read_statement`) and
+    reports the outcome of every line. The caller commits.
+    """
+    now = datetime.utcnow()
+    loan_ids = _disbursed_loan_ids(db, tenant_id)
+    allocator = allocation_service.Allocator(db)
+    closed_through = period_service.last_closed(db, tenant_id)
+    seen: set = set()
+    results: List[repayment_schema.RepaymentImportLine] = []
+    lines = iter(lines)
+    while batch := list(islice(lines, settings.REPAYMENT_IMPORT_BATCH_SIZE)):
+        results += _import_batch(db, tenant_id, user_id, batch, loan_ids, allocator, closed_through, seen, now)
+    results.sort(key=lambda result: result.line)
+
+    accepted = [result for result in results if result.outcome == "accepted"]
+    if accepted:
+        aging_service.refresh_loans(db, {result.loan_id for result in accepted})
+        reporting_service.invalidate_dashboard(db, tenant_id)
+    return repayment_schema.RepaymentImportReport(
+        accepted=len(accepted),
+        duplicates=sum(result.outcome == "duplicate" for result in results),
+        rejected=sum(result.outcome == "rejected" for result in results),
+        amount_accepted=float(sum(Decimal(str(result.amount)) for result in accepted)),
+        lines=results,
+    )
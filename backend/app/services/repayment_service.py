@@ -4,105 +4,128 @@
 Service for handling repayment schedules and transactions.
 """
 from sqlalchemy.orm import Session
-from datetime import date, datetime
-from dateutil.relativedelta import relativedelta
-from decimal import Decimal
+from sqlalchemy import insert
+from datetime import datetime
+from decimal import ROUND_HALF_UP, Decimal
+from typing import List
+import uuid
+
+import numpy as np
 
 # --- CORRECTED: Specific imports ---
 from .. import models
 from ..schemas import repayment as repayment_schema
-from . import accounting_service
+from . import accounting_service, aging_service, allocation_service, reporting_service, schedule_engine
 
-def generate_schedule(db: Session, loan: models.Loan, grace_days: int = 0):
+_CENT = Decimal("0.01")
+
+def _minor_to_decimal(values: np.ndarray) -> List[Decimal]:
+    # Installment amounts repeat heavily, so convert each distinct value once
+    distinct, inverse = np.unique(values, return_inverse=True)
+    decimals = [Decimal(v).scaleb(-2) for v in distinct.tolist()]
+    return [decimals[i] for i in inverse.ravel().tolist()]
+
+def schedule_rows(loans: List[models.Loan], grace_days: List[int]) -> List[dict]:
     """
-    Generates a simple, flat-interest repayment schedule for a loan.
+    Computes the installments of many loans with the vectorized schedule
+    engine and returns them as `repayment_schedules` rows ready for a bulk insert.
+    The first payment is due one month from disbursement, plus any grace period.
     """
-    principal = Decimal(loan.amount_requested)
-    interest_rate = Decimal(loan.product.interest_rate) / Decimal(100)
-    tenure = loan.tenure_months
-
-    # Simple flat interest calculation
-    total_interest = principal * interest_rate * (Decimal(tenure) / Decimal(12))
-    total_repayment = principal + total_interest
-    monthly_payment = total_repayment / Decimal(tenure)
-    monthly_principal = principal / Decimal(tenure)
-    monthly_interest = total_interest / Decimal(tenure)
-    
-    # The first payment is due one month from the disbursement date, plus any grace period
-    start_date = loan.disbursed_at or datetime.utcnow()
-    
-    for i in range(1, tenure + 1):
-        due_date = (start_date + relativedelta(months=i, days=grace_days)).date()
-        schedule_entry = models.repayment.RepaymentSchedule(
-            loan_id=loan.id,
-            due_date=due_date,
-            amount_due=monthly_payment,
-            principal_due=monthly_principal,
-            interest_due=monthly_interest,
-            tenant_id=loan.tenant_id
+    if not loans:
+        return []
+    now = datetime.utcnow()
+    schedule = schedule_engine.compute_schedules(
+        principal=[schedule_engine.to_minor_units(loan.amount_requested) for loan in loans],
+        rate=[schedule_engine.to_rate(loan.product.interest_rate) for loan in loans],
+        tenure=[loan.tenure_months for loan in loans],
+        method=[
+            schedule_engine.METHOD_CODES[models.InterestMethod(loan.product.interest_method or "flat")]
+            for loan in loans
+        ],
+        start_date=np.array([(loan.disbursed_at or now).date() for loan in loans], dtype="datetime64[D]"),
+        grace_days=grace_days,
+    )
+    loan_ids = [loans[i].id for i in schedule.loan_index.tolist()]
+    tenant_ids = [loans[i].tenant_id for i in schedule.loan_index.tolist()]
+    pending = models.repayment.RepaymentStatus.PENDING
+    return [
+        {
+            "id": uuid.uuid4(),
+            "loan_id": loan_id,
+            "tenant_id": tenant_id,
+            "due_date": due_date,
+            "amount_due": amount,
+            "principal_due": principal,
+            "interest_due": interest,
+            "status": pending,
+        }
+        for loan_id, tenant_id, due_date, amount, principal, interest in zip(
+            loan_ids, tenant_ids, schedule.due_date.tolist(), _minor_to_decimal(schedule.amount),
+            _minor_to_decimal(schedule.principal), _minor_to_decimal(schedule.interest),
         )
-        db.add(schedule_entry)
+    ]
+
+def insert_schedule_rows(db: Session, rows: List[dict]) -> None:
+    """Writes schedule rows with one executemany (batched multi-row INSERTs)."""
+    if rows:
+        db.execute(insert(models.repayment.RepaymentSchedule.__table__), rows)
+
+def generate_schedule(db: Session, loan: models.Loan, grace_days: int = 0):
+    """
+    Generates a loan's repayment schedule using its product's interest
+    method (flat, declining balance or annuity).
+    """
+    insert_schedule_rows(db, schedule_rows([loan], [grace_days]))
 
 def record_payment(
     db: Session, 
     payment_in: repayment_schema.RepaymentRecord, # This now works
     loan: models.Loan,
     user: models.User
-):
+) -> models.RepaymentTransaction:
     """
-    Records a repayment transaction and posts it to the GL.
+    Records a repayment transaction, allocates it over the loan's penalties,
+    interest and principal (oldest first) and posts it to the GL.
     """
-    # 1. Create the repayment transaction record
+    # Round to cents first so the allocations, the transaction and the GL all carry the same amount
+    amount = Decimal(str(payment_in.amount_paid)).quantize(_CENT, ROUND_HALF_UP)
+    paid_at = datetime.utcnow()
+
+    # 1. Allocate over the loan's open installments and penalties
+    allocator = allocation_service.Allocator(db)
+    allocator.load([loan.id])
+    allocations = allocator.allocate(loan.id, amount, paid_at)
+
+    # 2. Create the repayment transaction record and its allocation breakdown
     transaction = models.repayment.RepaymentTransaction(
+        id=uuid.uuid4(),
         loan_id=loan.id,
-        schedule_id=payment_in.schedule_id,
-        amount_paid=Decimal(payment_in.amount_paid),
+        # The installment the payment went to first, unless it only covered penalties or an overpayment
+        schedule_id=next((a.schedule_id for a in allocations if a.schedule_id), payment_in.schedule_id),
+        amount_paid=amount,
+        transaction_date=paid_at,
         recorded_by_user_id=user.id,
         tenant_id=user.tenant_id
     )
     db.add(transaction)
-
-    # 2. Post to accounting
-    accounting_service.post_transaction(
-        db,
-        tenant_id=user.tenant_id,
-        description=f"Repayment for Loan ID {loan.id}",
-        debit_account_code=accounting_service.CASH_ACCOUNT,
-        credit_account_code=accounting_service.LOANS_RECEIVABLE_ACCOUNT,
-        amount=Decimal(payment_in.amount_paid)
+    db.flush()
+    db.execute(
+        insert(models.RepaymentAllocation.__table__),
+        allocation_service.allocation_rows(transaction.id, user.tenant_id, allocations),
     )
+    allocator.flush()
 
-    # 3. Update schedule status (simplified)
-    schedule_entry = db.query(models.repayment.RepaymentSchedule).filter(
-        models.repayment.RepaymentSchedule.id == payment_in.schedule_id
-    ).first()
-    if schedule_entry:
-        schedule_entry.status = models.repayment.RepaymentStatus.PAID
-    
-    # Commit will be handled by the endpoint function's db session management
+    # 3. Post to accounting
+    accounting_service.post_journal_batch(db, user.tenant_id, [
+        allocation_service.journal_entry(f"Repayment for Loan ID {loan.id}", amount, allocations)
+    ])
 
-def apply_late_penalties(db: Session, loan: models.Loan):
-    """
-    Checks for overdue payments and applies penalties based on the loan product rules.
-    This would ideally be run by a scheduled background job (e.g., nightly).
-    """
-    product = loan.product
-    if not product.penalty_type or not product.penalty_value:
-        return # No penalty configured
+    # 4. Re-age the loan (outstanding balances, next due date, days past due, PAR aggregate)
+    aging_service.refresh_loans(db, [loan.id])
+    reporting_service.invalidate_dashboard(db, loan.tenant_id)
+
+    # Commit will be handled by the endpoint function's db session management
+    return transaction
 
-    today = date.today()
-    overdue_installments = db.query(models.repayment.RepaymentSchedule).filter(
-        models.repayment.RepaymentSchedule.loan_id == loan.id,
-        models.repayment.RepaymentSchedule.status == models.repayment.RepaymentStatus.PENDING,
-        models.repayment.RepaymentSchedule.due_date < today
-    ).all()
-    
-    for installment in overdue_installments:
-        # Simple example: Apply a flat penalty
-        # A more robust system would check if a penalty for this installment was already applied.
-        if product.penalty_type == 'flat':
-            # Add logic here to create a penalty transaction or add to the due amount
-            print(f"Applying flat penalty of {product.penalty_value} to installment {installment.id}")
-            # installment.amount_due += Decimal(product.penalty_value)
-        
-        installment.status = models.repayment.RepaymentStatus.LATE
\ No newline at end of file
+# Overdue installments and late penalties are handled tenant-wide by
+# `delinquency_service.sweep_all_tenants` (see `python manage.py sweep`).
@@ -0,0 +1,302 @@
+# backend/app/services/report_job_service.py
+
+"""
+Background report jobs.
+
+`POST /reports/jobs` only records a QUEUED `ReportJob`; a small worker pool
+in each API process generates the file on local disk and clients poll the
+job and download the artifact when it has SUCCEEDED.
+
+Jobs are claimed with a conditional UPDATE that also counts the tenant's
+RUNNING jobs, under a per-tenant advisory lock held until the claim
+commits, so no job runs twice and no tenant can hold more than
+REPORT_JOB_MAX_RUNNING_PER_TENANT workers, even with several processes
+polling the same table. Artifacts are kept for
+REPORT_ARTIFACT_RETENTION_HOURS and then removed by `purge_expired`.
+"""
+from concurrent.futures import Executor, ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from typing import Callable, Iterator, List, Optional
+import logging
+import os
+import threading
+import time
+import uuid
+
+from fastapi import HTTPException, status
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session, aliased
+
+from .. import models
+from ..core.config import settings
+from ..core.database import SessionLocal
+from ..schemas import reporting as reporting_schema
+from . import export_service
+
+logger = logging.getLogger(__name__)
+
+# How often the dispatcher also applies the retention policy and fails stale jobs
+_PURGE_INTERVAL_SECONDS = 600
+# Advisory lock namespace ("MFXR") for claims; the second key is the tenant
+_CLAIM_LOCK_CLASS = 0x4D465852 & 0x7FFFFFFF
+
+def _date_param(job: models.ReportJob, name: str) -> Optional[date]:
+    value = (job.parameters or {}).get(name)
+    return date.fromisoformat(value) if value else None
+
+def _loan_export(db: Session, job: models.ReportJob) -> Iterator[bytes]:
+    return export_service.stream_loans(db, job.tenant_id, job.format)
+
+def _trial_balance(db: Session, job: models.ReportJob) -> Iterator[bytes]:
+    rows = export_service.trial_balance_rows(db, job.tenant_id, as_of=_date_param(job, "as_of"))
+    return export_service.stream_rows(export_service.TRIAL_BALANCE_COLUMNS, rows, job.format, "Trial Balance")
+
+def _general_ledger(db: Session, job: models.ReportJob) -> Iterator[bytes]:
+    rows = export_service.ledger_rows(
+        db, job.tenant_id, start_date=_date_param(job, "start_date"), end_date=_date_param(job, "end_date")
+    )
+    return export_service.stream_rows(export_service.LEDGER_COLUMNS, rows, job.format, "General Ledger")
+
+_GENERATORS = {
+    models.ReportKind.LOAN_EXPORT.value: _loan_export,
+    models.ReportKind.TRIAL_BALANCE.value: _trial_balance,
+    models.ReportKind.GENERAL_LEDGER.value: _general_ledger,
+}
+
+def artifact_path(job: models.ReportJob) -> str:
+    return os.path.join(settings.REPORT_ARTIFACT_DIR, str(job.tenant_id), f"{job.id}.{job.format}")
+
+def _lock_tenant(db: Session, tenant_id: uuid.UUID) -> bool:
+    """
+    Takes the tenant's claim lock until the caller commits; False if another
+    dispatcher holds it. Without the lock, two dispatchers' counts of the
+    tenant's RUNNING jobs could both pass the cap under READ COMMITTED.
+    """
+    if db.get_bind().dialect.name != "postgresql":
+        return True  # SQLite serializes writers already
+    return db.execute(
+        select(func.pg_try_advisory_xact_lock(_CLAIM_LOCK_CLASS, tenant_id.int & 0x7FFFFFFF))
+    ).scalar()
+
+def claim_jobs(db: Session, limit: int, max_running_per_tenant: int) -> List[uuid.UUID]:
+    """
+    Moves up to `limit` of the oldest QUEUED jobs to RUNNING, skipping tenants
+    already at their running cap or being claimed by another dispatcher (try
+    locks, so dispatchers never wait on each other in conflicting orders).
+    Each claim is a single conditional UPDATE, so concurrent dispatchers
+    never claim the same job. The caller commits.
+    """
+    job = models.ReportJob
+    candidates = db.execute(
+        select(job.id, job.tenant_id)
+        .where(job.status == models.ReportJobStatus.QUEUED)
+        .order_by(job.created_at)
+        .limit(max(limit * 10, 50))
+    ).all()
+    running = aliased(job)
+    claimed: List[uuid.UUID] = []
+    locked: dict[uuid.UUID, bool] = {}
+    for job_id, tenant_id in candidates:
+        if len(claimed) >= limit:
+            break
+        if tenant_id not in locked:
+            locked[tenant_id] = _lock_tenant(db, tenant_id)
+        if not locked[tenant_id]:
+            continue
+        tenant_running = (
+            select(func.count(running.id))
+            .where(running.tenant_id == tenant_id, running.status == models.ReportJobStatus.RUNNING)
+            .scalar_subquery()
+        )
+        result = db.execute(
+            update(job)
+            .where(job.id == job_id, job.status == models.ReportJobStatus.QUEUED, tenant_running < max_running_per_tenant)
+            .values(status=models.ReportJobStatus.RUNNING, started_at=datetime.utcnow())
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount == 1:
+            claimed.append(job_id)
+    return claimed
+
+def run_job(db: Session, job_id: uuid.UUID) -> models.ReportJob:
+    """Generates a claimed job's artifact and records the outcome. Commits."""
+    job = db.get(models.ReportJob, job_id)
+    path = artifact_path(job)
+    partial = f"{path}.part"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(partial, "wb") as artifact:
+            for chunk in _GENERATORS[job.kind](db, job):
+                artifact.write(chunk)
+        os.replace(partial, path)
+    except Exception as exc:
+        logger.exception("Report job %s failed", job_id)
+        if os.path.exists(partial):
+            os.remove(partial)
+        # A database error leaves the transaction aborted; recording the
+        # failure needs a fresh one, or the job would stay RUNNING (and keep
+        # its tenant's slot) until it times out
+        db.rollback()
+        job = db.get(models.ReportJob, job_id)
+        job.status = models.ReportJobStatus.FAILED
+        job.error = str(exc)[:500]
+    else:
+        now = datetime.utcnow()
+        job.status = models.ReportJobStatus.SUCCEEDED
+        job.artifact_path = path
+        job.artifact_size = os.path.getsize(path)
+        job.expires_at = now + timedelta(hours=settings.REPORT_ARTIFACT_RETENTION_HOURS)
+    job.finished_at = datetime.utcnow()
+    db.commit()
+    return job
+
+def fail_stale(db: Session, now: Optional[datetime] = None) -> int:
+    """
+    Fails RUNNING jobs older than REPORT_JOB_TIMEOUT_MINUTES, e.g. jobs whose
+    process was stopped mid-run, so they stop counting against the tenant's cap.
+    """
+    job = models.ReportJob
+    cutoff = (now or datetime.utcnow()) - timedelta(minutes=settings.REPORT_JOB_TIMEOUT_MINUTES)
+    result = db.execute(
+        update(job)
+        .where(job.status == models.ReportJobStatus.RUNNING, job.started_at < cutoff)
+        .values(status=models.ReportJobStatus.FAILED, error="Interrupted or timed out.", finished_at=datetime.utcnow())
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    return result.rowcount
+
+def purge_expired(db: Session, now: Optional[datetime] = None) -> int:
+    """Deletes artifacts past their retention and marks their jobs EXPIRED. Commits."""
+    job = models.ReportJob
+    expired = db.execute(
+        select(job).where(job.status == models.ReportJobStatus.SUCCEEDED, job.expires_at < (now or datetime.utcnow()))
+    ).scalars().all()
+    for expired_job in expired:
+        if expired_job.artifact_path and os.path.exists(expired_job.artifact_path):
+            os.remove(expired_job.artifact_path)
+        expired_job.status = models.ReportJobStatus.EXPIRED
+        expired_job.artifact_path = None
+    db.commit()
+    return len(expired)
+
+class ReportJobRunner:
+    """
+    The per-process worker pool. `dispatch()` fills free workers with claimed
+    jobs and is called after every enqueue, after every finished job and at
+    startup (to pick up jobs queued while no process had capacity).
+    """
+    def __init__(self, workers: int, max_running_per_tenant: int, session_factory: Callable[[], Session]):
+        self.workers = workers
+        self.max_running_per_tenant = max_running_per_tenant
+        self.session_factory = session_factory
+        self._executor: Executor | None = None
+        # Re-entrant: with workers=0 a job runs inline and dispatches again when it finishes
+        self._lock = threading.RLock()
+        self._in_flight = 0
+        self._last_purge = 0.0
+        self.completed = 0
+
+    def _get_executor(self) -> Executor | None:
+        if self._executor is None and self.workers > 0:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="report-job")
+        return self._executor
+
+    def dispatch(self) -> None:
+        with self._lock:
+            # REPORT_JOB_WORKERS=0 runs one job at a time inline (tests, local dev)
+            free = (self.workers or 1) - self._in_flight
+            if free <= 0:
+                return
+            db = self.session_factory()
+            try:
+                if time.monotonic() - self._last_purge > _PURGE_INTERVAL_SECONDS:
+                    self._last_purge = time.monotonic()
+                    fail_stale(db)
+                    purge_expired(db)
+                claimed = claim_jobs(db, free, self.max_running_per_tenant)
+                db.commit()
+            finally:
+                db.close()
+            self._in_flight += len(claimed)
+            executor = self._get_executor()
+        for job_id in claimed:
+            if executor is None:
+                self._run(job_id)
+            else:
+                executor.submit(self._run, job_id)
+
+    def _run(self, job_id: uuid.UUID) -> None:
+        db = self.session_factory()
+        try:
+            run_job(db, job_id)
+        except Exception:
+            logger.exception("Report job %s could not be recorded", job_id)
+        finally:
+            db.close()
+            with self._lock:
+                self._in_flight -= 1
+                self.completed += 1
+        self.dispatch()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "max_running_per_tenant": self.max_running_per_tenant,
+                "in_flight": self._in_flight,
+                "completed": self.completed,
+            }
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+runner = ReportJobRunner(
+    workers=settings.REPORT_JOB_WORKERS,
+    max_running_per_tenant=settings.REPORT_JOB_MAX_RUNNING_PER_TENANT,
+    session_factory=SessionLocal,
+)
+
+def enqueue(db: Session, job_in: reporting_schema.ReportJobCreate, user: models.User) -> models.ReportJob:
+    """Records a QUEUED job for the user's tenant. The caller commits and then calls `runner.dispatch()`."""
+    parameters = {
+        name: value.isoformat()
+        for name, value in (("as_of", job_in.as_of), ("start_date", job_in.start_date), ("end_date", job_in.end_date))
+        if value is not None
+    }
+    job = models.ReportJob(
+        kind=job_in.kind.value, format=job_in.format, parameters=parameters,
+        requested_by_user_id=user.id, tenant_id=user.tenant_id,
+    )
+    db.add(job)
+    return job
+
+def get_job(db: Session, job_id: uuid.UUID, tenant_id: uuid.UUID) -> models.ReportJob:
+    job = db.execute(
+        select(models.ReportJob).where(models.ReportJob.id == job_id, models.ReportJob.tenant_id == tenant_id)
+    ).scalar_one_or_none()
+    if not job:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Report job not found.")
+    return job
+
+def list_jobs(db: Session, tenant_id: uuid.UUID, limit: int = 50) -> List[models.ReportJob]:
+    return db.execute(
+        select(models.ReportJob)
+        .where(models.ReportJob.tenant_id == tenant_id)
+        .order_by(models.ReportJob.created_at.desc())
+        .limit(limit)
+    ).scalars().all()
+
+def artifact_for_download(db: Session, job_id: uuid.UUID, tenant_id: uuid.UUID) -> models.ReportJob:
+    """The job, if its artifact can be downloaded; 409 while it is not ready, 410 once expired."""
+    job = get_job(db, job_id, tenant_id)
+    if job.status == models.ReportJobStatus.EXPIRED or (
+        job.status == models.ReportJobStatus.SUCCEEDED and not os.path.exists(job.artifact_path)
+    ):
+        raise HTTPException(status_code=status.HTTP_410_GONE, detail="The report has expired; request it again.")
+    if job.status != models.ReportJobStatus.SUCCEEDED:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=f"The report is {job.status.value}.")
+    return job
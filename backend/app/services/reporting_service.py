@@ -4,42 +4,94 @@
 Service for aggregating data and generating reports and dashboard metrics.
 """
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, select, true
+from decimal import Decimal
 import uuid
 
 # --- CORRECTED: Specific imports ---
 from .. import models
+from ..core.cache import TTLCache, next_version, register_invalidator
+from ..core.config import settings
 from ..schemas import reporting as reporting_schema
+from . import aging_service
+
+# tenant id -> (metrics version, DashboardMetrics)
+_dashboard_cache = TTLCache(maxsize=settings.DASHBOARD_CACHE_MAXSIZE, ttl=settings.DASHBOARD_CACHE_TTL_SECONDS)
+# tenant id -> version, bumped after every commit that changes the tenant's metrics.
+# A cached result is only served while its version is still current, so a
+# result computed concurrently with a write can never outlive that write.
+_metrics_versions: dict[uuid.UUID, int] = {}
+
+def _metrics_statement(tenant_id: uuid.UUID):
+    """All dashboard figures as one single-row statement built from per-table CTEs."""
+    active = models.loan.LoanStatus.DISBURSED
+    lent = [models.loan.LoanStatus.DISBURSED, models.loan.LoanStatus.PAID_OFF]
+    clients = select(func.count(models.Client.id).label("total_clients")).where(
+        models.Client.tenant_id == tenant_id
+    ).cte("client_totals")
+    loans = select(
+        func.count(models.Loan.id).filter(models.Loan.status == active).label("active_loans"),
+        func.coalesce(func.sum(models.Loan.amount_requested), 0).label("total_disbursed"),
+    ).where(
+        models.Loan.tenant_id == tenant_id,
+        models.Loan.status.in_(lent)
+    ).cte("loan_totals")
+    repaid = select(
+        func.coalesce(func.sum(models.repayment.RepaymentTransaction.amount_paid), 0).label("total_repaid")
+    ).where(
+        models.repayment.RepaymentTransaction.tenant_id == tenant_id
+    ).cte("repayment_totals")
+    par = aging_service.par_totals(tenant_id, days=30).cte("par_totals")
+    return (
+        select(
+            clients.c.total_clients, loans.c.active_loans, loans.c.total_disbursed,
+            repaid.c.total_repaid, par.c.outstanding, par.c.at_risk,
+        )
+        .select_from(clients)
+        .join(loans, true())
+        .join(repaid, true())
+        .join(par, true())
+    )
+
+def compute_dashboard_metrics(db: Session, tenant_id: uuid.UUID) -> reporting_schema.DashboardMetrics:
+    """Calculates the dashboard metrics from the database with a single query."""
+    row = db.execute(_metrics_statement(tenant_id)).one()
+    return reporting_schema.DashboardMetrics(
+        total_clients=row.total_clients or 0,
+        active_loans=row.active_loans or 0,
+        total_disbursed=float(row.total_disbursed or 0.0),
+        total_repaid=float(row.total_repaid or 0.0),
+        # Read from the maintained aging aggregate, not the repayment schedules
+        portfolio_at_risk_par30=float(Decimal(row.at_risk) / Decimal(row.outstanding)) if row.outstanding else 0.0,
+    )
 
 def get_dashboard_metrics(db: Session, tenant_id: uuid.UUID) -> reporting_schema.DashboardMetrics:
     """
     Calculates key performance indicators for the MFI admin dashboard.
+    Served from a per-tenant cache until the tenant's metrics version changes
+    (see `invalidate_dashboard`) or the entry expires.
     """
-    total_clients = db.query(func.count(models.Client.id)).filter(
-        models.Client.tenant_id == tenant_id
-    ).scalar()
+    version = _metrics_versions.get(tenant_id, 0)
+    cached = _dashboard_cache.get(tenant_id)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    metrics = compute_dashboard_metrics(db, tenant_id)
+    _dashboard_cache.set(tenant_id, (version, metrics))
+    return metrics
 
-    active_loans = db.query(func.count(models.Loan.id)).filter(
-        models.Loan.tenant_id == tenant_id,
-        models.Loan.status == models.loan.LoanStatus.DISBURSED
-    ).scalar()
-    
-    total_disbursed_query = db.query(func.sum(models.Loan.amount_requested)).filter(
-        models.Loan.tenant_id == tenant_id,
-        models.Loan.status.in_([models.loan.LoanStatus.DISBURSED, models.loan.LoanStatus.PAID_OFF])
-    ).scalar()
-    
-    total_repaid_query = db.query(func.sum(models.repayment.RepaymentTransaction.amount_paid)).filter(
-        models.repayment.RepaymentTransaction.tenant_id == tenant_id
-    ).scalar()
+def invalidate_dashboard(db: Session, tenant_id: uuid.UUID) -> None:
+    """
+    Marks the tenant's dashboard metrics stale once `db` commits. Call from
+    every write that changes them (disbursements, repayments, sweeps).
+    """
+    _queue_dashboards(db, [tenant_id])
 
-    # In a real app, PAR would be more complex, checking overdue dates
-    portfolio_at_risk_par30 = 0.0 
+def dashboard_cache_stats() -> dict:
+    return _dashboard_cache.stats()
 
-    return reporting_schema.DashboardMetrics(
-        total_clients=total_clients or 0,
-        active_loans=active_loans or 0,
-        total_disbursed=float(total_disbursed_query or 0.0),
-        total_repaid=float(total_repaid_query or 0.0),
-        portfolio_at_risk_par30=portfolio_at_risk_par30
-    )
\ No newline at end of file
+# --- Version bumps are applied only once the transaction commits ---
+
+def _bump_metrics_version(tenant_id: uuid.UUID) -> None:
+    _metrics_versions[tenant_id] = next_version()
+
+_queue_dashboards = register_invalidator("stale_dashboards", _bump_metrics_version)
@@ -1,17 +1,41 @@
+from fastapi import HTTPException, status
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 import uuid
 from ..models.user import User
 from ..schemas.user import UserCreate
 from ..core.security import get_password_hash, verify_password, UserRole
+from ..core import principal
+from ..core.hashing import HashingBusyError, password_hasher
 from .. import schemas
 
 def get_user_by_email(db: Session, email: str) -> User | None:
     return db.query(User).filter(User.email == email).first()
 
+async def hash_password(password: str) -> str:
+    """
+    Hashes a new password in the dedicated hashing pool, like logins do.
+    A saturated pool is refused with a 503 rather than queued.
+    """
+    try:
+        return await password_hasher.hash(password)
+    except HashingBusyError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many concurrent requests. Please retry shortly.",
+            headers={"Retry-After": "1"},
+        )
+
 def create_user(
-    db: Session, user_in: UserCreate, role: UserRole, tenant_id: uuid.UUID, client_id: uuid.UUID | None = None
+    db: Session, user_in: UserCreate, role: UserRole, tenant_id: uuid.UUID, client_id: uuid.UUID | None = None,
+    hashed_password: str | None = None,
 ) -> User:
-    hashed_password = get_password_hash(user_in.password)
+    """
+    Request handlers pass `hashed_password` from `hash_password`; without it
+    the password is hashed inline (scripts and tests).
+    """
+    if hashed_password is None:
+        hashed_password = get_password_hash(user_in.password)
     db_user = User(
         email=user_in.email,
         hashed_password=hashed_password,
@@ -32,7 +56,32 @@ def authenticate_user(db: Session, email: str, password: str) -> User | None:
         return None
     return user
 
-def create_team_member(db: Session, member_in: schemas.user.TeamMemberCreate, tenant_id: uuid.UUID) -> User:
+async def authenticate_user_async(db: Session, email: str, password: str) -> User | None:
+    """
+    Async variant of `authenticate_user` for the login endpoint.
+
+    The bcrypt check runs in the dedicated hashing pool (and may raise
+    `HashingBusyError`), so it never occupies a request thread. If the stored
+    hash uses an outdated bcrypt cost it is transparently replaced.
+    """
+    user = await run_in_threadpool(get_user_by_email, db, email)
+    if not user:
+        return None
+    is_valid, new_hash = await password_hasher.verify(password, user.hashed_password)
+    if not is_valid:
+        return None
+    if new_hash:
+        await run_in_threadpool(update_password_hash, db, user, new_hash)
+    return user
+
+def update_password_hash(db: Session, user: User, hashed_password: str) -> None:
+    user.hashed_password = hashed_password
+    db.commit()
+    db.refresh(user)
+
+def create_team_member(
+    db: Session, member_in: schemas.user.TeamMemberCreate, tenant_id: uuid.UUID, hashed_password: str | None = None
+) -> User:
     """
     Creates a new user (team member) within a specific tenant.
     This is called by an admin of that tenant.
@@ -45,5 +94,27 @@ def create_team_member(db: Session, member_in: schemas.user.TeamMemberCreate, te
         db,
         user_in=schemas.user.UserCreate(email=member_in.email, password=member_in.password),
         role=member_in.role,
-        tenant_id=tenant_id
-    )
\ No newline at end of file
+        tenant_id=tenant_id,
+        hashed_password=hashed_password,
+    )
+
+def revoke_tokens(db: Session, user: User) -> User:
+    """
+    Invalidates every access token issued to the user so far by bumping
+    their token version. Other workers notice within the version-cache TTL.
+    """
+    user.token_version = (user.token_version or 0) + 1
+    db.commit()
+    principal.invalidate_user(user.id)
+    db.refresh(user)
+    return user
+
+def set_user_active(db: Session, user: User, is_active: bool) -> User:
+    """Activates or deactivates a user; deactivation also revokes their tokens."""
+    user.is_active = is_active
+    if not is_active:
+        user.token_version = (user.token_version or 0) + 1
+    db.commit()
+    principal.invalidate_user(user.id)
+    db.refresh(user)
+    return user
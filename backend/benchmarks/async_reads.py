@@ -0,0 +1,152 @@
+# backend/benchmarks/async_reads.py
+
+"""
+Concurrent-throughput comparison of the sync and async read paths.
+
+Registers sync copies of the ported read endpoints (the pre-async
+implementation, running in the anyio threadpool on `SessionLocal`) next to
+the async ones, then drives both with the same number of concurrent clients
+and reports requests/sec and latency percentiles.
+
+The difference is most visible against a networked Postgres, where each
+request spends most of its time waiting on the database:
+
+    DATABASE_URL=postgresql://... python -m benchmarks.async_reads --concurrency 200
+
+Without DATABASE_URL a temporary SQLite file is used.
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.gettempdir()}/mfx_bench_reads.db")
+os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+
+import anyio.to_thread  # noqa: E402
+import httpx  # noqa: E402
+from fastapi import Depends  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from app import models  # noqa: E402
+from app.core import security  # noqa: E402
+from app.core.database import SessionLocal, engine, get_db  # noqa: E402
+from app.core.dependencies import allow_admin_only, allow_clients_only, get_current_user  # noqa: E402
+from app.core.principal import Principal  # noqa: E402
+from app.core.security import UserRole  # noqa: E402
+from app.main import app  # noqa: E402
+from app.services import reporting_service  # noqa: E402
+
+# --- The pre-async implementations, kept only for comparison ---
+
+@app.get("/bench/sync/my-loans", include_in_schema=False)
+def sync_my_loans(current_user: Principal = Depends(allow_clients_only), db: Session = Depends(get_db)):
+    loans = db.query(models.Loan).filter(models.Loan.client_id == current_user.client_id).all()
+    return [{"id": str(loan.id), "status": loan.status.value} for loan in loans]
+
+@app.get("/bench/sync/loan-products", include_in_schema=False)
+def sync_loan_products(current_user: Principal = Depends(get_current_user), db: Session = Depends(get_db)):
+    products = db.query(models.LoanProduct).filter(models.LoanProduct.tenant_id == current_user.tenant_id).all()
+    return [{"id": str(p.id), "name": p.name} for p in products]
+
+@app.get("/bench/sync/dashboard", include_in_schema=False)
+def sync_dashboard(current_user: Principal = Depends(allow_admin_only), db: Session = Depends(get_db)):
+    return reporting_service.get_dashboard_metrics(db, tenant_id=current_user.tenant_id)
+
+ENDPOINTS = {
+    "my-loans": ("/bench/sync/my-loans", "/api/v1/loans/my-loans", "client"),
+    "loan-products": ("/bench/sync/loan-products", "/api/v1/loan-products/", "client"),
+    "dashboard": ("/bench/sync/dashboard", "/api/v1/reports/dashboard", "admin"),
+}
+
+
+def seed(loans_per_client: int) -> dict[str, str]:
+    models.Base.metadata.drop_all(bind=engine)
+    models.Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        tenant = models.Tenant(name="Bench Reads MFI", subdomain="benchreads")
+        db.add(tenant)
+        db.flush()
+        client = models.Client(first_name="Bench", last_name="Borrower", tenant_id=tenant.id)
+        db.add(client)
+        product = models.LoanProduct(name="Bench Loan", interest_rate=12, max_tenure_months=12, tenant_id=tenant.id)
+        db.add(product)
+        db.flush()
+        db.add_all(
+            models.Loan(
+                amount_requested=1000, tenure_months=6, client_id=client.id, loan_product_id=product.id,
+                tenant_id=tenant.id, status=models.LoanStatus.DISBURSED
+            )
+            for _ in range(loans_per_client)
+        )
+        admin = models.User(email="admin@example.com", hashed_password="x", role=UserRole.ADMIN.value, tenant_id=tenant.id)
+        borrower = models.User(
+            email="borrower@example.com", hashed_password="x", role=UserRole.CLIENT.value,
+            tenant_id=tenant.id, client_id=client.id
+        )
+        db.add_all([admin, borrower])
+        db.commit()
+        return {
+            "admin": security.create_access_token(security.build_token_claims(admin)),
+            "client": security.create_access_token(security.build_token_claims(borrower)),
+        }
+    finally:
+        db.close()
+
+
+async def drive(path: str, token: str, requests: int, concurrency: int) -> dict:
+    transport = httpx.ASGITransport(app=app)
+    latencies: list[float] = []
+    remaining = requests
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120) as client:
+        headers = {"Authorization": f"Bearer {token}"}
+        await client.get(path, headers=headers)  # warm-up
+
+        async def worker():
+            nonlocal remaining
+            while remaining > 0:
+                remaining -= 1
+                start = time.perf_counter()
+                r = await client.get(path, headers=headers)
+                r.raise_for_status()
+                latencies.append((time.perf_counter() - start) * 1000)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "rps": len(latencies) / elapsed,
+        "p50_ms": statistics.median(latencies),
+        "p99_ms": latencies[min(len(latencies) - 1, int(0.99 * len(latencies)))],
+    }
+
+
+async def run_all(args, tokens: dict[str, str]):
+    # Mirror production: the sync path is bounded by the anyio threadpool size
+    anyio.to_thread.current_default_thread_limiter().total_tokens = args.threads
+    for name in args.endpoints:
+        sync_path, async_path, role = ENDPOINTS[name]
+        for label, path in (("sync", sync_path), ("async", async_path)):
+            result = await drive(path, tokens[role], args.requests, args.concurrency)
+            print(f"{name:>14} {label:>5}: {result['rps']:8.1f} req/s  p50={result['p50_ms']:.1f}ms  p99={result['p99_ms']:.1f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--threads", type=int, default=40, help="anyio threadpool size (FastAPI default: 40)")
+    parser.add_argument("--loans", type=int, default=20, help="loans per client to return from my-loans")
+    parser.add_argument("--endpoints", nargs="+", choices=sorted(ENDPOINTS), default=sorted(ENDPOINTS))
+    args = parser.parse_args()
+
+    tokens = seed(args.loans)
+    asyncio.run(run_all(args, tokens))
+
+
+if __name__ == "__main__":
+    main()
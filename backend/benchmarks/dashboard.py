@@ -0,0 +1,138 @@
+# backend/benchmarks/dashboard.py
+
+"""
+Dashboard latency on a large tenant: the pre-CTE implementation versus the
+single-query `compute_dashboard_metrics` and the cached `get_dashboard_metrics`.
+
+  legacy   four separate aggregate queries (clients, loans x2, repayments)
+  query    one CTE-based statement, uncached
+  cached   `get_dashboard_metrics` with a warm per-tenant cache
+
+Usage (from backend/):
+    python -m benchmarks.dashboard --transactions 1000000
+    DATABASE_URL=postgresql://... python -m benchmarks.dashboard --transactions 1000000
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.gettempdir()}/mfx_bench_dashboard.db")
+os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+
+from sqlalchemy import func, insert  # noqa: E402
+
+from app import models  # noqa: E402
+from app.core.database import SessionLocal, engine  # noqa: E402
+from app.services import aging_service, reporting_service  # noqa: E402
+
+
+def new_id() -> uuid.UUID:
+    """
+    uuid4 minus the rare ids SQLite would coerce to numbers (the Postgres UUID
+    column type has NUMERIC affinity there), which break uniqueness at 1M rows.
+    """
+    while True:
+        candidate = uuid.uuid4()
+        if not candidate.hex.replace("e", "", 1).isdigit():
+            return candidate
+
+
+def legacy_metrics(db, tenant_id):
+    """The pre-CTE `get_dashboard_metrics` queries, kept only for comparison."""
+    db.query(func.count(models.Client.id)).filter(models.Client.tenant_id == tenant_id).scalar()
+    db.query(func.count(models.Loan.id)).filter(
+        models.Loan.tenant_id == tenant_id, models.Loan.status == models.LoanStatus.DISBURSED
+    ).scalar()
+    db.query(func.sum(models.Loan.amount_requested)).filter(
+        models.Loan.tenant_id == tenant_id,
+        models.Loan.status.in_([models.LoanStatus.DISBURSED, models.LoanStatus.PAID_OFF])
+    ).scalar()
+    db.query(func.sum(models.RepaymentTransaction.amount_paid)).filter(
+        models.RepaymentTransaction.tenant_id == tenant_id
+    ).scalar()
+
+
+def seed(clients: int, loans: int, transactions: int, chunk: int = 50_000) -> uuid.UUID:
+    models.Base.metadata.drop_all(bind=engine)
+    models.Base.metadata.create_all(bind=engine)
+    rng = random.Random(15)
+    db = SessionLocal()
+    try:
+        tenant = models.Tenant(name="Bench Dashboard MFI", subdomain="benchdashboard")
+        db.add(tenant)
+        db.flush()
+        teller = models.User(email="teller@bench.test", hashed_password="x", role="teller", tenant_id=tenant.id)
+        product = models.LoanProduct(name="Bench Loan", interest_rate=18, max_tenure_months=12, tenant_id=tenant.id)
+        db.add_all([teller, product])
+        db.flush()
+        client_ids = [new_id() for _ in range(clients)]
+        db.execute(insert(models.Client.__table__), [
+            {"id": client_id, "first_name": "Bench", "last_name": str(i), "tenant_id": tenant.id}
+            for i, client_id in enumerate(client_ids)
+        ])
+        loan_ids = [new_id() for _ in range(loans)]
+        statuses = [models.LoanStatus.DISBURSED, models.LoanStatus.PAID_OFF, models.LoanStatus.PENDING]
+        db.execute(insert(models.Loan.__table__), [
+            {
+                "id": loan_id, "amount_requested": Decimal(rng.randint(100, 5000)), "tenure_months": 12,
+                "status": statuses[i % 3], "client_id": rng.choice(client_ids), "loan_product_id": product.id,
+                "tenant_id": tenant.id,
+            }
+            for i, loan_id in enumerate(loan_ids)
+        ])
+        start = datetime(2024, 1, 1)
+        for offset in range(0, transactions, chunk):
+            db.execute(insert(models.RepaymentTransaction.__table__), [
+                {
+                    "id": new_id(), "loan_id": rng.choice(loan_ids), "amount_paid": Decimal("25.00"),
+                    "transaction_date": start + timedelta(minutes=offset + i), "recorded_by_user_id": teller.id,
+                    "tenant_id": tenant.id,
+                }
+                for i in range(min(chunk, transactions - offset))
+            ])
+        aging_service.rebuild_tenant_aging(db, tenant.id)
+        db.commit()
+        return tenant.id
+    finally:
+        db.close()
+
+
+def timed(label: str, fn, runs: int) -> None:
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    print(f"{label:>7}: median {statistics.median(samples):9.3f} ms  (min {min(samples):.3f}, max {max(samples):.3f})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=20_000)
+    parser.add_argument("--loans", type=int, default=50_000)
+    parser.add_argument("--transactions", type=int, default=1_000_000)
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    seed_start = time.perf_counter()
+    tenant_id = seed(args.clients, args.loans, args.transactions)
+    print(f"seeded {args.transactions:,} transactions in {time.perf_counter() - seed_start:.1f}s")
+
+    db = SessionLocal()
+    try:
+        timed("legacy", lambda: legacy_metrics(db, tenant_id), args.runs)
+        timed("query", lambda: reporting_service.compute_dashboard_metrics(db, tenant_id), args.runs)
+        reporting_service.get_dashboard_metrics(db, tenant_id)
+        timed("cached", lambda: reporting_service.get_dashboard_metrics(db, tenant_id), args.runs)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
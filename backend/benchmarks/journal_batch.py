@@ -0,0 +1,96 @@
+# backend/benchmarks/journal_batch.py
+
+"""
+Journal posting throughput: the pre-batch posting path versus
+`accounting_service.post_journal_batch`.
+
+  legacy  - per entry, look up both accounts and add one ORM object per leg
+            (the old `post_transaction`), committing once at the end.
+  batch   - one `post_journal_batch` call for all entries (multi-row INSERT,
+            or COPY on Postgres above JOURNAL_COPY_THRESHOLD rows).
+
+Usage (from backend/):
+    python -m benchmarks.journal_batch --entries 10000
+    DATABASE_URL=postgresql://... python -m benchmarks.journal_batch --entries 50000
+"""
+import argparse
+import os
+import tempfile
+import time
+import uuid
+from decimal import Decimal
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.gettempdir()}/mfx_bench_journal.db")
+os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+
+from app import models  # noqa: E402
+from app.core.database import SessionLocal, engine  # noqa: E402
+from app.schemas import accounting as accounting_schema  # noqa: E402
+from app.services import accounting_service  # noqa: E402
+
+
+def legacy_post(db, tenant_id, description, debit_code, credit_code, amount):
+    """The pre-batch `post_transaction`, kept only for comparison."""
+    transaction_id = str(uuid.uuid4())
+    chart = models.ChartOfAccount
+    debit_account = db.query(chart).filter(chart.account_code == debit_code, chart.tenant_id == tenant_id).first()
+    credit_account = db.query(chart).filter(chart.account_code == credit_code, chart.tenant_id == tenant_id).first()
+    for account, debit, credit in ((debit_account, amount, Decimal("0.00")), (credit_account, Decimal("0.00"), amount)):
+        db.add(models.GeneralLedgerEntry(
+            transaction_id=transaction_id, description=description, account_id=account.id,
+            debit=debit, credit=credit, tenant_id=tenant_id
+        ))
+
+
+def seed() -> uuid.UUID:
+    models.Base.metadata.drop_all(bind=engine)
+    models.Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        tenant = models.Tenant(name="Bench Journal MFI", subdomain="benchjournal")
+        db.add(tenant)
+        db.flush()
+        db.add_all(models.ChartOfAccount(**account, tenant_id=tenant.id) for account in models.DEFAULT_COA)
+        db.commit()
+        return tenant.id
+    finally:
+        db.close()
+
+
+def run(mode: str, tenant_id: uuid.UUID, entries: int) -> float:
+    db = SessionLocal()
+    try:
+        start = time.perf_counter()
+        if mode == "legacy":
+            for i in range(entries):
+                legacy_post(db, tenant_id, f"Repayment {i}", "1010", "1100", Decimal("100.00"))
+        else:
+            line = accounting_schema.JournalLine
+            journal = [
+                accounting_schema.JournalEntry(description=f"Repayment {i}", lines=[
+                    line(account_code="1010", debit=Decimal("100.00")),
+                    line(account_code="1100", credit=Decimal("100.00")),
+                ])
+                for i in range(entries)
+            ]
+            accounting_service.post_journal_batch(db, tenant_id, journal)
+        db.commit()
+        return time.perf_counter() - start
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entries", type=int, default=10000)
+    parser.add_argument("--mode", choices=["legacy", "batch", "both"], default="both")
+    args = parser.parse_args()
+
+    tenant_id = seed()
+    for mode in (["legacy", "batch"] if args.mode == "both" else [args.mode]):
+        elapsed = run(mode, tenant_id, args.entries)
+        print(f"{mode:>6}: {args.entries} entries in {elapsed:.2f}s ({args.entries / elapsed:,.0f} entries/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+# backend/benchmarks/loan_export.py
+
+"""
+Memory and time of the loan export: the pre-streaming implementation versus
+the streaming CSV and XLSX writers of `export_service`.
+
+  legacy  ORM objects -> list of dicts -> pandas DataFrame -> in-memory workbook
+  csv     `export_service.stream_loans(..., "csv")`
+  xlsx    `export_service.stream_loans(..., "xlsx")`
+
+Each mode runs in its own child process so its peak RSS is measured in
+isolation. The output is consumed chunk by chunk and discarded, as the
+response would be.
+
+Usage (from backend/):
+    python -m benchmarks.loan_export --loans 1000000
+    python -m benchmarks.loan_export --loans 1000000 --modes csv,xlsx
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from decimal import Decimal
+from io import BytesIO
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.gettempdir()}/mfx_bench_export.db")
+os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+
+from sqlalchemy import func, insert, select  # noqa: E402
+
+from app import models  # noqa: E402
+from app.core.database import SessionLocal, engine  # noqa: E402
+from app.services import export_service  # noqa: E402
+from benchmarks.dashboard import new_id  # noqa: E402
+
+SUBDOMAIN = "benchexport"
+
+
+def legacy_export(db, tenant_id) -> BytesIO:
+    """The pre-streaming export endpoint body, kept only for comparison."""
+    import pandas as pd
+
+    loans = db.query(models.Loan).filter(models.Loan.tenant_id == tenant_id).all()
+    loan_data = [
+        {
+            "loan_id": str(loan.id),
+            "client_id": str(loan.client_id),
+            "amount_requested": float(loan.amount_requested),
+            "status": loan.status.value,
+            "applied_at": loan.applied_at.strftime("%Y-%m-%d %H:%M:%S") if loan.applied_at else None
+        }
+        for loan in loans
+    ]
+    df = pd.DataFrame(loan_data)
+    output = BytesIO()
+    with pd.ExcelWriter(output, engine='openpyxl') as writer:
+        df.to_excel(writer, index=False, sheet_name='Loans')
+    output.seek(0)
+    return output
+
+
+def seed(loans: int, chunk: int = 50_000) -> None:
+    db = SessionLocal()
+    try:
+        models.Base.metadata.create_all(bind=engine)
+        tenant = db.query(models.Tenant).filter(models.Tenant.subdomain == SUBDOMAIN).first()
+        if tenant is not None:
+            existing = db.execute(select(func.count(models.Loan.id)).where(models.Loan.tenant_id == tenant.id)).scalar()
+            if existing == loans:
+                return
+        models.Base.metadata.drop_all(bind=engine)
+        models.Base.metadata.create_all(bind=engine)
+        tenant = models.Tenant(name="Bench Export MFI", subdomain=SUBDOMAIN)
+        db.add(tenant)
+        db.flush()
+        client = models.Client(first_name="Bench", last_name="Borrower", tenant_id=tenant.id)
+        product = models.LoanProduct(name="Bench Loan", interest_rate=18, max_tenure_months=12, tenant_id=tenant.id)
+        db.add_all([client, product])
+        db.flush()
+        for offset in range(0, loans, chunk):
+            db.execute(insert(models.Loan.__table__), [
+                {
+                    "id": new_id(), "amount_requested": Decimal(100 + (offset + i) % 5000), "tenure_months": 12,
+                    "status": models.LoanStatus.DISBURSED, "client_id": client.id,
+                    "loan_product_id": product.id, "tenant_id": tenant.id,
+                }
+                for i in range(min(chunk, loans - offset))
+            ])
+        db.commit()
+    finally:
+        db.close()
+
+
+def run_mode(mode: str) -> None:
+    """Child process body: run one export and print its time and size."""
+    db = SessionLocal()
+    try:
+        tenant_id = db.query(models.Tenant.id).filter(models.Tenant.subdomain == SUBDOMAIN).scalar()
+        start = time.perf_counter()
+        if mode == "legacy":
+            size = len(legacy_export(db, tenant_id).getvalue())
+        else:
+            size = sum(len(chunk) for chunk in export_service.stream_loans(db, tenant_id, mode))
+        print(f"{time.perf_counter() - start:.1f} {size}")
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--loans", type=int, default=1_000_000)
+    parser.add_argument("--modes", default="legacy,csv,xlsx")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        run_mode(args.child)
+        return
+
+    seed(args.loans)
+    print(f"{args.loans:,} loans")
+    for mode in args.modes.split(","):
+        child = subprocess.Popen(
+            [sys.executable, "-m", "benchmarks.loan_export", "--child", mode], stdout=subprocess.PIPE, text=True
+        )
+        output = child.stdout.read().split()
+        _, status, usage = os.wait4(child.pid, 0)
+        if status != 0 or len(output) != 2:
+            print(f"{mode:>6}: failed (status {status})")
+            continue
+        elapsed, size = output
+        # ru_maxrss is in KiB on Linux
+        print(f"{mode:>6}: {float(elapsed):7.1f}s  peak RSS {usage.ru_maxrss / 1024:8.1f} MiB  output {int(size) / 2**20:7.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+# backend/benchmarks/login_storm.py
+
+"""
+Login-storm benchmark.
+
+Fires a burst of concurrent logins at the API while a probe client keeps
+calling an unrelated endpoint (`GET /loan-products/`), and reports login
+throughput plus the probe's latency percentiles. Two modes are compared:
+
+  legacy  - bcrypt verification inside a sync endpoint (the old behaviour),
+            occupying the shared anyio threadpool.
+  pool    - the async `/auth/token` path backed by the hashing process pool.
+
+Usage (from backend/):
+    python -m benchmarks.login_storm --logins 400 --concurrency 80
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.gettempdir()}/mfx_bench_login.db")
+os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+
+import httpx  # noqa: E402
+from fastapi import Depends  # noqa: E402
+from fastapi.security import OAuth2PasswordRequestForm  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from app import models  # noqa: E402
+from app.core import security  # noqa: E402
+from app.core.database import engine, get_db, SessionLocal  # noqa: E402
+from app.core.security import UserRole  # noqa: E402
+from app.main import app  # noqa: E402
+from app.schemas.user import UserCreate  # noqa: E402
+from app.services import user_service  # noqa: E402
+
+EMAIL = "storm.teller@example.com"
+PASSWORD = "storm-password"
+
+
+@app.post("/bench/legacy-token", include_in_schema=False)
+def legacy_login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
+    """The pre-pool login: synchronous bcrypt inside the request threadpool."""
+    user = user_service.authenticate_user(db, email=form_data.username, password=form_data.password)
+    return {"ok": user is not None}
+
+
+def seed() -> str:
+    models.Base.metadata.drop_all(bind=engine)
+    models.Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        tenant = models.Tenant(name="Bench MFI", subdomain="bench")
+        db.add(tenant)
+        db.flush()
+        user = user_service.create_user(db, UserCreate(email=EMAIL, password=PASSWORD), UserRole.TELLER, tenant.id)
+        return security.create_access_token(data=security.build_token_claims(user))
+    finally:
+        db.close()
+
+
+def percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return float("nan")
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))]
+
+
+async def run(mode: str, logins: int, concurrency: int, token: str) -> dict:
+    path = "/api/v1/auth/token" if mode == "pool" else "/bench/legacy-token"
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120) as client:
+        remaining = logins
+        statuses: dict[int, int] = {}
+        probe_latencies: list[float] = []
+        done = asyncio.Event()
+
+        async def login_worker():
+            nonlocal remaining
+            while remaining > 0:
+                remaining -= 1
+                r = await client.post(path, data={"username": EMAIL, "password": PASSWORD})
+                statuses[r.status_code] = statuses.get(r.status_code, 0) + 1
+
+        async def probe():
+            headers = {"Authorization": f"Bearer {token}"}
+            while not done.is_set():
+                start = time.perf_counter()
+                await client.get("/api/v1/loan-products/", headers=headers)
+                probe_latencies.append((time.perf_counter() - start) * 1000)
+                await asyncio.sleep(0.01)
+
+        # Warm up the pool and caches outside of the measurement
+        await client.post(path, data={"username": EMAIL, "password": PASSWORD})
+        probe_task = asyncio.create_task(probe())
+        started = time.perf_counter()
+        await asyncio.gather(*(login_worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+        done.set()
+        await probe_task
+
+    return {
+        "mode": mode,
+        "logins_per_sec": statuses.get(200, 0) / elapsed,
+        "statuses": statuses,
+        "probe_requests": len(probe_latencies),
+        "probe_p50_ms": statistics.median(probe_latencies) if probe_latencies else float("nan"),
+        "probe_p99_ms": percentile(probe_latencies, 99),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=60)
+    parser.add_argument("--mode", choices=["legacy", "pool", "both"], default="both")
+    args = parser.parse_args()
+
+    token = seed()
+    modes = ["legacy", "pool"] if args.mode == "both" else [args.mode]
+    for mode in modes:
+        result = asyncio.run(run(mode, args.logins, args.concurrency, token))
+        print(
+            f"{result['mode']:>6}: {result['logins_per_sec']:.1f} logins/s  statuses={result['statuses']}  "
+            f"probe n={result['probe_requests']} p50={result['probe_p50_ms']:.1f}ms p99={result['probe_p99_ms']:.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+# backend/benchmarks/schedule_engine.py
+
+"""
+Schedule generation throughput: the vectorized engine versus the
+loop-per-installment implementations.
+
+  legacy     the old flat-only `generate_schedule` loop (Decimal +
+             relativedelta + one ORM object per installment), on a sample
+  reference  `schedule_engine.reference_schedule`, on a sample
+  engine     `schedule_engine.compute_schedules` for all loans at once
+  rows       engine + conversion to insert-ready rows
+  insert     rows + bulk insert into DATABASE_URL (with --insert)
+
+Sampled timings are extrapolated to the full loan count.
+
+Usage (from backend/):
+    python -m benchmarks.schedule_engine --loans 100000 --tenure 24
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+import uuid
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.gettempdir()}/mfx_bench_schedule.db")
+os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+
+import numpy as np  # noqa: E402
+from dateutil.relativedelta import relativedelta  # noqa: E402
+
+from app import models  # noqa: E402
+from app.core.database import SessionLocal, engine  # noqa: E402
+from app.models.loan import InterestMethod  # noqa: E402
+from app.services import repayment_service, schedule_engine  # noqa: E402
+
+
+def legacy_schedule(principal: Decimal, rate: Decimal, tenure: int, start: datetime, grace_days: int):
+    """The pre-engine flat-interest `generate_schedule` loop, kept only for comparison."""
+    total_interest = principal * (rate / Decimal(100)) * (Decimal(tenure) / Decimal(12))
+    monthly_payment = (principal + total_interest) / Decimal(tenure)
+    monthly_principal = principal / Decimal(tenure)
+    monthly_interest = total_interest / Decimal(tenure)
+    return [
+        models.RepaymentSchedule(
+            loan_id=None, due_date=(start + relativedelta(months=i, days=grace_days)).date(),
+            amount_due=monthly_payment, principal_due=monthly_principal, interest_due=monthly_interest, tenant_id=None
+        )
+        for i in range(1, tenure + 1)
+    ]
+
+
+def make_loans(count: int, tenure: int):
+    rng = random.Random(42)
+    methods = list(InterestMethod)
+    return [
+        (
+            Decimal(rng.randint(10_000, 5_000_000)) / 100, Decimal(rng.randint(500, 4_000)) / 100, tenure,
+            methods[i % len(methods)], date(2025, 1, 1) + timedelta(days=rng.randint(0, 365)), rng.choice([0, 0, 7]),
+        )
+        for i in range(count)
+    ]
+
+
+class _Product:
+    def __init__(self, rate, method):
+        self.interest_rate, self.interest_method = rate, method.value
+
+
+class _Loan:
+    """Duck-typed stand-in for models.Loan, so row building runs without a session."""
+    def __init__(self, principal, rate, tenure, method, start, tenant_id):
+        self.id, self.tenant_id = uuid.uuid4(), tenant_id
+        self.amount_requested, self.tenure_months = principal, tenure
+        self.disbursed_at = datetime.combine(start, datetime.min.time())
+        self.product = _Product(rate, method)
+
+
+def timed(label: str, fn, scale: float = 1.0):
+    start = time.perf_counter()
+    result = fn()
+    elapsed = (time.perf_counter() - start) * scale
+    suffix = " (extrapolated)" if scale != 1.0 else ""
+    print(f"{label:>10}: {elapsed:8.2f}s{suffix}")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--loans", type=int, default=100_000)
+    parser.add_argument("--tenure", type=int, default=24)
+    parser.add_argument("--sample", type=int, default=5_000, help="loans timed for the slow implementations")
+    parser.add_argument("--insert", action="store_true", help="also bulk insert the rows into DATABASE_URL")
+    args = parser.parse_args()
+
+    loans = make_loans(args.loans, args.tenure)
+    sample = loans[: args.sample]
+    scale = args.loans / len(sample)
+    print(f"{args.loans} loans x {args.tenure} months = {args.loans * args.tenure:,} installments")
+
+    timed("legacy", lambda: [
+        legacy_schedule(p, r, n, datetime.combine(s, datetime.min.time()), g) for p, r, n, _, s, g in sample
+    ], scale)
+    timed("reference", lambda: [schedule_engine.reference_schedule(*loan) for loan in sample], scale)
+    timed("engine", lambda: schedule_engine.compute_schedules(
+        principal=[schedule_engine.to_minor_units(loan[0]) for loan in loans],
+        rate=[schedule_engine.to_rate(loan[1]) for loan in loans],
+        tenure=[loan[2] for loan in loans],
+        method=[schedule_engine.METHOD_CODES[loan[3]] for loan in loans],
+        start_date=np.array([loan[4] for loan in loans], dtype="datetime64[D]"),
+        grace_days=[loan[5] for loan in loans],
+    ))
+    tenant_id = uuid.uuid4()
+    stand_ins = [_Loan(p, r, n, m, s, tenant_id) for p, r, n, m, s, _ in loans]
+    rows = timed("rows", lambda: repayment_service.schedule_rows(stand_ins, [loan[5] for loan in loans]))
+
+    if args.insert:
+        models.Base.metadata.drop_all(bind=engine, tables=[models.RepaymentSchedule.__table__])
+        models.Base.metadata.create_all(bind=engine, tables=[models.RepaymentSchedule.__table__])
+        db = SessionLocal()
+        try:
+            timed("insert", lambda: (repayment_service.insert_schedule_rows(db, rows), db.commit()))
+        finally:
+            db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,251 @@
+# backend/manage.py
+
+"""
+Operational commands for MFI-SaaS.
+
+Usage (from backend/):
+    python manage.py balances verify [--tenant SUBDOMAIN]
+    python manage.py balances rebuild [--tenant SUBDOMAIN]
+    python manage.py sweep [--tenant SUBDOMAIN] [--as-of YYYY-MM-DD] [--workers N]
+    python manage.py aging rebuild [--tenant SUBDOMAIN] [--as-of YYYY-MM-DD]
+    python manage.py loans verify [--tenant SUBDOMAIN]
+    python manage.py loans rebuild [--tenant SUBDOMAIN]
+    python manage.py reports purge
+    python manage.py analytics sync [--tenant SUBDOMAIN] [--full]
+    python manage.py periods close [--tenant SUBDOMAIN] [--period-end YYYY-MM-DD]
+"""
+import argparse
+import sys
+from datetime import date
+
+from dotenv import load_dotenv
+from fastapi import HTTPException
+from sqlalchemy import select
+
+# Load environment variables before the app reads its settings
+load_dotenv()
+
+from app.core.database import SessionLocal  # noqa: E402
+from app.models import Tenant  # noqa: E402
+from app.services import (  # noqa: E402
+    accounting_service, aging_service, analytics_service, delinquency_service, period_service, report_job_service,
+)
+
+
+def _tenant_id(db, subdomain: str | None):
+    if subdomain is None:
+        return None
+    tenant = db.query(Tenant).filter(Tenant.subdomain == subdomain).first()
+    if tenant is None:
+        sys.exit(f"No tenant with subdomain '{subdomain}'.")
+    return tenant.id
+
+
+def balances_verify(args) -> int:
+    db = SessionLocal()
+    try:
+        drift = accounting_service.verify_account_balances(db, tenant_id=_tenant_id(db, args.tenant))
+    finally:
+        db.close()
+    for row in drift:
+        print(
+            f"DRIFT tenant={row['tenant_id']} account={row['account_id']} "
+            f"ledger={row['ledger_debits']}/{row['ledger_credits']} "
+            f"stored={row['stored_debits']}/{row['stored_credits']}"
+        )
+    print(f"{len(drift)} account(s) drifted.")
+    return 1 if drift else 0
+
+
+def balances_rebuild(args) -> int:
+    db = SessionLocal()
+    try:
+        written = accounting_service.rebuild_account_balances(db, tenant_id=_tenant_id(db, args.tenant))
+        db.commit()
+    finally:
+        db.close()
+    print(f"Rebuilt {written} account balance(s) from the ledger.")
+    return 0
+
+
+def sweep(args) -> int:
+    tenant_ids = None
+    if args.tenant is not None:
+        db = SessionLocal()
+        try:
+            tenant_ids = [_tenant_id(db, args.tenant)]
+        finally:
+            db.close()
+    results = delinquency_service.sweep_all_tenants(as_of=args.as_of, tenant_ids=tenant_ids, workers=args.workers)
+    for result in results:
+        if result["outcome"] == "swept":
+            print(
+                f"SWEPT tenant={result['tenant_id']} late={result['installments_marked_late']} "
+                f"penalties={result['penalties_charged']}"
+            )
+        elif result["outcome"] == "failed":
+            print(f"FAILED tenant={result['tenant_id']}: {result['detail']}")
+    skipped = sum(result["outcome"] == "skipped" for result in results)
+    failed = sum(result["outcome"] == "failed" for result in results)
+    print(f"{len(results)} tenant(s): {skipped} already swept, {failed} failed.")
+    return 1 if failed else 0
+
+
+def aging_rebuild(args) -> int:
+    db = SessionLocal()
+    try:
+        tenant_id = _tenant_id(db, args.tenant)
+        tenant_ids = [tenant_id] if tenant_id else list(db.execute(select(Tenant.id)).scalars())
+        aged = 0
+        for tenant_id in tenant_ids:
+            aged += aging_service.rebuild_tenant_aging(db, tenant_id, args.as_of)
+            db.commit()
+    finally:
+        db.close()
+    print(f"Re-aged {aged} loan(s) across {len(tenant_ids)} tenant(s).")
+    return 0
+
+
+def loans_verify(args) -> int:
+    db = SessionLocal()
+    try:
+        drift = aging_service.verify_loan_balances(db, tenant_id=_tenant_id(db, args.tenant))
+    finally:
+        db.close()
+    for row in drift:
+        print(
+            f"DRIFT tenant={row['tenant_id']} loan={row['loan_id']} {row['field']} "
+            f"expected={row['expected']} stored={row['stored']}"
+        )
+    print(f"{len({row['loan_id'] for row in drift})} loan(s) drifted.")
+    return 1 if drift else 0
+
+
+def loans_rebuild(args) -> int:
+    db = SessionLocal()
+    try:
+        tenant_id = _tenant_id(db, args.tenant)
+        tenant_ids = [tenant_id] if tenant_id else list(db.execute(select(Tenant.id)).scalars())
+        aged = 0
+        for tenant_id in tenant_ids:
+            aged += aging_service.rebuild_loan_balances(db, tenant_id)
+            db.commit()
+    finally:
+        db.close()
+    print(f"Rebuilt payment totals and re-aged {aged} loan(s) across {len(tenant_ids)} tenant(s).")
+    return 0
+
+
+def reports_purge(args) -> int:
+    db = SessionLocal()
+    try:
+        failed = report_job_service.fail_stale(db)
+        expired = report_job_service.purge_expired(db)
+    finally:
+        db.close()
+    print(f"Expired {expired} report artifact(s); failed {failed} stale job(s).")
+    return 0
+
+
+def analytics_sync(args) -> int:
+    db = SessionLocal()
+    try:
+        tenant_id = _tenant_id(db, args.tenant)
+        tenant_ids = [tenant_id] if tenant_id else list(db.execute(select(Tenant.id)).scalars())
+        for tenant_id in tenant_ids:
+            written = analytics_service.sync_tenant(db, tenant_id, full=args.full)
+            db.rollback()  # End the read transaction between tenants
+            print(f"{tenant_id}: {written}")
+    finally:
+        db.close()
+    return 0
+
+
+def periods_close(args) -> int:
+    period_end = args.period_end or period_service.previous_month_end()
+    failed = 0
+    db = SessionLocal()
+    try:
+        tenant_id = _tenant_id(db, args.tenant)
+        tenant_ids = [tenant_id] if tenant_id else list(db.execute(select(Tenant.id)).scalars())
+        for tenant_id in tenant_ids:
+            try:
+                period_service.close_period(db, tenant_id, period_end)
+                db.commit()
+                print(f"CLOSED tenant={tenant_id} period_end={period_end}")
+            except HTTPException as exc:
+                db.rollback()
+                failed += exc.status_code != 409  # Already closed is fine on a re-run
+                print(f"SKIPPED tenant={tenant_id}: {exc.detail}")
+    finally:
+        db.close()
+    return 1 if failed else 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    balances = commands.add_parser("balances", help="Materialized account balances")
+    balance_actions = balances.add_subparsers(dest="action", required=True)
+    verify = balance_actions.add_parser("verify", help="Recompute from the ledger and report drift (exit 1 on drift)")
+    verify.set_defaults(func=balances_verify)
+    rebuild = balance_actions.add_parser("rebuild", help="Recompute from the ledger and overwrite stored balances")
+    rebuild.set_defaults(func=balances_rebuild)
+    for sub in (verify, rebuild):
+        sub.add_argument("--tenant", metavar="SUBDOMAIN", help="Limit to one tenant (default: all tenants)")
+
+    sweep_parser = commands.add_parser("sweep", help="Mark overdue installments late and charge penalties")
+    sweep_parser.add_argument("--tenant", metavar="SUBDOMAIN", help="Limit to one tenant (default: all tenants)")
+    sweep_parser.add_argument("--as-of", type=date.fromisoformat, help="Sweep date (default: today)")
+    sweep_parser.add_argument("--workers", type=int, help="Tenants swept in parallel (default: SWEEP_WORKERS)")
+    sweep_parser.set_defaults(func=sweep)
+
+    aging = commands.add_parser("aging", help="Loan aging and the portfolio-at-risk aggregate")
+    aging_actions = aging.add_subparsers(dest="action", required=True)
+    aging_rebuild_parser = aging_actions.add_parser("rebuild", help="Re-age active loans and rewrite the aggregate")
+    aging_rebuild_parser.add_argument("--tenant", metavar="SUBDOMAIN", help="Limit to one tenant (default: all tenants)")
+    aging_rebuild_parser.add_argument("--as-of", type=date.fromisoformat, help="Aging date (default: today)")
+    aging_rebuild_parser.set_defaults(func=aging_rebuild)
+
+    loans = commands.add_parser("loans", help="Balance, next-due and payment fields stored on loans")
+    loan_actions = loans.add_subparsers(dest="action", required=True)
+    loans_verify_parser = loan_actions.add_parser(
+        "verify", help="Recompute from schedules, penalties and transactions and report drift (exit 1 on drift)"
+    )
+    loans_verify_parser.set_defaults(func=loans_verify)
+    loans_rebuild_parser = loan_actions.add_parser("rebuild", help="Recompute and overwrite the stored fields")
+    loans_rebuild_parser.set_defaults(func=loans_rebuild)
+    for sub in (loans_verify_parser, loans_rebuild_parser):
+        sub.add_argument("--tenant", metavar="SUBDOMAIN", help="Limit to one tenant (default: all tenants)")
+
+    reports = commands.add_parser("reports", help="Background report jobs")
+    report_actions = reports.add_subparsers(dest="action", required=True)
+    purge = report_actions.add_parser("purge", help="Remove expired artifacts and fail jobs stuck RUNNING")
+    purge.set_defaults(func=reports_purge)
+
+    analytics = commands.add_parser("analytics", help="The Parquet analytics mirror")
+    analytics_actions = analytics.add_subparsers(dest="action", required=True)
+    sync_parser = analytics_actions.add_parser("sync", help="Copy rows changed since the last sync to the mirror")
+    sync_parser.add_argument("--tenant", metavar="SUBDOMAIN", help="Limit to one tenant (default: all tenants)")
+    sync_parser.add_argument("--full", action="store_true", help="Rebuild the mirror from scratch")
+    sync_parser.set_defaults(func=analytics_sync)
+
+    periods = commands.add_parser("periods", help="Accounting period close")
+    period_actions = periods.add_subparsers(dest="action", required=True)
+    close_parser = period_actions.add_parser("close", help="Close a month and snapshot account balances")
+    close_parser.add_argument("--tenant", metavar="SUBDOMAIN", help="Limit to one tenant (default: all tenants)")
+    close_parser.add_argument(
+        "--period-end", type=date.fromisoformat, help="Last day of the month to close (default: end of last month)"
+    )
+    close_parser.set_defaults(func=periods_close)
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
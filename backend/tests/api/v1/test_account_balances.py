@@ -0,0 +1,149 @@
+# backend/tests/api/v1/test_account_balances.py
+
+from decimal import Decimal
+
+import pytest
+from fastapi.testclient import TestClient
+from pydantic import ValidationError
+from sqlalchemy.orm import Session
+
+from app import models
+from app.schemas import accounting as accounting_schema
+from app.services import accounting_service
+from tests.utils import add_chart_of_accounts, create_tenant_and_admin, get_auth_headers
+
+
+def setup_ledger(db_session: Session):
+    tenant, admin, password = create_tenant_and_admin(db_session)
+    add_chart_of_accounts(db_session, tenant)
+    db_session.commit()
+    for amount in ("1000.00", "250.50"):
+        accounting_service.post_transaction(
+            db_session, tenant_id=tenant.id, description="Disbursement",
+            debit_account_code=accounting_service.LOANS_RECEIVABLE_ACCOUNT,
+            credit_account_code=accounting_service.CASH_ACCOUNT, amount=Decimal(amount)
+        )
+    accounting_service.post_transaction(
+        db_session, tenant_id=tenant.id, description="Repayment",
+        debit_account_code=accounting_service.CASH_ACCOUNT,
+        credit_account_code=accounting_service.LOANS_RECEIVABLE_ACCOUNT, amount=Decimal("200.00")
+    )
+    db_session.commit()
+    return tenant, admin, password
+
+
+def test_trial_balance_reads_running_balances(test_client: TestClient, db_session: Session):
+    """
+    As an accountant, I want the trial balance to show per-account totals that
+    match the ledger, without the report summing every ledger entry.
+    """
+    tenant, admin, password = setup_ledger(db_session)
+    tenant_id = tenant.id
+    auth_headers = get_auth_headers(test_client, admin.email, password)
+
+    response = test_client.get("/api/v1/reports/trial-balance", headers=auth_headers)
+    assert response.status_code == 200
+    rows = {row["account_code"]: row for row in response.json()}
+    assert rows["1010"]["total_debits"] == 200.0
+    assert rows["1010"]["total_credits"] == 1250.5
+    assert rows["1100"]["total_debits"] == 1250.5
+    assert rows["1100"]["total_credits"] == 200.0
+    assert accounting_service.verify_account_balances(db_session, tenant_id=tenant_id) == []
+
+
+def test_verify_reports_drift_and_rebuild_repairs_it(db_session: Session):
+    """
+    As an operator, I want to detect balances that drifted from the ledger and rebuild them.
+    """
+    tenant, _, _ = setup_ledger(db_session)
+    [cash_id] = accounting_service.get_account_ids(db_session, tenant.id, [accounting_service.CASH_ACCOUNT]).values()
+    balance = db_session.get(models.AccountBalance, cash_id)
+    balance.total_debits = Decimal("999.99")
+    db_session.commit()
+
+    drift = accounting_service.verify_account_balances(db_session, tenant_id=tenant.id)
+    assert [(row["account_id"], row["ledger_debits"], row["stored_debits"]) for row in drift] == [
+        (cash_id, Decimal("200.00"), Decimal("999.99"))
+    ]
+
+    assert accounting_service.rebuild_account_balances(db_session, tenant_id=tenant.id) == 2
+    db_session.commit()
+    assert accounting_service.verify_account_balances(db_session, tenant_id=tenant.id) == []
+
+
+def test_postings_resolve_accounts_from_cached_chart(db_session: Session):
+    """
+    As an operator, I want repeat postings to skip chart-of-accounts lookups,
+    and chart changes to be visible to the next posting.
+    """
+    tenant, _, _ = setup_ledger(db_session)
+    before = accounting_service.account_cache_stats()
+    accounting_service.post_transaction(
+        db_session, tenant_id=tenant.id, description="Repayment",
+        debit_account_code=accounting_service.CASH_ACCOUNT,
+        credit_account_code=accounting_service.LOANS_RECEIVABLE_ACCOUNT, amount=Decimal("10.00")
+    )
+    after = accounting_service.account_cache_stats()
+    assert after["hits"] - before["hits"] == 1
+    assert after["misses"] == before["misses"]
+
+    db_session.add(models.ChartOfAccount(
+        name="Fee Revenue", account_code="4030", account_type=models.AccountType.REVENUE, tenant_id=tenant.id
+    ))
+    db_session.commit()
+    assert accounting_service._account_ids.get(tenant.id) is None
+    ids = accounting_service.get_account_ids(db_session, tenant.id, ["4030", accounting_service.CASH_ACCOUNT])
+    assert set(ids) == {"4030", accounting_service.CASH_ACCOUNT}
+
+
+def test_journal_batch_posts_multi_leg_entries(db_session: Session):
+    """
+    As an accountant, I want batch jobs to post many multi-leg entries at once,
+    with the ledger, balances and trial balance all agreeing.
+    """
+    tenant, _, _ = setup_ledger(db_session)
+    line = accounting_schema.JournalLine
+    entries = [
+        accounting_schema.JournalEntry(description=f"Repayment {i}", lines=[
+            line(account_code="1010", debit=Decimal("110.00")),
+            line(account_code="1100", credit=Decimal("100.00")),
+            line(account_code="4010", credit=Decimal("10.00")),
+        ])
+        for i in range(50)
+    ]
+    transaction_ids = accounting_service.post_journal_batch(db_session, tenant.id, entries)
+    db_session.commit()
+
+    assert len(set(transaction_ids)) == 50
+    entry_count = db_session.query(models.GeneralLedgerEntry).filter(
+        models.GeneralLedgerEntry.transaction_id == transaction_ids[0]
+    ).count()
+    assert entry_count == 3
+    interest = accounting_service.get_account_ids(db_session, tenant.id, ["4010"])["4010"]
+    assert db_session.get(models.AccountBalance, interest).total_credits == Decimal("500.00")
+    assert accounting_service.verify_account_balances(db_session, tenant_id=tenant.id) == []
+
+
+def test_unbalanced_entry_rejects_the_whole_batch(db_session: Session):
+    """
+    As an accountant, I never want a partially posted batch or an unbalanced entry in the ledger.
+    """
+    tenant, _, _ = setup_ledger(db_session)
+    line = accounting_schema.JournalLine
+    balanced = accounting_schema.JournalEntry(description="ok", lines=[
+        line(account_code="1010", debit=Decimal("5.00")), line(account_code="1100", credit=Decimal("5.00")),
+    ])
+    unbalanced = accounting_schema.JournalEntry(description="bad", lines=[
+        line(account_code="1010", debit=Decimal("5.00")), line(account_code="1100", credit=Decimal("4.00")),
+    ])
+    before = db_session.query(models.GeneralLedgerEntry).count()
+    with pytest.raises(accounting_service.UnbalancedJournalError, match="entry 1"):
+        accounting_service.post_journal_batch(db_session, tenant.id, [balanced, unbalanced])
+    assert db_session.query(models.GeneralLedgerEntry).count() == before
+
+    with pytest.raises(ValidationError):
+        line(account_code="1010", debit=Decimal("1.00"), credit=Decimal("1.00"))
+    # Amounts are rounded half-up to the cent before the entry is checked for balance
+    assert line(account_code="1010", debit=Decimal("2.005")).debit == Decimal("2.01")
+    with pytest.raises(ValidationError):
+        line(account_code="1010", debit=Decimal("0.004"))
@@ -0,0 +1,148 @@
+# backend/tests/api/v1/test_analytics_mirror.py
+
+import os
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from app import models, schemas
+from app.core.security import UserRole
+from app.services import analytics_service, repayment_service
+from tests.utils import (
+    add_chart_of_accounts, create_disbursed_loans, create_tenant_and_admin, create_user_in_db, get_auth_headers,
+)
+
+
+@pytest.fixture(autouse=True)
+def mirror_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(analytics_service.settings, "ANALYTICS_MIRROR_DIR", str(tmp_path))
+    monkeypatch.setattr(analytics_service.settings, "ANALYTICS_SYNC_LAG_SECONDS", 0)
+    monkeypatch.setattr(analytics_service.settings, "ANALYTICS_SYNC_OVERLAP_SECONDS", 0)
+    return tmp_path
+
+
+def seed_portfolio(db_session: Session):
+    """Two 1200.00 / 12-month interest-free loans disbursed 40 days ago, one with an officer."""
+    tenant, admin, password = create_tenant_and_admin(db_session)
+    add_chart_of_accounts(db_session, tenant)
+    officer = create_user_in_db(db_session, tenant, "mirror.officer@test.com", "officerpass", UserRole.LOAN_OFFICER)
+    loans = create_disbursed_loans(
+        db_session, tenant, count=2, disbursed_at=datetime.combine(date.today() - timedelta(days=40), datetime.min.time()),
+        each=lambda i: {"assigned_officer_id": officer.id} if i == 0 else {},
+    )
+    return tenant, admin, password, officer, loans
+
+
+def pay_first_installment(db_session: Session, loan: models.Loan, officer: models.User) -> None:
+    first_due = db_session.query(models.RepaymentSchedule).filter(
+        models.RepaymentSchedule.loan_id == loan.id
+    ).order_by(models.RepaymentSchedule.due_date).first()
+    repayment_service.record_payment(
+        db_session, schemas.repayment.RepaymentRecord(schedule_id=first_due.id, amount_paid=100.0), loan, officer
+    )
+    db_session.commit()
+
+
+def test_mirror_is_synced_incrementally(db_session: Session):
+    """
+    As a data analyst, I want the mirror to copy only what changed since the
+    last sync, while always reading back the latest version of each row.
+    """
+    tenant, _, _, officer, loans = seed_portfolio(db_session)
+
+    first = analytics_service.sync_tenant(db_session, tenant.id)
+    assert first["loans"] == 2
+    assert first["repayment_schedules"] == 24
+    assert analytics_service.sync_tenant(db_session, tenant.id)["repayment_schedules"] == 0
+
+    pay_first_installment(db_session, loans[0], officer)
+    changed = analytics_service.sync_tenant(db_session, tenant.id)
+    assert (changed["loans"], changed["repayment_schedules"], changed["repayment_transactions"]) == (1, 1, 1)
+    assert changed["general_ledger_entries"] > 0
+
+    productivity = analytics_service.officer_productivity(tenant.id)["rows"]
+    by_officer = {row["officer_id"]: row for row in productivity}
+    assert by_officer[str(officer.id)]["collected"] == Decimal("100.00")
+    assert by_officer[str(officer.id)]["principal_outstanding"] == Decimal("1100.00")
+    assert by_officer[None]["principal_outstanding"] == Decimal("1200.00")
+
+
+def test_rows_inside_the_lag_window_wait_for_the_next_sync(db_session: Session, monkeypatch):
+    tenant, _, _, officer, loans = seed_portfolio(db_session)
+    analytics_service.sync_tenant(db_session, tenant.id)
+
+    pay_first_installment(db_session, loans[0], officer)
+    monkeypatch.setattr(analytics_service.settings, "ANALYTICS_SYNC_LAG_SECONDS", 3600)
+    assert analytics_service.sync_tenant(db_session, tenant.id)["repayment_transactions"] == 0
+    monkeypatch.setattr(analytics_service.settings, "ANALYTICS_SYNC_LAG_SECONDS", 0)
+    assert analytics_service.sync_tenant(db_session, tenant.id)["repayment_transactions"] == 1
+
+
+def test_rows_committed_behind_the_mark_are_mirrored_once(db_session: Session, monkeypatch):
+    monkeypatch.setattr(analytics_service.settings, "ANALYTICS_SYNC_OVERLAP_SECONDS", 3600)
+    tenant, _, _, officer, loans = seed_portfolio(db_session)
+    analytics_service.sync_tenant(db_session, tenant.id)
+
+    # A payment whose transaction stamped its rows before the last sync but committed after it
+    pay_first_installment(db_session, loans[0], officer)
+    db_session.execute(
+        update(models.RepaymentTransaction).where(models.RepaymentTransaction.loan_id == loans[0].id)
+        .values(created_at=datetime.utcnow() - timedelta(minutes=10))
+    )
+    db_session.commit()
+    assert analytics_service.sync_tenant(db_session, tenant.id)["repayment_transactions"] == 1
+    # Re-read by the next sync's overlap, but still counted once
+    assert analytics_service.sync_tenant(db_session, tenant.id)["repayment_transactions"] == 1
+
+    by_officer = {row["officer_id"]: row for row in analytics_service.officer_productivity(tenant.id)["rows"]}
+    assert by_officer[str(officer.id)]["collected"] == Decimal("100.00")
+
+
+def test_parts_are_compacted(db_session: Session, monkeypatch, mirror_dir):
+    monkeypatch.setattr(analytics_service.settings, "ANALYTICS_MAX_PARTS", 1)
+    tenant, _, _, officer, loans = seed_portfolio(db_session)
+    analytics_service.sync_tenant(db_session, tenant.id)
+    pay_first_installment(db_session, loans[0], officer)
+    analytics_service.sync_tenant(db_session, tenant.id)
+
+    manifest = analytics_service.read_manifest(tenant.id)
+    parts = manifest["tables"]["loans"]["parts"]
+    assert len(parts) == 1 and parts[0].endswith("-compact.parquet")
+    # Replaced parts stay for readers until the following sync
+    assert len(os.listdir(mirror_dir / str(tenant.id) / "loans")) == 3
+    analytics_service.sync_tenant(db_session, tenant.id)
+    assert len(os.listdir(mirror_dir / str(tenant.id) / "loans")) == 1
+
+    outstanding = sorted(row["principal_outstanding"] for row in analytics_service.officer_productivity(tenant.id)["rows"])
+    assert outstanding == [Decimal("1100.00"), Decimal("1200.00")]
+
+
+def test_auditor_reads_analytics_from_the_mirror(test_client: TestClient, db_session: Session):
+    """
+    As an auditor, I want vintage and repayment-behaviour reports that do not
+    load the operational database.
+    """
+    tenant, admin, password, officer, loans = seed_portfolio(db_session)
+    pay_first_installment(db_session, loans[0], officer)
+    tenant_id, admin_email = tenant.id, admin.email
+    headers = get_auth_headers(test_client, admin_email, password)
+    assert test_client.get("/api/v1/reports/analytics/vintages", headers=headers).status_code == 409
+
+    analytics_service.sync_tenant(db_session, tenant_id)
+
+    vintages = test_client.get("/api/v1/reports/analytics/vintages", headers=headers).json()
+    assert vintages["rows"][0]["loans"] == 2
+    assert vintages["rows"][0]["cumulative_collected_ratio"] == 100.0 / 2400.0
+
+    behavior = test_client.get("/api/v1/reports/analytics/repayment-behavior", headers=headers).json()
+    [product] = behavior["rows"]
+    assert product["product_name"] == "Test Loan"
+    assert product["installments_due"] == 2
+    assert product["installments_paid"] == 1
+
+    productivity = test_client.get("/api/v1/reports/analytics/officer-productivity", headers=headers).json()
+    assert sum(row["loans_disbursed"] for row in productivity["rows"]) == 2
@@ -1,5 +1,8 @@
 # backend/tests/api/v1/test_auth.py
 
+import asyncio
+
+import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy.orm import Session
 from app import models
@@ -11,6 +14,7 @@ def test_register_organization(test_client: TestClient, db_session: Session):
     """
     org_data = {
         "organization_name": "Test MFI",
+        "subdomain": "testmfi",
         "admin_email": "testadmin@testmfi.com",
         "admin_password": "a_very_secure_password"
     }
@@ -50,4 +54,102 @@ def test_read_current_user(test_client: TestClient, db_session: Session):
     assert response.status_code == 200
     data = response.json()
     assert data["email"] == admin.email
-    assert data["id"] == str(admin.id)
\ No newline at end of file
+    assert data["id"] == str(admin.id)
+def test_token_carries_principal_claims(test_client: TestClient, db_session: Session):
+    """The access token must carry everything RBAC needs, so no user row is loaded per request."""
+    from jose import jwt
+    from app.core.config import settings
+    from tests.utils import create_tenant_and_admin, get_auth_headers
+
+    tenant, admin, password = create_tenant_and_admin(db_session)
+    tenant_id, admin_id = str(tenant.id), str(admin.id)
+    auth_headers = get_auth_headers(test_client, admin.email, password)
+
+    claims = jwt.decode(auth_headers["Authorization"].split()[1], settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    assert claims["sub"] == admin_id
+    assert claims["tid"] == tenant_id
+    assert claims["role"] == UserRole.ADMIN.value
+    assert claims["ver"] == 0
+
+def test_deactivated_user_token_is_rejected(test_client: TestClient, db_session: Session):
+    """Deactivating a team member must revoke their outstanding tokens."""
+    from tests.utils import create_tenant_and_admin, create_user_in_db, get_auth_headers
+
+    tenant, admin, password = create_tenant_and_admin(db_session)
+    teller = create_user_in_db(db_session, tenant, "revoked.teller@test.com", "tellerpass", UserRole.TELLER)
+    teller_id = teller.id
+    admin_headers = get_auth_headers(test_client, admin.email, password)
+    teller_headers = get_auth_headers(test_client, "revoked.teller@test.com", "tellerpass")
+
+    response = test_client.get("/api/v1/loan-products/", headers=teller_headers)
+    assert response.status_code == 200
+
+    response = test_client.post(f"/api/v1/team/members/{teller_id}/deactivate", headers=admin_headers)
+    assert response.status_code == 200
+    assert response.json()["is_active"] is False
+
+    response = test_client.get("/api/v1/loan-products/", headers=teller_headers)
+    assert response.status_code == 401
+
+def test_token_without_version_claim_is_rejected(test_client: TestClient, db_session: Session):
+    """Tokens issued before revocation existed carry no `ver` claim and cannot be revoked, so they are refused."""
+    from app.core import security
+    from tests.utils import create_tenant_and_admin
+
+    _, admin, _ = create_tenant_and_admin(db_session)
+    claims = security.build_token_claims(admin)
+    del claims["ver"]
+    headers = {"Authorization": f"Bearer {security.create_access_token(claims)}"}
+    response = test_client.get("/api/v1/loan-products/", headers=headers)
+    assert response.status_code == 401
+
+def test_login_rehashes_password_when_cost_changes(test_client: TestClient, db_session: Session):
+    """Passwords hashed with an outdated bcrypt cost are upgraded transparently on login."""
+    from passlib.context import CryptContext
+    from app.core.config import settings
+    from tests.utils import create_tenant_and_admin
+
+    _, admin, password = create_tenant_and_admin(db_session)
+    admin.hashed_password = CryptContext(schemes=["bcrypt"], bcrypt__rounds=4).hash(password)
+    db_session.commit()
+    admin_id = admin.id
+
+    response = test_client.post("/api/v1/auth/token", data={"username": "main.admin@test.com", "password": password})
+    assert response.status_code == 200
+    stored = db_session.get(models.User, admin_id).hashed_password
+    assert stored.split("$")[2] == f"{settings.BCRYPT_ROUNDS:02d}"
+
+def test_login_returns_503_when_hashing_queue_is_full(test_client: TestClient, db_session: Session, monkeypatch):
+    """A saturated hashing pool must shed load instead of stalling the request."""
+    from app.core.hashing import password_hasher
+    from tests.utils import create_tenant_and_admin
+
+    _, _, password = create_tenant_and_admin(db_session)
+    monkeypatch.setattr(password_hasher, "max_pending", 0)
+    response = test_client.post("/api/v1/auth/token", data={"username": "main.admin@test.com", "password": password})
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "1"
+
+def test_new_passwords_are_hashed_in_the_pool(test_client: TestClient, db_session: Session, monkeypatch):
+    """Sign-ups share the bounded hashing pool with logins, and failed calls are not counted as completed."""
+    from app.core.hashing import password_hasher
+
+    org_data = {
+        "organization_name": "Pooled MFI",
+        "subdomain": "pooledmfi",
+        "admin_email": "admin@pooledmfi.com",
+        "admin_password": "a_very_secure_password",
+    }
+    completed = password_hasher.stats()["completed"]
+    assert test_client.post("/api/v1/auth/register-organization", json=org_data).status_code == 201
+    assert password_hasher.stats()["completed"] == completed + 1
+
+    failed = password_hasher.stats()["failed"]
+    with pytest.raises(ValueError):
+        asyncio.run(password_hasher.verify("secret", "not-a-bcrypt-hash"))
+    assert password_hasher.stats()["failed"] == failed + 1
+
+    monkeypatch.setattr(password_hasher, "max_pending", 0)
+    response = test_client.post("/api/v1/auth/register-organization", json={**org_data, "subdomain": "pooledmfi2"})
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "1"
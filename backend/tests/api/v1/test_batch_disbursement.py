@@ -0,0 +1,87 @@
+# backend/tests/api/v1/test_batch_disbursement.py
+
+import uuid
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app import models
+from app.core.security import UserRole
+from app.services import accounting_service
+from tests.utils import add_chart_of_accounts, create_loans, create_tenant_and_admin, create_user_in_db, get_auth_headers
+
+
+def setup_approved_loans(db_session: Session, count: int):
+    tenant, admin, password = create_tenant_and_admin(db_session)
+    add_chart_of_accounts(db_session, tenant)
+    loans = create_loans(
+        db_session, tenant, count=count, tenure_months=6, interest_rate=12,
+        each=lambda i: {"amount_requested": 1000 + i},
+    )
+    [pending] = create_loans(db_session, tenant, status=models.LoanStatus.PENDING, amount=500, tenure_months=6)
+    db_session.commit()
+    return tenant.id, admin.email, password, [loan.id for loan in loans], pending.id
+
+
+def test_admin_can_disburse_a_batch_of_loans(test_client: TestClient, db_session: Session):
+    """
+    USER STORY: As an MFI admin, on disbursement day I want to push many approved
+    loans through at once and see what happened to each one.
+    """
+    tenant_id, email, password, loan_ids, pending_id = setup_approved_loans(db_session, 3)
+    unknown_id = uuid.uuid4()
+    auth_headers = get_auth_headers(test_client, email, password)
+
+    payload = {"loan_ids": [str(i) for i in [*loan_ids, pending_id, unknown_id]]}
+    response = test_client.post("/api/v1/loans/disburse-batch", json=payload, headers=auth_headers)
+    assert response.status_code == 200
+    report = response.json()
+    assert (report["disbursed"], report["skipped"], report["failed"]) == (3, 2, 0)
+    assert [r["outcome"] for r in report["results"]] == ["disbursed"] * 3 + ["skipped"] * 2
+
+    disbursed = db_session.query(models.Loan).filter(models.Loan.status == models.LoanStatus.DISBURSED).count()
+    schedules = db_session.query(models.RepaymentSchedule).filter(models.RepaymentSchedule.loan_id.in_(loan_ids)).count()
+    assert (disbursed, schedules) == (3, 18)
+    assert accounting_service.verify_account_balances(db_session, tenant_id=tenant_id) == []
+
+    # Re-submitting the same batch disburses nothing twice
+    response = test_client.post("/api/v1/loans/disburse-batch", json=payload, headers=auth_headers)
+    assert response.json()["disbursed"] == 0
+
+
+def test_one_failing_loan_does_not_poison_the_batch(test_client: TestClient, db_session: Session, monkeypatch):
+    """
+    As an MFI admin, a loan that cannot be disbursed must not block the others.
+    """
+    _, email, password, loan_ids, _ = setup_approved_loans(db_session, 3)
+    poisoned = loan_ids[1]  # the loan of 1001.00
+    post_journal_batch = accounting_service.post_journal_batch
+
+    def failing_post(db, tenant_id, entries):
+        if any(line.debit == 1001 for entry in entries for line in entry.lines):
+            raise RuntimeError("ledger unavailable for this loan")
+        return post_journal_batch(db, tenant_id, entries)
+
+    monkeypatch.setattr(accounting_service, "post_journal_batch", failing_post)
+    auth_headers = get_auth_headers(test_client, email, password)
+    response = test_client.post(
+        "/api/v1/loans/disburse-batch", json={"loan_ids": [str(i) for i in loan_ids]}, headers=auth_headers
+    )
+    report = response.json()
+    assert [r["outcome"] for r in report["results"]] == ["disbursed", "failed", "disbursed"]
+    # Unexpected errors are logged, not echoed to the client
+    assert "ledger unavailable" not in report["results"][1]["detail"]
+    assert "internal error" in report["results"][1]["detail"]
+    statuses = {
+        loan.id: loan.status for loan in db_session.query(models.Loan).filter(models.Loan.id.in_(loan_ids))
+    }
+    assert statuses[poisoned] == models.LoanStatus.APPROVED
+    assert db_session.query(models.RepaymentSchedule).filter(models.RepaymentSchedule.loan_id == poisoned).count() == 0
+
+
+def test_staff_other_than_admin_cannot_batch_disburse(test_client: TestClient, db_session: Session):
+    tenant, _, _ = create_tenant_and_admin(db_session)
+    create_user_in_db(db_session, tenant, "batch.teller@test.com", "tellerpass", UserRole.TELLER)
+    auth_headers = get_auth_headers(test_client, "batch.teller@test.com", "tellerpass")
+    response = test_client.post("/api/v1/loans/disburse-batch", json={"loan_ids": [str(uuid.uuid4())]}, headers=auth_headers)
+    assert response.status_code == 403
@@ -0,0 +1,54 @@
+# backend/tests/api/v1/test_catalog_cache.py
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app import models
+from app.services import catalog_service
+from tests.utils import create_tenant_and_admin, get_auth_headers
+
+PRODUCT = {"name": "Catalog Loan", "interest_rate": 10.0, "max_tenure_months": 12}
+
+
+def test_loan_products_are_revalidated_with_etags(test_client: TestClient, db_session: Session):
+    """
+    As a borrower, I want the product list my app fetches on every screen to
+    come back as a bodiless 304 while it has not changed.
+    """
+    _, admin, password = create_tenant_and_admin(db_session)
+    headers = get_auth_headers(test_client, admin.email, password)
+    assert test_client.post("/api/v1/loan-products/", json=PRODUCT, headers=headers).status_code == 201
+
+    first = test_client.get("/api/v1/loan-products/", headers=headers)
+    etag = first.headers["ETag"]
+    assert [p["name"] for p in first.json()] == ["Catalog Loan"]
+
+    hits = catalog_service.catalog_cache_stats()["hits"]
+    unchanged = test_client.get("/api/v1/loan-products/", headers={**headers, "If-None-Match": etag})
+    assert (unchanged.status_code, unchanged.content, unchanged.headers["ETag"]) == (304, b"", etag)
+    assert catalog_service.catalog_cache_stats()["hits"] == hits + 1
+
+    # A new product invalidates the cached list once the create commits
+    assert test_client.post(
+        "/api/v1/loan-products/", json={**PRODUCT, "name": "Second Loan"}, headers=headers
+    ).status_code == 201
+    changed = test_client.get("/api/v1/loan-products/", headers={**headers, "If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+    assert sorted(p["name"] for p in changed.json()) == ["Catalog Loan", "Second Loan"]
+
+
+def test_settings_are_revalidated_with_etags(test_client: TestClient, db_session: Session):
+    tenant, admin, password = create_tenant_and_admin(db_session)
+    db_session.add(models.TenantSettings(tenant_id=tenant.id, currency="USD", configurations={}))
+    db_session.commit()
+    headers = get_auth_headers(test_client, admin.email, password)
+
+    first = test_client.get("/api/v1/settings/", headers=headers)
+    assert first.json()["currency"] == "USD"
+    etag = first.headers["ETag"]
+    assert test_client.get("/api/v1/settings/", headers={**headers, "If-None-Match": etag}).status_code == 304
+
+    assert test_client.put("/api/v1/settings/", json={"currency": "UGX"}, headers=headers).status_code == 200
+    changed = test_client.get("/api/v1/settings/", headers={**headers, "If-None-Match": etag})
+    assert (changed.status_code, changed.json()["currency"]) == (200, "UGX")
@@ -0,0 +1,67 @@
+# backend/tests/api/v1/test_dashboard_metrics.py
+
+from decimal import Decimal
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.services import reporting_service
+from tests.utils import add_chart_of_accounts, create_loans, create_tenant_and_admin, get_auth_headers
+
+
+def capture_metric_queries():
+    """Statements reading the dashboard's source tables (not auth lookups)."""
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if any(table in statement for table in ("FROM clients", "FROM loans", "FROM repayment_transactions")):
+            statements.append(statement)
+
+    return statements, capture
+
+
+def test_dashboard_is_one_query_and_cached_until_a_write(test_client: TestClient, db_session: Session):
+    """
+    As an MFI admin, I want the dashboard to load instantly, yet show a
+    disbursement as soon as it has happened.
+    """
+    tenant, admin, password = create_tenant_and_admin(db_session)
+    add_chart_of_accounts(db_session, tenant)
+    [loan] = create_loans(db_session, tenant, amount=Decimal("500.00"), tenure_months=6, interest_rate=12)
+    db_session.commit()
+    tenant_id, loan_id = tenant.id, loan.id
+    headers = get_auth_headers(test_client, admin.email, password)
+
+    statements, capture = capture_metric_queries()
+    engine = db_session.get_bind().engine
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        first = test_client.get("/api/v1/reports/dashboard", headers=headers).json()
+        computed = len(statements)
+        second = test_client.get("/api/v1/reports/dashboard", headers=headers).json()
+        assert len(statements) == computed  # served from the cache
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+    assert computed == 1
+    assert first == second
+    assert (first["total_clients"], first["active_loans"], first["total_disbursed"]) == (1, 0, 0.0)
+
+    response = test_client.post("/api/v1/loans/disburse-batch", json={"loan_ids": [str(loan_id)]}, headers=headers)
+    assert response.json()["disbursed"] == 1
+    after = test_client.get("/api/v1/reports/dashboard", headers=headers).json()
+    assert (after["active_loans"], after["total_disbursed"]) == (1, 500.0)
+    assert reporting_service.compute_dashboard_metrics(db_session, tenant_id).model_dump() == after
+
+
+def test_invalidation_waits_for_commit(db_session: Session):
+    tenant, _, _ = create_tenant_and_admin(db_session)
+    tenant_id = tenant.id
+    cached = reporting_service.get_dashboard_metrics(db_session, tenant_id)
+
+    reporting_service.invalidate_dashboard(db_session, tenant_id)
+    assert reporting_service.get_dashboard_metrics(db_session, tenant_id) is cached
+
+    reporting_service.invalidate_dashboard(db_session, tenant_id)
+    db_session.commit()
+    assert reporting_service.get_dashboard_metrics(db_session, tenant_id) is not cached
@@ -0,0 +1,94 @@
+# backend/tests/api/v1/test_delinquency_sweep.py
+
+from datetime import date, datetime
+from decimal import Decimal
+
+from sqlalchemy.orm import Session
+
+from app import models
+from app.services import accounting_service, delinquency_service
+from tests.utils import add_chart_of_accounts, create_disbursed_loans, create_tenant_and_admin
+
+
+def seed_portfolio(db_session: Session):
+    """Two disbursed loans of 1200.00 over 12 months from 2025-01-10: one flat, one percentage penalty."""
+    tenant, _, _ = create_tenant_and_admin(db_session)
+    add_chart_of_accounts(db_session, tenant)
+    loans = [
+        create_disbursed_loans(db_session, tenant, penalty=penalty, disbursed_at=datetime(2025, 1, 10))[0]
+        for penalty in ((models.PenaltyType.FLAT, Decimal("5.00")), (models.PenaltyType.PERCENTAGE, Decimal("2.50")))
+    ]
+    # The first installment of the flat loan was paid on time
+    first = db_session.query(models.RepaymentSchedule).filter(
+        models.RepaymentSchedule.loan_id == loans[0].id
+    ).order_by(models.RepaymentSchedule.due_date).first()
+    first.status = models.RepaymentStatus.PAID
+    # The percentage loan's first installment was part-paid
+    first = db_session.query(models.RepaymentSchedule).filter(
+        models.RepaymentSchedule.loan_id == loans[1].id
+    ).order_by(models.RepaymentSchedule.due_date).first()
+    first.principal_paid = Decimal("60.00")
+    db_session.commit()
+    return tenant.id, [loan.id for loan in loans]
+
+
+def penalty_totals(db_session: Session, tenant_id):
+    penalties = db_session.query(models.LoanPenalty).filter(models.LoanPenalty.tenant_id == tenant_id).all()
+    return len(penalties), sum((Decimal(p.amount) for p in penalties), Decimal("0"))
+
+
+def test_sweep_marks_overdue_installments_and_charges_penalties_once(db_session: Session):
+    """
+    As an MFI admin, I want the nightly sweep to flag every overdue installment
+    and book its late penalty exactly once per month, however often it runs.
+    """
+    tenant_id, loan_ids = seed_portfolio(db_session)
+
+    # Due dates 2025-02-10, 03-10 and 04-10 are overdue on 2025-04-15
+    checkpoint = delinquency_service.sweep_tenant(db_session, tenant_id, date(2025, 4, 15))
+    db_session.commit()
+    late = db_session.query(models.RepaymentSchedule).filter(
+        models.RepaymentSchedule.status == models.RepaymentStatus.LATE,
+        models.RepaymentSchedule.loan_id.in_(loan_ids),
+    ).count()
+    assert (checkpoint.installments_marked_late, checkpoint.penalties_charged, late) == (5, 5, 5)
+    # Flat: 2 x 5.00; percentage: 2.5% of the 40.00 left on the first, 2 x 2.5% of 100.00
+    assert penalty_totals(db_session, tenant_id) == (5, Decimal("16.00"))
+
+    # Running again in the same month charges nothing new
+    checkpoint = delinquency_service.sweep_tenant(db_session, tenant_id, date(2025, 4, 20))
+    db_session.commit()
+    assert (checkpoint.installments_marked_late, checkpoint.penalties_charged) == (0, 0)
+
+    # Next month: the still-late installments are charged again, plus the newly overdue ones
+    checkpoint = delinquency_service.sweep_tenant(db_session, tenant_id, date(2025, 5, 11))
+    db_session.commit()
+    assert (checkpoint.installments_marked_late, checkpoint.penalties_charged) == (2, 7)
+
+    accounts = accounting_service.get_account_ids(
+        db_session, tenant_id, [accounting_service.PENALTIES_RECEIVABLE_ACCOUNT]
+    )
+    receivable = db_session.get(models.AccountBalance, accounts[accounting_service.PENALTIES_RECEIVABLE_ACCOUNT])
+    assert Decimal(receivable.total_debits) == penalty_totals(db_session, tenant_id)[1]
+    assert accounting_service.verify_account_balances(db_session, tenant_id=tenant_id) == []
+
+
+def test_sweep_all_tenants_checkpoints_and_resumes(db_session: Session):
+    tenant_id, _ = seed_portfolio(db_session)
+    as_of = date(2025, 4, 15)
+
+    def run():
+        return delinquency_service.sweep_all_tenants(
+            as_of=as_of, tenant_ids=[tenant_id], workers=1, session_factory=lambda: db_session
+        )
+
+    first = run()
+    assert first == [{"tenant_id": tenant_id, "outcome": "swept", "installments_marked_late": 5, "penalties_charged": 5}]
+    assert run() == [{"tenant_id": tenant_id, "outcome": "skipped"}]
+    assert penalty_totals(db_session, tenant_id)[0] == 5
+
+
+def test_penalty_amounts_round_half_up():
+    assert delinquency_service.penalty_amount("flat", Decimal("7.5"), Decimal("999")) == Decimal("7.50")
+    assert delinquency_service.penalty_amount("percentage", Decimal("1.5"), Decimal("83.67")) == Decimal("1.26")
+    assert delinquency_service.penalty_period(date(2025, 4, 30)) == date(2025, 4, 1)
@@ -0,0 +1,112 @@
+# backend/tests/api/v1/test_ledger_browser.py
+
+import csv
+import io
+import json
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app import models
+from app.schemas import accounting as accounting_schema
+from app.services import accounting_service, export_service
+from tests.utils import add_chart_of_accounts, create_tenant_and_admin, get_auth_headers
+
+START = datetime(2025, 1, 1, 9, 0)
+
+
+def post_entries(db_session: Session, tenant_id, count: int, start: datetime = START, prefix: str = "entry"):
+    """`count` cash disbursements, one a day from `start`, two ledger rows each."""
+    entries = [
+        accounting_schema.JournalEntry(
+            description=f"{prefix} {i}", transaction_date=start + timedelta(days=i), transaction_id=f"{prefix}-{i}",
+            lines=[
+                accounting_schema.JournalLine(account_code="1100", debit=Decimal(10 + i)),
+                accounting_schema.JournalLine(account_code="1010", credit=Decimal(10 + i)),
+            ],
+        )
+        for i in range(count)
+    ]
+    accounting_service.post_journal_batch(db_session, tenant_id, entries)
+    db_session.commit()
+
+
+def seed_ledger(db_session: Session, count: int = 12):
+    tenant, admin, password = create_tenant_and_admin(db_session)
+    add_chart_of_accounts(db_session, tenant)
+    post_entries(db_session, tenant.id, count)
+    return tenant.id, admin.email, password
+
+
+def test_auditor_pages_through_the_ledger(test_client: TestClient, db_session: Session):
+    """
+    As an auditor, I want to read raw ledger entries page by page without
+    pages shifting when new entries are posted meanwhile.
+    """
+    tenant_id, email, password = seed_ledger(db_session)
+    headers = get_auth_headers(test_client, email, password)
+
+    first = test_client.get("/api/v1/reports/ledger?limit=5", headers=headers).json()
+    assert len(first["items"]) == 5
+    # Entries posted before the current position do not shift later pages
+    post_entries(db_session, tenant_id, 3, start=START - timedelta(days=30), prefix="backdated")
+
+    seen, cursor = [entry["id"] for entry in first["items"]], first["next_cursor"]
+    while cursor:
+        page = test_client.get(f"/api/v1/reports/ledger?limit=5&cursor={cursor}", headers=headers).json()
+        seen += [entry["id"] for entry in page["items"]]
+        cursor = page["next_cursor"]
+    assert len(seen) == len(set(seen)) == 24
+
+    entry = models.GeneralLedgerEntry
+    expected = db_session.query(entry.id).filter(
+        entry.tenant_id == tenant_id, entry.transaction_date >= START
+    ).order_by(entry.transaction_date, entry.id).all()
+    assert seen == [str(row.id) for row in expected]
+
+
+def test_ledger_filters(test_client: TestClient, db_session: Session):
+    _, email, password = seed_ledger(db_session)
+    headers = get_auth_headers(test_client, email, password)
+
+    cash = test_client.get("/api/v1/reports/ledger?account_code=1010", headers=headers).json()["items"]
+    assert len(cash) == 12
+    assert {entry["account_name"] for entry in cash} == {"Cash on Hand"}
+
+    window = test_client.get(
+        "/api/v1/reports/ledger?start_date=2025-01-03&end_date=2025-01-04", headers=headers
+    ).json()["items"]
+    assert sorted({entry["transaction_id"] for entry in window}) == ["entry-2", "entry-3"]
+
+    one = test_client.get("/api/v1/reports/ledger?transaction_id=entry-7", headers=headers).json()["items"]
+    assert [(entry["debit"], entry["credit"]) for entry in one] in ([(17.0, 0.0), (0.0, 17.0)], [(0.0, 17.0), (17.0, 0.0)])
+
+    assert test_client.get("/api/v1/reports/ledger?account_code=9999", headers=headers).json()["items"] == []
+    assert test_client.get("/api/v1/reports/ledger?cursor=not-a-cursor", headers=headers).status_code == 400
+    assert test_client.get(
+        "/api/v1/reports/ledger?start_date=2025-02-01&end_date=2025-01-01", headers=headers
+    ).status_code == 400
+
+
+def test_ledger_streams_as_ndjson_and_csv(test_client: TestClient, db_session: Session, monkeypatch):
+    """
+    As an auditor, I want to pull a whole ledger as NDJSON or CSV in one request.
+    """
+    monkeypatch.setattr(export_service, "CHUNK_SIZE", 200)
+    monkeypatch.setattr(export_service.settings, "EXPORT_BATCH_SIZE", 4)
+    _, email, password = seed_ledger(db_session)
+    headers = get_auth_headers(test_client, email, password)
+
+    response = test_client.get("/api/v1/reports/ledger?format=ndjson&account_code=1100", headers=headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert len(lines) == 12
+    assert set(lines[0]) == set(export_service.LEDGER_COLUMNS)
+    assert [line["debit"] for line in lines] == [float(10 + i) for i in range(12)]
+
+    response = test_client.get("/api/v1/reports/ledger?format=csv", headers=headers)
+    assert 'filename="general_ledger.csv"' in response.headers["content-disposition"]
+    assert len(list(csv.DictReader(io.StringIO(response.text)))) == 24
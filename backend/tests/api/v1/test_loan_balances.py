@@ -0,0 +1,78 @@
+# backend/tests/api/v1/test_loan_balances.py
+
+from datetime import date
+from decimal import Decimal
+
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from app import models, schemas
+from app.services import aging_service, delinquency_service, loan_service, repayment_service
+from tests.utils import add_chart_of_accounts, create_loans, create_tenant_and_admin
+
+
+def seed_approved_loan(db_session: Session):
+    """An approved 1200.00 / 12-month loan at 12% flat with a 5.00 late penalty."""
+    tenant, admin, _ = create_tenant_and_admin(db_session)
+    add_chart_of_accounts(db_session, tenant)
+    [loan] = create_loans(db_session, tenant, interest_rate=12, penalty=(models.PenaltyType.FLAT, Decimal("5.00")))
+    db_session.commit()
+    return admin, loan
+
+
+def test_loan_balances_follow_disbursement_payments_and_penalties(db_session: Session):
+    """
+    As a loan officer, I want each loan to carry its outstanding balances,
+    next due date and payment totals so lists and the client portal never
+    aggregate schedules.
+    """
+    admin, loan = seed_approved_loan(db_session)
+    loan = loan_service.disburse_loan(db_session, loan.id)
+    db_session.commit()
+    first_due = db_session.query(models.RepaymentSchedule.due_date).filter(
+        models.RepaymentSchedule.loan_id == loan.id
+    ).order_by(models.RepaymentSchedule.due_date).limit(1).scalar()
+    view = schemas.loan.Loan.model_validate(loan)
+    assert (view.principal_outstanding, view.interest_outstanding, view.penalties_outstanding) == (1200.0, 144.0, 0.0)
+    assert (view.next_due_date, view.days_past_due, view.total_paid, view.last_payment_at) == (first_due, 0, 0.0, None)
+
+    repayment_service.record_payment(db_session, schemas.repayment.RepaymentRecord(amount_paid=150.0), loan, admin)
+    db_session.commit()
+    db_session.refresh(loan)
+    # 112.00 settles the first installment; 38.00 goes to the second (12.00 interest, 26.00 principal)
+    assert (Decimal(loan.principal_outstanding), Decimal(loan.interest_outstanding)) == (
+        Decimal("1074.00"), Decimal("120.00")
+    )
+    assert Decimal(loan.total_paid) == Decimal("150.00")
+    assert loan.last_payment_at is not None and loan.next_due_date > first_due
+
+    # Once the second installment is overdue, the sweep charges its penalty and ages the loan
+    as_of = date.fromordinal(loan.next_due_date.toordinal() + 10)
+    delinquency_service.sweep_tenant(db_session, loan.tenant_id, as_of)
+    db_session.commit()
+    db_session.refresh(loan)
+    assert (Decimal(loan.penalties_outstanding), loan.days_past_due) == (Decimal("5.00"), 10)
+    assert aging_service.verify_loan_balances(db_session, loan.tenant_id) == []
+
+
+def test_consistency_checker_reports_and_repairs_drift(db_session: Session):
+    admin, loan = seed_approved_loan(db_session)
+    loan = loan_service.disburse_loan(db_session, loan.id)
+    repayment_service.record_payment(db_session, schemas.repayment.RepaymentRecord(amount_paid=50.0), loan, admin)
+    db_session.commit()
+    loan_id, tenant_id = loan.id, loan.tenant_id
+    assert aging_service.verify_loan_balances(db_session, tenant_id) == []
+
+    db_session.execute(
+        update(models.Loan).where(models.Loan.id == loan_id).values(total_paid=0, interest_outstanding=144)
+    )
+    db_session.commit()
+    drift = aging_service.verify_loan_balances(db_session, tenant_id)
+    assert sorted((row["field"], row["expected"], row["stored"]) for row in drift) == [
+        ("interest_outstanding", Decimal("132.00"), Decimal("144.00")),
+        ("total_paid", Decimal("50.00"), Decimal("0.00")),
+    ]
+
+    aging_service.rebuild_loan_balances(db_session, tenant_id)
+    db_session.commit()
+    assert aging_service.verify_loan_balances(db_session, tenant_id) == []
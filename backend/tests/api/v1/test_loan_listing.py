@@ -0,0 +1,70 @@
+# backend/tests/api/v1/test_loan_listing.py
+
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app import models
+from app.core.security import UserRole
+from tests.utils import create_loans, create_tenant_and_admin, create_user_in_db, get_auth_headers
+
+
+def seed_loans(test_client: TestClient, db_session: Session):
+    """Seven loans applied for a day apart; the odd ones disbursed and assigned to an officer."""
+    tenant, admin, password = create_tenant_and_admin(db_session)
+    officer = create_user_in_db(db_session, tenant, "listing.officer@test.com", "officerpass", UserRole.LOAN_OFFICER)
+    other_client = models.Client(first_name="Other", last_name="Borrower", tenant_id=tenant.id)
+    db_session.add(other_client)
+    db_session.flush()
+    start = datetime(2025, 3, 1, 9, 0)
+    loans = create_loans(
+        db_session, tenant, count=7, status=models.LoanStatus.PENDING, tenure_months=6, interest_rate=10,
+        each=lambda i: {
+            "amount_requested": Decimal("100.00") * (i + 1), "applied_at": start + timedelta(days=i),
+            **({"status": models.LoanStatus.DISBURSED, "assigned_officer_id": officer.id} if i % 2 else {}),
+            **({"client_id": other_client.id} if i == 6 else {}),
+        },
+    )
+    db_session.commit()
+    ids = [loan.id for loan in loans], officer.id, loans[0].client_id
+    return (get_auth_headers(test_client, admin.email, password), *ids)
+
+
+def test_staff_pages_through_loans_newest_first(test_client: TestClient, db_session: Session):
+    """
+    As a loan officer, I want to browse my organisation's loans page by page,
+    newest application first, without the list slowing down as it grows.
+    """
+    headers, loan_ids, _, _ = seed_loans(test_client, db_session)
+
+    first = test_client.get("/api/v1/loans/?limit=3", headers=headers).json()
+    seen, cursor = [loan["id"] for loan in first["items"]], first["next_cursor"]
+    while cursor:
+        page = test_client.get(f"/api/v1/loans/?limit=3&cursor={cursor}", headers=headers).json()
+        seen += [loan["id"] for loan in page["items"]]
+        cursor = page["next_cursor"]
+    assert seen == [str(loan_id) for loan_id in reversed(loan_ids)]
+    assert first["items"][0]["amount_requested"] == 700.0
+
+    assert test_client.get("/api/v1/loans/?cursor=not-a-cursor", headers=headers).status_code == 400
+    assert test_client.get(
+        "/api/v1/loans/?start_date=2025-03-05&end_date=2025-03-01", headers=headers
+    ).status_code == 400
+
+
+def test_staff_filter_loans(test_client: TestClient, db_session: Session):
+    headers, loan_ids, officer_id, client_id = seed_loans(test_client, db_session)
+
+    def ids(query: str) -> list:
+        response = test_client.get(f"/api/v1/loans/?{query}", headers=headers)
+        assert response.status_code == 200
+        return [loan["id"] for loan in response.json()["items"]]
+
+    disbursed = [str(loan_ids[i]) for i in (5, 3, 1)]
+    assert ids("status=disbursed") == disbursed
+    assert ids(f"officer_id={officer_id}") == disbursed
+    assert ids(f"client_id={client_id}&status=pending") == [str(loan_ids[i]) for i in (4, 2, 0)]
+    # Inclusive dates: applications of 2025-03-02 through 2025-03-04
+    assert ids("start_date=2025-03-02&end_date=2025-03-04") == [str(loan_ids[i]) for i in (3, 2, 1)]
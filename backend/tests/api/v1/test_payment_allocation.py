@@ -0,0 +1,147 @@
+# backend/tests/api/v1/test_payment_allocation.py
+
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app import models, schemas
+from app.services import allocation_service, repayment_service
+from tests.utils import add_chart_of_accounts, create_disbursed_loans, create_tenant_and_admin, get_auth_headers
+
+
+def seed_loan(db_session: Session):
+    """A 1200.00 / 12-month loan at 12% flat: installments of 100.00 principal and 12.00 interest."""
+    tenant, admin, password = create_tenant_and_admin(db_session)
+    add_chart_of_accounts(db_session, tenant)
+    [loan] = create_disbursed_loans(
+        db_session, tenant, interest_rate=12,
+        disbursed_at=datetime.combine(date.today() - timedelta(days=70), datetime.min.time()),
+    )
+    return admin, password, loan
+
+
+def pay(db_session: Session, loan: models.Loan, user: models.User, amount: str) -> list:
+    transaction = repayment_service.record_payment(
+        db_session, schemas.repayment.RepaymentRecord(amount_paid=float(amount)), loan, user
+    )
+    db_session.commit()
+    allocations = db_session.query(models.RepaymentAllocation).filter(
+        models.RepaymentAllocation.transaction_id == transaction.id
+    ).all()
+    return sorted((a.component, Decimal(a.amount)) for a in allocations)
+
+
+def installments(db_session: Session, loan: models.Loan) -> list:
+    return db_session.query(models.RepaymentSchedule).filter(
+        models.RepaymentSchedule.loan_id == loan.id
+    ).order_by(models.RepaymentSchedule.due_date).all()
+
+
+def credits(db_session: Session, account_code: str) -> Decimal:
+    ledger = models.GeneralLedgerEntry
+    return sum(
+        (entry.credit for entry in db_session.query(ledger).join(models.ChartOfAccount).filter(
+            models.ChartOfAccount.account_code == account_code, ledger.description.like("Repayment%")
+        )),
+        Decimal("0"),
+    )
+
+
+def test_partial_payments_and_prepayments_are_allocated_oldest_first(db_session: Session):
+    """
+    As a teller, I want any amount a client pays to be applied to interest
+    and then principal of the oldest installment first, carrying over to
+    the next ones.
+    """
+    admin, _, loan = seed_loan(db_session)
+
+    assert pay(db_session, loan, admin, "50.00") == [("interest", Decimal("12.00")), ("principal", Decimal("38.00"))]
+    first, second, third = installments(db_session, loan)[:3]
+    assert (first.status, first.interest_paid, first.principal_paid) == (
+        models.RepaymentStatus.PENDING, Decimal("12.00"), Decimal("38.00")
+    )
+    assert Decimal(loan.principal_outstanding) == Decimal("1162.00")
+
+    # 62.00 completes the first installment; the rest runs into the second and third
+    assert pay(db_session, loan, admin, "200.00") == [
+        ("interest", Decimal("12.00")), ("interest", Decimal("12.00")),
+        ("principal", Decimal("14.00")), ("principal", Decimal("62.00")), ("principal", Decimal("100.00")),
+    ]
+    db_session.expire_all()
+    assert first.status == second.status == models.RepaymentStatus.PAID
+    assert (third.status, third.interest_paid, third.principal_paid) == (
+        models.RepaymentStatus.PENDING, Decimal("12.00"), Decimal("14.00")
+    )
+    assert Decimal(loan.principal_outstanding) == Decimal("1200.00") - Decimal("214.00")
+    assert credits(db_session, "4010") == Decimal("36.00")
+    assert credits(db_session, "1100") == Decimal("214.00")
+
+
+def test_penalties_are_paid_first_and_the_loan_is_paid_off(db_session: Session):
+    admin, _, loan = seed_loan(db_session)
+    first = installments(db_session, loan)[0]
+    db_session.add(models.LoanPenalty(
+        schedule_id=first.id, loan_id=loan.id, period=date.today().replace(day=1), amount=Decimal("10.00"),
+        transaction_id="penalty-1", tenant_id=loan.tenant_id,
+    ))
+    db_session.commit()
+
+    assert pay(db_session, loan, admin, "15.00") == [("interest", Decimal("5.00")), ("penalty", Decimal("10.00"))]
+    assert credits(db_session, "1110") == Decimal("10.00")
+
+    # Everything left (1344.00 scheduled less 5.00 interest paid) plus 20.00 too much
+    allocations = pay(db_session, loan, admin, "1359.00")
+    assert ("overpayment", Decimal("20.00")) in allocations
+    assert sum(amount for _, amount in allocations) == Decimal("1359.00")
+    db_session.expire_all()
+    assert loan.status == models.LoanStatus.PAID_OFF
+    assert Decimal(loan.principal_outstanding) == Decimal("0.00")
+    assert {i.status for i in installments(db_session, loan)} == {models.RepaymentStatus.PAID}
+    assert credits(db_session, "2010") == Decimal("20.00")
+
+
+def test_sub_cent_payments_are_rounded_to_cents(db_session: Session):
+    """The transaction, its allocations and the GL must agree to the cent."""
+    admin, _, loan = seed_loan(db_session)
+
+    assert pay(db_session, loan, admin, "50.005") == [("interest", Decimal("12.00")), ("principal", Decimal("38.01"))]
+    transaction = db_session.query(models.RepaymentTransaction).filter(
+        models.RepaymentTransaction.loan_id == loan.id
+    ).one()
+    assert Decimal(transaction.amount_paid) == Decimal("50.01")
+    assert credits(db_session, "4010") + credits(db_session, "1100") == Decimal("50.01")
+
+
+def test_teller_records_a_payment_without_naming_an_installment(test_client: TestClient, db_session: Session):
+    admin, password, loan = seed_loan(db_session)
+    loan_id, headers = loan.id, get_auth_headers(test_client, admin.email, password)
+    response = test_client.post(f"/api/v1/repayments/{loan_id}/record", json={"amount_paid": 112.0}, headers=headers)
+    assert response.status_code == 204
+    first = db_session.query(models.RepaymentSchedule).filter(
+        models.RepaymentSchedule.loan_id == loan_id
+    ).order_by(models.RepaymentSchedule.due_date).first()
+    assert first.status == models.RepaymentStatus.PAID
+    for amount in (0, 0.004):
+        assert test_client.post(
+            f"/api/v1/repayments/{loan_id}/record", json={"amount_paid": amount}, headers=headers
+        ).status_code == 422
+
+
+def test_concurrent_payments_to_one_loan_are_both_recorded(db_session: Session):
+    """Two sessions paying the same loan must not overwrite each other's paid amounts."""
+    _, _, loan = seed_loan(db_session)
+    other = Session(bind=db_session.connection())
+    first, second = allocation_service.Allocator(db_session), allocation_service.Allocator(other)
+    # Both read the loan before either writes (SQLite has no row locks to make the second wait)
+    first.load([loan.id])
+    second.load([loan.id])
+    for allocator in (first, second):
+        allocator.allocate(loan.id, Decimal("50.00"), datetime.utcnow())
+        allocator.flush()
+    other.close()
+
+    db_session.expire_all()
+    installment = installments(db_session, loan)[0]
+    assert installment.interest_paid + installment.principal_paid == Decimal("100.00") == loan.total_paid
@@ -0,0 +1,155 @@
+# backend/tests/api/v1/test_period_close.py
+
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app import models
+from app.core.security import UserRole
+from app.schemas import accounting as accounting_schema
+from app.services import accounting_service, period_service
+from tests.utils import (
+    add_chart_of_accounts, create_disbursed_loans, create_tenant_and_admin, create_user_in_db, get_auth_headers,
+)
+
+START = datetime(2025, 1, 1, 9, 0)
+
+
+def entry(day: datetime, debit_code: str, credit_code: str, amount: int, description: str):
+    return accounting_schema.JournalEntry(
+        description=description, transaction_date=day,
+        lines=[
+            accounting_schema.JournalLine(account_code=debit_code, debit=Decimal(amount)),
+            accounting_schema.JournalLine(account_code=credit_code, credit=Decimal(amount)),
+        ],
+    )
+
+
+def seed_books(db_session: Session, days: int = 90):
+    """A savings deposit, then a daily disbursement and interest receipt from 1 January 2025."""
+    tenant, admin, password = create_tenant_and_admin(db_session)
+    add_chart_of_accounts(db_session, tenant)
+    entries = [entry(START, "1010", "2010", 10000, "savings deposit")]
+    for i in range(days):
+        day = START + timedelta(days=i)
+        entries.append(entry(day, "1100", "1010", 50 + i, f"disbursement {i}"))
+        entries.append(entry(day, "1010", "4010", 5, f"interest {i}"))
+    accounting_service.post_journal_batch(db_session, tenant.id, entries)
+    db_session.commit()
+    return tenant, admin, password
+
+
+def ledger_totals(db_session: Session, tenant_id, as_of: date) -> dict:
+    ledger = models.GeneralLedgerEntry
+    rows = db_session.query(ledger.account_id, func.sum(ledger.debit), func.sum(ledger.credit)).filter(
+        ledger.tenant_id == tenant_id, ledger.transaction_date < as_of + timedelta(days=1)
+    ).group_by(ledger.account_id).all()
+    return {account_id: [Decimal(debits), Decimal(credits)] for account_id, debits, credits in rows}
+
+
+def test_closed_months_are_snapshotted_and_locked(db_session: Session):
+    """
+    As an accountant, I want to close a month so that its balances are
+    frozen and nothing can be posted into it afterwards.
+    """
+    tenant, admin, _ = seed_books(db_session)
+    period_service.close_period(db_session, tenant.id, date(2025, 1, 31), admin.id)
+    period_service.close_period(db_session, tenant.id, date(2025, 2, 28))
+    db_session.commit()
+
+    for as_of in (date(2024, 12, 31), date(2025, 1, 31), date(2025, 2, 14), date(2025, 2, 28), date(2025, 3, 20)):
+        assert period_service.balances_as_of(db_session, tenant.id, as_of) == ledger_totals(db_session, tenant.id, as_of)
+
+    with pytest.raises(period_service.ClosedPeriodError):
+        accounting_service.post_journal_batch(
+            db_session, tenant.id, [entry(datetime(2025, 2, 10), "1100", "1010", 1, "backdated")]
+        )
+    # The first open day is fine
+    accounting_service.post_journal_batch(db_session, tenant.id, [entry(datetime(2025, 3, 1), "1100", "1010", 1, "open")])
+    db_session.commit()
+
+
+def test_api_postings_into_a_closed_month_are_conflicts(
+    test_client: TestClient, db_session: Session, monkeypatch: pytest.MonkeyPatch
+):
+    """A posting that reaches a month closed in the meantime is a 409 naming the close, not a server error."""
+    tenant, admin, password = seed_books(db_session, days=3)
+    [loan] = create_disbursed_loans(db_session, tenant, disbursed_at=START)
+    period_service.close_period(db_session, tenant.id, date(2025, 1, 31))
+    db_session.commit()
+    loan_id, headers = loan.id, get_auth_headers(test_client, admin.email, password)
+
+    # The import reads the last closed month before the close above commits
+    last_closed = period_service.last_closed
+
+    def before_the_close(db, tenant_id):
+        monkeypatch.setattr(period_service, "last_closed", last_closed)
+        return None
+
+    monkeypatch.setattr(period_service, "last_closed", before_the_close)
+    statement = f"reference,loan_id,amount,transaction_date\nBK-001,{loan_id},100.00,2025-01-15\n".encode()
+    response = test_client.post(
+        "/api/v1/repayments/import", files={"statement": ("bank.csv", statement, "text/csv")}, headers=headers
+    )
+    assert response.status_code == 409
+    assert response.json()["closed_through"] == "2025-01-31"
+    assert "closed through 2025-01-31" in response.json()["detail"]
+
+
+def test_months_are_closed_in_order(db_session: Session):
+    tenant, _, _ = seed_books(db_session, days=3)
+    period_service.close_period(db_session, tenant.id, date(2025, 1, 31))
+    db_session.commit()
+
+    for period_end, status_code in [
+        (date(2025, 1, 31), 409), (date(2025, 3, 31), 400), (date(2025, 2, 27), 400),
+        (period_service.month_end(date.today()), 400),
+    ]:
+        with pytest.raises(HTTPException) as excinfo:
+            period_service.close_period(db_session, tenant.id, period_end)
+        assert excinfo.value.status_code == status_code
+    assert [p.period_end for p in period_service.list_closed_periods(db_session, tenant.id)] == [date(2025, 1, 31)]
+
+
+def test_statements_as_of_any_date(test_client: TestClient, db_session: Session):
+    """
+    As an accountant, I want a trial balance, balance sheet and income
+    statement for any past date.
+    """
+    tenant, admin, password = seed_books(db_session)
+    create_user_in_db(db_session, tenant, "period.auditor@test.com", "auditorpass", UserRole.AUDITOR)
+    admin_email = admin.email
+    headers = get_auth_headers(test_client, admin_email, password)
+
+    response = test_client.post("/api/v1/reports/periods", json={"period_end": "2025-01-31"}, headers=headers)
+    assert response.status_code == 201
+    assert response.json()["period_end"] == "2025-01-31"
+    auditor_headers = get_auth_headers(test_client, "period.auditor@test.com", "auditorpass")
+    assert test_client.post(
+        "/api/v1/reports/periods", json={"period_end": "2025-02-28"}, headers=auditor_headers
+    ).status_code == 403
+    assert len(test_client.get("/api/v1/reports/periods", headers=auditor_headers).json()) == 1
+
+    trial = test_client.get("/api/v1/reports/trial-balance?as_of=2025-02-10", headers=headers).json()
+    by_code = {row["account_code"]: row for row in trial}
+    assert by_code["1100"]["total_debits"] == sum(50 + i for i in range(41))
+    assert sum(row["total_debits"] for row in trial) == sum(row["total_credits"] for row in trial)
+
+    sheet = test_client.get("/api/v1/reports/balance-sheet?as_of=2025-02-10", headers=headers).json()
+    assert sheet["total_assets"] == sheet["total_liabilities_and_equity"]
+    assert sheet["total_liabilities"] == 10000
+    assert sheet["current_earnings"] == 5 * 41
+
+    income = test_client.get(
+        "/api/v1/reports/income-statement?start_date=2025-01-20&end_date=2025-02-10", headers=headers
+    ).json()
+    assert income["revenue"] == [{"account_code": "4010", "account_name": "Interest Revenue", "amount": 5.0 * 22}]
+    assert income["net_income"] == 5 * 22
+    assert test_client.get(
+        "/api/v1/reports/income-statement?start_date=2025-02-10&end_date=2025-01-20", headers=headers
+    ).status_code == 400
@@ -0,0 +1,104 @@
+# backend/tests/api/v1/test_portfolio_aging.py
+
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app import models, schemas
+from app.core.security import UserRole
+from app.services import aging_service, delinquency_service, repayment_service
+from tests.utils import (
+    add_chart_of_accounts, create_disbursed_loans, create_tenant_and_admin, create_user_in_db, get_auth_headers,
+)
+
+
+def seed_aged_portfolio(db_session: Session):
+    """
+    Three 1200.00 / 12-month interest-free loans (100.00 principal a month):
+    two disbursed 100 days ago under an officer, one disbursed today.
+    """
+    tenant, admin, password = create_tenant_and_admin(db_session)
+    add_chart_of_accounts(db_session, tenant)
+    officer = create_user_in_db(db_session, tenant, "aging.officer@test.com", "officerpass", UserRole.LOAN_OFFICER)
+    today = datetime.combine(date.today(), datetime.min.time())
+    loans = create_disbursed_loans(
+        db_session, tenant, count=3,
+        each=lambda i: {"disbursed_at": today - timedelta(days=100), "assigned_officer_id": officer.id} if i < 2 else {},
+        disbursed_at=today,
+    )
+    return tenant, admin, password, officer, loans
+
+
+def aggregate(db_session: Session, tenant_id):
+    rows = db_session.query(models.PortfolioAging).filter(
+        models.PortfolioAging.tenant_id == tenant_id, models.PortfolioAging.loan_count != 0
+    ).all()
+    return sorted((row.officer_id, row.bucket, row.loan_count, Decimal(row.principal_outstanding)) for row in rows)
+
+
+def test_aging_is_maintained_incrementally_and_by_the_sweep(db_session: Session):
+    """
+    As a risk manager, I want each loan's days past due and outstanding
+    principal kept current by repayments and the nightly sweep, with the
+    incremental updates always agreeing with a full recomputation.
+    """
+    tenant, _, _, officer, loans = seed_aged_portfolio(db_session)
+    tenant_id, old_loan_id = tenant.id, loans[0].id
+
+    # Freshly disbursed: everything outstanding and aged as of disbursement
+    assert {Decimal(loan.principal_outstanding) for loan in loans} == {Decimal("1200.00")}
+
+    delinquency_service.sweep_tenant(db_session, tenant_id, date.today())
+    db_session.commit()
+    old_loan = db_session.get(models.Loan, old_loan_id)
+    first_due = db_session.query(models.RepaymentSchedule).filter(
+        models.RepaymentSchedule.loan_id == old_loan_id
+    ).order_by(models.RepaymentSchedule.due_date).first()
+    assert old_loan.days_past_due == (date.today() - first_due.due_date).days
+    swept = aggregate(db_session, tenant_id)
+    assert [row[2] for row in swept if row[0] == officer.id] == [2]
+
+    # Paying the oldest installment moves the loan to a younger bucket
+    repayment_service.record_payment(
+        db_session, schemas.repayment.RepaymentRecord(schedule_id=first_due.id, amount_paid=100.0),
+        old_loan, officer,
+    )
+    db_session.commit()
+    assert Decimal(old_loan.principal_outstanding) == Decimal("1100.00")
+    assert old_loan.days_past_due < (date.today() - first_due.due_date).days
+    incremental = aggregate(db_session, tenant_id)
+    assert incremental != swept
+
+    aging_service.rebuild_tenant_aging(db_session, tenant_id)
+    db_session.commit()
+    assert aggregate(db_session, tenant_id) == incremental
+
+
+def test_admin_sees_portfolio_at_risk(test_client: TestClient, db_session: Session):
+    """
+    As an MFI admin, I want PAR ratios and aging buckets by product and officer.
+    """
+    tenant, admin, password, officer, _ = seed_aged_portfolio(db_session)
+    admin_email, officer_email = admin.email, officer.email
+    delinquency_service.sweep_tenant(db_session, tenant.id, date.today())
+    db_session.commit()
+
+    headers = get_auth_headers(test_client, admin_email, password)
+    response = test_client.get("/api/v1/reports/portfolio-at-risk", headers=headers)
+    assert response.status_code == 200
+    par = response.json()
+    # 100 days after disbursement the first installment is about 70 days overdue
+    assert par["loan_count"] == 3
+    assert par["principal_outstanding"] == 3600.0
+    assert par["par1"] == par["par30"] == par["par60"] == 2400.0 / 3600.0
+    assert par["par90"] == 0.0
+    buckets = {b["bucket"]: b["loan_count"] for b in par["buckets"]}
+    assert buckets == {"current": 1, "1-30": 0, "31-60": 0, "61-90": 2, "91+": 0}
+    assert [p["name"] for p in par["by_product"]] == ["Test Loan"]
+    officers = {o["name"]: o["par30"] for o in par["by_officer"]}
+    assert officers == {officer_email: 1.0, None: 0.0}
+
+    dashboard = test_client.get("/api/v1/reports/dashboard", headers=headers).json()
+    assert dashboard["portfolio_at_risk_par30"] == par["par30"]
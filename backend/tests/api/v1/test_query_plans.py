@@ -0,0 +1,132 @@
+# backend/tests/api/v1/test_query_plans.py
+
+"""
+Asserts that the hot tenant-scoped queries are served by the indexes added
+for them. The SQL is captured while the real service/endpoint code runs and
+then passed through SQLite's EXPLAIN QUERY PLAN.
+"""
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app import models
+from app.core.security import UserRole
+from app.services import accounting_service, delinquency_service, reporting_service
+from tests.utils import (
+    add_chart_of_accounts, create_disbursed_loans, create_tenant_and_admin, create_user_in_db, get_auth_headers,
+)
+
+
+@contextmanager
+def captured_sql(db: Session):
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(("SELECT", "WITH", "UPDATE")):
+            statements.append((statement, parameters))
+
+    engine = db.get_bind().engine
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+
+def query_plan(db: Session, statements, *fragments: str) -> str:
+    """EXPLAIN QUERY PLAN of the captured statement containing all `fragments`."""
+    matches = [(s, p) for s, p in statements if all(f in s for f in fragments)]
+    assert matches, f"no captured query contains {fragments}"
+    statement, parameters = matches[-1]
+    rows = db.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all()
+    return "\n".join(row[-1] for row in rows)
+
+
+def seed_portfolio(db: Session):
+    tenant, admin, password = create_tenant_and_admin(db)
+    add_chart_of_accounts(db, tenant)
+    [loan] = create_disbursed_loans(
+        db, tenant, interest_rate=12, penalty=(models.PenaltyType.FLAT, Decimal("5.00")),
+        disbursed_at=datetime.utcnow() - timedelta(days=90),
+    )
+    borrower = create_user_in_db(db, tenant, "plan.borrower@test.com", "borrowerpass", UserRole.CLIENT)
+    borrower.client_id = loan.client_id
+    db.commit()
+    return tenant, admin, password, loan, borrower
+
+
+def test_hot_queries_use_tenant_scoped_indexes(test_client: TestClient, db_session: Session):
+    """
+    As an operator, I want every hot tenant-scoped query to be an index search,
+    never a full table scan, so latency does not grow with other tenants' data.
+    """
+    tenant, admin, password, loan, borrower = seed_portfolio(db_session)
+    tenant_id, admin_email, borrower_email = tenant.id, admin.email, borrower.email
+
+    with captured_sql(db_session) as statements:
+        accounting_service.get_account_ids(db_session, tenant_id, [accounting_service.CASH_ACCOUNT])
+        reporting_service.get_dashboard_metrics(db_session, tenant_id=tenant_id)
+
+        admin_headers = get_auth_headers(test_client, admin_email, password)
+        assert test_client.get("/api/v1/reports/trial-balance", headers=admin_headers).status_code == 200
+        borrower_headers = get_auth_headers(test_client, borrower_email, "borrowerpass")
+        assert test_client.get("/api/v1/loans/my-loans", headers=borrower_headers).status_code == 200
+        assert test_client.get("/api/v1/loan-products/", headers=borrower_headers).status_code == 200
+
+    expectations = {
+        ("FROM chart_of_accounts", "chart_of_accounts.tenant_id ="): "uq_chart_of_accounts_tenant_id_account_code",
+        ("count(clients.id)",): "ix_clients_tenant_id",
+        ("count(loans.id)",): "ix_loans_tenant_id_status",
+        ("sum(loans.amount_requested)",): "ix_loans_tenant_id_status",
+        # Only tenant_id is filtered, so any (tenant_id, ...) index serves it
+        ("sum(repayment_transactions.amount_paid)",): "repayment_transactions_tenant_id_",
+        ("JOIN account_balances",): "ix_account_balances_tenant_id",
+        ("FROM loans", "loans.client_id ="): "ix_loans_client_id",
+        ("FROM loan_products", "loan_products.tenant_id ="): "ix_loan_products_tenant_id",
+    }
+    for fragments, index_name in expectations.items():
+        plan = query_plan(db_session, statements, *fragments)
+        assert index_name in plan, f"{fragments} not using {index_name}:\n{plan}"
+
+
+def test_overdue_sweep_uses_partial_index(db_session: Session):
+    """
+    As an operator, I want tenant-wide overdue lookups to read only the
+    (small) partial index of unpaid installments.
+    """
+    tenant, *_ = seed_portfolio(db_session)
+    with captured_sql(db_session) as statements:
+        delinquency_service.sweep_tenant(db_session, tenant.id, date.today())
+    for fragments in (("UPDATE repayment_schedules",), ("FROM repayment_schedules JOIN loans",)):
+        plan = query_plan(db_session, statements, *fragments)
+        assert "ix_repayment_schedules_unpaid_tenant_id_due_date" in plan, f"{fragments}:\n{plan}"
+
+
+def test_ledger_pages_are_index_range_scans(test_client: TestClient, db_session: Session):
+    """
+    As an auditor, I want deep ledger pages to cost the same as the first one:
+    the keyset predicate must seek into the (…, transaction_date, id) index.
+    """
+    tenant, admin, password, *_ = seed_portfolio(db_session)
+    for amount in (10, 20, 30):
+        accounting_service.post_transaction(
+            db_session, tenant.id, "Plan posting", accounting_service.LOANS_RECEIVABLE_ACCOUNT,
+            accounting_service.CASH_ACCOUNT, amount,
+        )
+    db_session.commit()
+    headers = get_auth_headers(test_client, admin.email, password)
+
+    with captured_sql(db_session) as statements:
+        for query in ("", "&account_code=1010"):
+            cursor = test_client.get(f"/api/v1/reports/ledger?limit=1{query}", headers=headers).json()["next_cursor"]
+            assert test_client.get(f"/api/v1/reports/ledger?limit=1&cursor={cursor}{query}", headers=headers).status_code == 200
+
+    pages = [(s, p) for s, p in statements if "general_ledger_entries.id) > (?, ?)" in s]
+    tenant_plan = query_plan(db_session, [page for page in pages if "account_code = ?" not in page[0]], "LIMIT")
+    account_plan = query_plan(db_session, pages, "account_code = ?", "LIMIT")
+    assert "ix_general_ledger_entries_tenant_id_transaction_date_id" in tenant_plan, tenant_plan
+    assert "ix_general_ledger_entries_account_id_transaction_date_id" in account_plan, account_plan
@@ -0,0 +1,86 @@
+# backend/tests/api/v1/test_read_routing.py
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core import database, read_routing
+from tests.utils import create_tenant_and_admin, get_auth_headers
+
+TELLER = {"email": "replica.teller@test.com", "password": "password123", "role": "teller"}
+
+
+@pytest.fixture
+def replica(monkeypatch):
+    """
+    Points the read replica at a second connection to the test database.
+    Test data lives in an uncommitted transaction, so the "replica" cannot
+    see it yet -- just like a replica that has not replayed a write.
+    """
+    def attach(url: str = "sqlite:///./test.db"):
+        read_engine = create_engine(url)
+        async_read_engine = create_async_engine(database.async_database_url(url))
+        monkeypatch.setattr(database, "read_engine", read_engine)
+        monkeypatch.setattr(database, "ReadSessionLocal", sessionmaker(bind=read_engine))
+        monkeypatch.setattr(
+            database, "AsyncReadSessionLocal",
+            async_sessionmaker(async_read_engine, class_=AsyncSession, expire_on_commit=False)
+        )
+        engines.append(read_engine)
+        return read_engine
+
+    engines = []
+    yield attach
+    for engine in engines:
+        engine.dispose()
+
+
+def test_user_reads_own_writes_from_primary(test_client: TestClient, db_session: Session, replica):
+    """
+    As an admin, a team member I just added shows up in the list even though
+    the replica has not caught up; once the pin expires, reads go to the replica.
+    """
+    replica()
+    _, admin, password = create_tenant_and_admin(db_session)
+    admin_id = admin.id
+    auth_headers = get_auth_headers(test_client, admin.email, password)
+
+    response = test_client.post("/api/v1/team/members", json=TELLER, headers=auth_headers)
+    assert response.status_code == 201
+    assert read_routing.is_pinned(admin_id)
+
+    assert read_routing.LAST_WRITE_COOKIE in response.cookies
+
+    response = test_client.get("/api/v1/team/members", headers=auth_headers)
+    assert TELLER["email"] in [m["email"] for m in response.json()["items"]]
+
+    # A worker that did not see the write is pinned by the cookie
+    read_routing._recent_writers.clear()
+    response = test_client.get("/api/v1/team/members", headers=auth_headers)
+    assert TELLER["email"] in [m["email"] for m in response.json()["items"]]
+
+    # Pin expired: the (lagging) replica serves the read
+    test_client.cookies.clear()
+    response = test_client.get("/api/v1/team/members", headers=auth_headers)
+    assert response.status_code == 200
+    assert response.json()["items"] == []
+    assert read_routing.stats()["replica_reads"] == 1
+
+
+def test_unreachable_replica_falls_back_to_primary(test_client: TestClient, db_session: Session, replica):
+    """
+    As an operator, a broken replica must never fail requests; reads fall back to the primary.
+    """
+    replica("sqlite:////nonexistent-dir/replica.db")
+    _, admin, password = create_tenant_and_admin(db_session)
+    auth_headers = get_auth_headers(test_client, admin.email, password)
+    test_client.post("/api/v1/team/members", json=TELLER, headers=auth_headers)
+    read_routing._recent_writers.clear()
+    test_client.cookies.clear()
+
+    response = test_client.get("/api/v1/team/members", headers=auth_headers)
+    assert TELLER["email"] in [m["email"] for m in response.json()["items"]]
+    assert read_routing.stats()["healthy"] is False
+    assert read_routing.stats()["last_error"]
@@ -0,0 +1,127 @@
+# backend/tests/api/v1/test_repayment_import.py
+
+import csv
+import io
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+from fastapi.testclient import TestClient
+from openpyxl import Workbook
+from sqlalchemy.orm import Session
+
+from app import models
+from app.services import repayment_import_service
+from tests.utils import (
+    add_chart_of_accounts, create_disbursed_loans, create_loans, create_tenant_and_admin, get_auth_headers,
+)
+
+
+def seed_loans(db_session: Session):
+    """Two disbursed 1200.00 / 12-month interest-free loans (100.00 installments) and one pending loan."""
+    tenant, admin, password = create_tenant_and_admin(db_session)
+    add_chart_of_accounts(db_session, tenant)
+    disbursed = create_disbursed_loans(
+        db_session, tenant, count=2, disbursed_at=datetime.combine(date.today() - timedelta(days=40), datetime.min.time())
+    )
+    pending = create_loans(db_session, tenant, status=models.LoanStatus.PENDING)
+    db_session.commit()
+    return admin.email, password, [loan.id for loan in (*disbursed, *pending)]
+
+
+def statement_csv(lines) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(["reference", "loan_id", "amount", "transaction_date"])
+    writer.writerows(lines)
+    return buffer.getvalue().encode()
+
+
+def paid_installments(db_session: Session, loan_id) -> int:
+    return db_session.query(models.RepaymentSchedule).filter(
+        models.RepaymentSchedule.loan_id == loan_id, models.RepaymentSchedule.status == models.RepaymentStatus.PAID
+    ).count()
+
+
+def test_teller_imports_a_statement_idempotently(test_client: TestClient, db_session: Session):
+    """
+    As a teller, I want to upload the day's mobile-money statement and see
+    which lines were recorded, without double-counting a re-upload.
+    """
+    email, password, (loan_id, other_loan_id, pending_loan_id) = seed_loans(db_session)
+    headers = get_auth_headers(test_client, email, password)
+    yesterday = (date.today() - timedelta(days=1)).isoformat()
+    statement = statement_csv([
+        ("MP-001", loan_id, "100.00", yesterday),
+        ("MP-002", loan_id, "50", ""),
+        ("MP-003", loan_id, "1,050.00", ""),
+        ("MP-001", other_loan_id, "100.00", ""),
+        ("MP-004", "not-a-loan", "100.00", ""),
+        ("MP-005", pending_loan_id, "100.00", ""),
+        ("MP-006", other_loan_id, "-5", ""),
+        ("MP-007", loan_id, "10.00", ""),
+    ])
+
+    response = test_client.post(
+        "/api/v1/repayments/import", files={"statement": ("mpesa.csv", statement, "text/csv")}, headers=headers
+    )
+    assert response.status_code == 200
+    report = response.json()
+    assert (report["accepted"], report["duplicates"], report["rejected"]) == (3, 1, 4)
+    assert report["amount_accepted"] == 1200.0
+    assert [line["outcome"] for line in report["lines"]] == [
+        "accepted", "accepted", "accepted", "duplicate", "rejected", "rejected", "rejected", "rejected",
+    ]
+    assert report["lines"][-1]["detail"] == "The loan has nothing left to pay."
+    assert paid_installments(db_session, loan_id) == 12
+
+    transactions = db_session.query(models.RepaymentTransaction).filter(
+        models.RepaymentTransaction.loan_id == loan_id
+    ).order_by(models.RepaymentTransaction.reference).all()
+    assert [t.reference for t in transactions] == ["MP-001", "MP-002", "MP-003"]
+    assert transactions[0].transaction_date.date() == date.today() - timedelta(days=1)
+    assert db_session.get(models.Loan, loan_id).principal_outstanding == Decimal("0.00")
+    cash = db_session.query(models.GeneralLedgerEntry).join(models.ChartOfAccount).filter(
+        models.ChartOfAccount.account_code == "1010", models.GeneralLedgerEntry.description.like("%(ref MP-%")
+    ).all()
+    assert sum(entry.debit for entry in cash) == Decimal("1200.00")
+
+    again = test_client.post(
+        "/api/v1/repayments/import", files={"statement": ("mpesa.csv", statement, "text/csv")}, headers=headers
+    ).json()
+    assert (again["accepted"], again["duplicates"]) == (0, 4)
+    assert db_session.query(models.RepaymentTransaction).count() == 3
+
+
+def test_xlsx_statements_are_imported_in_batches(test_client: TestClient, db_session: Session, monkeypatch):
+    monkeypatch.setattr(repayment_import_service.settings, "REPAYMENT_IMPORT_BATCH_SIZE", 2)
+    email, password, (loan_id, other_loan_id, _) = seed_loans(db_session)
+    headers = get_auth_headers(test_client, email, password)
+
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.append(["Reference", "Loan_ID", "Amount", "Transaction_Date"])
+    paid_on = datetime.combine(date.today() - timedelta(days=2), datetime.min.time())
+    for i in range(5):
+        # Half an installment per line: the carry completes one every second line
+        sheet.append([f"BANK-{i}", str(loan_id if i % 2 else other_loan_id), 50, paid_on])
+        sheet.append([f"BANK-{i}b", str(loan_id if i % 2 else other_loan_id), 50.0, paid_on])
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+
+    report = test_client.post(
+        "/api/v1/repayments/import", files={"statement": ("bank.xlsx", buffer.getvalue(), "application/octet-stream")},
+        headers=headers,
+    ).json()
+    assert report["accepted"] == 10
+    assert [line["line"] for line in report["lines"]] == list(range(2, 12))
+    assert (paid_installments(db_session, loan_id), paid_installments(db_session, other_loan_id)) == (2, 3)
+
+
+def test_statement_without_required_columns_is_rejected(test_client: TestClient, db_session: Session):
+    email, password, _ = seed_loans(db_session)
+    headers = get_auth_headers(test_client, email, password)
+    response = test_client.post(
+        "/api/v1/repayments/import", files={"statement": ("bad.csv", b"ref,amount\nX,1\n", "text/csv")}, headers=headers
+    )
+    assert response.status_code == 400
+    assert "loan_id" in response.json()["detail"]
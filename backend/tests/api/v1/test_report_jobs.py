@@ -0,0 +1,157 @@
+# backend/tests/api/v1/test_report_jobs.py
+
+import csv
+import io
+import os
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import pytest
+from fastapi.testclient import TestClient
+from openpyxl import load_workbook
+from sqlalchemy.orm import Session
+
+from app import models
+from app.core.security import UserRole
+from app.services import report_job_service
+from tests.utils import create_tenant_and_admin, create_user_in_db, get_auth_headers
+
+
+@pytest.fixture
+def inline_runner(db_session: Session, tmp_path, monkeypatch):
+    """Runs jobs inline on the test session and writes artifacts under tmp_path."""
+    monkeypatch.setattr(report_job_service.settings, "REPORT_ARTIFACT_DIR", str(tmp_path))
+    runner = report_job_service.ReportJobRunner(
+        workers=0, max_running_per_tenant=1, session_factory=lambda: db_session
+    )
+    monkeypatch.setattr(report_job_service, "runner", runner)
+    return runner
+
+
+def queued_job(db_session: Session, user: models.User, kind=models.ReportKind.LOAN_EXPORT) -> models.ReportJob:
+    job = models.ReportJob(
+        kind=kind.value, format="csv", parameters={}, requested_by_user_id=user.id, tenant_id=user.tenant_id
+    )
+    db_session.add(job)
+    db_session.flush()
+    return job
+
+
+def test_auditor_can_request_and_download_a_report(test_client: TestClient, db_session: Session, inline_runner):
+    """
+    As an auditor, I want large reports generated in the background so I can
+    download them when ready instead of holding a request open.
+    """
+    tenant, admin, password = create_tenant_and_admin(db_session)
+    client = models.Client(first_name="Queued", last_name="Borrower", tenant_id=tenant.id)
+    product = models.LoanProduct(name="Queued Loan", interest_rate=10, max_tenure_months=12, tenant_id=tenant.id)
+    db_session.add_all([client, product])
+    db_session.flush()
+    db_session.add_all(
+        models.Loan(
+            amount_requested=Decimal(200 + i), tenure_months=6, client_id=client.id,
+            loan_product_id=product.id, tenant_id=tenant.id,
+        )
+        for i in range(3)
+    )
+    db_session.commit()
+    headers = get_auth_headers(test_client, admin.email, password)
+
+    response = test_client.post("/api/v1/reports/jobs", json={"kind": "loan_export", "format": "csv"}, headers=headers)
+    assert response.status_code == 202
+    assert response.json()["status"] == "queued"
+    job_id = response.json()["id"]
+
+    job = test_client.get(f"/api/v1/reports/jobs/{job_id}", headers=headers).json()
+    assert job["status"] == "succeeded"
+    assert job["artifact_size"] > 0
+    assert inline_runner.stats()["completed"] == 1
+
+    response = test_client.get(f"/api/v1/reports/jobs/{job_id}/download", headers=headers)
+    assert response.status_code == 200
+    records = list(csv.DictReader(io.StringIO(response.text)))
+    assert sorted(float(record["amount_requested"]) for record in records) == [200.0, 201.0, 202.0]
+
+    response = test_client.post("/api/v1/reports/jobs", json={"kind": "trial_balance"}, headers=headers)
+    job_id = response.json()["id"]
+    response = test_client.get(f"/api/v1/reports/jobs/{job_id}/download", headers=headers)
+    assert response.status_code == 200
+    sheet = load_workbook(io.BytesIO(response.content), read_only=True)["Trial Balance"]
+    assert list(next(sheet.iter_rows(values_only=True))) == report_job_service.export_service.TRIAL_BALANCE_COLUMNS
+
+    listed = test_client.get("/api/v1/reports/jobs", headers=headers).json()
+    assert [entry["kind"] for entry in listed] == ["trial_balance", "loan_export"]
+
+
+def test_report_parameters_are_validated(test_client: TestClient, db_session: Session, inline_runner):
+    _, admin, password = create_tenant_and_admin(db_session)
+    headers = get_auth_headers(test_client, admin.email, password)
+
+    response = test_client.post(
+        "/api/v1/reports/jobs", json={"kind": "loan_export", "as_of": "2025-01-31"}, headers=headers
+    )
+    assert response.status_code == 422
+    response = test_client.post(
+        "/api/v1/reports/jobs",
+        json={"kind": "general_ledger", "start_date": "2025-02-01", "end_date": "2025-01-01"},
+        headers=headers,
+    )
+    assert response.status_code == 422
+
+
+def test_jobs_are_private_and_downloads_wait_for_success(test_client: TestClient, db_session: Session, inline_runner):
+    _, admin, password = create_tenant_and_admin(db_session)
+    other_tenant = models.Tenant(name="Other MFI", subdomain="other-mfi")
+    db_session.add(other_tenant)
+    db_session.flush()
+    other_admin = create_user_in_db(db_session, other_tenant, "admin@other-mfi.com", "password", UserRole.ADMIN)
+    queued = queued_job(db_session, admin)
+    foreign = queued_job(db_session, other_admin)
+    queued_id, foreign_id = queued.id, foreign.id
+    db_session.commit()
+    headers = get_auth_headers(test_client, admin.email, password)
+
+    assert test_client.get(f"/api/v1/reports/jobs/{foreign_id}", headers=headers).status_code == 404
+    assert test_client.get(f"/api/v1/reports/jobs/{queued_id}/download", headers=headers).status_code == 409
+
+
+def test_claims_respect_the_per_tenant_running_cap(db_session: Session):
+    """
+    As an operator, I want one tenant's burst of reports not to take every
+    worker, so other tenants' reports still start promptly.
+    """
+    _, busy_admin, _ = create_tenant_and_admin(db_session)
+    other_tenant = models.Tenant(name="Quiet MFI", subdomain="quiet-mfi")
+    db_session.add(other_tenant)
+    db_session.flush()
+    quiet_admin = create_user_in_db(db_session, other_tenant, "admin@quiet-mfi.com", "password", UserRole.ADMIN)
+    busy_jobs = [queued_job(db_session, busy_admin) for _ in range(3)]
+    quiet_job = queued_job(db_session, quiet_admin)
+
+    claimed = report_job_service.claim_jobs(db_session, limit=4, max_running_per_tenant=1)
+    assert set(claimed) == {busy_jobs[0].id, quiet_job.id}
+    assert report_job_service.claim_jobs(db_session, limit=4, max_running_per_tenant=1) == []
+    assert len(report_job_service.claim_jobs(db_session, limit=4, max_running_per_tenant=2)) == 1
+
+
+def test_expired_artifacts_are_purged(test_client: TestClient, db_session: Session, tmp_path):
+    _, admin, password = create_tenant_and_admin(db_session)
+    artifact = tmp_path / "old.csv"
+    artifact.write_text("id\n")
+    job = queued_job(db_session, admin)
+    job.status = models.ReportJobStatus.SUCCEEDED
+    job.artifact_path = str(artifact)
+    job.expires_at = datetime.utcnow() - timedelta(minutes=1)
+    stale = queued_job(db_session, admin)
+    stale.status = models.ReportJobStatus.RUNNING
+    stale.started_at = datetime.utcnow() - timedelta(days=1)
+    job_id = job.id
+    db_session.commit()
+
+    assert report_job_service.purge_expired(db_session) == 1
+    assert report_job_service.fail_stale(db_session) == 1
+    assert not os.path.exists(artifact)
+    assert stale.status == models.ReportJobStatus.FAILED
+
+    headers = get_auth_headers(test_client, admin.email, password)
+    assert test_client.get(f"/api/v1/reports/jobs/{job_id}/download", headers=headers).status_code == 410
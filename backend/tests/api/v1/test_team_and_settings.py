@@ -53,4 +53,39 @@ def test_admin_can_view_dashboard(test_client: TestClient, db_session: Session):
     assert response.status_code == 200
     data = response.json()
     assert "total_clients" in data
-    assert "active_loans" in data
\ No newline at end of file
+    assert "active_loans" in data
+
+def test_admin_can_view_pool_metrics(test_client: TestClient, db_session: Session):
+    """
+    As an operator, I want connection-pool and cache metrics to size workers x pool.
+    """
+    from sqlalchemy import text
+    from app.core.database import engine
+
+    _, admin, password = create_tenant_and_admin(db_session)
+    auth_headers = get_auth_headers(test_client, admin.email, password)
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+
+    response = test_client.get("/api/v1/metrics/", headers=auth_headers)
+    assert response.status_code == 200
+    data = response.json()
+    primary = data["database"]["pools"]["primary"]
+    assert primary["checkouts"] >= 1
+    assert sum(primary["wait_ms_histogram"].values()) == primary["checkouts"]
+    assert "tenant_registry" in data["caches"]
+
+def test_admin_can_list_team_members(test_client: TestClient, db_session: Session):
+    """
+    USER STORY: As an MFI admin, I want to see everyone on my team.
+    """
+    from tests.utils import create_user_in_db
+
+    tenant, admin, password = create_tenant_and_admin(db_session)
+    create_user_in_db(db_session, tenant, "listed.teller@test.com", "tellerpass", UserRole.TELLER)
+    auth_headers = get_auth_headers(test_client, admin.email, password)
+
+    response = test_client.get("/api/v1/team/members", headers=auth_headers)
+    assert response.status_code == 200
+    emails = {member["email"] for member in response.json()["items"]}
+    assert emails == {"main.admin@test.com", "listed.teller@test.com"}
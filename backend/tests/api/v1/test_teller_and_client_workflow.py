@@ -70,7 +70,7 @@ def test_client_can_view_their_loans(test_client: TestClient, db_session: Sessio
     response = test_client.get("/api/v1/loans/my-loans", headers=client_headers)
     
     assert response.status_code == 200
-    data = response.json()
+    data = response.json()["items"]
     assert len(data) == 1
     assert data[0]["id"] == str(approved_loan.id)
     assert data[0]["status"] == "disbursed"
\ No newline at end of file
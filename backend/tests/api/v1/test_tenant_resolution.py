@@ -0,0 +1,46 @@
+# backend/tests/api/v1/test_tenant_resolution.py
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+from app import models
+from app.core import tenant_registry
+from tests.utils import create_tenant_and_admin
+
+def test_client_signup_resolves_tenant_from_cache(test_client: TestClient, db_session: Session):
+    """
+    USER STORY: As a borrower, I want to sign up on my MFI's portal.
+    The tenant lookup should only hit the database once per subdomain.
+    """
+    tenant, _, _ = create_tenant_and_admin(db_session)
+    tenant_id = str(tenant.id)
+    headers = {"X-Tenant-Subdomain": tenant.subdomain}
+    before = tenant_registry.stats()
+
+    for i in range(2):
+        signup_data = {
+            "first_name": "Self", "last_name": f"Signup{i}",
+            "user_info": {"email": f"self{i}@test.com", "password": "password123"}
+        }
+        response = test_client.post("/api/v1/clients/signup", json=signup_data, headers=headers)
+        assert response.status_code == 201
+        assert response.json()["tenant_id"] == tenant_id
+
+    after = tenant_registry.stats()
+    assert after["misses"] - before["misses"] == 1
+    assert after["hits"] - before["hits"] == 1
+
+def test_unknown_subdomain_is_negatively_cached(test_client: TestClient, db_session: Session):
+    """Repeated requests for a bogus subdomain should 404 without re-querying."""
+    signup_data = {"first_name": "No", "last_name": "Tenant", "user_info": {"email": "x@test.com", "password": "pw"}}
+    headers = {"X-Tenant-Subdomain": "doesnotexist"}
+    misses_before = tenant_registry.stats()["misses"]
+    for _ in range(3):
+        response = test_client.post("/api/v1/clients/signup", json=signup_data, headers=headers)
+        assert response.status_code == 404
+    assert tenant_registry.stats()["misses"] - misses_before == 1
+
+    # Creating the tenant must invalidate the negative entry
+    db_session.add(models.Tenant(name="Late Tenant", subdomain="doesnotexist"))
+    db_session.commit()
+    response = test_client.post("/api/v1/clients/signup", json=signup_data, headers=headers)
+    assert response.status_code == 201
@@ -6,7 +6,11 @@ from sqlalchemy.orm import sessionmaker
 
 from app.main import app
 from app.core.config import settings
-from app.core.database import Base, get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import get_db, get_async_db
+from app.models.base import Base
+from app.core import tenant_registry, principal, read_routing
+from app.services import accounting_service, catalog_service, reporting_service
 
 # --- Create a separate Test Database ---
 # Use a different database for testing. An in-memory SQLite DB is fast and isolated.
@@ -26,6 +30,21 @@ def setup_database():
     yield
     Base.metadata.drop_all(bind=engine) # Clean up after tests
 
+# --- Reset in-process caches so state never leaks between tests ---
+@pytest.fixture(scope="function", autouse=True)
+def reset_caches():
+    yield
+    tenant_registry._tenants.clear()
+    principal._verified_tokens.clear()
+    principal._token_versions.clear()
+    read_routing._recent_writers.clear()
+    read_routing._replica.reset()
+    accounting_service._account_ids.clear()
+    reporting_service._dashboard_cache.clear()
+    reporting_service._metrics_versions.clear()
+    catalog_service._catalog_cache.clear()
+    catalog_service._catalog_versions.clear()
+
 # --- Fixture to Override the 'get_db' Dependency ---
 @pytest.fixture(scope="function")
 def db_session() -> Generator:
@@ -52,6 +71,16 @@ def test_client(db_session: Generator) -> TestClient:
         finally:
             db_session.close()
 
+    async def override_get_async_db():
+        # Async endpoints share the test session (and its rolled-back transaction);
+        # the sync SQLite connection simply runs inside SQLAlchemy's greenlet bridge.
+        async_session = AsyncSession(sync_session_class=lambda **_: db_session)
+        try:
+            yield async_session
+        finally:
+            db_session.close()
+
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
     client = TestClient(app)
     return client
\ No newline at end of file
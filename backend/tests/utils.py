@@ -1,10 +1,14 @@
 # backend/tests/utils.py
 
+from datetime import datetime
+from decimal import Decimal
+from typing import Callable
+
 from fastapi.testclient import TestClient
 from sqlalchemy.orm import Session
 from app import models, schemas
 from app.core.security import UserRole
-from app.services import user_service
+from app.services import aging_service, repayment_service, user_service
 
 def get_auth_headers(test_client: TestClient, email: str, password: str) -> dict:
     """Helper function to log in and get auth headers."""
@@ -23,9 +27,71 @@ def create_user_in_db(db: Session, tenant: models.Tenant, email: str, password:
 def create_tenant_and_admin(db: Session) -> tuple[models.Tenant, models.User, str]:
     """Helper fixture to create a tenant and an admin user, returning them."""
     password = "a_secure_password"
-    tenant = models.Tenant(name="Test Tenant Inc.")
+    tenant = models.Tenant(name="Test Tenant Inc.", subdomain="testtenant")
     db.add(tenant)
     db.commit()
     db.refresh(tenant)
     admin = create_user_in_db(db, tenant, "main.admin@test.com", password, UserRole.ADMIN)
-    return tenant, admin, password
\ No newline at end of file
+    return tenant, admin, password
+
+def add_chart_of_accounts(db: Session, tenant: models.Tenant) -> None:
+    """Gives the tenant the default chart of accounts, which every GL posting needs."""
+    db.add_all(models.ChartOfAccount(**account, tenant_id=tenant.id) for account in models.DEFAULT_COA)
+    db.flush()
+
+def create_loans(
+    db: Session,
+    tenant: models.Tenant,
+    *,
+    count: int = 1,
+    status: models.LoanStatus = models.LoanStatus.APPROVED,
+    amount: Decimal = Decimal("1200.00"),
+    tenure_months: int = 12,
+    interest_rate: float = 0,
+    interest_method: str = "flat",
+    penalty: tuple[models.PenaltyType, Decimal] | None = None,
+    each: Callable[[int], dict] = lambda i: {},
+) -> list[models.Loan]:
+    """
+    `count` loans of one new client under one new product, flushed but not
+    committed. `penalty` is the product's (type, value); `each(i)` returns
+    column overrides for the i-th loan (amount, officer, dates, ...).
+    """
+    client = models.Client(first_name="Test", last_name="Borrower", tenant_id=tenant.id)
+    product = models.LoanProduct(
+        name="Test Loan", interest_rate=interest_rate, interest_method=interest_method, max_tenure_months=12,
+        tenant_id=tenant.id,
+        penalty_type=penalty[0].value if penalty else None, penalty_value=penalty[1] if penalty else 0,
+    )
+    db.add_all([client, product])
+    db.flush()
+    loans = [
+        models.Loan(**{
+            "amount_requested": amount, "tenure_months": tenure_months, "client_id": client.id,
+            "loan_product_id": product.id, "tenant_id": tenant.id, "status": status, **each(i),
+        })
+        for i in range(count)
+    ]
+    db.add_all(loans)
+    db.flush()
+    return loans
+
+def create_disbursed_loans(
+    db: Session, tenant: models.Tenant, *, disbursed_at: datetime | None = None, **options
+) -> list[models.Loan]:
+    """
+    Loans as `create_loans` makes them, disbursed at `disbursed_at` (default
+    now) with their repayment schedules and aging in place, and committed.
+    """
+    each = options.pop("each", lambda i: {})
+    disbursed_at = disbursed_at or datetime.utcnow()
+    loans = create_loans(
+        db, tenant, status=models.LoanStatus.DISBURSED,
+        each=lambda i: {"disbursed_at": disbursed_at, **each(i)}, **options,
+    )
+    for loan in loans:
+        repayment_service.generate_schedule(db, loan)
+    db.flush()
+    aging_service.refresh_loans(db, [loan.id for loan in loans])
+    db.commit()
+    return loans